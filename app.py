@@ -4,13 +4,15 @@ from scrapers.sao_joao import SaoJoaoScraper
 from scrapers.panvel import PanvelScraper
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 import os
-import platform
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Importar funções do base_scraper
 from scrapers.base_scraper import get_chrome_version, get_chromedriver_url, update_chromedriver, get_os_type
+from scrapers.base_scraper import build_chrome_options, get_local_chromedriver_path, create_pool_driver
+from scrapers.base_scraper import resolve_chromedriver_path, CHROME_USER_AGENT
+from scrapers.base_scraper import set_shared_browser_backend, set_shared_tab_backend, create_tab_backend_driver
+from scrapers.base_scraper import ENGINE_POOL, ENGINE_TABS
 
 # Importar o unificador de produtos
 from utils.product_unifier import ProductUnifier
@@ -18,40 +20,83 @@ from utils.product_unifier import ProductUnifier
 # Importar o gerenciador de cache
 from utils.cache_manager import CacheManager
 
+# Importar o parser de preços em centavos compartilhado com os scrapers
+from utils.money import parse_brl_batch, to_reais
+
+# Importar o pool de drivers e o backend de navegador para páginas de produto
+from utils.driver_pool import DriverPool
+from utils.browser_backend import BrowserBackend
+from utils.tab_backend import TabBrowserBackend
+
+# Importar os perfis persistentes do Chrome (cache HTTP em disco por farmácia)
+from utils.profile_manager import ProfileManager, set_default_profile_manager, get_default_profile_manager
+
+# Importar o estado de sessão persistido (cookies de consentimento) por farmácia
+from utils.session_state import SessionStateStore, set_default_session_store
+
+# Importar os detalhes de produto persistidos (marca e preço das páginas de produto)
+from utils.product_details import ProductDetailStore, set_default_product_detail_store, get_default_product_detail_store
+
+# Importar a sessão HTTP keep-alive usada no caminho rápido das listagens
+from utils.http_session import create_http_session, set_default_http_session
+from utils.http_enrichment import HttpEnrichmentEngine, set_default_enrichment_engine, get_default_enrichment_engine
+
+# Importar os transportes das páginas (selenium, http e páginas gravadas)
+from utils.transports import ReplayTransport, register_transport, resolve_transports, REPLAY_TRANSPORTS
+from utils.fixture_store import FixtureStore, set_default_capture_store
+
+# Importar os parsers HTML disponíveis (html.parser, lxml e, se instalado, selectolax)
+from utils.html_parsers import get_parser_backend
+
+# Importar o pool de processos que parseia as listagens fora das threads das buscas
+from utils.parse_pool import ParsePool, scraper_path, set_default_parse_pool, get_default_parse_pool
+
+# Importar o serviço do ChromeDriver compartilhado entre as sessões
+from utils.chromedriver_service import (
+    SharedChromeDriverService, set_default_chromedriver_service, get_default_chromedriver_service
+)
+
+# Importar a política de bloqueio de recursos das páginas
+from utils.resource_blocking import (
+    BlockingPolicy, set_default_blocking_policy,
+    DEFAULT_BLOCKED_RESOURCE_TYPES, DEFAULT_BLOCKED_URL_PATTERNS
+)
+
 # Inicializar ProductUnifier global
 product_unifier = ProductUnifier()
 
+# Scrapers das farmácias consultadas em cada busca
+PHARMACY_SCRAPERS = {
+    'droga_raia': DrogaRaiaScraper,
+    'sao_joao': SaoJoaoScraper,
+    'panvel': PanvelScraper
+}
+
 def process_pharmacy_results(results, search_term=""):
     """Processa resultados de farmácias usando o novo ProductUnifier"""
     processed_results = {}
     
     for pharmacy_name, pharmacy_data in results.items():
         if 'products' in pharmacy_data and pharmacy_data['products']:
-            # Filtrar produtos com preço zero antes do processamento
+            # Filtrar produtos com preço zero antes do processamento: os preços (número ou texto)
+            # viram centavos de uma vez, e ausentes (MISSING) ou zerados ficam de fora por `> 0`
+            products = pharmacy_data['products']
             valid_products = []
-            for product in pharmacy_data['products']:
-                # Verificar se o preço é válido (não zero e não None)
-                price = product.get('price', 0)
-                
-                # Converter para float se for string
-                try:
-                    if isinstance(price, str):
-                        # Remover caracteres não numéricos e converter
-                        price_clean = price.replace('R$', '').replace(' ', '').replace(',', '.').strip()
-                        price = float(price_clean) if price_clean else 0
-                    elif price is None:
-                        price = 0
-                    else:
-                        price = float(price)
-                except (ValueError, TypeError):
-                    price = 0
-                
-                if price > 0:
-                    # Atualizar o preço no produto para garantir que seja numérico
-                    product['price'] = price
+            for product, price_cents, original_cents in zip(
+                products,
+                parse_brl_batch(product.get('price') for product in products),
+                parse_brl_batch(product.get('original_price') for product in products)
+            ):
+                if price_cents > 0:
+                    # Preço numérico em reais para a resposta e em centavos para comparações
+                    product['price'] = to_reais(price_cents)
+                    product['price_cents'] = price_cents
+                    if original_cents > 0:
+                        product['original_price'] = to_reais(original_cents)
+                        product['original_price_cents'] = original_cents
                     valid_products.append(product)
                 else:
-                    print(f"Produto removido por preço zero: {product.get('name', 'N/A')} - Preço: {price}")
+                    print(f"Produto removido por preço zero: {product.get('name', 'N/A')} - Preço: {product.get('price')}")
             
             # Processar apenas produtos válidos
             if valid_products:
@@ -89,6 +134,127 @@ global_driver = None
 # Variável global para o cache manager
 cache_manager = None
 
+# Variável global para o pool de drivers usado pelas buscas
+driver_pool = None
+
+# Configurações padrão do pool de drivers (sobrescritas via create_app(config))
+DEFAULT_DRIVER_POOL_CONFIG = {
+    'DRIVER_POOL_SIZE': 3,  # Um driver por farmácia em uma busca
+    'DRIVER_POOL_PREWARM': 0,  # Drivers iniciados junto com a aplicação
+    'DRIVER_POOL_LEASE_TIMEOUT': 120,  # Espera máxima por um driver livre (segundos)
+    'DRIVER_MAX_PAGES': 50,  # Páginas servidas por driver antes de reciclá-lo
+    'DRIVER_MAX_AGE': 1800,  # Idade máxima de um driver (segundos)
+    'DRIVER_MAX_MEMORY_MB': 1024,  # Memória máxima dos processos do Chrome de um driver (MB)
+    'DRIVER_RECYCLE_INTERVAL': 30  # Intervalo da reciclagem em segundo plano (segundos)
+}
+
+# Variável global para o backend de navegador usado no enriquecimento de produtos
+browser_backend = None
+
+# Motor de navegação usado pelas buscas ('pool' ou 'tabs')
+browser_engine = ENGINE_POOL
+
+# Configurações padrão do backend de enriquecimento (sobrescritas via create_app(config))
+DEFAULT_BROWSER_BACKEND_CONFIG = {
+    'BROWSER_ENGINE': ENGINE_POOL,  # 'tabs' multiplexa listagem e páginas de produto em um único Chrome
+    'ENRICHMENT_MAX_PAGES': 4,  # Limite global de páginas de produto abertas ao mesmo tempo
+    'TAB_BACKEND_MAX_TABS': 8  # Máximo de abas simultâneas no motor 'tabs'
+}
+
+# Sobrescritas do bloqueio de recursos por farmácia (chave = nome do scraper, ex.: 'panvel')
+resource_blocking_overrides = {}
+
+# Configurações padrão do bloqueio de recursos (sobrescritas via create_app(config))
+DEFAULT_RESOURCE_BLOCKING_CONFIG = {
+    'RESOURCE_BLOCKING_ENABLED': True,  # Bloqueia recursos desnecessários via DevTools antes de cada navegação
+    'BLOCKED_RESOURCE_TYPES': DEFAULT_BLOCKED_RESOURCE_TYPES,  # Image, Font, Stylesheet, Media
+    'BLOCKED_URL_PATTERNS': DEFAULT_BLOCKED_URL_PATTERNS,  # Rastreadores e analytics de terceiros
+    'RESOURCE_BLOCKING_OVERRIDES': {}  # Ex.: {'panvel': {'allow_resource_types': ['Stylesheet']}}
+}
+
+# Configurações padrão do estado de sessão persistido (sobrescritas via create_app(config))
+DEFAULT_SESSION_STATE_CONFIG = {
+    'SESSION_STATE_ENABLED': True,  # Reutiliza cookies/localStorage de consentimento entre drivers e abas
+    'SESSION_STATE_DIR': 'cache/session_state',  # Diretório dos arquivos JSON de estado
+    'SESSION_STATE_MAX_AGE_HOURS': 24  # Validade do estado capturado
+}
+
+# Configurações padrão dos detalhes de produto persistidos (sobrescritas via create_app(config))
+DEFAULT_PRODUCT_DETAIL_CONFIG = {
+    'PRODUCT_DETAIL_CACHE_ENABLED': True,  # Consulta marca/preço guardados antes de abrir as páginas de produto
+    'PRODUCT_DETAIL_CACHE_DIR': 'cache/product_details',  # Diretório dos arquivos JSON (um por site)
+    'PRODUCT_DETAIL_BRAND_TTL_HOURS': 24 * 21,  # Validade da marca/fabricante (não muda)
+    'PRODUCT_DETAIL_PRICE_TTL_HOURS': 6  # Validade do preço e do desconto
+}
+
+# Configurações padrão dos perfis do Chrome (sobrescritas via create_app(config))
+DEFAULT_CHROME_PROFILE_CONFIG = {
+    'CHROME_PROFILES_ENABLED': True,  # Perfil e cache HTTP em disco persistentes por farmácia
+    'CHROME_PROFILE_DIR': 'cache/chrome_profiles',  # Diretório raiz dos perfis
+    'CHROME_DISK_CACHE_MB': 100,  # Tamanho máximo do cache HTTP de cada perfil
+    'CHROME_PROFILES_PER_PHARMACY': 4,  # Perfis persistentes por farmácia (acima disso, perfis temporários)
+    'CHROME_PROFILES_MAX_TOTAL_MB': 1024  # Tamanho máximo de todos os perfis em disco
+}
+
+# Configurações padrão do serviço do ChromeDriver (sobrescritas via create_app(config))
+DEFAULT_CHROMEDRIVER_CONFIG = {
+    'CHROMEDRIVER_SHARED': True  # Um único processo do ChromeDriver atende todas as sessões do Chrome
+}
+
+# Configurações padrão da sessão HTTP das listagens (sobrescritas via create_app(config))
+DEFAULT_HTTP_SESSION_CONFIG = {
+    'HTTP_POOL_MAXSIZE': 10,  # Conexões keep-alive mantidas por host
+    'HTTP_ENRICHMENT_ENABLED': True,  # Completa marca/preço pelas páginas de produto via HTTP antes do navegador
+    'HTTP_ENRICHMENT_PER_HOST': 4,  # Páginas de produto simultâneas por farmácia, somando todas as buscas
+    'HTTP_ENRICHMENT_BATCH_TIMEOUT': 20  # Orçamento de tempo das páginas de produto de uma busca (segundos)
+}
+
+# Cadeias de transportes e URL base por farmácia (chave = nome do scraper), e se todas as buscas vêm das gravações
+scraper_transports = {}
+pharmacy_base_urls = {}
+replay_all = False
+
+# Configurações padrão dos transportes das páginas (sobrescritas via create_app(config))
+DEFAULT_TRANSPORT_CONFIG = {
+    'SCRAPER_TRANSPORTS': {},  # Ex.: {'panvel': {'listing': ['replay'], 'product': ['replay']}}
+    'REPLAY_FIXTURE_DIR': None,  # Diretório das páginas gravadas servidas pelo transporte 'replay'
+    'REPLAY_LATENCY': 0.0,  # Atraso simulado por página gravada, em segundos
+    'REPLAY_ALL': False,  # Todas as farmácias e páginas vêm das gravações (busca offline, sem navegador)
+    'FIXTURE_CAPTURE_DIR': None,  # Grava todas as páginas obtidas neste diretório (para replay posterior)
+    'PHARMACY_BASE_URLS': {}  # Ex.: {'panvel': 'http://127.0.0.1:8123'} para o servidor local de testes
+}
+
+# Parser HTML configurado por farmácia (chave = nome do scraper, ex.: 'panvel')
+html_parser_backends = {}
+
+# Configurações padrão do parser HTML (sobrescritas via create_app(config))
+DEFAULT_HTML_PARSER_CONFIG = {
+    'HTML_PARSER_BACKENDS': {}  # Ex.: {'panvel': 'html.parser'}; padrão: PARSER_BACKEND de cada scraper (lxml)
+}
+
+# Configurações padrão do pool de parse das listagens (sobrescritas via create_app(config))
+DEFAULT_PARSE_POOL_CONFIG = {
+    'PARSE_POOL_ENABLED': False,  # Parse e extração das listagens em processos, fora do GIL das buscas
+    'PARSE_POOL_WORKERS': None,  # Processos do pool (padrão: número de CPUs)
+    'PARSE_POOL_START_METHOD': 'spawn'  # Criação dos processos ('spawn', 'forkserver' ou 'fork')
+}
+
+def config_settings(defaults, config=None):
+    """
+    Combina as configurações padrão de um componente com as da aplicação
+    
+    Args:
+        defaults (dict): Configurações padrão (DEFAULT_*_CONFIG)
+        config (dict): Configuração da aplicação (app.config); só as chaves de defaults são lidas
+        
+    Returns:
+        dict: Nova cópia dos padrões com os valores configurados
+    """
+    settings = dict(defaults)
+    if config:
+        settings.update({key: config[key] for key in defaults if key in config})
+    return settings
+
 def setup_global_driver():
     """Configura o driver global do Selenium"""
     global global_driver
@@ -104,13 +270,7 @@ def setup_global_driver():
             print(f"URL do ChromeDriver: {chromedriver_url}")
             
             # Atualizar ChromeDriver se necessário
-            CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
-            chromedriver_path = os.path.join(CHROMEDRIVER_DIR, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-            # Se não encontrar, tente na subpasta chromedriver-win64
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-                if os.path.exists(chromedriver_path_alt):
-                    chromedriver_path = chromedriver_path_alt
+            chromedriver_path = get_local_chromedriver_path()
             
             if not os.path.exists(chromedriver_path):
                 print("ChromeDriver não encontrado. Baixando...")
@@ -121,20 +281,18 @@ def setup_global_driver():
             print("Usando ChromeDriverManager como fallback...")
         
         # Configurar opções do Chrome
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options = build_chrome_options()
+        chromedriver_path = get_local_chromedriver_path()
         
         # Inicializar o driver
         try:
+            shared_service = get_default_chromedriver_service()
+            if shared_service is not None:
+                # Conectar ao ChromeDriver compartilhado, iniciando apenas o Chrome
+                global_driver = webdriver.Chrome(service=shared_service, options=chrome_options)
+                print("Driver inicializado com o ChromeDriver compartilhado")
             # Tentar usar ChromeDriver local primeiro
-            if os.path.exists(chromedriver_path):
+            elif os.path.exists(chromedriver_path):
                 service = Service(chromedriver_path)
                 global_driver = webdriver.Chrome(service=service, options=chrome_options)
                 print("Driver inicializado com ChromeDriver local")
@@ -179,6 +337,285 @@ def cleanup_global_driver():
         global_driver = None
         print("Driver global encerrado")
 
+def setup_driver_pool(config=None):
+    """Configura o pool global de drivers a partir da configuração da aplicação"""
+    global driver_pool
+    settings = config_settings(DEFAULT_DRIVER_POOL_CONFIG, config)
+    
+    # Encerrar pool anterior, se houver
+    cleanup_driver_pool()
+    driver_pool = DriverPool(
+        create_pool_driver,
+        max_size=int(settings['DRIVER_POOL_SIZE']),
+        lease_timeout=float(settings['DRIVER_POOL_LEASE_TIMEOUT']),
+        **driver_recycling_options(config)
+    )
+    if int(settings['DRIVER_POOL_PREWARM']) > 0:
+        driver_pool.prewarm(int(settings['DRIVER_POOL_PREWARM']))
+    driver_pool.start_recycler()
+    print(f"Pool de drivers configurado (tamanho máximo: {driver_pool.max_size})")
+    return driver_pool
+
+def driver_recycling_options(config=None):
+    """Retorna os limites de reciclagem de drivers (páginas, idade e memória) para criar um DriverPool"""
+    settings = config_settings(DEFAULT_DRIVER_POOL_CONFIG, config)
+    
+    def optional(value, cast):
+        return None if value is None else cast(value)
+    
+    return {
+        'max_pages': optional(settings['DRIVER_MAX_PAGES'], int),
+        'max_age': optional(settings['DRIVER_MAX_AGE'], float),
+        'max_memory_mb': optional(settings['DRIVER_MAX_MEMORY_MB'], float),
+        'recycle_interval': float(settings['DRIVER_RECYCLE_INTERVAL'])
+    }
+
+def get_driver_pool():
+    """Retorna o pool global de drivers"""
+    global driver_pool
+    if driver_pool is None:
+        setup_driver_pool()
+    return driver_pool
+
+def cleanup_driver_pool():
+    """Encerra o pool global de drivers"""
+    global driver_pool
+    if driver_pool:
+        driver_pool.close()
+        driver_pool = None
+        print("Pool de drivers encerrado")
+
+def setup_browser_backend(config=None):
+    """Configura o backend de navegador compartilhado pelo enriquecimento de produtos"""
+    global browser_backend, browser_engine
+    settings = config_settings(DEFAULT_BROWSER_BACKEND_CONFIG, config)
+    
+    # Encerrar backend anterior, se houver
+    cleanup_browser_backend()
+    engine = settings['BROWSER_ENGINE']
+    if engine == ENGINE_TABS:
+        max_pages = int(settings['TAB_BACKEND_MAX_TABS'])
+        browser_backend = TabBrowserBackend(create_tab_backend_driver, max_tabs=max_pages)
+        set_shared_tab_backend(browser_backend)
+    elif engine == ENGINE_POOL:
+        max_pages = int(settings['ENRICHMENT_MAX_PAGES'])
+        enrichment_pool = DriverPool(create_pool_driver, max_size=max_pages, **driver_recycling_options(config))
+        enrichment_pool.start_recycler()
+        browser_backend = BrowserBackend(enrichment_pool, max_concurrent_pages=max_pages)
+        set_shared_browser_backend(browser_backend)
+    else:
+        raise ValueError(f"BROWSER_ENGINE inválido: {engine}")
+    browser_engine = engine
+    print(f"Backend de navegador '{engine}' configurado (máximo de {max_pages} páginas simultâneas)")
+    return browser_backend
+
+def get_browser_backend():
+    """Retorna o backend de navegador compartilhado"""
+    global browser_backend
+    if browser_backend is None:
+        setup_browser_backend()
+    return browser_backend
+
+def cleanup_browser_backend():
+    """Encerra o backend de navegador compartilhado"""
+    global browser_backend
+    if browser_backend:
+        browser_backend.close()
+        browser_backend = None
+        set_shared_browser_backend(None)
+        set_shared_tab_backend(None)
+        print("Backend de navegador encerrado")
+
+def setup_resource_blocking(config=None):
+    """Configura a política padrão de bloqueio de recursos e as sobrescritas por farmácia"""
+    global resource_blocking_overrides
+    settings = config_settings(DEFAULT_RESOURCE_BLOCKING_CONFIG, config)
+    
+    policy = BlockingPolicy(
+        resource_types=settings['BLOCKED_RESOURCE_TYPES'],
+        url_patterns=settings['BLOCKED_URL_PATTERNS'],
+        enabled=bool(settings['RESOURCE_BLOCKING_ENABLED'])
+    )
+    set_default_blocking_policy(policy)
+    resource_blocking_overrides = dict(settings['RESOURCE_BLOCKING_OVERRIDES'])
+    print(f"Bloqueio de recursos {'ativado' if policy.enabled else 'desativado'} ({len(policy.patterns())} padrões)")
+    return policy
+
+def setup_http_session(config=None):
+    """Configura a sessão HTTP keep-alive compartilhada pelo caminho rápido das listagens"""
+    settings = config_settings(DEFAULT_HTTP_SESSION_CONFIG, config)
+    
+    session = create_http_session(int(settings['HTTP_POOL_MAXSIZE']), user_agent=CHROME_USER_AGENT)
+    set_default_http_session(session)
+    
+    # Motor assíncrono das páginas de produto, sobre a mesma sessão
+    cleanup_http_enrichment()
+    if settings['HTTP_ENRICHMENT_ENABLED']:
+        set_default_enrichment_engine(HttpEnrichmentEngine(
+            session,
+            per_host_limit=int(settings['HTTP_ENRICHMENT_PER_HOST']),
+            batch_timeout=float(settings['HTTP_ENRICHMENT_BATCH_TIMEOUT'])
+        ))
+    return session
+
+def setup_transports(config=None):
+    """Registra o transporte de páginas gravadas e as cadeias de transportes por farmácia"""
+    global scraper_transports, pharmacy_base_urls, replay_all
+    settings = config_settings(DEFAULT_TRANSPORT_CONFIG, config)
+    
+    pharmacy_base_urls = dict(settings['PHARMACY_BASE_URLS'])
+    if settings['REPLAY_FIXTURE_DIR']:
+        register_transport(ReplayTransport(FixtureStore(settings['REPLAY_FIXTURE_DIR']),
+                                           latency=float(settings['REPLAY_LATENCY'])))
+    elif settings['REPLAY_ALL']:
+        raise ValueError("REPLAY_ALL requer REPLAY_FIXTURE_DIR")
+    replay_all = bool(settings['REPLAY_ALL'])
+    
+    capture_dir = settings['FIXTURE_CAPTURE_DIR']
+    set_default_capture_store(FixtureStore(capture_dir) if capture_dir else None)
+    if capture_dir:
+        print(f"Captura de páginas ativada em {capture_dir}")
+    
+    # Validar os nomes já na inicialização, em vez de falhar na primeira busca
+    for chains in settings['SCRAPER_TRANSPORTS'].values():
+        for names in chains.values():
+            resolve_transports(names)
+    scraper_transports = dict(settings['SCRAPER_TRANSPORTS'])
+    return scraper_transports
+
+def get_scraper_transports(pharmacy_name):
+    """Retorna as cadeias de transportes configuradas para a farmácia (None usa as do scraper)"""
+    if replay_all:
+        return REPLAY_TRANSPORTS
+    return scraper_transports.get(pharmacy_name)
+
+def setup_html_parsers(config=None):
+    """Configura o parser HTML de cada farmácia"""
+    global html_parser_backends
+    settings = config_settings(DEFAULT_HTML_PARSER_CONFIG, config)
+    
+    # Validar os nomes já na inicialização (ex.: selectolax não instalado)
+    for name in settings['HTML_PARSER_BACKENDS'].values():
+        get_parser_backend(name)
+    html_parser_backends = dict(settings['HTML_PARSER_BACKENDS'])
+    return html_parser_backends
+
+def get_scraper_options(pharmacy_name):
+    """Opções de configuração passadas a cada scraper da farmácia"""
+    return {
+        'blocking_overrides': resource_blocking_overrides.get(pharmacy_name),
+        'transports': get_scraper_transports(pharmacy_name),
+        'base_url_override': pharmacy_base_urls.get(pharmacy_name),
+        'parser_backend': html_parser_backends.get(pharmacy_name)
+    }
+
+def setup_parse_pool(config=None):
+    """Inicia o pool de processos que parseia as listagens, com os scrapers configurados pré-carregados"""
+    settings = config_settings(DEFAULT_PARSE_POOL_CONFIG, config)
+    
+    # Encerrar pool anterior, se houver
+    cleanup_parse_pool()
+    if not settings['PARSE_POOL_ENABLED']:
+        return None
+    # Mesmas opções que parse_pool_options() de cada scraper das buscas (parser e origem configurados)
+    preload = [
+        (scraper_path(scraper_class), {
+            'parser_backend': html_parser_backends.get(pharmacy_name) or scraper_class.PARSER_BACKEND,
+            'base_url_override': pharmacy_base_urls.get(pharmacy_name)
+        })
+        for pharmacy_name, scraper_class in PHARMACY_SCRAPERS.items()
+    ]
+    workers = settings['PARSE_POOL_WORKERS']
+    pool = ParsePool(
+        max_workers=int(workers) if workers else None,
+        preload=preload,
+        start_method=settings['PARSE_POOL_START_METHOD']
+    ).start()
+    set_default_parse_pool(pool)
+    print(f"Pool de parse iniciado com {pool.max_workers} processos")
+    return pool
+
+def cleanup_parse_pool():
+    """Encerra o pool de parse"""
+    pool = get_default_parse_pool()
+    if pool is not None:
+        set_default_parse_pool(None)
+        pool.close()
+
+def cleanup_http_enrichment():
+    """Encerra o motor de enriquecimento HTTP"""
+    engine = get_default_enrichment_engine()
+    if engine is not None:
+        set_default_enrichment_engine(None)
+        engine.close()
+
+def setup_chromedriver_service(config=None):
+    """Configura o processo único do ChromeDriver compartilhado por todos os drivers"""
+    settings = config_settings(DEFAULT_CHROMEDRIVER_CONFIG, config)
+    
+    # Encerrar serviço anterior, se houver
+    cleanup_chromedriver_service()
+    service = None
+    if settings['CHROMEDRIVER_SHARED']:
+        # O binário só é localizado (e, se preciso, baixado) quando o primeiro driver for criado
+        service = SharedChromeDriverService(path_resolver=resolve_chromedriver_path)
+    set_default_chromedriver_service(service)
+    print(f"ChromeDriver {'compartilhado entre as sessões' if service else 'iniciado por driver'}")
+    return service
+
+def cleanup_chromedriver_service():
+    """Encerra o ChromeDriver compartilhado"""
+    service = get_default_chromedriver_service()
+    if service is not None:
+        set_default_chromedriver_service(None)
+        service.shutdown()
+        print("ChromeDriver compartilhado encerrado")
+
+def setup_chrome_profiles(config=None):
+    """Configura os perfis persistentes do Chrome usados pelos drivers do pool"""
+    settings = config_settings(DEFAULT_CHROME_PROFILE_CONFIG, config)
+    
+    manager = None
+    if settings['CHROME_PROFILES_ENABLED']:
+        manager = ProfileManager(
+            base_dir=settings['CHROME_PROFILE_DIR'],
+            disk_cache_mb=int(settings['CHROME_DISK_CACHE_MB']),
+            max_profiles_per_key=int(settings['CHROME_PROFILES_PER_PHARMACY']),
+            max_total_mb=int(settings['CHROME_PROFILES_MAX_TOTAL_MB'])
+        )
+    set_default_profile_manager(manager)
+    print(f"Perfis persistentes do Chrome {'ativados' if manager else 'desativados'}")
+    return manager
+
+def setup_session_state(config=None):
+    """Configura o armazenamento de estado de sessão usado pelos scrapers"""
+    settings = config_settings(DEFAULT_SESSION_STATE_CONFIG, config)
+    
+    store = None
+    if settings['SESSION_STATE_ENABLED']:
+        store = SessionStateStore(
+            state_dir=settings['SESSION_STATE_DIR'],
+            max_age_hours=float(settings['SESSION_STATE_MAX_AGE_HOURS'])
+        )
+    set_default_session_store(store)
+    print(f"Estado de sessão persistido {'ativado' if store else 'desativado'}")
+    return store
+
+def setup_product_details(config=None):
+    """Configura o armazenamento de detalhes de produto consultado pelo enriquecimento dos scrapers"""
+    settings = config_settings(DEFAULT_PRODUCT_DETAIL_CONFIG, config)
+    
+    store = None
+    if settings['PRODUCT_DETAIL_CACHE_ENABLED']:
+        store = ProductDetailStore(
+            store_dir=settings['PRODUCT_DETAIL_CACHE_DIR'],
+            brand_ttl_hours=float(settings['PRODUCT_DETAIL_BRAND_TTL_HOURS']),
+            price_ttl_hours=float(settings['PRODUCT_DETAIL_PRICE_TTL_HOURS'])
+        )
+    set_default_product_detail_store(store)
+    print(f"Detalhes de produto persistidos {'ativados' if store else 'desativados'}")
+    return store
+
 # Criar blueprint para as rotas da API
 pharma_api = Blueprint('pharma_api', __name__, url_prefix='/api/pharma')
 
@@ -215,46 +652,25 @@ def search_medicines():
         print(f"Fazendo nova busca para: {medicine_description}")
         
         # Função para rodar cada scraper em thread separada
-        def run_scraper(scraper_class, medicine_description):
-            # Cada thread precisa de seu próprio driver
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            import platform
-            import os
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--window-size=1920,1080")
-            CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
-            chromedriver_path = os.path.join(CHROMEDRIVER_DIR, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-                if os.path.exists(chromedriver_path_alt):
-                    chromedriver_path = chromedriver_path_alt
-            service = Service(chromedriver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+        pool = get_driver_pool()
+        backend = get_browser_backend()
+        def run_scraper(pharmacy_name, scraper_class, medicine_description):
+            # Cada thread empresta um driver do pool e o devolve ao final;
+            # as páginas de produto são abertas no backend compartilhado.
+            # No motor 'tabs', a listagem também é aberta em uma aba do backend.
+            scraper = scraper_class(driver_pool=pool, browser_backend=backend, engine=browser_engine,
+                                    **get_scraper_options(pharmacy_name))
             try:
-                scraper = scraper_class(driver=driver)
                 result = scraper.search(medicine_description)
             finally:
-                driver.quit()
+                scraper.cleanup()
             return result
         
-        scrapers = {
-            'droga_raia': DrogaRaiaScraper,
-            'sao_joao': SaoJoaoScraper,
-            'panvel': PanvelScraper
-        }
+        scrapers = PHARMACY_SCRAPERS
         results = {}
         with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
             future_to_pharmacy = {
-                executor.submit(run_scraper, scraper_class, medicine_description): pharmacy_name
+                executor.submit(run_scraper, pharmacy_name, scraper_class, medicine_description): pharmacy_name
                 for pharmacy_name, scraper_class in scrapers.items()
             }
             for future in as_completed(future_to_pharmacy):
@@ -310,46 +726,35 @@ def search_medicines_unified():
         # Cache não encontrado ou expirado - fazer nova busca
         print(f"Fazendo nova busca unificada para: {medicine_description}")
         
-        # Obter driver global
-        driver = get_global_driver()
+        # Drivers emprestados do pool, reciclados pelo próprio pool ao passar dos limites
+        pool = get_driver_pool()
+        backend = get_browser_backend()
         
         # Lista de scrapers disponíveis
-        scrapers = {
-            'droga_raia': DrogaRaiaScraper(driver=driver),
-            'sao_joao': SaoJoaoScraper(driver=driver),
-            'panvel': PanvelScraper(driver=driver)
-        }
+        scrapers = PHARMACY_SCRAPERS
         
         results = {}
         
-        # Executar busca em cada farmácia
-        for pharmacy_name, scraper in scrapers.items():
-            tried_restart = False
-            while True:
+        # Executar busca em cada farmácia; um driver com sessão inválida é descartado
+        # na devolução ao pool e a busca é repetida uma vez com outro driver
+        for pharmacy_name, scraper_class in scrapers.items():
+            for attempt in range(2):
+                scraper = scraper_class(driver_pool=pool, browser_backend=backend, engine=browser_engine,
+                                        **get_scraper_options(pharmacy_name))
                 try:
-                    pharmacy_results = scraper.search(medicine_description)
-                    results[pharmacy_name] = pharmacy_results
+                    results[pharmacy_name] = scraper.search(medicine_description)
                     break
                 except Exception as e:
                     error_msg = str(e)
-                    if (not tried_restart) and ('invalid session id' in error_msg.lower()):
-                        # Reiniciar driver global e tentar novamente uma vez
-                        cleanup_global_driver()
-                        setup_global_driver()
-                        # Recriar o scraper específico
-                        if pharmacy_name == 'droga_raia':
-                            scrapers[pharmacy_name] = DrogaRaiaScraper(driver=get_global_driver())
-                        elif pharmacy_name == 'sao_joao':
-                            scrapers[pharmacy_name] = SaoJoaoScraper(driver=get_global_driver())
-                        elif pharmacy_name == 'panvel':
-                            scrapers[pharmacy_name] = PanvelScraper(driver=get_global_driver())
-                        tried_restart = True
+                    if attempt == 0 and 'invalid session id' in error_msg.lower():
                         continue
                     results[pharmacy_name] = {
                         'error': f'Erro ao buscar em {pharmacy_name}: {error_msg}',
                         'products': []
                     }
                     break
+                finally:
+                    scraper.cleanup()
         
         # Salvar resultados no cache (apenas os dados das farmácias, sem processamento)
         cache_mgr.save_cache_results(medicine_description, results)
@@ -364,15 +769,39 @@ def search_medicines_unified():
 
 @pharma_api.route('/health', methods=['GET'])
 def health_check():
-    """Endpoint para verificar se o driver está funcionando"""
+    """Endpoint para verificar se os drivers do pool estão funcionando"""
     try:
-        driver = get_global_driver()
-        # Testar se o driver está respondendo
-        driver.current_url
+        with get_driver_pool().leased(timeout=5) as driver:
+            # Testar se o driver está respondendo
+            driver.current_url
         return jsonify({'status': 'healthy', 'driver': 'active'})
+    except TimeoutError:
+        # Todos os drivers estão ocupados com buscas
+        return jsonify({'status': 'healthy', 'driver': 'busy'})
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
+@pharma_api.route('/drivers/stats', methods=['GET'])
+def driver_stats():
+    """Endpoint para monitorar os drivers: uso, memória, reciclagens (contagem e motivos) e o ChromeDriver"""
+    try:
+        profile_manager = get_default_profile_manager()
+        chromedriver_service = get_default_chromedriver_service()
+        enrichment_engine = get_default_enrichment_engine()
+        parse_pool = get_default_parse_pool()
+        product_detail_store = get_default_product_detail_store()
+        return jsonify({
+            'driver_pool': get_driver_pool().get_stats(),
+            'browser_backend': get_browser_backend().get_stats(),
+            'chrome_profiles': profile_manager.get_stats() if profile_manager else None,
+            'chromedriver': chromedriver_service.get_stats() if chromedriver_service else None,
+            'http_enrichment': enrichment_engine.get_stats() if enrichment_engine else None,
+            'parse_pool': parse_pool.get_stats() if parse_pool else None,
+            'product_details': product_detail_store.get_stats() if product_detail_store else None
+        })
+    except Exception as e:
+        return jsonify({'error': f'Erro ao obter estatísticas dos drivers: {str(e)}'}), 500
+
 @pharma_api.route('/cache/stats', methods=['GET'])
 def cache_stats():
     """Endpoint para obter estatísticas do cache"""
@@ -449,9 +878,55 @@ def create_app(config=None):
     app.register_blueprint(pharma_api)
     app.register_blueprint(pharma_web)
     
+    # Configurar o ChromeDriver compartilhado antes de iniciar drivers (CHROMEDRIVER_SHARED)
+    setup_chromedriver_service(app.config)
+    
+    # Configurar perfis do Chrome antes de iniciar drivers (CHROME_PROFILES_ENABLED, CHROME_PROFILE_DIR,
+    # CHROME_DISK_CACHE_MB, CHROME_PROFILES_PER_PHARMACY, CHROME_PROFILES_MAX_TOTAL_MB)
+    setup_chrome_profiles(app.config)
+    
+    # Configurar pool de drivers (DRIVER_POOL_SIZE, DRIVER_POOL_PREWARM, DRIVER_POOL_LEASE_TIMEOUT)
+    # e reciclagem (DRIVER_MAX_PAGES, DRIVER_MAX_AGE, DRIVER_MAX_MEMORY_MB, DRIVER_RECYCLE_INTERVAL)
+    setup_driver_pool(app.config)
+    
+    # Configurar backend de enriquecimento (BROWSER_ENGINE, ENRICHMENT_MAX_PAGES, TAB_BACKEND_MAX_TABS)
+    setup_browser_backend(app.config)
+    
+    # Configurar bloqueio de recursos (RESOURCE_BLOCKING_ENABLED, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS,
+    # RESOURCE_BLOCKING_OVERRIDES)
+    setup_resource_blocking(app.config)
+    
+    # Configurar sessão HTTP das listagens (HTTP_POOL_MAXSIZE) e enriquecimento por HTTP
+    # (HTTP_ENRICHMENT_ENABLED, HTTP_ENRICHMENT_PER_HOST, HTTP_ENRICHMENT_BATCH_TIMEOUT)
+    setup_http_session(app.config)
+    
+    # Configurar transportes das páginas (SCRAPER_TRANSPORTS, REPLAY_FIXTURE_DIR, REPLAY_LATENCY, REPLAY_ALL)
+    # captura das páginas obtidas (FIXTURE_CAPTURE_DIR) e origens alternativas (PHARMACY_BASE_URLS)
+    setup_transports(app.config)
+    
+    # Configurar parser HTML por farmácia (HTML_PARSER_BACKENDS)
+    setup_html_parsers(app.config)
+    
+    # Configurar pool de parse das listagens (PARSE_POOL_ENABLED, PARSE_POOL_WORKERS, PARSE_POOL_START_METHOD),
+    # depois dos parsers e origens por farmácia que os processos reproduzem
+    setup_parse_pool(app.config)
+    
+    # Configurar estado de sessão persistido (SESSION_STATE_ENABLED, SESSION_STATE_DIR, SESSION_STATE_MAX_AGE_HOURS)
+    setup_session_state(app.config)
+    
+    # Configurar detalhes de produto persistidos (PRODUCT_DETAIL_CACHE_ENABLED, PRODUCT_DETAIL_CACHE_DIR,
+    # PRODUCT_DETAIL_BRAND_TTL_HOURS, PRODUCT_DETAIL_PRICE_TTL_HOURS)
+    setup_product_details(app.config)
+    
     # Configurar limpeza do driver ao encerrar
     import atexit
+    # O atexit executa na ordem inversa: o ChromeDriver compartilhado é encerrado depois de todos os drivers
+    atexit.register(cleanup_chromedriver_service)
     atexit.register(cleanup_global_driver)
+    atexit.register(cleanup_driver_pool)
+    atexit.register(cleanup_browser_backend)
+    atexit.register(cleanup_http_enrichment)
+    atexit.register(cleanup_parse_pool)
     
     return app
 
@@ -474,12 +949,14 @@ def get_blueprints():
 def main():
     """Função principal para execução standalone"""
     try:
+        # Criar a aplicação antes do driver global, para que ele use o ChromeDriver compartilhado
+        app = create_app()
+        
         # Inicializar driver global
         if init_driver():
             print("Aplicação iniciada com driver global configurado")
             
-            # Criar e executar a aplicação
-            app = create_app()
+            # Executar a aplicação
             app.run(debug=True, host='0.0.0.0', port=5000)
         else:
             print("Falha ao inicializar driver. Encerrando aplicação.")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark da localização dos campos dos cards: uma passada vs. find() por campo.
+
+Para cada listagem gravada com FIXTURE_CAPTURE_DIR, localiza os elementos
+de todos os cards com o CARD_EXTRACTOR do scraper da farmácia (uma única
+passada por card) e com um find() por campo, como os extratores faziam
+(find() dentro do elemento do campo pai para as regras com within, e as
+classes geradas por predicado lambda). Confere que os dois encontram os
+mesmos elementos e relata o tempo por card.
+
+Uso:
+    python benchmarks/card_extraction.py --fixtures cache/fixtures --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import droga_raia, panvel, sao_joao
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import PHARMACY_ORIGINS
+from utils.transports import KIND_LISTING
+
+# Extrator e localização dos cards de cada farmácia
+PHARMACIES = {
+    'droga_raia': (
+        droga_raia.DrogaRaiaScraper, droga_raia.CARD_EXTRACTOR,
+        lambda soup: soup.select('div[data-testid="container-products"] article')
+    ),
+    'sao_joao': (
+        sao_joao.SaoJoaoScraper, sao_joao.CARD_EXTRACTOR,
+        lambda soup: soup.select('div.vtex-search-result-3-x-gallery section.vtex-product-summary-2-x-container')
+    ),
+    'panvel': (
+        panvel.PanvelScraper, panvel.CARD_EXTRACTOR,
+        lambda soup: soup.find_all(['lib-card-item-v2-vertical', 'lib-card-item-v2-horizontal'])
+    )
+}
+
+def parse_args():
+    """Lê as opções da linha de comando"""
+    parser = argparse.ArgumentParser(description="Localização dos campos dos cards: uma passada vs. find() por campo")
+    parser.add_argument('--fixtures', required=True, help="Diretório das páginas gravadas (FIXTURE_CAPTURE_DIR)")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por listagem")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args()
+
+def find_each(extractor, card):
+    """Localiza cada campo com o seu próprio find(), como os extratores anteriores"""
+    found = {}
+    for field in extractor.fields:
+        root = card if field.within is None else found[field.within]
+        if root is None:
+            found[field.name] = None
+            continue
+        kwargs = dict(field.attrs)
+        if field.classes:
+            kwargs['class_'] = ' '.join(field.classes)
+        elif field.class_contains:
+            kwargs['class_'] = lambda value, part=field.class_contains: value and part in value
+        found[field.name] = root.find(field.tag or True, **kwargs)
+    return found
+
+def time_call(function, cards, repeat):
+    """Menor tempo, em milissegundos, de `repeat` execuções sobre todos os cards"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for card in cards:
+            function(card)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main():
+    """Executa o benchmark"""
+    args = parse_args()
+    by_pharmacy = {}
+    for entry in FixtureStore(args.fixtures).iter_entries(KIND_LISTING):
+        key = next((key for key, origin in PHARMACY_ORIGINS.items() if entry['url'].startswith(origin)), None)
+        if key is None:
+            continue
+        scraper_class, extractor, find_cards = PHARMACIES[key]
+        cards = find_cards(scraper_class(session_store=None).parse_listing(entry['content']))
+        if not cards:
+            continue
+        mismatches = sum(extractor.extract(card) != find_each(extractor, card) for card in cards)
+        single_ms = time_call(extractor.extract, cards, args.repeat)
+        find_ms = time_call(lambda card: find_each(extractor, card), cards, args.repeat)
+        stats = by_pharmacy.setdefault(key, {'listings': 0, 'cards': 0, 'mismatches': 0, 'single_us': [], 'find_us': []})
+        stats['listings'] += 1
+        stats['cards'] += len(cards)
+        stats['mismatches'] += mismatches
+        stats['single_us'].append(single_ms * 1000 / len(cards))
+        stats['find_us'].append(find_ms * 1000 / len(cards))
+
+    results = {
+        key: {
+            'listings': stats['listings'],
+            'cards': stats['cards'],
+            'mismatches': stats['mismatches'],
+            'single_pass_us_per_card': round(statistics.mean(stats['single_us']), 1),
+            'find_us_per_card': round(statistics.mean(stats['find_us']), 1)
+        }
+        for key, stats in by_pharmacy.items()
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if not results:
+        print(f"Nenhuma listagem com cards gravada em {args.fixtures}")
+        return
+    for key, stats in results.items():
+        speedup = stats['find_us_per_card'] / stats['single_pass_us_per_card'] if stats['single_pass_us_per_card'] else 0
+        print(f"{key:11} {stats['cards']} cards em {stats['listings']} listagens | uma passada "
+              f"{stats['single_pass_us_per_card']} µs/card | find() {stats['find_us_per_card']} µs/card "
+              f"({speedup:.1f}x) | divergências {stats['mismatches']}")
+
+if __name__ == '__main__':
+    main()
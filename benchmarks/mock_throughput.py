@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão dos scrapers Selenium contra o servidor local de farmácias.
+
+Sobe um servidor local por farmácia a partir das páginas gravadas
+(FIXTURE_CAPTURE_DIR) e executa buscas reais com DrogaRaiaScraper,
+SaoJoaoScraper e PanvelScraper apontados para ele (base_url_override), sem
+acessar a internet. Mede buscas por minuto, duração das buscas e memória do
+Chrome (RSS do navegador da listagem) ao final de cada busca.
+
+Uso:
+    python benchmarks/mock_throughput.py --fixtures cache/fixtures --searches 30 --concurrency 3 \
+        --latency lognormal --latency-mean 0.3 --latency-spread 0.5 --error-rate 0.02
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.base_scraper import create_pool_driver
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.sao_joao import SaoJoaoScraper
+from scrapers.panvel import PanvelScraper
+from utils.driver_pool import DriverPool, get_driver_rss_mb
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import LatencyModel, start_mock_pharmacies, LATENCY_DISTRIBUTIONS
+
+SCRAPERS = {
+    'droga_raia': DrogaRaiaScraper,
+    'sao_joao': SaoJoaoScraper,
+    'panvel': PanvelScraper
+}
+
+DEFAULT_TERMS = ['dipirona 500mg', 'losartana 50mg', 'paracetamol 750mg']
+
+def parse_args():
+    """Lê as opções da linha de comando"""
+    parser = argparse.ArgumentParser(description="Vazão dos scrapers contra o servidor local de farmácias")
+    parser.add_argument('--fixtures', required=True, help="Diretório das páginas gravadas (FIXTURE_CAPTURE_DIR)")
+    parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help="Termos de busca (gravados)")
+    parser.add_argument('--pharmacies', nargs='+', default=list(SCRAPERS), choices=list(SCRAPERS))
+    parser.add_argument('--searches', type=int, default=30, help="Total de buscas")
+    parser.add_argument('--concurrency', type=int, default=3, help="Buscas simultâneas (drivers no pool)")
+    parser.add_argument('--latency', default='fixed', choices=LATENCY_DISTRIBUTIONS)
+    parser.add_argument('--latency-mean', type=float, default=0.0, help="Latência média das páginas (s)")
+    parser.add_argument('--latency-spread', type=float, default=0.0, help="Dispersão da latência")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fração de páginas com 503")
+    parser.add_argument('--slow-resource-delay', type=float, default=0.0, help="Atraso de JS/CSS/imagens (s)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args()
+
+def run_search(pool, servers, pharmacy, term):
+    """Executa uma busca e mede duração, produtos e memória do Chrome"""
+    scraper = SCRAPERS[pharmacy](driver_pool=pool, session_store=None, base_url_override=servers[pharmacy].url)
+    started = time.monotonic()
+    try:
+        result = scraper.search(term)
+        rss_mb = get_driver_rss_mb(scraper.driver) if scraper.driver is not None else None
+    finally:
+        scraper.cleanup()
+    return {
+        'pharmacy': pharmacy,
+        'term': term,
+        'seconds': time.monotonic() - started,
+        'products': len(result.get('products', [])),
+        'error': result.get('error'),
+        'rss_mb': rss_mb
+    }
+
+def summarize(samples, elapsed, servers):
+    """Resume as medições do benchmark"""
+    durations = sorted(s['seconds'] for s in samples)
+    memory = [s['rss_mb'] for s in samples if s['rss_mb'] is not None]
+    return {
+        'searches': len(samples),
+        'errors': sum(1 for s in samples if s['error']),
+        'elapsed_seconds': round(elapsed, 2),
+        'searches_per_minute': round(len(samples) / elapsed * 60, 1) if elapsed else None,
+        'search_seconds': {
+            'mean': round(statistics.mean(durations), 3),
+            'p50': round(durations[len(durations) // 2], 3),
+            'p95': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3)
+        } if durations else None,
+        'chrome_rss_mb_per_search': {
+            'mean': round(statistics.mean(memory), 1),
+            'max': max(memory)
+        } if memory else None,
+        'products_per_search': round(statistics.mean(s['products'] for s in samples), 1) if samples else None,
+        'servers': {key: server.get_stats() for key, server in servers.items()}
+    }
+
+def main():
+    """Executa o benchmark"""
+    args = parse_args()
+    servers = start_mock_pharmacies(
+        FixtureStore(args.fixtures),
+        latency=LatencyModel(args.latency, args.latency_mean, args.latency_spread),
+        error_rate=args.error_rate,
+        slow_resource_delay=args.slow_resource_delay,
+        seed=args.seed
+    )
+    pool = DriverPool(create_pool_driver, max_size=args.concurrency)
+    jobs = cycle([(pharmacy, term) for term in args.terms for pharmacy in args.pharmacies])
+    try:
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [executor.submit(run_search, pool, servers, *next(jobs)) for _ in range(args.searches)]
+            samples = [future.result() for future in futures]
+        summary = summarize(samples, time.monotonic() - started, servers)
+    finally:
+        pool.close()
+        for server in servers.values():
+            server.stop()
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    print(f"Buscas: {summary['searches']} ({summary['errors']} com erro) em {summary['elapsed_seconds']}s")
+    print(f"Vazão: {summary['searches_per_minute']} buscas/min")
+    print(f"Duração das buscas (s): {summary['search_seconds']}")
+    print(f"Memória do Chrome por busca (MB): {summary['chrome_rss_mb_per_search']}")
+    for key, stats in summary['servers'].items():
+        print(f"  {key}: {stats['pages']} páginas, {stats['resources']} recursos, "
+              f"{stats['errors_injected']} erros injetados, {stats['not_found']} não gravadas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parse das listagens em threads vs. no pool de processos.
+
+Extrai os produtos das listagens gravadas com FIXTURE_CAPTURE_DIR como nas
+buscas: várias listagens ao mesmo tempo, cada uma em uma thread. Na linha
+de base, o parse e a extração rodam nas próprias threads (disputando o
+GIL); com o pool, cada thread entrega o HTML a um processo de
+utils.parse_pool. Relata listagens por segundo de cada modo.
+
+Uso:
+    python benchmarks/parse_pool.py --fixtures cache/fixtures --workers 4 --rounds 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.sao_joao import SaoJoaoScraper
+from scrapers.panvel import PanvelScraper
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import PHARMACY_ORIGINS
+from utils.parse_pool import ParsePool, scraper_path
+from utils.transports import KIND_LISTING
+
+SCRAPERS = {
+    'droga_raia': DrogaRaiaScraper,
+    'sao_joao': SaoJoaoScraper,
+    'panvel': PanvelScraper
+}
+
+def parse_args():
+    """Lê as opções da linha de comando"""
+    parser = argparse.ArgumentParser(description="Parse das listagens gravadas em threads e no pool de processos")
+    parser.add_argument('--fixtures', required=True, help="Diretório das páginas gravadas (FIXTURE_CAPTURE_DIR)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processos do pool")
+    parser.add_argument('--concurrency', type=int, default=3, help="Listagens extraídas ao mesmo tempo (threads)")
+    parser.add_argument('--rounds', type=int, default=3, help="Vezes que cada listagem é extraída")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args()
+
+def load_listings(store):
+    """Listagens gravadas com o scraper da farmácia de cada uma"""
+    scrapers = {key: cls(session_store=None) for key, cls in SCRAPERS.items()}
+    listings = []
+    for entry in store.iter_entries(KIND_LISTING):
+        for key, origin in PHARMACY_ORIGINS.items():
+            if entry['url'].startswith(origin):
+                listings.append((scrapers[key], entry['content'], entry.get('search_term') or ''))
+    return listings
+
+def run(listings, extract, concurrency, rounds):
+    """Listagens por segundo e produtos extraídos com a função de extração"""
+    jobs = listings * rounds
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        counts = list(executor.map(lambda job: len(extract(*job)), jobs))
+    elapsed = time.perf_counter() - started
+    return {
+        'listings': len(jobs),
+        'products': sum(counts),
+        'seconds': round(elapsed, 3),
+        'listings_per_second': round(len(jobs) / elapsed, 2) if elapsed else None
+    }
+
+def main():
+    """Executa o benchmark"""
+    args = parse_args()
+    listings = load_listings(FixtureStore(args.fixtures))
+    if not listings:
+        print(f"Nenhuma listagem gravada em {args.fixtures}")
+        return
+
+    def extract_in_thread(scraper, content, search_term):
+        return scraper._extract_listing_products(scraper.parse_listing(content), search_term)
+
+    preload = {(scraper_path(type(scraper)), tuple(scraper.parse_pool_options().items())) for scraper, _, _ in listings}
+    pool = ParsePool(max_workers=args.workers, preload=[(path, dict(options)) for path, options in preload])
+    try:
+        started = time.perf_counter()
+        pool.start()
+        startup = time.perf_counter() - started
+        results = {
+            'threads': run(listings, extract_in_thread, args.concurrency, args.rounds),
+            'process_pool': run(listings, pool.extract_listing, args.concurrency, args.rounds)
+        }
+        results['process_pool']['startup_seconds'] = round(startup, 3)
+        results['process_pool']['workers'] = pool.max_workers
+    finally:
+        pool.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for mode, stats in results.items():
+        print(f"{mode:13} {stats['listings']} listagens ({stats['products']} produtos) em {stats['seconds']}s | "
+              f"{stats['listings_per_second']} listagens/s")
+    print(f"{'':13} pool: {results['process_pool']['workers']} processos iniciados em "
+          f"{results['process_pool']['startup_seconds']}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos parsers HTML sobre páginas gravadas.
+
+Para cada backend de utils.html_parsers (html.parser, lxml e selectolax, se
+instalado), mede o tempo de parse completo (árvore do BeautifulSoup usada
+pelos extratores) e o da checagem de listagem com produtos (has_match) nas
+listagens e páginas de produto gravadas com FIXTURE_CAPTURE_DIR. Nas
+listagens, mede também o parse restrito às regiões do scraper da farmácia
+(LISTING_PARSE_ONLY) e o pico de memória dos dois parses.
+
+Uso:
+    python benchmarks/parser_backends.py --fixtures cache/fixtures --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.sao_joao import SaoJoaoScraper
+from scrapers.panvel import PanvelScraper
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import PHARMACY_ORIGINS
+from utils.html_parsers import available_parser_backends, get_parser_backend
+from utils.transports import KIND_LISTING, KIND_PRODUCT
+
+# Seletor da checagem de listagem (o mais genérico dos scrapers; qualquer seletor mede o custo do parse)
+LISTING_SELECTOR = 'article, lib-card-item-v2-vertical, section.vtex-product-summary-2-x-container'
+
+SCRAPERS = {
+    'droga_raia': DrogaRaiaScraper,
+    'sao_joao': SaoJoaoScraper,
+    'panvel': PanvelScraper
+}
+
+def parse_args():
+    """Lê as opções da linha de comando"""
+    parser = argparse.ArgumentParser(description="Tempo de parse das páginas gravadas por parser HTML")
+    parser.add_argument('--fixtures', required=True, help="Diretório das páginas gravadas (FIXTURE_CAPTURE_DIR)")
+    parser.add_argument('--backends', nargs='+', default=available_parser_backends())
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por página")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args()
+
+def time_call(function, content, repeat):
+    """Menor tempo, em milissegundos, de `repeat` execuções"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(content)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def listing_strainer(url):
+    """Regiões da listagem declaradas pelo scraper da farmácia da URL (None se desconhecida)"""
+    for key, origin in PHARMACY_ORIGINS.items():
+        if url.startswith(origin):
+            return SCRAPERS[key].LISTING_PARSE_ONLY
+    return None
+
+def peak_memory_mb(function, content):
+    """Pico de memória alocada, em MB, durante uma execução"""
+    tracemalloc.start()
+    try:
+        function(content)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def benchmark(entries, backend, repeat, scoped=False):
+    """Mede parse completo, checagem por seletor e, nas listagens, o parse restrito às regiões"""
+    pages = [entry['content'] for entry in entries]
+    parse_ms = [time_call(backend.parse, page, repeat) for page in pages]
+    match_ms = [time_call(lambda content: backend.has_match(content, LISTING_SELECTOR), page, repeat) for page in pages]
+    total_mb = sum(len(page.encode('utf-8')) for page in pages) / (1024 * 1024)
+    result = {
+        'pages': len(pages),
+        'parse_ms_mean': round(statistics.mean(parse_ms), 2),
+        'parse_ms_max': round(max(parse_ms), 2),
+        'parse_mb_per_s': round(total_mb / (sum(parse_ms) / 1000), 2) if sum(parse_ms) else None,
+        'has_match_ms_mean': round(statistics.mean(match_ms), 2)
+    }
+    scoped_entries = [entry for entry in entries if scoped and listing_strainer(entry['url']) is not None]
+    if scoped_entries:
+        scoped_ms, full_peak, scoped_peak = [], [], []
+        for entry in scoped_entries:
+            strainer = listing_strainer(entry['url'])
+            parse_scoped = lambda content: backend.parse(content, parse_only=strainer)
+            scoped_ms.append(time_call(parse_scoped, entry['content'], repeat))
+            full_peak.append(peak_memory_mb(backend.parse, entry['content']))
+            scoped_peak.append(peak_memory_mb(parse_scoped, entry['content']))
+        result.update({
+            'scoped_pages': len(scoped_entries),
+            'scoped_parse_ms_mean': round(statistics.mean(scoped_ms), 2),
+            'full_peak_mb_mean': round(statistics.mean(full_peak), 1),
+            'scoped_peak_mb_mean': round(statistics.mean(scoped_peak), 1)
+        })
+    return result
+
+def main():
+    """Executa o benchmark"""
+    args = parse_args()
+    store = FixtureStore(args.fixtures)
+    results = {}
+    for kind in (KIND_LISTING, KIND_PRODUCT):
+        entries = list(store.iter_entries(kind))
+        if not entries:
+            continue
+        results[kind] = {
+            name: benchmark(entries, get_parser_backend(name), args.repeat, scoped=kind == KIND_LISTING)
+            for name in args.backends
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if not results:
+        print(f"Nenhuma listagem ou página de produto gravada em {args.fixtures}")
+        return
+    for kind, by_backend in results.items():
+        print(f"{kind}:")
+        for name, stats in by_backend.items():
+            print(f"  {name:12} {stats['pages']} páginas | parse {stats['parse_ms_mean']} ms (máx {stats['parse_ms_max']}, "
+                  f"{stats['parse_mb_per_s']} MB/s) | has_match {stats['has_match_ms_mean']} ms")
+            if 'scoped_pages' in stats:
+                print(f"  {'':12} regiões: parse {stats['scoped_parse_ms_mean']} ms em {stats['scoped_pages']} páginas | "
+                      f"pico {stats['full_peak_mb_mean']} MB -> {stats['scoped_peak_mb_mean']} MB")
+
+if __name__ == '__main__':
+    main()
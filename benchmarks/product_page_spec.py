@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark da extração das páginas de produto: PageSpec vs. select_one() por seletor.
+
+Para cada página de produto gravada com FIXTURE_CAPTURE_DIR, extrai os
+campos com o PRODUCT_PAGE_SPEC do scraper da farmácia (uma única passada
+pela página) e com um select_one() por seletor, em ordem, como a busca de
+marca da São João fazia. Confere que os dois chegam aos mesmos valores e
+relata o tempo por página.
+
+Uso:
+    python benchmarks/product_page_spec.py --fixtures cache/fixtures --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import droga_raia, panvel, sao_joao
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import PHARMACY_ORIGINS
+from utils.transports import KIND_PRODUCT
+
+PHARMACIES = {
+    'droga_raia': (droga_raia.DrogaRaiaScraper, droga_raia.PRODUCT_PAGE_SPEC),
+    'sao_joao': (sao_joao.SaoJoaoScraper, sao_joao.PRODUCT_PAGE_SPEC),
+    'panvel': (panvel.PanvelScraper, panvel.PRODUCT_PAGE_SPEC)
+}
+
+def parse_args():
+    """Lê as opções da linha de comando"""
+    parser = argparse.ArgumentParser(description="Páginas de produto: PageSpec vs. select_one() por seletor")
+    parser.add_argument('--fixtures', required=True, help="Diretório das páginas gravadas (FIXTURE_CAPTURE_DIR)")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por página")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args()
+
+def select_each(spec, soup):
+    """Extrai cada campo com um select_one() por seletor, em ordem, até o primeiro valor válido"""
+    values = {}
+    for field in spec.fields:
+        values[field.name] = None
+        for candidate, selector in field.candidates():
+            if candidate.where is None:
+                element = soup.select_one(selector.css)
+            else:
+                element = next((el for el in soup.select(selector.css) if candidate.where(el)), None)
+            value = candidate.value_of(element) if element is not None else None
+            if value is not None:
+                values[field.name] = value
+                break
+    return values
+
+def time_call(function, soup, repeat):
+    """Menor tempo, em milissegundos, de `repeat` execuções sobre a página"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(soup)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main():
+    """Executa o benchmark"""
+    args = parse_args()
+    by_pharmacy = {}
+    for entry in FixtureStore(args.fixtures).iter_entries(KIND_PRODUCT):
+        key = next((key for key, origin in PHARMACY_ORIGINS.items() if entry['url'].startswith(origin)), None)
+        if key is None:
+            continue
+        scraper_class, spec = PHARMACIES[key]
+        soup = scraper_class(session_store=None).parse_html(entry['content'])
+        stats = by_pharmacy.setdefault(key, {'pages': 0, 'mismatches': 0, 'spec_ms': [], 'select_ms': []})
+        stats['pages'] += 1
+        stats['mismatches'] += spec.extract(soup) != select_each(spec, soup)
+        stats['spec_ms'].append(time_call(spec.extract, soup, args.repeat))
+        stats['select_ms'].append(time_call(lambda page: select_each(spec, page), soup, args.repeat))
+
+    results = {
+        key: {
+            'pages': stats['pages'],
+            'mismatches': stats['mismatches'],
+            'spec_ms_per_page': round(statistics.mean(stats['spec_ms']), 3),
+            'select_ms_per_page': round(statistics.mean(stats['select_ms']), 3)
+        }
+        for key, stats in by_pharmacy.items()
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if not results:
+        print(f"Nenhuma página de produto gravada em {args.fixtures}")
+        return
+    for key, stats in results.items():
+        speedup = stats['select_ms_per_page'] / stats['spec_ms_per_page'] if stats['spec_ms_per_page'] else 0
+        print(f"{key:11} {stats['pages']} páginas | PageSpec {stats['spec_ms_per_page']} ms/página | "
+              f"select_one() {stats['select_ms_per_page']} ms/página ({speedup:.1f}x) | divergências {stats['mismatches']}")
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,109 @@
 from abc import ABC, abstractmethod
 import logging
-import time
+import threading
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
 import os
 import platform
 import requests
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.driver_pool import DriverPool
+from utils.browser_backend import BrowserBackend
+from utils.tab_backend import TabBrowserBackend
+from utils.resource_blocking import NetworkStats, get_default_blocking_policy
+from utils.session_state import get_default_session_store, session_key
+from utils.profile_manager import get_default_profile_manager
+from utils.chromedriver_service import get_default_chromedriver_service
+from utils.http_enrichment import get_default_enrichment_engine
+from utils.transports import (
+    SeleniumTransport, HttpTransport, ReplayTransport, TransportResponse, resolve_transports,
+    KIND_LISTING, KIND_PRODUCT, KIND_API
+)
+from utils.fixture_store import get_default_capture_store
+from utils.parse_pool import get_default_parse_pool
+from utils.product_details import get_default_product_detail_store, PRICE_FIELDS
+from utils.html_parsers import get_parser_backend, PARSER_LXML
+from utils.readiness import (
+    ReadinessCondition, wait_for_page, mark_stale_document, PAGE_LOAD_STRATEGIES
+)
+
+# Backend de navegador compartilhado pelos scrapers para abrir páginas de produto
+_shared_browser_backend = None
+# Backend de abas compartilhado pelos scrapers no modo engine='tabs'
+_shared_tab_backend = None
+_shared_browser_backend_lock = threading.Lock()
+
+# Limite padrão de páginas de produto abertas ao mesmo tempo
+DEFAULT_MAX_CONCURRENT_PAGES = 4
+
+# Limite padrão de abas abertas ao mesmo tempo no modo engine='tabs'
+DEFAULT_MAX_TABS = 8
+
+# Estratégia nativa dos drivers do pool e do backend de abas: driver.get() retorna imediatamente
+# e cada scraper emula a própria estratégia (PAGE_LOAD_STRATEGY) seguida da condição de prontidão
+DRIVER_PAGE_LOAD_STRATEGY = 'none'
+
+# Modos de motor de navegação suportados pelos scrapers
+ENGINE_POOL = 'pool'  # Um driver emprestado do pool por scraper e backend de drivers para as páginas de produto
+ENGINE_TABS = 'tabs'  # Listagem e páginas de produto em abas de um único Chrome compartilhado
+
+# Caminho que serviu a listagem de uma busca (registrado na resposta como 'fetch_path');
+# além destes, o nome de qualquer outro transporte configurado (ex.: 'replay')
+FETCH_PATH_HTTP = HttpTransport.name  # HTML obtido por requisição HTTP direta, sem navegador
+FETCH_PATH_BROWSER = SeleniumTransport.name  # Página renderizada pelo Selenium
+FETCH_PATH_API = 'api'  # Produtos obtidos da API JSON de busca da loja
+
+# Cadeias de transportes padrão por tipo de página: cada transporte é tentado em ordem, e o
+# seguinte é usado quando o anterior falha ou não traz o conteúdo esperado
+DEFAULT_TRANSPORTS = {
+    KIND_LISTING: (SeleniumTransport.name,),
+    KIND_PRODUCT: (SeleniumTransport.name,),
+    KIND_API: (HttpTransport.name,)
+}
 
 class BaseScraper(ABC):
     """Classe base para todos os scrapers de farmácias usando Selenium"""
     
-    def __init__(self, base_url, search_url, pharmacy_name, driver=None):
+    # Estratégia de carregamento da página: 'eager' (DOM pronto) ou 'none' (apenas a condição de prontidão)
+    PAGE_LOAD_STRATEGY = 'eager'
+    
+    # Condição de prontidão da listagem: cards de produto estáveis ou rede ociosa
+    LISTING_READINESS = ReadinessCondition('[data-testid="container-products"] article', timeout=15)
+    
+    # Condição de prontidão da página de produto
+    PRODUCT_READINESS = ReadinessCondition('h1', timeout=8, stable_for=0.5)
+    
+    # Sobrescritas da política de bloqueio de recursos para esta farmácia (ver BlockingPolicy.with_overrides)
+    BLOCKING_OVERRIDES = {}
+    
+    # Transportes desta farmácia por tipo de página (sobrescrevem DEFAULT_TRANSPORTS; ver utils.transports)
+    TRANSPORTS = {}
+    
+    # Limite de espera da requisição HTTP direta, em segundos
+    HTTP_TIMEOUT = 10
+    
+    # Parser HTML das listagens e páginas de produto (ver utils.html_parsers)
+    PARSER_BACKEND = PARSER_LXML
+    
+    # Regiões da listagem usadas pelo extrator (region_strainer); None monta o documento inteiro
+    LISTING_PARSE_ONLY = None
+    
+    # Script executado na listagem renderizada (execute_script) que devolve a lista de registros dos
+    # produtos lida no próprio DOM; None, erro ou lista vazia mantêm o page_source e o parser Python
+    LISTING_EXTRACT_SCRIPT = None
+    
+    # Tenta completar marca/preço pelas páginas de produto via HTTP (motor assíncrono) antes do navegador;
+    # só vale para sites cujo HTML do servidor já traz esses campos (nos renderizados no cliente, a página
+    # seria baixada duas vezes)
+    HTTP_PRODUCT_PAGES = False
+    
+    def __init__(self, base_url, search_url, pharmacy_name, driver=None, driver_pool=None, browser_backend=None,
+                 engine=ENGINE_POOL, blocking_overrides=None, session_store=None, transports=None,
+                 base_url_override=None, parser_backend=None):
         """
         Inicializa o scraper base
         
@@ -27,32 +112,68 @@ class BaseScraper(ABC):
             search_url (str): URL de busca da farmácia
             pharmacy_name (str): Nome da farmácia
             driver (webdriver, optional): Driver Selenium externo para reutilização
+            driver_pool (DriverPool, optional): Pool de drivers do qual emprestar um driver
+            browser_backend (BrowserBackend, optional): Backend para abrir páginas de produto
+            engine (str): 'pool' (padrão) ou 'tabs' para multiplexar todas as páginas em abas de um único Chrome
+            blocking_overrides (dict, optional): Sobrescritas adicionais do bloqueio de recursos (ex.: vindas da configuração)
+            session_store (SessionStateStore, optional): Estado de sessão persistido (padrão: o armazenamento global)
+            transports (dict, optional): Cadeias de transportes por tipo de página vindas da configuração,
+                ex.: {'listing': ['http', 'selenium']}
+            base_url_override (str, optional): Origem que substitui a da farmácia nas URLs
+                (ex.: 'http://127.0.0.1:8123' do servidor local de testes)
+            parser_backend (str, optional): Parser HTML que substitui PARSER_BACKEND
         """
+        if engine not in (ENGINE_POOL, ENGINE_TABS):
+            raise ValueError(f"Motor de navegação inválido: {engine}")
+        if self.PAGE_LOAD_STRATEGY not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Estratégia de carregamento inválida: {self.PAGE_LOAD_STRATEGY}")
+        if base_url_override:
+            base_url = replace_origin(base_url, base_url_override)
+            search_url = replace_origin(search_url, base_url_override)
+        self.base_url_override = base_url_override
         self.base_url = base_url
         self.search_url = search_url
         self.pharmacy_name = pharmacy_name
         self.driver = driver
+        self.driver_pool = driver_pool
+        self.browser_backend = browser_backend
+        self.engine = engine
         self.logger = logging.getLogger(self.__class__.__name__)
-        self._owns_driver = driver is None  # Indica se este scraper é responsável por limpar o driver
+        self._owns_driver = driver is None and driver_pool is None  # Indica se este scraper é responsável por limpar o driver
+        self._leased_driver = False  # Indica se o driver atual foi emprestado do pool
+        self.blocking_policy = get_default_blocking_policy().with_overrides(self.BLOCKING_OVERRIDES).with_overrides(blocking_overrides)
+        self.network_stats = NetworkStats()  # Requisições e bytes da busca atual
+        self.session_store = session_store if session_store is not None else get_default_session_store()
+        self.session_key = session_key(pharmacy_name)
+        parsed_url = urlparse(base_url)
+        self.session_origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        self._session_changed = False  # Indica que a página alterou o estado de sessão (ex.: cookies aceitos)
+        self.fetch_path = None  # Caminho que serviu a última listagem (FETCH_PATH_* ou nome do transporte)
+        self.search_term = None  # Termo da busca atual (chave das páginas gravadas junto com a URL)
+        self.parser = get_parser_backend(parser_backend or self.PARSER_BACKEND)
+        self._parsed_listing = None  # (HTML, árvore restrita) da última listagem checada, reaproveitada na extração
+        self.transports = {
+            kind: resolve_transports(names)
+            for kind, names in {**DEFAULT_TRANSPORTS, **self.TRANSPORTS, **(transports or {})}.items()
+        }
     
     def _setup_driver(self):
         """Configura o driver do Chrome com opções para evitar detecção"""
         if self.driver is not None:
             self.logger.info("Driver já configurado, reutilizando...")
             return
+        
+        # Emprestar do pool quando disponível, em vez de iniciar um novo Chrome
+        if self.driver_pool is not None:
+            self.driver = self.driver_pool.lease(affinity=self.session_key)
+            self._leased_driver = True
+            self.logger.info("Driver emprestado do pool")
+            return
             
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        chrome_options.add_argument("--headless=new")  # Executa o Chrome de forma oculta
-        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options = build_chrome_options(DRIVER_PAGE_LOAD_STRATEGY)
         # Inicializar o driver
         try:
-            service = Service(ChromeDriverManager().install())
+            service = get_default_chromedriver_service() or Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
         except Exception as e:
             self.logger.warning(f"Erro ao baixar ChromeDriver automaticamente: {e}")
@@ -108,51 +229,451 @@ class BaseScraper(ABC):
     
     def make_request(self, url, timeout=30):
         """
-        Faz uma requisição HTTP usando Selenium
+        Faz a requisição da listagem pela cadeia de transportes configurada
         
         Args:
             url (str): URL para fazer a requisição
             timeout (int): Timeout em segundos
             
         Returns:
-            dict: Dados da página carregada
+            dict: Dados da página carregada ('content', 'status_code', 'url' e 'records', os
+                registros extraídos no navegador ou None)
         """
         try:
-            # Configurar driver se necessário
-            if not self.driver:
-                self._setup_driver()
-            
-            # Navegar para a página
-            self.driver.get(url)
-            self.logger.info("Página carregada")
+            response = self.fetch(url, KIND_LISTING)
+            self.fetch_path = response.transport
+            self.logger.info(f"Listagem obtida via {self.fetch_path}")
+            if response.records is not None:
+                self.logger.debug(f"Registros extraídos no navegador: {len(response.records)}")
+            else:
+                self.logger.debug(f"Tamanho do HTML: {len(response.content)} caracteres")
+            return response.to_dict()
             
-            # Aguardar carregamento da página
-            time.sleep(3)
+        except Exception as e:
+            self.logger.error(f"Erro ao acessar {url}: {str(e)}")
+            raise Exception(f"Erro ao acessar {url}: {str(e)}")
+    
+    def fetch(self, url, kind=KIND_LISTING):
+        """
+        Obtém uma página pela cadeia de transportes do tipo de página
+        
+        Cada transporte é tentado em ordem; o seguinte é usado quando o anterior
+        falha ou não traz o conteúdo esperado (ex.: listagem sem produtos). O
+        erro do último transporte é propagado.
+        
+        Args:
+            url (str): URL da página
+            kind (str): 'listing', 'product' ou 'api'
             
-            # Aguardar pelo container de produtos
+        Returns:
+            TransportResponse: Resposta normalizada, com o transporte que a atendeu
+        """
+        chain = self.transports.get(kind)
+        if not chain:
+            raise ValueError(f"Nenhum transporte configurado para páginas do tipo '{kind}'")
+        for index, transport in enumerate(chain):
+            is_last = index == len(chain) - 1
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="container-products"]'))
-                )
-                self.logger.info("Container de produtos encontrado")
+                response = transport.fetch(self, url, kind)
             except Exception as e:
-                self.logger.warning(f"Container de produtos não encontrado: {e}")
-                # Tentar aguardar mais um pouco
-                time.sleep(5)
+                if is_last:
+                    raise
+                self.logger.info(f"Transporte {transport.name} falhou ({kind}), tentando o próximo: {e}")
+                continue
+            if is_last or self._accepts_response(response, kind):
+                self._capture_response(response, kind)
+                return response
+            self.logger.info(f"Transporte {transport.name} sem o conteúdo esperado ({kind}), tentando o próximo")
+    
+    def _capture_response(self, response, kind):
+        """Grava a página obtida no armazenamento de fixtures quando a captura está ativa"""
+        store = get_default_capture_store()
+        if store is None or response.transport == ReplayTransport.name or response.records is not None:
+            return
+        try:
+            store.put(response.url, response.content, response.status_code, kind=kind, search_term=self.search_term)
+        except OSError as e:
+            self.logger.warning(f"Erro ao gravar a página {response.url}: {e}")
+    
+    def _is_replaying(self):
+        """Indica se todas as páginas vêm de gravações (busca offline, sem navegador nem rede)"""
+        return all(
+            transport.name == ReplayTransport.name
+            for chain in self.transports.values() for transport in chain
+        )
+    
+    def _accepts_response(self, response, kind):
+        """Indica se a resposta de um transporte traz o conteúdo esperado para o tipo de página"""
+        if kind == KIND_LISTING and response.records:
+            return True
+        if not response.ok or not response.content:
+            return False
+        if kind == KIND_LISTING:
+            return self._has_listing_content(response.content)
+        return True
+    
+    def http_headers(self, kind=KIND_LISTING):
+        """Cabeçalhos das requisições HTTP diretas desta farmácia"""
+        headers = {'User-Agent': CHROME_USER_AGENT}
+        if kind == KIND_API:
+            headers['Accept'] = 'application/json'
+        return headers
+    
+    def _has_listing_content(self, html):
+        """
+        Indica se o HTML já contém os nós de produto da condição de prontidão da listagem
+        
+        Sem um parser que responda sem árvore, a checagem usa a árvore restrita de
+        parse_listing, guardada para a extração da mesma página.
+        """
+        if self.parser.match_without_tree:
+            return self.parser.has_match(html, self.LISTING_READINESS.selector)
+        soup = self.parser.parse(html, parse_only=self.LISTING_PARSE_ONLY)
+        self._parsed_listing = (html, soup)
+        return soup.select_one(self.LISTING_READINESS.selector) is not None
+    
+    def fetch_listing_page(self, url):
+        """
+        Abre a página de listagem e retorna o HTML, no driver do scraper ou,
+        no modo engine='tabs', em uma aba do Chrome compartilhado
+        
+        Com LISTING_EXTRACT_SCRIPT, os produtos são lidos no DOM do navegador e
+        apenas os registros são retornados, sem transferir o page_source.
+        
+        Args:
+            url (str): URL da página de busca
             
-            # Obter o HTML da página
-            page_source = self.driver.page_source
-            self.logger.debug(f"Tamanho do HTML: {len(page_source)} caracteres")
+        Returns:
+            str ou list: HTML da página de busca, ou os registros extraídos no navegador
+        """
+        if self.engine == ENGINE_TABS:
+            return self._get_browser_backend().fetch_page(
+                url, wait=self._with_page_hooks(self._wait_listing_page), prepare=self._prepare_page,
+                extract=self._extract_listing_records
+            )
+        
+        # Configurar driver se necessário
+        if not self.driver:
+            self._setup_driver()
+        
+        # Navegar para a página
+        self._prepare_page(self.driver)
+        self.driver.get(url)
+        if self._leased_driver:
+            self.driver_pool.record_page(self.driver)
+        self.logger.info("Página carregada")
+        self._wait_listing_page(self.driver)
+        self._finish_page(self.driver)
+        records = self._extract_listing_records(self.driver)
+        return records if records is not None else self.driver.page_source
+    
+    def _extract_listing_records(self, driver):
+        """
+        Executa LISTING_EXTRACT_SCRIPT na listagem pronta
+        
+        Args:
+            driver: Driver (ou aba) com a listagem carregada
             
-            return {
-                'content': page_source,
-                'status_code': 200,
-                'url': url
-            }
+        Returns:
+            list: Registros dos produtos, ou None para usar o page_source (sem script, durante a
+                captura de páginas, em erro ou sem produtos)
+        """
+        if not self.LISTING_EXTRACT_SCRIPT or get_default_capture_store() is not None:
+            # A captura grava o HTML da listagem para as execuções offline
+            return None
+        try:
+            records = driver.execute_script(self.LISTING_EXTRACT_SCRIPT, *self._listing_script_args())
+        except Exception as e:
+            self.logger.warning(f"Extração no navegador falhou; usando o HTML da listagem: {e}")
+            return None
+        if not isinstance(records, list) or not records:
+            self.logger.info("Extração no navegador sem produtos; usando o HTML da listagem")
+            return None
+        self.logger.info(f"Produtos extraídos no navegador: {len(records)}")
+        return records
+    
+    def _listing_script_args(self):
+        """Argumentos passados a LISTING_EXTRACT_SCRIPT (disponíveis no script como arguments)"""
+        return ()
+    
+    def _wait_listing_page(self, driver):
+        """Aguarda a listagem ficar pronta (cards de produto estáveis ou rede ociosa)"""
+        result = wait_for_page(driver, self.PAGE_LOAD_STRATEGY, self.LISTING_READINESS, on_poll=self._while_waiting)
+        self.logger.info(f"Listagem pronta: {result['reason']} em {result['elapsed']}s ({result['nodes']} produtos)")
+    
+    def fetch_product_page(self, product_url):
+        """
+        Abre a página de um produto no backend de navegador compartilhado
+        
+        Args:
+            product_url (str): URL da página do produto
             
+        Returns:
+            str: HTML da página do produto
+        """
+        return self._get_browser_backend().fetch_page(
+            product_url, wait=self._with_page_hooks(self._wait_product_page), prepare=self._prepare_page,
+            affinity=self.session_key
+        )
+    
+    def _prepare_page(self, driver):
+        """
+        Prepara o driver antes de navegar: bloqueio de recursos, estado de sessão salvo,
+        descarte do tráfego anterior e marcação do documento atual
+        """
+        self.blocking_policy.apply(driver)
+        if self.session_store is not None:
+            self.session_store.inject(driver, self.session_key)
+        self._read_performance_log(driver)
+        mark_stale_document(driver)
+    
+    def _with_page_hooks(self, wait):
+        """Envolve a função de espera para finalizar a página (tráfego e estado de sessão) ao final"""
+        def wait_and_finish(driver):
+            wait(driver)
+            self._finish_page(driver)
+        return wait_and_finish
+    
+    def _finish_page(self, driver):
+        """Contabiliza o tráfego da página e captura o estado de sessão se ele mudou"""
+        self._collect_network_stats(driver)
+        if self._session_changed and self.session_store is not None:
+            self._session_changed = False
+            self.session_store.capture(driver, self.session_key, self.session_origin)
+    
+    def _session_is_warm(self):
+        """Indica se há estado de sessão salvo (ex.: cookies já aceitos) para esta farmácia"""
+        return self.session_store is not None and self.session_store.is_warm(self.session_key)
+    
+    def _collect_network_stats(self, driver):
+        """Contabiliza requisições bloqueadas e bytes transferidos da página atual"""
+        self.network_stats.record_performance_log(self._read_performance_log(driver))
+    
+    def _read_performance_log(self, driver):
+        """Lê (e esvazia) o log de performance do driver; retorna lista vazia se indisponível"""
+        try:
+            return list(driver.get_log('performance'))
         except Exception as e:
-            self.logger.error(f"Erro ao acessar {url}: {str(e)}")
-            raise Exception(f"Erro ao acessar {url}: {str(e)}")
+            self.logger.debug(f"Log de performance indisponível: {e}")
+            return []
+    
+    def _get_browser_backend(self):
+        """Retorna o backend de navegador do scraper, usando o compartilhado do motor configurado"""
+        if self.browser_backend is None:
+            if self.engine == ENGINE_TABS:
+                self.browser_backend = get_shared_tab_backend()
+            else:
+                self.browser_backend = get_shared_browser_backend()
+        return self.browser_backend
+    
+    def _wait_product_page(self, driver):
+        """Aguarda a página de produto ficar pronta"""
+        result = wait_for_page(driver, self.PAGE_LOAD_STRATEGY, self.PRODUCT_READINESS, on_poll=self._while_waiting)
+        self.logger.debug(f"Página de produto pronta: {result['reason']} em {result['elapsed']}s")
+    
+    def _while_waiting(self, driver):
+        """
+        Ação executada a cada verificação de prontidão (ex.: aceitar cookies)
+        
+        Args:
+            driver: Driver ou aba da página em espera
+            
+        Returns:
+            bool: True quando a ação não precisa mais ser repetida nesta página
+        """
+        return True
+    
+    def _extract_details_from_product_page(self, soup):
+        """
+        Extrai marca, preço e desconto da página de um produto
+        
+        Args:
+            soup (BeautifulSoup): HTML parseado da página do produto
+            
+        Returns:
+            dict: Campos encontrados (brand, price, original_price, discount_percentage, has_discount);
+                campos ausentes ou None não alteram o produto
+        """
+        return {}
+    
+    def _needs_enrichment(self, product):
+        """Indica se o produto precisa da página específica para completar marca ou preço"""
+        return self._needs_brand(product) or self._needs_price(product)
+    
+    def _needs_brand(self, product):
+        """Indica se falta a marca do produto"""
+        return bool(product.get('_pending_brand') or product.get('brand') in [None, '', 'Marca não disponível'])
+    
+    def _needs_price(self, product):
+        """Indica se falta o preço do produto"""
+        return product.get('price') == 'Preço não disponível' or product.get('original_price') == 'Preço não disponível'
+    
+    def _enrich_products(self, products):
+        """
+        Completa marca e preço dos produtos abrindo as páginas específicas em paralelo,
+        limitado pela capacidade do backend de navegador compartilhado
+        
+        Args:
+            products (list): Produtos extraídos da listagem
+            
+        Returns:
+            list: Os mesmos produtos, atualizados
+        """
+        products_to_update = [p for p in products if self._needs_enrichment(p) and p.get('product_url')]
+        replaying = self._is_replaying()
+        detail_store = self._get_product_detail_store()
+        # Detalhes extraídos nesta busca, guardados ao final para as próximas
+        fetched = []
+        if products_to_update and detail_store is not None:
+            products_to_update = self._apply_stored_details(products_to_update, detail_store)
+        if products_to_update and self.HTTP_PRODUCT_PAGES and not replaying:
+            products_to_update = self._enrich_products_http(products_to_update, fetched)
+        if products_to_update:
+            max_concurrent_pages = (
+                DEFAULT_MAX_CONCURRENT_PAGES if replaying else self._get_browser_backend().max_concurrent_pages
+            )
+            max_workers = min(len(products_to_update), max_concurrent_pages)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_product = {executor.submit(self._fetch_product_details, p): p for p in products_to_update}
+                for future in as_completed(future_to_product):
+                    product = future_to_product[future]
+                    try:
+                        details = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Erro ao abrir página do produto {product.get('product_url')}: {e}")
+                        details = {}
+                    fetched.append((product['product_url'], details))
+                    self._apply_product_details(product, details)
+        if fetched and detail_store is not None:
+            detail_store.record_many(fetched)
+        for product in products:
+            product.pop('_pending_brand', None)
+        return products
+    
+    def _get_product_detail_store(self):
+        """
+        Armazenamento de detalhes de produto consultado antes de abrir as páginas
+        
+        Returns:
+            ProductDetailStore, ou None se desativado, em replay (as gravações são a fonte)
+            ou gravando páginas (as páginas de produto precisam ser visitadas)
+        """
+        if self._is_replaying() or get_default_capture_store() is not None:
+            return None
+        return get_default_product_detail_store()
+    
+    def _apply_stored_details(self, products, detail_store):
+        """
+        Completa os produtos com os detalhes ainda válidos guardados de buscas anteriores
+        
+        A marca guardada só completa produtos sem marca, e o preço guardado só os
+        produtos sem preço: o preço da listagem é sempre mais recente.
+        
+        Args:
+            products (list): Produtos que precisam da página específica
+            detail_store (ProductDetailStore): Armazenamento de detalhes de produto
+            
+        Returns:
+            list: Produtos que continuam incompletos e precisam da página
+        """
+        remaining = []
+        for product in products:
+            stored = detail_store.lookup(product['product_url'])
+            if stored:
+                details = {}
+                if 'brand' in stored and self._needs_brand(product):
+                    details['brand'] = stored['brand']
+                    product.pop('_pending_brand', None)
+                if 'price' in stored and self._needs_price(product):
+                    details.update({field: stored[field] for field in PRICE_FIELDS if field in stored})
+                self._apply_product_details(product, details)
+            if self._needs_enrichment(product):
+                remaining.append(product)
+        self.logger.info(f"Detalhes de produto guardados: {len(products) - len(remaining)} de {len(products)} completados")
+        return remaining
+    
+    def _enrich_products_http(self, products, fetched=None):
+        """
+        Completa os produtos pelas páginas obtidas por HTTP no motor de enriquecimento assíncrono
+        
+        Args:
+            products (list): Produtos que precisam da página específica
+            fetched (list, optional): Recebe os pares (product_url, detalhes) extraídos
+            
+        Returns:
+            list: Produtos que continuam incompletos e precisam do navegador
+        """
+        engine = get_default_enrichment_engine()
+        if engine is None:
+            return products
+        def capture_page(url, html):
+            # Páginas obtidas pelo motor também são gravadas, para que o replay dispense o motor
+            self._capture_response(TransportResponse(url, html, transport=HttpTransport.name), KIND_PRODUCT)
+        on_page = capture_page if get_default_capture_store() is not None else None
+        results = engine.enrich(
+            [p['product_url'] for p in products], self._extract_details_from_html,
+            stats=self.network_stats, on_page=on_page
+        )
+        details_by_url = {
+            url: {'brand': brand, 'price': price, 'original_price': original_price,
+                  'discount_percentage': discount, 'has_discount': has_discount}
+            for url, brand, price, original_price, discount, has_discount in results
+        }
+        remaining = []
+        for product in products:
+            details = details_by_url.get(product['product_url'])
+            if details is not None:
+                if fetched is not None:
+                    fetched.append((product['product_url'], details))
+                if isinstance(details['brand'], str) and details['brand'].strip():
+                    product.pop('_pending_brand', None)
+                self._apply_product_details(product, details)
+            if self._needs_enrichment(product):
+                remaining.append(product)
+        self.logger.info(f"Páginas de produto via HTTP: {len(products) - len(remaining)} de {len(products)} completadas")
+        return remaining
+    
+    def _extract_details_from_html(self, html):
+        """Extrai os detalhes de uma página de produto a partir do HTML"""
+        return self._extract_details_from_product_page(self.parse_html(html))
+    
+    def _fetch_product_details(self, product):
+        """Abre a página do produto e extrai os detalhes"""
+        product_url = product['product_url']
+        reason_open = []
+        if self._needs_brand(product):
+            reason_open.append('marca')
+        if self._needs_price(product):
+            reason_open.append('preço')
+        self.logger.info(f"[{self.__class__.__name__}] (PARALLEL) Abrindo página do produto para buscar: {', '.join(reason_open)} | URL: {product_url}")
+        soup = self.parse_html(self.fetch(product_url, KIND_PRODUCT).content)
+        details = self._extract_details_from_product_page(soup)
+        self.logger.info(f"[{self.__class__.__name__}] (PARALLEL) Resultado da extração na página do produto: {details}")
+        return details
+    
+    def _apply_product_details(self, product, details):
+        """Aplica ao produto os detalhes encontrados na página específica"""
+        brand = details.get('brand')
+        if isinstance(brand, str) and brand.strip() and brand != 'Marca não disponível':
+            product['brand'] = self.format_brand(brand)
+        for field in ('price', 'original_price'):
+            value = details.get(field)
+            if isinstance(value, (int, float)):
+                product[field] = value
+        if details.get('discount_percentage') is not None:
+            product['discount_percentage'] = details['discount_percentage']
+            product['has_discount'] = details.get('has_discount', False)
+        # Garantir que brand nunca seja string vazia
+        if not product.get('brand') or not str(product['brand']).strip():
+            product['brand'] = "Marca não disponível"
+    
+    def format_brand(self, brand):
+        """Capitaliza a marca, exceto EMS"""
+        if isinstance(brand, str) and brand.strip():
+            if brand.strip().upper() == 'EMS':
+                return 'EMS'
+            return ' '.join([w.capitalize() for w in brand.strip().split()])
+        return brand
     
     def parse_html(self, content):
         """
@@ -164,7 +685,95 @@ class BaseScraper(ABC):
         Returns:
             BeautifulSoup: HTML parseado
         """
-        return BeautifulSoup(content, 'html.parser')
+        return self.parser.parse(content)
+    
+    def _extract_listing(self, response, search_term):
+        """
+        Extrai os produtos da listagem obtida por make_request: dos registros extraídos no
+        navegador quando existem, senão do HTML pelo parser
+        
+        Args:
+            response (dict): Resposta de make_request
+            search_term (str): Termo de busca
+            
+        Returns:
+            list: Lista de produtos extraídos
+        """
+        if response.get('records'):
+            return self._extract_products_from_records(response['records'], search_term)
+        pool = get_default_parse_pool()
+        if pool is not None and not self._is_parsed_listing(response['content']):
+            try:
+                products = pool.extract_listing(self, response['content'], search_term)
+            except Exception as e:
+                self.logger.warning(f"Pool de parse falhou; extraindo na thread da busca: {e}")
+            else:
+                return self._finish_products(products, search_term)
+        return self._extract_products(self.parse_listing(response['content']), search_term)
+    
+    def _extract_listing_products(self, soup, search_term):
+        """
+        Extrai os produtos da listagem parseada, sem completar pelas páginas de produto
+        (executado também nos processos do pool de parse)
+        
+        Args:
+            soup (BeautifulSoup): Listagem parseada
+            search_term (str): Termo de busca
+            
+        Returns:
+            list: Produtos extraídos (dicts simples)
+        """
+        raise NotImplementedError(f"{type(self).__name__} não separa a extração da listagem")
+    
+    def _finish_products(self, products, search_term):
+        """
+        Completa os produtos extraídos da listagem pelas páginas de produto
+        
+        Args:
+            products (list): Produtos extraídos da listagem
+            search_term (str): Termo de busca
+            
+        Returns:
+            list: Produtos completos
+        """
+        return self._enrich_products(products)
+    
+    def parse_pool_options(self):
+        """Opções que reproduzem este scraper nos processos do pool de parse"""
+        return {'parser_backend': self.parser.name, 'base_url_override': self.base_url_override}
+    
+    def _extract_products_from_records(self, records, search_term):
+        """
+        Monta os produtos a partir dos registros de LISTING_EXTRACT_SCRIPT
+        
+        Args:
+            records (list): Registros retornados pelo script
+            search_term (str): Termo de busca
+            
+        Returns:
+            list: Lista de produtos extraídos
+        """
+        raise NotImplementedError(f"{type(self).__name__} não define LISTING_EXTRACT_SCRIPT")
+    
+    def parse_listing(self, content):
+        """
+        Parseia a listagem montando apenas as regiões declaradas em LISTING_PARSE_ONLY
+        
+        Args:
+            content (str): HTML da listagem
+            
+        Returns:
+            BeautifulSoup: Regiões da listagem parseadas
+        """
+        if self._is_parsed_listing(content):
+            soup = self._parsed_listing[1]
+            self._parsed_listing = None
+            return soup
+        return self.parser.parse(content, parse_only=self.LISTING_PARSE_ONLY)
+    
+    def _is_parsed_listing(self, content):
+        """Indica se a árvore restrita deste HTML já foi montada pela checagem da listagem"""
+        return self._parsed_listing is not None and self._parsed_listing[0] is content
     
     def create_search_url(self, medicine_description):
         """
@@ -197,25 +806,175 @@ class BaseScraper(ABC):
                 'error': error,
                 'products': [],
                 'url': url,
-                'total_products': 0
+                'total_products': 0,
+                'network_stats': self.network_stats.to_dict(),
+                'fetch_path': self.fetch_path
             }
         
         return {
             'pharmacy': self.pharmacy_name,
             'url': url,
             'products': products,
-            'total_products': len(products)
+            'total_products': len(products),
+            'network_stats': self.network_stats.to_dict(),
+            'fetch_path': self.fetch_path
         }
     
     def cleanup(self):
-        """Limpa recursos do driver apenas se for o proprietário"""
-        if self.driver and self._owns_driver:
+        """Devolve o driver ao pool ou limpa recursos do driver apenas se for o proprietário"""
+        if self.driver and self._leased_driver:
+            self.driver_pool.release(self.driver)
+            self.driver = None
+            self._leased_driver = False
+            self.logger.info("Driver devolvido ao pool")
+        elif self.driver and self._owns_driver:
             self.driver.quit()
             self.driver = None
             self.logger.info("Driver encerrado pelo scraper")
 
+def replace_origin(url, origin):
+    """
+    Troca o esquema, host e porta da URL pelos da origem informada, mantendo caminho e query
+    
+    Args:
+        url (str): URL original (ex.: 'https://www.panvel.com/panvel/buscarProduto.do')
+        origin (str): Nova origem (ex.: 'http://127.0.0.1:8123')
+        
+    Returns:
+        str: URL com a nova origem
+    """
+    parsed_origin = urlparse(origin)
+    return urlparse(url)._replace(scheme=parsed_origin.scheme, netloc=parsed_origin.netloc).geturl()
+
+def get_shared_browser_backend():
+    """Retorna o backend de navegador compartilhado, criando-o se necessário"""
+    global _shared_browser_backend
+    with _shared_browser_backend_lock:
+        if _shared_browser_backend is None:
+            pool = DriverPool(create_pool_driver, max_size=DEFAULT_MAX_CONCURRENT_PAGES)
+            _shared_browser_backend = BrowserBackend(pool, max_concurrent_pages=DEFAULT_MAX_CONCURRENT_PAGES)
+        return _shared_browser_backend
+
+def get_shared_tab_backend():
+    """Retorna o backend de abas compartilhado, criando-o se necessário"""
+    global _shared_tab_backend
+    with _shared_browser_backend_lock:
+        if _shared_tab_backend is None:
+            _shared_tab_backend = TabBrowserBackend(create_tab_backend_driver, max_tabs=DEFAULT_MAX_TABS)
+        return _shared_tab_backend
+
+def set_shared_tab_backend(backend):
+    """Define o backend de abas compartilhado pelos scrapers"""
+    global _shared_tab_backend
+    with _shared_browser_backend_lock:
+        _shared_tab_backend = backend
+
+def create_tab_backend_driver():
+    """Create the shared Chrome used in tab mode; 'none' keeps tab navigations from blocking each other."""
+    return create_chrome_driver(page_load_strategy=DRIVER_PAGE_LOAD_STRATEGY, profile_key=TAB_BACKEND_PROFILE_KEY)
+
+def create_pool_driver(profile_key=None):
+    """Create a pooled Chrome; navigation returns immediately and each scraper waits for its own content.
+
+    profile_key selects the pharmacy's persistent profile (shared HTTP disk cache) when profiles are enabled.
+    """
+    return create_chrome_driver(page_load_strategy=DRIVER_PAGE_LOAD_STRATEGY, profile_key=profile_key)
+
+def set_shared_browser_backend(backend):
+    """Define o backend de navegador compartilhado pelos scrapers"""
+    global _shared_browser_backend
+    with _shared_browser_backend_lock:
+        _shared_browser_backend = backend
+
 # ChromeDriver Management
 
+# Profile shared by every tab of the 'tabs' engine (one browser for all pharmacies)
+TAB_BACKEND_PROFILE_KEY = 'tabs'
+
+class ProfiledChrome(webdriver.Chrome):
+    """Chrome driver that hands its profile directory back to the ProfileManager when it quits."""
+
+    def __init__(self, *args, profile_manager=None, profile_dir=None, **kwargs):
+        self._profile_manager = profile_manager
+        self._profile_dir = profile_dir
+        super().__init__(*args, **kwargs)
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            if self._profile_manager is not None:
+                self._profile_manager.release(self._profile_dir)
+                self._profile_manager = None
+
+CHROME_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+def build_chrome_options(page_load_strategy=None):
+    """Build the Chrome options shared by every driver (headless, anti-detection)."""
+    chrome_options = Options()
+    if page_load_strategy:
+        chrome_options.page_load_strategy = page_load_strategy
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f"--user-agent={CHROME_USER_AGENT}")
+    chrome_options.add_argument("--headless=new")  # Executa o Chrome de forma oculta
+    chrome_options.add_argument("--window-size=1920,1080")
+    # Performance log feeds the per-search network stats (blocked requests, bytes transferred)
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+def get_local_chromedriver_path():
+    """Return the path of the ChromeDriver binary inside chromedriver_bin."""
+    CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
+    binary_name = "chromedriver.exe" if platform.system() == "Windows" else "chromedriver"
+    chromedriver_path = os.path.join(CHROMEDRIVER_DIR, binary_name)
+    # Se não encontrar, tente na subpasta chromedriver-win64
+    if not os.path.exists(chromedriver_path):
+        chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", binary_name)
+        if os.path.exists(chromedriver_path_alt):
+            chromedriver_path = chromedriver_path_alt
+    return chromedriver_path
+
+def resolve_chromedriver_path(chromedriver_path=None):
+    """Return the ChromeDriver binary to use: the given path, the local one, or a ChromeDriverManager download."""
+    chromedriver_path = chromedriver_path or get_local_chromedriver_path()
+    if os.path.exists(chromedriver_path):
+        return chromedriver_path
+    return ChromeDriverManager().install()
+
+def create_chrome_driver(chromedriver_path=None, page_load_strategy=None, profile_key=None):
+    """Start a configured headless Chrome, preferring the local ChromeDriver.
+
+    When the application runs a shared ChromeDriver service (and no explicit chromedriver_path is
+    given), the session attaches to it and only a new Chrome is launched.
+    With a profile_key and an active ProfileManager, Chrome runs on a persistent per-pharmacy
+    profile with a bounded disk cache; if that profile cannot be used, it falls back to a fresh one.
+    """
+    service = None if chromedriver_path else get_default_chromedriver_service()
+    if service is None:
+        service = Service(resolve_chromedriver_path(chromedriver_path))
+    profile_manager = get_default_profile_manager() if profile_key else None
+    driver = None
+    if profile_manager is not None:
+        profile_dir = profile_manager.acquire(profile_key)
+        chrome_options = build_chrome_options(page_load_strategy)
+        for argument in profile_manager.chrome_arguments(profile_dir):
+            chrome_options.add_argument(argument)
+        try:
+            driver = ProfiledChrome(service=service, options=chrome_options,
+                                    profile_manager=profile_manager, profile_dir=profile_dir)
+        except Exception as e:
+            profile_manager.release(profile_dir)
+            logging.getLogger(__name__).warning(f"Chrome profile {profile_dir} unavailable, using a fresh one: {e}")
+    if driver is None:
+        driver = webdriver.Chrome(service=service, options=build_chrome_options(page_load_strategy))
+    # Executar script para remover propriedades de automação
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
 def get_chrome_version():
     """Retrieve the installed version of Google Chrome."""
     try:
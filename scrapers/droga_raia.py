@@ -3,21 +3,167 @@ import logging
 import datetime
 from .base_scraper import BaseScraper
 from utils.product_unifier import ProductUnifier
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.readiness import ReadinessCondition
+from utils.embedded_state import load_next_data, find_records, first_value, to_text, to_price, NEXT_DATA_SCRIPT_ID
+from utils.transports import KIND_PRODUCT
+from utils.html_parsers import region_strainer
+from utils.card_extractor import CardExtractor, CardField, text_of
+from utils.selector_spec import FieldSpec, PageSpec
+from utils.money import MISSING, PRICE_UNAVAILABLE, parse_brl, price_field, sort_by_price, to_reais
 
 # Configuração básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger("DrogaRaiaScraper")
 
+# Chaves candidatas de cada campo nos produtos do estado embutido (__NEXT_DATA__), em ordem de preferência
+STATE_PRODUCT_FIELDS = {
+    'name': ('name', 'productName', 'title'),
+    'brand': ('manufacturer', 'fabricante', 'manufacturerName', 'brand', 'marca', 'brandName'),
+    'description': ('shortDescription', 'presentation', 'subtitle', 'description'),
+    'url': ('urlKey', 'url', 'link', 'href', 'slug'),
+    'price': ('finalPrice', 'price.final', 'sellingPrice', 'salePrice', 'specialPrice', 'valueTo', 'price'),
+    'original_price': ('regularPrice', 'price.regular', 'listPrice', 'originalPrice', 'oldPrice', 'valueFrom', 'price'),
+    'available': ('available', 'isAvailable', 'inStock', 'isInStock')
+}
+
+# Elementos de cada card (fallback sem estado embutido), localizados em uma única passada pelo card;
+# as classes geradas pelo styled-components são casadas por trecho
+CARD_EXTRACTOR = CardExtractor([
+    CardField('availability', 'span', classes=['sc-ddb3b127-0', 'RTDNF']),
+    CardField('name', 'h2', class_contains='eGzxuI'),
+    CardField('name_link', 'a', within='name'),
+    CardField('brand', 'a', class_contains='fibMCW'),
+    CardField('description', 'div', class_contains='jJbyoN'),
+    CardField('description_text', 'p', within='description'),
+    CardField('price_discount', 'div', attrs={'data-testid': 'price-discount'}),
+    CardField('original_price', 'div', class_contains='bZuLpF', within='price_discount'),
+    CardField('discount_price', 'div', class_contains='hsAtyD', within='price_discount'),
+    CardField('price', 'div', class_contains='hUuLwk'),
+    CardField('discount', 'div', class_contains='bogZNT'),
+    CardField('discount_value', 'div', within='discount')
+])
+
+def _label_is(*words):
+    """Filtro de linhas de ficha técnica ('<li><span>rótulo</span><span>valor</span></li>') pelo rótulo"""
+    def where(li):
+        spans = li.find_all('span')
+        return len(spans) >= 2 and any(word in spans[0].get_text(strip=True).lower() for word in words)
+    return where
+
+def _labeled_value(li):
+    """Valor de uma linha da ficha técnica: o texto do link do valor ou, sem ele, o do próprio valor"""
+    value_span = li.find_all('span')[1]
+    a_tag = value_span.find('a')
+    if a_tag and a_tag.get_text(strip=True):
+        return a_tag.get_text(strip=True)
+    return value_span.get_text(strip=True)
+
+def _has_price_text(span):
+    """Filtro de spans cujo texto próprio traz um preço legível após 'R$'"""
+    return bool(span.string) and 'R$' in span.string and parse_brl(span.string, require_symbol=True) != MISSING
+
+def _has_other_price_text(span):
+    """Filtro de spans com preço legível que não são o do preço atual (price-pdp-content)"""
+    return _has_price_text(span) and 'price-pdp-content' not in (span.get('class') or ())
+
+def _price_centavos(span):
+    """Centavos do preço do span (None se ilegível, para valer o próximo seletor)"""
+    centavos = parse_brl(span.get_text(strip=True), require_symbol=True)
+    return None if centavos == MISSING else centavos
+
+# Marca, preços (em centavos) e desconto da página do produto, em uma única passada pela página: a marca
+# vem da linha 'Fabricante' da ficha técnica (ou, sem ela, da linha 'Marca'); sem as classes dos preços,
+# vale o primeiro span com um preço legível após 'R$' (para o original, fora o span do preço atual)
+PRODUCT_PAGE_SPEC = PageSpec([
+    FieldSpec(
+        'brand', 'li', where=_label_is('fabricante'), transform=_labeled_value,
+        fallback=FieldSpec('brand_label', 'li', where=_label_is('marca'), transform=_labeled_value)
+    ),
+    FieldSpec(
+        'price', 'span.sc-fd6fe09f-0.jRRyrf.price-pdp-content', transform=_price_centavos,
+        fallback=FieldSpec('price_text', 'span', where=_has_price_text, transform=_price_centavos)
+    ),
+    FieldSpec(
+        'original_price', 'span.sc-14e14dc8-0.kpLpXu', transform=_price_centavos,
+        fallback=FieldSpec('original_price_text', 'span', where=_has_other_price_text, transform=_price_centavos)
+    ),
+    FieldSpec('discount', 'span.sc-311eb643-0.igSiSz', pattern=r'(\d+)%', cast=int)
+])
+
+# Registros de produto do estado embutido procurados no navegador (mesmo critério de find_records e
+# _is_state_product), sem transferir a página: arguments[0] são as chaves candidatas de STATE_PRODUCT_FIELDS
+# e arguments[1] o id do script do estado
+STATE_RECORDS_SCRIPT = r"""
+var fields = arguments[0];
+var state = window.__NEXT_DATA__;
+if (!state) {
+    var script = document.getElementById(arguments[1]);
+    try { state = script ? JSON.parse(script.textContent) : null; } catch (e) { state = null; }
+}
+function isEmpty(value) {
+    if (value === undefined || value === null || value === '') return true;
+    if (Array.isArray(value)) return value.length === 0;
+    return typeof value === 'object' && Object.keys(value).length === 0;
+}
+function firstValue(record, keys) {
+    for (var i = 0; i < keys.length; i++) {
+        var value = record;
+        var parts = keys[i].split('.');
+        for (var j = 0; j < parts.length; j++) {
+            value = value && typeof value === 'object' && !Array.isArray(value) ? value[parts[j]] : undefined;
+        }
+        if (!isEmpty(value)) return value;
+    }
+    return null;
+}
+function isProduct(item) {
+    return item !== null && typeof item === 'object' && !Array.isArray(item)
+        && firstValue(item, fields.name) !== null
+        && typeof firstValue(item, fields.url) === 'string'
+        && firstValue(item, fields.price) !== null;
+}
+var best = [];
+var pending = state ? [state] : [];
+while (pending.length) {
+    var node = pending.pop();
+    if (Array.isArray(node)) {
+        var records = node.filter(isProduct);
+        if (records.length > best.length) best = records;
+        Array.prototype.push.apply(pending, node);
+    } else if (node !== null && typeof node === 'object') {
+        for (var key in node) pending.push(node[key]);
+    }
+}
+return best;
+"""
+
 class DrogaRaiaScraper(BaseScraper):
     """Scraper para o site Droga Raia usando Selenium"""
     
-    def __init__(self, driver=None):
+    # Os cards vêm renderizados no HTML do servidor: basta o DOM pronto, sem esperar imagens e scripts de terceiros
+    PAGE_LOAD_STRATEGY = 'eager'
+    
+    # A página do produto também vem do servidor com a ficha técnica e o preço: basta o HTTP, sem navegador
+    HTTP_PRODUCT_PAGES = True
+    
+    # Preço da página do produto (a listagem usa a condição padrão, com os cards de container-products)
+    PRODUCT_READINESS = ReadinessCondition('span.price-pdp-content', timeout=8, stable_for=0.5)
+    
+    # Apenas o estado embutido e o container dos cards (fallback) são montados pelo parser
+    LISTING_PARSE_ONLY = region_strainer(
+        ('script', 'id', NEXT_DATA_SCRIPT_ID), ('div', 'data-testid', 'container-products')
+    )
+    
+    # No navegador, os produtos do estado embutido são procurados na própria página e só eles atravessam o WebDriver
+    LISTING_EXTRACT_SCRIPT = STATE_RECORDS_SCRIPT
+    
+    def __init__(self, driver=None, **kwargs):
         super().__init__(
             base_url="https://www.drogaraia.com.br",
             search_url="https://www.drogaraia.com.br/search",
             pharmacy_name="Droga Raia",
-            driver=driver
+            driver=driver,
+            **kwargs
         )
         self.product_unifier = ProductUnifier()  # Instância única
 
@@ -26,16 +172,13 @@ class DrogaRaiaScraper(BaseScraper):
         Busca medicamentos no site Droga Raia
         """
         try:
+            self.search_term = medicine_description
             url = self.create_search_url(medicine_description)
             self.logger.info(f"Buscando URL: {url}")
             response = self.make_request(url)
-            soup = self.parse_html(response['content'])
-            products = self._extract_products(soup, medicine_description)
+            products = self._extract_listing(response, medicine_description)
             self.logger.info(f"Produtos encontrados: {len(products)}")
-            products = sorted(
-                products,
-                key=lambda p: p['price'] if isinstance(p['price'], (int, float)) else float('inf')
-            )
+            products = sort_by_price(products)
             return self.format_response(products, url)
         except Exception as e:
             self.logger.error(f"Erro inesperado: {e}")
@@ -43,179 +186,42 @@ class DrogaRaiaScraper(BaseScraper):
 
     def _extract_products(self, soup, search_term):
         """
-        Extrai produtos do HTML parseado
+        Extrai produtos do HTML parseado: do estado embutido da página (__NEXT_DATA__),
+        com fallback para os cards do HTML
+        """
+        return self._finish_products(self._extract_listing_products(soup, search_term), search_term)
+
+    def _extract_listing_products(self, soup, search_term):
+        """
+        Extrai os produtos do estado embutido ou dos cards, sem completar pelas páginas de produto
+        """
+        products = self._extract_products_from_state(soup, search_term)
+        if products is None:
+            products = self._extract_products_from_cards(soup, search_term)
+        return products or []
+
+    def _extract_products_from_records(self, records, search_term):
+        """
+        Monta os produtos a partir dos registros do estado embutido encontrados no navegador
+        (LISTING_EXTRACT_SCRIPT)
         """
-        products_container = soup.find('div', {'data-testid': 'container-products'})
-        if not products_container:
-            self.logger.warning("Container de produtos não encontrado no HTML.")
-            self.logger.debug(f"HTML da página (primeiros 1000 chars):\n{str(soup)[:1000]}")
-            return []
         products = []
-        product_articles = products_container.find_all('article', class_=lambda x: x and 'vertical' in x)
-        self.logger.info(f"Quantidade de <article> encontrados: {len(product_articles)}")
-        for idx, article in enumerate(product_articles, 1):
+        for idx, record in enumerate([r for r in records if self._is_state_product(r)], 1):
             try:
-                product = self._extract_product_info(article, idx, search_term, skip_open=True)
+                product = self._extract_state_product_info(record, idx, search_term)
                 if product:
                     products.append(product)
             except Exception as e:
-                self.logger.error(f"Erro ao extrair produto: {e}")
+                self.logger.error(f"Erro ao extrair produto do estado embutido: {e}")
                 continue
-        # Paralelizar abertura das páginas específicas
-        def fetch_brand_and_price_with_own_driver(product):
-            import datetime
-            product_url = product.get('product_url')
-            reason_open = []
-            if product.get('brand') in [None, '', 'Marca não disponível']:
-                reason_open.append('marca')
-            if product.get('price') == 'Preço não disponível' or product.get('original_price') == 'Preço não disponível':
-                reason_open.append('preço')
-            if not product_url:
-                return (product_url, product.get('brand'), product.get('price'), product.get('original_price'), product.get('discount_percentage'), product.get('has_discount'))
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            import platform
-            import os
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--window-size=1920,1080")
-            CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
-            chromedriver_path = os.path.join(CHROMEDRIVER_DIR, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-                if os.path.exists(chromedriver_path_alt):
-                    chromedriver_path = chromedriver_path_alt
-            service = Service(chromedriver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            try:
-                now = datetime.datetime.now().strftime('%H:%M:%S')
-                logger.info(f"[DrogaRaiaScraper] [{now}] (PARALLEL) Abrindo página do produto para buscar: {', '.join(reason_open)} | URL: {product_url}")
-                driver.get(product_url)
-                import time
-                time.sleep(2)
-                # Marca
-                brand = None
-                li_tags = []
-                try:
-                    from bs4 import BeautifulSoup
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    li_tags = soup.find_all('li')
-                except Exception:
-                    pass
-                for li in li_tags:
-                    spans = li.find_all('span')
-                    if len(spans) >= 2:
-                        label = spans[0].get_text(strip=True).lower()
-                        if 'fabricante' in label:
-                            value_span = spans[1]
-                            a_tag = value_span.find('a')
-                            if a_tag and a_tag.get_text(strip=True):
-                                brand = a_tag.get_text(strip=True)
-                            else:
-                                value_text = value_span.get_text(strip=True)
-                                if value_text:
-                                    brand = value_text
-                            break
-                if not brand:
-                    for li in li_tags:
-                        spans = li.find_all('span')
-                        if len(spans) >= 2:
-                            label = spans[0].get_text(strip=True).lower()
-                            if 'marca' in label:
-                                value_span = spans[1]
-                                a_tag = value_span.find('a')
-                                if a_tag and a_tag.get_text(strip=True):
-                                    brand = a_tag.get_text(strip=True)
-                                else:
-                                    value_text = value_span.get_text(strip=True)
-                                    if value_text:
-                                        brand = value_text
-                                break
-                # Preço
-                price = product.get('price', 'Preço não disponível')
-                original_price = product.get('original_price', 'Preço não disponível')
-                discount_percentage = product.get('discount_percentage', 0)
-                has_discount = product.get('has_discount', False)
-                try:
-                    # Preço atual
-                    price_span = soup.find('span', class_='sc-fd6fe09f-0 jRRyrf price-pdp-content')
-                    if not price_span:
-                        price_span = soup.find('span', string=lambda t: t and 'R$' in t)
-                    if price_span:
-                        price_text = price_span.get_text(strip=True)
-                        price_match = re.search(r'R\$[\s]*([\d,.]+)', price_text)
-                        if price_match:
-                            price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                            original_price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                except Exception:
-                    pass
-                try:
-                    # Preço original
-                    original_price_span = soup.find('span', class_='sc-14e14dc8-0 kpLpXu')
-                    if not original_price_span:
-                        all_spans = soup.find_all('span', string=lambda t: t and 'R$' in t)
-                        for span in all_spans:
-                            if price_span and span == price_span:
-                                continue
-                            original_price_span = span
-                            break
-                    if original_price_span:
-                        original_price_text = original_price_span.get_text(strip=True)
-                        original_price_match = re.search(r'R\$[\s]*([\d,.]+)', original_price_text)
-                        if original_price_match:
-                            original_price = float(original_price_match.group(1).replace('.', '').replace(',', '.'))
-                except Exception:
-                    pass
-                try:
-                    # Desconto
-                    discount_span = soup.find('span', class_='sc-311eb643-0 igSiSz')
-                    if discount_span:
-                        discount_text = discount_span.get_text(strip=True)
-                        discount_match = re.search(r'(\d+)%', discount_text)
-                        if discount_match:
-                            discount_percentage = int(discount_match.group(1))
-                            has_discount = True
-                except Exception:
-                    pass
-                now2 = datetime.datetime.now().strftime('%H:%M:%S')
-                logger.info(f"[DrogaRaiaScraper] [{now2}] (PARALLEL) Resultado da extração na página do produto: marca='{brand}', preço={{'current_price': {price}, 'original_price': {original_price}}}, desconto={{'has_discount': {has_discount}, 'percentage': {discount_percentage}}}")
-                return (product_url, brand, price, original_price, discount_percentage, has_discount)
-            finally:
-                driver.quit()
-        # Coletar produtos que precisam buscar marca ou preço
-        products_to_update = [p for p in products if (p.get('brand') in [None, '', 'Marca não disponível'] or p.get('price') == 'Preço não disponível' or p.get('original_price') == 'Preço não disponível') and p.get('product_url')]
-        if products_to_update:
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_url = {executor.submit(fetch_brand_and_price_with_own_driver, p): p for p in products_to_update}
-                url_to_data = {}
-                for future in as_completed(future_to_url):
-                    url, brand, price, original_price, discount_percentage, has_discount = future.result()
-                    # Capitalizar brand, exceto EMS
-                    if isinstance(brand, str) and brand.strip():
-                        if brand.strip().upper() == 'EMS':
-                            brand = 'EMS'
-                        else:
-                            brand = ' '.join([w.capitalize() for w in brand.strip().split()])
-                    url_to_data[url] = (brand, price, original_price, discount_percentage, has_discount)
-                # Atualizar produtos
-                for p in products:
-                    if p.get('product_url') in url_to_data:
-                        brand, price, original_price, discount_percentage, has_discount = url_to_data[p['product_url']]
-                        p['brand'] = brand
-                        p['price'] = price
-                        p['original_price'] = original_price
-                        p['discount_percentage'] = discount_percentage
-                        p['has_discount'] = has_discount
-                        # Garantir que brand nunca seja string vazia
-                        if not p['brand'] or not str(p['brand']).strip():
-                            p['brand'] = "Marca não disponível"
+        return self._finish_products(products, search_term)
+
+    def _finish_products(self, products, search_term):
+        """
+        Completa os produtos pelas páginas específicas e aplica o filtro '+'
+        """
+        # Completar marca/preço abrindo as páginas específicas no backend compartilhado
+        products = self._enrich_products(products)
         # Filtrar produtos com '+' no nome que não correspondem ao termo de busca (com log e normalização)
         import unicodedata
         def normalize(text):
@@ -235,48 +241,159 @@ class DrogaRaiaScraper(BaseScraper):
         products = [p for p in products if is_valid_plus_product(p, search_term)]
         return products
 
+    def _extract_products_from_state(self, soup, search_term):
+        """
+        Extrai os produtos do estado embutido da página em uma única passada, incluindo o fabricante
+        
+        Args:
+            soup (BeautifulSoup): HTML parseado da listagem
+            search_term (str): Termo de busca
+            
+        Returns:
+            list: Produtos extraídos, ou None se a página não tiver estado com produtos
+        """
+        state = load_next_data(soup)
+        if state is None:
+            return None
+        records = find_records(state, self._is_state_product)
+        if not records:
+            self.logger.info("Estado embutido sem produtos; usando os cards do HTML")
+            return None
+        self.logger.info(f"Quantidade de produtos no estado embutido: {len(records)}")
+        products = []
+        for idx, record in enumerate(records, 1):
+            try:
+                product = self._extract_state_product_info(record, idx, search_term)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                self.logger.error(f"Erro ao extrair produto do estado embutido: {e}")
+                continue
+        return products
+    
+    def _listing_script_args(self):
+        """Chaves candidatas dos campos que identificam um produto e o id do script do estado"""
+        fields = {field: list(STATE_PRODUCT_FIELDS[field]) for field in ('name', 'url', 'price')}
+        return (fields, NEXT_DATA_SCRIPT_ID)
+    
+    def _is_state_product(self, record):
+        """Indica se um registro do estado embutido é um produto (nome, link e preço)"""
+        return (
+            to_text(first_value(record, STATE_PRODUCT_FIELDS['name'])) is not None
+            and isinstance(first_value(record, STATE_PRODUCT_FIELDS['url']), str)
+            and first_value(record, STATE_PRODUCT_FIELDS['price']) is not None
+        )
+    
+    def _extract_state_product_info(self, record, position=None, search_term=None):
+        """
+        Extrai informações de um produto do estado embutido
+        
+        Args:
+            record (dict): Produto do estado embutido
+            position (int, optional): Posição na busca
+            search_term (str, optional): Termo de busca
+            
+        Returns:
+            dict: Informações do produto, ou None se indisponível
+        """
+        if first_value(record, STATE_PRODUCT_FIELDS['available']) is False:
+            self.logger.info(f"[DrogaRaiaScraper] Produto excluído - indisponível no estado embutido")
+            return None
+        name = to_text(first_value(record, STATE_PRODUCT_FIELDS['name'])) or "Nome não disponível"
+        description = to_text(first_value(record, STATE_PRODUCT_FIELDS['description'])) or ""
+        product_link = first_value(record, STATE_PRODUCT_FIELDS['url'])
+        if not product_link.startswith('http'):
+            product_link = f"{self.base_url}/{product_link.lstrip('/')}"
+        price = to_price(first_value(record, STATE_PRODUCT_FIELDS['price']))
+        original_price = to_price(first_value(record, STATE_PRODUCT_FIELDS['original_price'])) or price
+        if price is None:
+            price = original_price = PRICE_UNAVAILABLE
+        else:
+            original_price = max(original_price, price)
+        has_discount = isinstance(price, float) and original_price > price
+        # Fabricante do estado; sem ele, o laboratório padronizado ou a página do produto
+        brand = to_text(first_value(record, STATE_PRODUCT_FIELDS['brand']))
+        pending_brand = False
+        if not brand and search_term:
+            found_lab = self.product_unifier.find_best_match(
+                product_name=name,
+                product_brand="",
+                product_description=description,
+                search_term=search_term
+            )
+            brand = found_lab['laboratory'] if found_lab and found_lab.get('laboratory') else None
+            pending_brand = not brand
+        product_data = {
+            'name': name,
+            'brand': self.format_brand(brand) if brand else "Marca não disponível",
+            'description': description,
+            'price': price,
+            'original_price': original_price,
+            'discount_percentage': round((1 - price / original_price) * 100) if has_discount else 0,
+            'product_url': product_link,
+            'has_discount': has_discount,
+            'position': position
+        }
+        if pending_brand:
+            product_data['_pending_brand'] = True
+        return product_data
+    
+    def _extract_products_from_cards(self, soup, search_term):
+        """
+        Extrai produtos dos cards do HTML (classes geradas pelo styled-components)
+        
+        Returns:
+            list: Produtos extraídos, ou None se o container de produtos não existir
+        """
+        products_container = soup.find('div', {'data-testid': 'container-products'})
+        if not products_container:
+            self.logger.warning("Container de produtos não encontrado no HTML.")
+            return None
+        products = []
+        product_articles = products_container.find_all('article', class_=lambda x: x and 'vertical' in x)
+        self.logger.info(f"Quantidade de <article> encontrados: {len(product_articles)}")
+        for idx, article in enumerate(product_articles, 1):
+            try:
+                product = self._extract_product_info(article, idx, search_term, skip_open=True)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                self.logger.error(f"Erro ao extrair produto: {e}")
+                continue
+        return products
+
     def _extract_product_info(self, article, position=None, search_term=None, skip_open=False):
         """
         Extrai informações de um produto do HTML
         """
         try:
+            # Todos os elementos do card em uma única passada
+            fields = CARD_EXTRACTOR.extract(article)
             # Verificar se o produto tem "Consultar disponibilidade" - se sim, excluir
-            availability_span = article.find('span', class_='sc-ddb3b127-0 RTDNF')
+            availability_span = fields['availability']
             if availability_span and 'Consultar disponibilidade' in availability_span.get_text(strip=True):
                 self.logger.info(f"[DrogaRaiaScraper] Produto excluído - 'Consultar disponibilidade' encontrado")
                 return None
             
             # Nome do produto
-            name_element = article.find('h2', class_=lambda x: x and 'eGzxuI' in x)
+            name_element = fields['name']
+            name_link = fields['name_link']
             if name_element:
-                name_link = name_element.find('a')
                 name = name_link.get_text(strip=True) if name_link else name_element.get_text(strip=True)
             else:
                 name = "Nome não disponível"
             # Marca/Fabricante
-            brand_element = article.find('a', class_=lambda x: x and 'fibMCW' in x)
+            brand_element = fields['brand']
             brand = brand_element.get_text(strip=True) if brand_element else "Marca não disponível"
             # Descrição/Quantidade
-            description_element = article.find('div', class_=lambda x: x and 'jJbyoN' in x)
-            description = ""
-            if description_element:
-                desc_p = description_element.find('p')
-                description = desc_p.get_text(strip=True) if desc_p else description_element.get_text(strip=True)
+            description_element = fields['description_text'] or fields['description']
+            description = description_element.get_text(strip=True) if description_element else ""
             # Preço
-            price_info = self._extract_price(article)
+            price_info = self._extract_price(fields)
             # Link do produto
-            product_link = ""
-            if name_element:
-                name_link = name_element.find('a')
-                if name_link:
-                    product_link = self.base_url + name_link.get('href', '')
-            # Imagem do produto
-            img_element = article.find('img', {'data-testid': 'product-image'})
-            image_url = ""
-            if img_element:
-                image_url = img_element.get('src', '')
+            product_link = self.base_url + name_link.get('href', '') if name_link else ""
             # Verificar se há desconto
-            discount_info = self._extract_discount_info(article)
+            discount_info = self._extract_discount_info(fields)
             # --- Lógica de busca condicional ---
             final_brand = brand
             need_open_product_page = False
@@ -298,11 +415,13 @@ class DrogaRaiaScraper(BaseScraper):
                 else:
                     final_brand = found_lab_name or brand
             # Se faltar preço, também precisa abrir a página
-            if ((price_info['current_price'] == 'Preço não disponível' or price_info['original_price'] == 'Preço não disponível') and product_link):
+            if ((price_info['current_price'] == PRICE_UNAVAILABLE or price_info['original_price'] == PRICE_UNAVAILABLE) and product_link):
                 need_open_product_page = True
                 reason_open.append('preço')
+            # Na listagem, a página do produto é aberta depois, em paralelo, pelo backend compartilhado
+            pending_brand = need_open_product_page and skip_open and 'marca' in reason_open
             # Se precisar abrir a página do produto, extrair marca e preço juntos
-            if need_open_product_page and product_link:
+            if need_open_product_page and product_link and not skip_open:
                 now = datetime.datetime.now().strftime('%H:%M:%S')
                 self.logger.info(f"[DrogaRaiaScraper] [{now}] Abrindo página do produto para buscar: {', '.join(reason_open)} | URL: {product_link}")
                 extracted_brand, extracted_price_info, extracted_discount_info = self._extract_brand_and_price_from_product_page(product_link)
@@ -331,22 +450,22 @@ class DrogaRaiaScraper(BaseScraper):
                 'has_discount': discount_info['has_discount'],
                 'position': position
             }
+            if pending_brand:
+                product_data['_pending_brand'] = True
             self.logger.info(f"[DrogaRaiaScraper] Produto final: {product_data}")
             return product_data
         except Exception as e:
             self.logger.error(f"Erro ao extrair informações do produto: {e}")
             return None
     
-    def _extract_price(self, article):
-        """Extrai informações de preço do produto"""
+    def _extract_price(self, fields):
+        """Extrai informações de preço dos elementos do card (CARD_EXTRACTOR)"""
         try:
             # Verificar se há desconto (preço com desconto)
-            discount_price_container = article.find('div', {'data-testid': 'price-discount'})
-            
-            if discount_price_container:
+            if fields['price_discount'] is not None:
                 # Produto com desconto
-                original_price_elem = discount_price_container.find('div', class_=lambda x: x and 'bZuLpF' in x)
-                current_price_elem = discount_price_container.find('div', class_=lambda x: x and 'hsAtyD' in x)
+                original_price_elem = fields['original_price']
+                current_price_elem = fields['discount_price']
                 
                 original_price = self._extract_price_value(original_price_elem)
                 current_price = self._extract_price_value(current_price_elem)
@@ -357,7 +476,7 @@ class DrogaRaiaScraper(BaseScraper):
                 }
             else:
                 # Produto sem desconto
-                price_elem = article.find('div', class_=lambda x: x and 'hUuLwk' in x)
+                price_elem = fields['price']
                 price = self._extract_price_value(price_elem)
                 
                 return {
@@ -368,35 +487,25 @@ class DrogaRaiaScraper(BaseScraper):
         except Exception as e:
             self.logger.error(f"Erro ao extrair preço: {e}")
             return {
-                'current_price': "Preço não disponível",
-                'original_price': "Preço não disponível"
+                'current_price': PRICE_UNAVAILABLE,
+                'original_price': PRICE_UNAVAILABLE
             }
     
     def _extract_price_value(self, price_element):
-        """Extrai o valor do preço de um elemento"""
+        """Extrai o valor do preço de um elemento (reais, ou "Preço não disponível")"""
         if not price_element:
-            return "Preço não disponível"
-        
-        price_text = price_element.get_text(strip=True)
-        # Remover "R$" e espaços, converter para float
-        price_match = re.search(r'R\$\s*([\d,]+)', price_text)
-        if price_match:
-            price_str = price_match.group(1).replace(',', '.')
-            try:
-                return float(price_str)
-            except ValueError:
-                return price_text
-        return price_text
+            return PRICE_UNAVAILABLE
+        return price_field(parse_brl(price_element.get_text(strip=True), require_symbol=True))
     
-    def _extract_discount_info(self, article):
-        """Extrai informações de desconto do produto"""
+    def _extract_discount_info(self, fields):
+        """Extrai informações de desconto dos elementos do card (CARD_EXTRACTOR)"""
         try:
             # Verificar se há tag de desconto
-            discount_tag = article.find('div', class_=lambda x: x and 'bogZNT' in x)
+            discount_tag = fields['discount']
             
             if discount_tag:
                 # Encontrar a porcentagem de desconto
-                discount_div = discount_tag.find('div')
+                discount_div = fields['discount_value']
                 if discount_div:
                     discount_text = discount_div.get_text(strip=True)
                     # Extrair apenas números
@@ -426,94 +535,37 @@ class DrogaRaiaScraper(BaseScraper):
         try:
             if not product_url:
                 return None, None, None
-            response = self.make_request(product_url)
-            soup = self.parse_html(response['content'])
-            # Marca
-            brand = None
-            li_tags = soup.find_all('li')
-            for li in li_tags:
-                spans = li.find_all('span')
-                if len(spans) >= 2:
-                    label = spans[0].get_text(strip=True).lower()
-                    if 'fabricante' in label:
-                        value_span = spans[1]
-                        a_tag = value_span.find('a')
-                        if a_tag and a_tag.get_text(strip=True):
-                            brand = a_tag.get_text(strip=True)
-                        else:
-                            value_text = value_span.get_text(strip=True)
-                            if value_text:
-                                brand = value_text
-                        break
-            if not brand:
-                for li in li_tags:
-                    spans = li.find_all('span')
-                    if len(spans) >= 2:
-                        label = spans[0].get_text(strip=True).lower()
-                        if 'marca' in label:
-                            value_span = spans[1]
-                            a_tag = value_span.find('a')
-                            if a_tag and a_tag.get_text(strip=True):
-                                brand = a_tag.get_text(strip=True)
-                            else:
-                                value_text = value_span.get_text(strip=True)
-                                if value_text:
-                                    brand = value_text
-                            break
-            # Preço
-            price_info = {'current_price': 'Preço não disponível', 'original_price': 'Preço não disponível'}
-            discount_info = {'has_discount': False, 'percentage': 0}
-            # Preço atual
-            price_span = soup.find('span', class_='sc-fd6fe09f-0 jRRyrf price-pdp-content')
-            if not price_span:
-                price_span = soup.find('span', string=lambda t: t and 'R$' in t)
-            if price_span:
-                price_text = price_span.get_text(strip=True)
-                price_match = re.search(r'R\$[\s]*([\d,.]+)', price_text)
-                if price_match:
-                    price_info['current_price'] = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                    price_info['original_price'] = float(price_match.group(1).replace('.', '').replace(',', '.'))
-            # Preço original
-            original_price_span = soup.find('span', class_='sc-14e14dc8-0 kpLpXu')
-            if not original_price_span:
-                all_spans = soup.find_all('span', string=lambda t: t and 'R$' in t)
-                for span in all_spans:
-                    if price_span and span == price_span:
-                        continue
-                    original_price_span = span
-                    break
-            if original_price_span:
-                original_price_text = original_price_span.get_text(strip=True)
-                original_price_match = re.search(r'R\$[\s]*([\d,.]+)', original_price_text)
-                if original_price_match:
-                    price_info['original_price'] = float(original_price_match.group(1).replace('.', '').replace(',', '.'))
-            # Desconto
-            discount_span = soup.find('span', class_='sc-311eb643-0 igSiSz')
-            if discount_span:
-                discount_text = discount_span.get_text(strip=True)
-                discount_match = re.search(r'(\d+)%', discount_text)
-                if discount_match:
-                    discount_info['percentage'] = int(discount_match.group(1))
-                    discount_info['has_discount'] = True
-            # Fallback robusto: todos os <span> com 'R$'
-            if (price_info['current_price'] == 'Preço não disponível' or price_info['original_price'] == 'Preço não disponível'):
-                all_price_spans = soup.find_all('span', string=lambda t: t and 'R$' in t)
-                prices_found = []
-                for span in all_price_spans:
-                    price_text = span.get_text(strip=True)
-                    price_match = re.search(r'R\$[\s]*([\d,.]+)', price_text)
-                    if price_match:
-                        value = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                        prices_found.append(value)
-                if prices_found:
-                    if len(prices_found) >= 2:
-                        price_info['original_price'] = max(prices_found)
-                        price_info['current_price'] = min(prices_found)
-                    else:
-                        price_info['current_price'] = prices_found[0]
-                        price_info['original_price'] = prices_found[0]
-                    self.logger.info(f"[DrogaRaiaScraper] Preços encontrados na página do produto: {prices_found}")
-            return brand, price_info, discount_info
+            soup = self.parse_html(self.fetch(product_url, KIND_PRODUCT).content)
+            details = self._extract_details_from_product_page(soup)
+            price_info = {'current_price': details['price'], 'original_price': details['original_price']}
+            discount_info = {'has_discount': details['has_discount'], 'percentage': details['discount_percentage'] or 0}
+            return details['brand'], price_info, discount_info
         except Exception as e:
             self.logger.error(f"Erro ao extrair marca/preço da página do produto: {e}")
-            return None, None, None 
\ No newline at end of file
+            return None, None, None
+
+    def _extract_details_from_product_page(self, soup):
+        """
+        Extrai marca, preço e desconto do HTML da página do produto.
+        """
+        fields = PRODUCT_PAGE_SPEC.extract(soup)
+        brand = fields['brand'] or None
+        # Preço atual e original; o original nunca fica abaixo do atual (ex.: span de parcela no fallback)
+        price_info = {'current_price': PRICE_UNAVAILABLE, 'original_price': PRICE_UNAVAILABLE}
+        discount_info = {'has_discount': False, 'percentage': 0}
+        price = fields['price']
+        if price is not None:
+            price_info['current_price'] = to_reais(price)
+            price_info['original_price'] = to_reais(max(price, fields['original_price'] or price))
+        # Desconto
+        if fields['discount'] is not None:
+            discount_info['percentage'] = fields['discount']
+            discount_info['has_discount'] = True
+        return {
+            'brand': brand,
+            'price': price_info['current_price'],
+            'original_price': price_info['original_price'],
+            # Desconto só é informado quando encontrado, para preservar o da listagem
+            'discount_percentage': discount_info['percentage'] if discount_info['has_discount'] else None,
+            'has_discount': discount_info['has_discount']
+        }
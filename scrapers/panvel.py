@@ -3,21 +3,100 @@ import logging
 import datetime
 from .base_scraper import BaseScraper
 from utils.product_unifier import ProductUnifier
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.readiness import ReadinessCondition
+from utils.transports import KIND_LISTING
+from utils.html_parsers import region_strainer
+from utils.card_extractor import CardExtractor, CardField, text_of
+from utils.selector_spec import FieldSpec, PageSpec
+from utils.money import (
+    MISSING, PARSE_BRL_JS, PRICE_UNAVAILABLE, parse_brl, parse_brl_batch, parse_reais, price_field, sort_by_price, to_reais
+)
 
 # Configuração básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger("PanvelScraper")
 
+# Elementos de cada card da listagem, localizados em uma única passada pelo card
+CARD_EXTRACTOR = CardExtractor([
+    CardField('name', 'span', classes=['item-name']),
+    CardField('brand', 'span', classes=['brand-name']),
+    CardField('description', 'div', classes=['presentation-title']),
+    CardField('price', 'span', classes=['price']),
+    CardField('special_price', 'span', classes=['price', 'special']),
+    CardField('link', 'a', attrs={'href': True}),
+    CardField('discount', 'span', classes=['discount-percentage'])
+])
+
+def _price_value(text):
+    """Preço em reais do texto de um elemento de preço ('R$ 1.234,56'), ou None sem 'R$'"""
+    return parse_reais(text, require_symbol=True)
+
+# Marca, preço e desconto da página do produto, em uma única passada pela página; sem preço promocional
+# ('deal-price') com valor, vale o preço original
+PRODUCT_PAGE_SPEC = PageSpec([
+    FieldSpec('brand', 'span.brand-name'),
+    FieldSpec(
+        'price', 'span.deal-price', cast=_price_value,
+        fallback=FieldSpec('original_price', 'span.original-price', cast=_price_value)
+    ),
+    FieldSpec('discount', "span[data-cy='product-discount']", pattern=r'(\d+)%', cast=int)
+])
+
+# Campos dos cards lidos no DOM da listagem, no navegador (mesmos seletores e preços de _extract_product_info)
+LISTING_RECORDS_SCRIPT = PARSE_BRL_JS + r"""
+function text(root, selector) {
+    var element = root.querySelector(selector);
+    var value = element ? element.textContent.replace(/\s+/g, ' ').trim() : '';
+    return value || null;
+}
+var cards = document.querySelectorAll('lib-card-item-v2-vertical, lib-card-item-v2-horizontal');
+return Array.prototype.map.call(cards, function (card, index) {
+    var link = card.querySelector('a[href]');
+    var discount = (text(card, 'span.discount-percentage') || '').match(/(\d+)%/);
+    // Preço principal e, sem ele, o preço especial (ex: 2 por R$ X,XX cada)
+    var current = parseBrl(text(card, 'span.price'));
+    if (current === null) current = parseBrl(text(card, 'span.price.special'));
+    return {
+        name: text(card, 'span.item-name'),
+        brand: text(card, 'span.brand-name'),
+        description: text(card, 'div.presentation-title'),
+        price: current,
+        original_price: current,
+        discount_percentage: discount ? parseInt(discount[1], 10) : null,
+        url: link ? link.getAttribute('href') : null,
+        position: index + 1
+    };
+});
+"""
+
 class PanvelScraper(BaseScraper):
     """Scraper para o site Panvel usando Selenium"""
     
-    def __init__(self, driver=None):
+    # A listagem (Angular) é renderizada no cliente: não esperar o DOMContentLoaded, apenas os cards
+    PAGE_LOAD_STRATEGY = 'none'
+    
+    # Cards de produto da listagem (Angular) e marca/preço da página do produto
+    LISTING_READINESS = ReadinessCondition('lib-card-item-v2-vertical, lib-card-item-v2-horizontal', timeout=15)
+    PRODUCT_READINESS = ReadinessCondition('span.brand-name, span.deal-price', timeout=8, stable_for=0.5)
+    
+    # Quando o HTML do servidor já traz os cards, a busca dispensa o navegador; sem cards, usa o Selenium
+    TRANSPORTS = {KIND_LISTING: ('http', 'selenium')}
+    
+    # Apenas os cards de produto são montados pelo parser; o restante da página Angular é descartado
+    LISTING_PARSE_ONLY = region_strainer(
+        ('lib-card-item-v2-vertical', None, None), ('lib-card-item-v2-horizontal', None, None)
+    )
+    
+    # No navegador, os cards são lidos no próprio DOM e só os registros atravessam o WebDriver
+    LISTING_EXTRACT_SCRIPT = LISTING_RECORDS_SCRIPT
+    
+    def __init__(self, driver=None, **kwargs):
         super().__init__(
             base_url="https://www.panvel.com/panvel",
             search_url="https://www.panvel.com/panvel/buscarProduto.do",
             pharmacy_name="Panvel",
-            driver=driver
+            driver=driver,
+            **kwargs
         )
         self.product_unifier = ProductUnifier()  # Instância única
 
@@ -32,16 +111,13 @@ class PanvelScraper(BaseScraper):
         Busca medicamentos no site Panvel
         """
         try:
+            self.search_term = medicine_description
             url = self.create_search_url(medicine_description)
             self.logger.info(f"Buscando URL: {url}")
             response = self.make_request(url)
-            soup = self.parse_html(response['content'])
-            products = self._extract_products(soup, medicine_description)
+            products = self._extract_listing(response, medicine_description)
             self.logger.info(f"Produtos encontrados: {len(products)}")
-            products = sorted(
-                products,
-                key=lambda p: p['price'] if isinstance(p['price'], (int, float)) else float('inf')
-            )
+            products = sort_by_price(products)
             return self.format_response(products, url)
         except Exception as e:
             self.logger.error(f"Erro inesperado: {e}")
@@ -51,6 +127,12 @@ class PanvelScraper(BaseScraper):
         """
         Extrai produtos do HTML parseado
         """
+        return self._finish_products(self._extract_listing_products(soup, search_term), search_term)
+
+    def _extract_listing_products(self, soup, search_term):
+        """
+        Extrai os produtos dos cards da listagem, sem completar pelas páginas de produto
+        """
         # Panvel: produtos estão em <lib-card-item-v2-vertical> e <lib-card-item-v2-horizontal>
         products = []
         product_cards = soup.find_all(['lib-card-item-v2-vertical', 'lib-card-item-v2-horizontal'])
@@ -63,82 +145,29 @@ class PanvelScraper(BaseScraper):
             except Exception as e:
                 self.logger.error(f"Erro ao extrair produto: {e}")
                 continue
-        # Paralelizar abertura das páginas específicas para marca/preço
-        def fetch_brand_and_price_with_own_driver(product):
-            product_url = product.get('product_url')
-            reason_open = []
-            if product.get('brand') in [None, '', 'Marca não disponível']:
-                reason_open.append('marca')
-            if product.get('price') == 'Preço não disponível' or product.get('original_price') == 'Preço não disponível':
-                reason_open.append('preço')
-            if not product_url:
-                return (product_url, product.get('brand'), product.get('price'), product.get('original_price'), product.get('discount_percentage'), product.get('has_discount'))
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            import platform
-            import os
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--window-size=1920,1080")
-            CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
-            chromedriver_path = os.path.join(CHROMEDRIVER_DIR, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-                if os.path.exists(chromedriver_path_alt):
-                    chromedriver_path = chromedriver_path_alt
-            service = Service(chromedriver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+        return products
+
+    def _extract_products_from_records(self, records, search_term):
+        """
+        Monta os produtos a partir dos registros extraídos no navegador (LISTING_EXTRACT_SCRIPT)
+        """
+        products = []
+        for idx, record in enumerate(records, 1):
             try:
-                driver.get(product_url)
-                import time
-                time.sleep(2)
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                # Marca
-                brand = None
-                brand_span = soup.find('span', class_='brand-name')
-                if brand_span:
-                    brand = brand_span.get_text(strip=True)
-                # Preço
-                price_info = self._extract_price_from_product_page(soup)
-                # Desconto
-                discount_info = self._extract_discount_info_from_product_page(soup)
-                return (product_url, brand, price_info['current_price'], price_info['original_price'], discount_info['percentage'], discount_info['has_discount'])
-            finally:
-                driver.quit()
-        # Coletar produtos que precisam buscar marca ou preço
-        products_to_update = [p for p in products if (p.get('brand') in [None, '', 'Marca não disponível'] or p.get('price') == 'Preço não disponível' or p.get('original_price') == 'Preço não disponível') and p.get('product_url')]
-        if products_to_update:
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_url = {executor.submit(fetch_brand_and_price_with_own_driver, p): p for p in products_to_update}
-                url_to_data = {}
-                for future in as_completed(future_to_url):
-                    url, brand, price, original_price, discount_percentage, has_discount = future.result()
-                    # Capitalizar brand, exceto EMS
-                    if isinstance(brand, str) and brand.strip():
-                        if brand.strip().upper() == 'EMS':
-                            brand = 'EMS'
-                        else:
-                            brand = ' '.join([w.capitalize() for w in brand.strip().split()])
-                    url_to_data[url] = (brand, price, original_price, discount_percentage, has_discount)
-                # Atualizar produtos
-                for p in products:
-                    if p.get('product_url') in url_to_data:
-                        brand, price, original_price, discount_percentage, has_discount = url_to_data[p['product_url']]
-                        p['brand'] = brand
-                        p['price'] = price
-                        p['original_price'] = original_price
-                        p['discount_percentage'] = discount_percentage
-                        p['has_discount'] = has_discount
-                        if not p['brand'] or not str(p['brand']).strip():
-                            p['brand'] = "Marca não disponível"
+                product = self._build_product(record, record.get('position') or idx, search_term)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                self.logger.error(f"Erro ao montar produto extraído no navegador: {e}")
+                continue
+        return self._finish_products(products, search_term)
+
+    def _finish_products(self, products, search_term):
+        """
+        Completa os produtos pelas páginas específicas e aplica o filtro '+'
+        """
+        # Completar marca/preço abrindo as páginas específicas no backend compartilhado
+        products = self._enrich_products(products)
         # Filtro '+'
         import unicodedata
         def normalize(text):
@@ -163,91 +192,94 @@ class PanvelScraper(BaseScraper):
         Extrai informações de um produto do HTML
         """
         try:
-            # Nome do produto
-            name_element = card.find('span', class_='item-name')
-            name = name_element.get_text(strip=True) if name_element else "Nome não disponível"
-            # Marca
-            brand_element = card.find('span', class_='brand-name')
-            brand = brand_element.get_text(strip=True) if brand_element else "Marca não disponível"
-            # Descrição/Quantidade
-            desc_element = card.find('div', class_='presentation-title')
-            description = desc_element.get_text(strip=True) if desc_element else ""
-            # Preço
-            price_info = self._extract_price(card)
-            # Link do produto
-            link_element = card.find('a', href=True)
-            product_link = link_element['href'] if link_element else ""
-            if product_link and not product_link.startswith('http'):
-                product_link = self.base_url + product_link
-            # Imagem
-            img_element = card.find('img', class_='item-image')
-            image_url = img_element.get('src', '') if img_element else ""
-            # Desconto
-            discount_info = self._extract_discount_info(card)
-            # --- Lógica de normalização de marca ---
-            final_brand = brand
-            if name and search_term:
-                found_lab = self.product_unifier.find_best_match(
-                    product_name=name,
-                    product_brand=brand,
-                    product_description=description,
-                    search_term=search_term
-                )
-                found_lab_name = found_lab['laboratory'] if found_lab and found_lab.get('laboratory') else ""
-                if found_lab_name:
-                    final_brand = found_lab_name
-            # Capitalizar brand, exceto EMS
-            brand_value = final_brand
-            if isinstance(brand_value, str) and brand_value.strip():
-                if brand_value.strip().upper() == 'EMS':
-                    brand_value = 'EMS'
-                else:
-                    brand_value = ' '.join([w.capitalize() for w in brand_value.strip().split()])
-            product_data = {
-                'name': name,
-                'brand': brand_value,
-                'description': description,
+            # Nome, marca, descrição, preço, link e desconto em uma única passada pelo card
+            fields = CARD_EXTRACTOR.extract(card)
+            price_info = self._extract_price(fields)
+            discount_info = self._extract_discount_info(fields)
+            record = {
+                'name': text_of(fields['name']),
+                'brand': text_of(fields['brand']),
+                'description': text_of(fields['description']),
                 'price': price_info['current_price'],
                 'original_price': price_info['original_price'],
-                'discount_percentage': discount_info['percentage'],
-                'product_url': product_link,
-                'has_discount': discount_info['has_discount'],
-                'position': position
+                'discount_percentage': discount_info['percentage'] if discount_info['has_discount'] else None,
+                'url': fields['link']['href'] if fields['link'] is not None else None
             }
-            self.logger.info(f"[PanvelScraper] Produto final: {product_data}")
-            return product_data
+            return self._build_product(record, position, search_term)
         except Exception as e:
             self.logger.error(f"Erro ao extrair informações do produto: {e}")
             return None
 
-    def _extract_price(self, card):
-        """Extrai informações de preço do produto"""
-        try:
-            # Preço principal
-            price_span = card.find('span', class_='price')
-            if price_span:
-                price_text = price_span.get_text(strip=True)
-                price_match = re.search(r'R\$\s*([\d,.]+)', price_text)
-                if price_match:
-                    price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                    return {'current_price': price, 'original_price': price}
-            # Preço especial (ex: 2 por R$ X,XX cada)
-            special_price_span = card.find('span', class_='price special')
-            if special_price_span:
-                price_text = special_price_span.get_text(strip=True)
-                price_match = re.search(r'R\$\s*([\d,.]+)', price_text)
-                if price_match:
-                    price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                    return {'current_price': price, 'original_price': price}
-            return {'current_price': "Preço não disponível", 'original_price': "Preço não disponível"}
-        except Exception as e:
-            self.logger.error(f"Erro ao extrair preço: {e}")
-            return {'current_price': "Preço não disponível", 'original_price': "Preço não disponível"}
+    def _build_product(self, record, position=None, search_term=None):
+        """
+        Monta o produto a partir dos campos de um card (lidos pelo parser ou pelo script no navegador)
+        
+        Args:
+            record (dict): name, brand, description, price, original_price, discount_percentage e url
+            position (int, optional): Posição na busca
+            search_term (str, optional): Termo de busca
+            
+        Returns:
+            dict: Informações do produto
+        """
+        name = record.get('name') or "Nome não disponível"
+        brand = record.get('brand') or "Marca não disponível"
+        description = record.get('description') or ""
+        price, original_price = parse_brl_batch((record.get('price'), record.get('original_price')))
+        if original_price == MISSING:
+            original_price = price
+        price, original_price = price_field(price), price_field(original_price)
+        discount = record.get('discount_percentage')
+        product_link = record.get('url') or ""
+        if product_link and not product_link.startswith('http'):
+            product_link = self.base_url + product_link
+        # --- Lógica de normalização de marca ---
+        final_brand = brand
+        if name and search_term:
+            found_lab = self.product_unifier.find_best_match(
+                product_name=name,
+                product_brand=brand,
+                product_description=description,
+                search_term=search_term
+            )
+            found_lab_name = found_lab['laboratory'] if found_lab and found_lab.get('laboratory') else ""
+            if found_lab_name:
+                final_brand = found_lab_name
+        # Capitalizar brand, exceto EMS
+        brand_value = final_brand
+        if isinstance(brand_value, str) and brand_value.strip():
+            if brand_value.strip().upper() == 'EMS':
+                brand_value = 'EMS'
+            else:
+                brand_value = ' '.join([w.capitalize() for w in brand_value.strip().split()])
+        product_data = {
+            'name': name,
+            'brand': brand_value,
+            'description': description,
+            'price': price,
+            'original_price': original_price,
+            'discount_percentage': discount or 0,
+            'product_url': product_link,
+            'has_discount': bool(discount),
+            'position': position
+        }
+        self.logger.info(f"[PanvelScraper] Produto final: {product_data}")
+        return product_data
 
-    def _extract_discount_info(self, card):
-        """Extrai informações de desconto do produto"""
+    def _extract_price(self, fields):
+        """Extrai informações de preço dos elementos do card (CARD_EXTRACTOR)"""
+        # Preço principal e, sem ele, o preço especial (ex: 2 por R$ X,XX cada)
+        for field in ('price', 'special_price'):
+            centavos = parse_brl(text_of(fields[field]), require_symbol=True)
+            if centavos != MISSING:
+                price = to_reais(centavos)
+                return {'current_price': price, 'original_price': price}
+        return {'current_price': PRICE_UNAVAILABLE, 'original_price': PRICE_UNAVAILABLE}
+
+    def _extract_discount_info(self, fields):
+        """Extrai informações de desconto dos elementos do card (CARD_EXTRACTOR)"""
         try:
-            discount_span = card.find('span', class_='discount-percentage')
+            discount_span = fields['discount']
             if discount_span:
                 discount_text = discount_span.get_text(strip=True)
                 discount_match = re.search(r'(\d+)%', discount_text)
@@ -258,38 +290,14 @@ class PanvelScraper(BaseScraper):
             self.logger.error(f"Erro ao extrair desconto: {e}")
             return {'has_discount': False, 'percentage': 0}
 
-    def _extract_price_from_product_page(self, soup):
-        """Extrai preço da página do produto"""
-        try:
-            price_span = soup.find('span', class_='deal-price')
-            if price_span:
-                price_text = price_span.get_text(strip=True)
-                price_match = re.search(r'R\$\s*([\d,.]+)', price_text)
-                if price_match:
-                    price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                    return {'current_price': price, 'original_price': price}
-            original_price_span = soup.find('span', class_='original-price')
-            if original_price_span:
-                original_price_text = original_price_span.get_text(strip=True)
-                original_price_match = re.search(r'R\$\s*([\d,.]+)', original_price_text)
-                if original_price_match:
-                    original_price = float(original_price_match.group(1).replace('.', '').replace(',', '.'))
-                    return {'current_price': original_price, 'original_price': original_price}
-            return {'current_price': "Preço não disponível", 'original_price': "Preço não disponível"}
-        except Exception as e:
-            self.logger.error(f"Erro ao extrair preço da página do produto: {e}")
-            return {'current_price': "Preço não disponível", 'original_price': "Preço não disponível"}
-
-    def _extract_discount_info_from_product_page(self, soup):
-        """Extrai desconto da página do produto"""
-        try:
-            discount_span = soup.find('span', {'data-cy': 'product-discount'})
-            if discount_span:
-                discount_text = discount_span.get_text(strip=True)
-                discount_match = re.search(r'(\d+)%', discount_text)
-                if discount_match:
-                    return {'has_discount': True, 'percentage': int(discount_match.group(1))}
-            return {'has_discount': False, 'percentage': 0}
-        except Exception as e:
-            self.logger.error(f"Erro ao extrair desconto da página do produto: {e}")
-            return {'has_discount': False, 'percentage': 0} 
\ No newline at end of file
+    def _extract_details_from_product_page(self, soup):
+        """Extrai marca, preço e desconto da página do produto (PRODUCT_PAGE_SPEC)"""
+        fields = PRODUCT_PAGE_SPEC.extract(soup)
+        price = fields['price'] if fields['price'] is not None else PRICE_UNAVAILABLE
+        return {
+            'brand': fields['brand'],
+            'price': price,
+            'original_price': price,
+            'discount_percentage': fields['discount'],
+            'has_discount': fields['discount'] is not None
+        }
@@ -1,28 +1,138 @@
 import re
 import logging
-import time
 import datetime
-from .base_scraper import BaseScraper
-from urllib.parse import quote_plus
+import requests
+from .base_scraper import BaseScraper, FETCH_PATH_API
+from urllib.parse import quote, quote_plus
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from utils.product_unifier import ProductUnifier
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.readiness import ReadinessCondition
+from utils.transports import KIND_LISTING, KIND_API
+from utils.html_parsers import region_strainer
+from utils.card_extractor import CardExtractor, CardField, text_of
+from utils.selector_spec import FieldSpec, PageSpec
+from utils.money import MISSING, PARSE_BRL_JS, PRICE_UNAVAILABLE, parse_brl, parse_brl_batch, price_field, sort_by_price
 
 # Configuração básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger("SaoJoaoScraper")
 
+# Botão do banner de cookies
+COOKIE_BUTTON_XPATH = "//button[contains(translate(., 'ACEITAR', 'aceitar'), 'aceitar') or contains(., 'Aceitar') or contains(., 'OK') or contains(., 'Ok') or contains(., 'ok') or contains(., 'Concordo') or contains(., 'concordo')]"
+
+# Classes dos preços da vitrine (o valor vem dividido em parte inteira e centavos)
+LIST_PRICE_CLASS = 'sjdigital-custom-apps-7-x-listPriceValue'
+SELLING_PRICE_CLASS = 'sjdigital-custom-apps-7-x-sellingPriceValue'
+CURRENCY_INTEGER_CLASS = 'sjdigital-custom-apps-7-x-currencyInteger'
+CURRENCY_FRACTION_CLASS = 'sjdigital-custom-apps-7-x-currencyFraction'
+
+# Elementos de cada seção da galeria, localizados em uma única passada pela seção
+CARD_EXTRACTOR = CardExtractor([
+    CardField('name', 'span', classes=['vtex-product-summary-2-x-productBrand']),
+    CardField('link', 'a', classes=['vtex-product-summary-2-x-clearLink']),
+    CardField('prices', 'div', classes=['sjdigital-custom-apps-7-x-shelfPricesContainer']),
+    CardField('list_price', 'span', classes=[LIST_PRICE_CLASS], within='prices'),
+    CardField('list_integer', 'span', classes=[CURRENCY_INTEGER_CLASS], within='list_price'),
+    CardField('list_fraction', 'span', classes=[CURRENCY_FRACTION_CLASS], within='list_price'),
+    CardField('container_selling_price', 'span', classes=[SELLING_PRICE_CLASS], within='prices'),
+    CardField('selling_price', 'span', classes=[SELLING_PRICE_CLASS]),
+    CardField('selling_integer', 'span', classes=[CURRENCY_INTEGER_CLASS], within='selling_price'),
+    CardField('selling_fraction', 'span', classes=[CURRENCY_FRACTION_CLASS], within='selling_price'),
+    CardField('discount', 'span', classes=['vtex-product-price-1-x-savingsPercentage'])
+])
+
+# Marca e preços da página do produto, compilados em uma única passada pela página: os seletores de marca
+# são tentados em ordem (o primeiro elemento de cada um, como select_one) e, sem marca, vale o início do título
+PRODUCT_PAGE_SPEC = PageSpec([
+    FieldSpec('brand', [
+        "span.vtex-store-components-3-x-productBrandName",
+        ".vtex-store-components-3-x-productBrandName",
+        "span[class*='productBrandName']",
+        ".vtex-product-identifier-0-x-product-identifier__value",
+        "span[class*='brand']",
+        "span[class*='manufacturer']",
+        "div[class*='productBrandName']",
+        "div[class*='brand']",
+        "[class*='brand']",
+        "[class*='manufacturer']",
+        "[class*='productBrand']"
+    ], min_length=2, fallback=FieldSpec('title_brand', 'title', pattern=r'^([^-]+)', min_length=3)),
+    FieldSpec('selling_price', f'span.{SELLING_PRICE_CLASS}', transform='element'),
+    FieldSpec('list_price', f'span.{LIST_PRICE_CLASS}', transform='element')
+])
+
+# Campos das seções da galeria lidos no DOM da listagem, no navegador (mesmos seletores de _extract_product_info)
+LISTING_RECORDS_SCRIPT = PARSE_BRL_JS + r"""
+function priceValue(element) {
+    if (!element) return null;
+    var integer = element.querySelector('span.sjdigital-custom-apps-7-x-currencyInteger');
+    if (integer) {
+        var fraction = element.querySelector('span.sjdigital-custom-apps-7-x-currencyFraction');
+        var value = parseFloat(integer.textContent.replace(/\D/g, '') + '.' + (fraction ? fraction.textContent.trim() : '00'));
+        return isNaN(value) ? null : value;
+    }
+    return parseBrl(element.textContent);
+}
+var sections = document.querySelectorAll('.vtex-search-result-3-x-gallery section.vtex-product-summary-2-x-container');
+return Array.prototype.map.call(sections, function (section, index) {
+    var name = section.querySelector('span.vtex-product-summary-2-x-productBrand');
+    var link = section.querySelector('a.vtex-product-summary-2-x-clearLink');
+    var prices = section.querySelector('div.sjdigital-custom-apps-7-x-shelfPricesContainer');
+    var listPrice = prices ? prices.querySelector('span.sjdigital-custom-apps-7-x-listPriceValue') : null;
+    var current = priceValue(section.querySelector('span.sjdigital-custom-apps-7-x-sellingPriceValue'));
+    var discount = section.querySelector('span.vtex-product-price-1-x-savingsPercentage');
+    var percentage = discount ? discount.textContent.match(/(\d+)%/) : null;
+    return {
+        name: name ? name.textContent.trim() || null : null,
+        url: link ? link.getAttribute('href') : null,
+        price: current,
+        original_price: listPrice && current !== null ? priceValue(listPrice) : current,
+        discount_percentage: percentage ? parseInt(percentage[1], 10) : null,
+        position: index + 1
+    };
+});
+"""
+
+# Busca do catálogo VTEX (JSON com marca, preço de lista e preço de venda de cada produto)
+VTEX_SEARCH_PATH = "/api/catalog_system/pub/products/search"
+
 class SaoJoaoScraper(BaseScraper):
     """Scraper para o site São João usando Selenium"""
     
-    def __init__(self, driver=None):
+    # A loja VTEX depende do CSS para posicionar o banner de cookies e carregar a galeria sob demanda
+    BLOCKING_OVERRIDES = {'allow_resource_types': ['Stylesheet']}
+    
+    # A galeria VTEX é renderizada no cliente: navegação termina quando as seções de produto existem
+    PAGE_LOAD_STRATEGY = 'none'
+    
+    # A galeria VTEX é preenchida aos poucos; esperar os cards estabilizarem (até 30s em páginas lentas)
+    LISTING_READINESS = ReadinessCondition(
+        '.vtex-search-result-3-x-gallery section.vtex-product-summary-2-x-container', timeout=30
+    )
+    PRODUCT_READINESS = ReadinessCondition(
+        '.vtex-store-components-3-x-productBrandName, .sjdigital-custom-apps-7-x-sellingPriceValue',
+        timeout=8, stable_for=0.5
+    )
+    
+    # Apenas a galeria de produtos é montada pelo parser (a página VTEX traz megabytes de scripts e estado)
+    LISTING_PARSE_ONLY = region_strainer(('div', 'class', 'vtex-search-result-3-x-gallery'))
+    
+    # No navegador, as seções da galeria são lidas no próprio DOM e só os registros atravessam o WebDriver
+    LISTING_EXTRACT_SCRIPT = LISTING_RECORDS_SCRIPT
+    
+    # Busca pela API de catálogo da VTEX antes de abrir o navegador
+    API_SEARCH = True
+    
+    # Produtos por página da API (a VTEX limita a 50 por requisição)
+    API_PAGE_SIZE = 50
+    
+    def __init__(self, driver=None, **kwargs):
         super().__init__(
             base_url="https://www.saojoaofarmacias.com.br",
             search_url="https://www.saojoaofarmacias.com.br",
             pharmacy_name="São João",
-            driver=driver
+            driver=driver,
+            **kwargs
         )
         self.product_unifier = ProductUnifier()  # Instância única
 
@@ -31,16 +141,15 @@ class SaoJoaoScraper(BaseScraper):
         Busca medicamentos no site São João
         """
         try:
+            self.search_term = medicine_description
             url = self.create_search_url(medicine_description)
-            self.logger.info(f"Buscando URL: {url}")
-            response = self.make_request(url)
-            soup = self.parse_html(response)
-            products = self._extract_products(soup, medicine_description)
+            products = self._search_api(medicine_description) if self.API_SEARCH else None
+            if products is None:
+                self.logger.info(f"Buscando URL: {url}")
+                response = self.make_request(url)
+                products = self._extract_listing(response, medicine_description)
             self.logger.info(f"Produtos encontrados: {len(products)}")
-            products = sorted(
-                products,
-                key=lambda p: p['price'] if isinstance(p['price'], (int, float)) else float('inf')
-            )
+            products = sort_by_price(products)
             return self.format_response(products, url)
         except Exception as e:
             self.logger.error(f"Erro inesperado: {e}")
@@ -61,59 +170,163 @@ class SaoJoaoScraper(BaseScraper):
         search_query = quote_plus(medicine_description).replace('+', '%20')
         return f"{self.search_url}/{search_query}?_q={search_query}&map=ft"
     
-    def make_request(self, url, timeout=30):
-        """
-        Abre a URL no Selenium, aceita cookies se necessário e espera o carregamento do container de produtos.
+    def create_api_url(self, medicine_description):
         """
-        try:
-            # Verificar se o driver está inicializado
-            if not self.driver:
-                self.logger.info("Driver não inicializado, configurando...")
-                self._setup_driver()
+        Cria a URL da busca no catálogo VTEX
+        
+        Args:
+            medicine_description (str): Descrição do medicamento
             
-            self.driver.get(url)
-            self.logger.info(f"Página carregada: {url}")
+        Returns:
+            str: URL da API de busca
+        """
+        search_query = quote(medicine_description)
+        return f"{self.base_url}{VTEX_SEARCH_PATH}?ft={search_query}&_from=0&_to={self.API_PAGE_SIZE - 1}"
+    
+    def _search_api(self, medicine_description):
+        """
+        Busca os produtos na API de catálogo da VTEX, sem navegador
+        
+        Args:
+            medicine_description (str): Descrição do medicamento
             
-            # Tentar aceitar cookies se o botão existir
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (By.XPATH, "//button[contains(translate(., 'ACEITAR', 'aceitar'), 'aceitar') or contains(., 'Aceitar') or contains(., 'OK') or contains(., 'Ok') or contains(., 'ok') or contains(., 'Concordo') or contains(., 'concordo')]")
-                    )
-                ).click()
-                self.logger.info("Cookies aceitos")
-            except Exception:
-                self.logger.info("Nenhum popup de cookies encontrado")
+        Returns:
+            list: Produtos extraídos do JSON, ou None se a API falhar ou não retornar produtos
+        """
+        api_url = self.create_api_url(medicine_description)
+        self.logger.info(f"Buscando na API VTEX: {api_url}")
+        try:
+            response = self.fetch(api_url, KIND_API)
+            if not response.ok:
+                raise ValueError(f"status {response.status_code}")
+            items = response.json()
+        except (requests.RequestException, LookupError, ValueError) as e:
+            self.logger.info(f"API VTEX indisponível, usando o navegador: {e}")
+            return None
+        if not isinstance(items, list) or not items:
+            self.logger.info("API VTEX sem produtos, usando o navegador")
+            return None
+        self.fetch_path = FETCH_PATH_API
+        return self._extract_api_products(items, medicine_description)
+    
+    def _extract_api_products(self, items, search_term):
+        """
+        Extrai produtos do JSON da API de catálogo da VTEX
+        
+        Args:
+            items (list): Produtos retornados pela API
+            search_term (str): Termo de busca
             
-            # Espera até o container de produtos aparecer
+        Returns:
+            list: Lista de produtos extraídos
+        """
+        products = []
+        for idx, item in enumerate(items, 1):
             try:
-                WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "vtex-search-result-3-x-gallery"))
-                )
-                self.logger.info("Container de produtos encontrado")
+                product = self._extract_api_product_info(item, idx)
+                if product:
+                    products.append(product)
             except Exception as e:
-                self.logger.warning(f"Container de produtos não encontrado após {timeout}s: {e}")
-            
-            # Aguardar um pouco mais para garantir carregamento completo
-            time.sleep(3)
+                self.logger.error(f"Erro ao extrair produto da API: {e}")
+                continue
+        # Produtos sem oferta na API ainda podem ser completados pela página específica
+        products = self._enrich_products(products)
+        return self._filter_plus_products(products, search_term)
+    
+    def _extract_api_product_info(self, item, position=None):
+        """
+        Extrai informações de um produto do JSON da VTEX
+        
+        Args:
+            item (dict): Produto retornado pela API
+            position (int, optional): Posição na busca
             
-            page_source = self.driver.page_source
-            self.logger.info(f"HTML obtido com {len(page_source)} caracteres")
-            return page_source
+        Returns:
+            dict: Informações do produto
+        """
+        name = (item.get('productName') or '').strip() or "Nome não disponível"
+        product_link = item.get('link') or ''
+        if not product_link and item.get('linkText'):
+            product_link = f"{self.base_url}/{item['linkText']}/p"
+        description = ""
+        desc_match = re.search(r'(\d+mg?\s+\d+\s+\w+)', name)
+        if desc_match:
+            description = desc_match.group(1)
+        offer = self._api_commercial_offer(item)
+        price, list_price = parse_brl_batch((offer.get('Price'), offer.get('ListPrice')))
+        # Produto indisponível: a VTEX retorna preço zerado
+        if price <= 0:
+            price = list_price = MISSING
+        has_discount = list_price > price
+        current_price = price_field(price)
+        original_price = price_field(max(list_price, price))
+        brand = self.format_brand(item.get('brand') or '') or "Marca não disponível"
+        return {
+            'name': name,
+            'brand': brand,
+            'description': description,
+            'price': current_price,
+            'original_price': original_price,
+            'discount_percentage': round((1 - price / list_price) * 100) if has_discount else 0,
+            'product_url': product_link,
+            'has_discount': has_discount,
+            'position': position
+        }
+    
+    def _api_commercial_offer(self, item):
+        """Retorna a oferta do vendedor padrão do primeiro SKU do produto"""
+        for sku in item.get('items') or []:
+            sellers = sku.get('sellers') or []
+            seller = next((s for s in sellers if s.get('sellerDefault')), sellers[0] if sellers else None)
+            if seller and seller.get('commertialOffer'):
+                return seller['commertialOffer']
+        return {}
+    
+    def make_request(self, url, timeout=30):
+        """
+        Obtém a listagem pela cadeia de transportes (no Selenium, aceita cookies se necessário
+        e espera o carregamento do container de produtos).
+        """
+        try:
+            response = self.fetch(url, KIND_LISTING)
+            self.fetch_path = response.transport
+            if response.records is not None:
+                self.logger.info(f"Registros extraídos no navegador: {len(response.records)}")
+            else:
+                self.logger.info(f"HTML obtido com {len(response.content)} caracteres")
+            return response.to_dict()
             
         except Exception as e:
             self.logger.error(f"Erro no make_request: {e}")
             # Retornar HTML vazio em caso de erro
-            return "<html><body></body></html>"
+            return {'content': "<html><body></body></html>", 'status_code': None, 'url': url, 'records': None}
+    
+    def _while_waiting(self, driver):
+        """Aceita cookies assim que o botão aparecer, sem bloquear a espera da página"""
+        if self._session_is_warm():
+            # Cookies de consentimento já injetados: o banner não aparece
+            return True
+        for button in driver.find_elements(By.XPATH, COOKIE_BUTTON_XPATH):
+            if button.is_displayed() and button.is_enabled():
+                button.click()
+                self._session_changed = True
+                self.logger.info("Cookies aceitos; estado de sessão será salvo")
+                return True
+        return False
     
     def _extract_products(self, soup, search_term):
         """
         Extrai produtos do HTML parseado
         """
+        return self._finish_products(self._extract_listing_products(soup, search_term), search_term)
+
+    def _extract_listing_products(self, soup, search_term):
+        """
+        Extrai os produtos das seções da galeria, sem completar pelas páginas de produto
+        """
         products_container = soup.find('div', class_='vtex-search-result-3-x-gallery')
         if not products_container:
             self.logger.warning("Container de produtos não encontrado no HTML.")
-            self.logger.debug(f"HTML da página (primeiros 1000 chars):\n{str(soup)[:1000]}")
             return []
         products = []
         product_sections = products_container.find_all('section', class_='vtex-product-summary-2-x-container')
@@ -126,152 +339,35 @@ class SaoJoaoScraper(BaseScraper):
             except Exception as e:
                 self.logger.error(f"Erro ao extrair produto: {e}")
                 continue
-        # Paralelizar busca de marca nas páginas específicas
-        def fetch_brand_and_price_with_own_driver(product):
-            product_url = product.get('product_url')
-            reason_open = []
-            if product.get('brand') in [None, '', 'Marca não disponível']:
-                reason_open.append('marca')
-            if product.get('price') == 'Preço não disponível' or product.get('original_price') == 'Preço não disponível':
-                reason_open.append('preço')
-            if not product_url:
-                return (product_url, product.get('brand'), product.get('price'), product.get('original_price'))
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            import platform
-            import os
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--window-size=1920,1080")
-            CHROMEDRIVER_DIR = os.path.join(os.getcwd(), "chromedriver_bin")
-            chromedriver_path = os.path.join(CHROMEDRIVER_DIR, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-            if not os.path.exists(chromedriver_path):
-                chromedriver_path_alt = os.path.join(CHROMEDRIVER_DIR, "chromedriver-win64", "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
-                if os.path.exists(chromedriver_path_alt):
-                    chromedriver_path = chromedriver_path_alt
-            service = Service(chromedriver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+        return products
+
+    def _extract_products_from_records(self, records, search_term):
+        """
+        Monta os produtos a partir dos registros extraídos no navegador (LISTING_EXTRACT_SCRIPT)
+        """
+        products = []
+        for idx, record in enumerate(records, 1):
             try:
-                import time
-                driver.get(product_url)
-                time.sleep(2)
-                # Tentar aceitar cookies se o botão existir
-                try:
-                    from selenium.webdriver.common.by import By
-                    from selenium.webdriver.support.ui import WebDriverWait
-                    from selenium.webdriver.support import expected_conditions as EC
-                    WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable(
-                            (By.XPATH, "//button[contains(translate(., 'ACEITAR', 'aceitar'), 'aceitar') or contains(., 'Aceitar') or contains(., 'OK') or contains(., 'Ok') or contains(., 'ok') or contains(., 'Concordo') or contains(., 'concordo')]")
-                        )
-                    ).click()
-                except Exception:
-                    pass
-                time.sleep(1)
-                # Buscar marca
-                brand = None
-                try:
-                    brand_selectors = [
-                        "span.vtex-store-components-3-x-productBrandName",
-                        ".vtex-store-components-3-x-productBrandName",
-                        "span[class*='productBrandName']",
-                        ".vtex-product-identifier-0-x-product-identifier__value",
-                        "span[class*='brand']",
-                        ".vtex-product-identifier-0-x-product-identifier__value",
-                        "span[class*='manufacturer']",
-                        ".vtex-product-identifier-0-x-product-identifier__value",
-                        "[class*='brand']",
-                        "[class*='manufacturer']",
-                        "[class*='productBrand']"
-                    ]
-                    for selector in brand_selectors:
-                        try:
-                            brand_element = driver.find_element(By.CSS_SELECTOR, selector)
-                            brand_text = brand_element.text.strip()
-                            if brand_text and len(brand_text) > 1:
-                                brand = brand_text
-                                break
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-                # Se não encontrar, tentar extrair do título
-                if not brand:
-                    try:
-                        page_title = driver.title
-                        if page_title:
-                            import re
-                            brand_match = re.search(r'^([^-]+)', page_title)
-                            if brand_match:
-                                brand_text = brand_match.group(1).strip()
-                                if brand_text and len(brand_text) > 2:
-                                    brand = brand_text
-                    except Exception:
-                        pass
-                if not brand:
-                    brand = "Marca não disponível"
-                # Buscar preço
-                price = product.get('price', 'Preço não disponível')
-                original_price = product.get('original_price', 'Preço não disponível')
-                try:
-                    # Preço atual
-                    price_span = driver.find_element(By.CSS_SELECTOR, 'span.sjdigital-custom-apps-7-x-sellingPriceValue')
-                    price_text = price_span.text.strip()
-                    price_match = re.search(r'R\$[\s]*([\d,.]+)', price_text)
-                    if price_match:
-                        price = float(price_match.group(1).replace('.', '').replace(',', '.'))
-                        original_price = price
-                except Exception:
-                    pass
-                try:
-                    # Preço original
-                    list_price_span = driver.find_element(By.CSS_SELECTOR, 'span.sjdigital-custom-apps-7-x-listPriceValue')
-                    list_price_text = list_price_span.text.strip()
-                    list_price_match = re.search(r'R\$[\s]*([\d,.]+)', list_price_text)
-                    if list_price_match:
-                        original_price = float(list_price_match.group(1).replace('.', '').replace(',', '.'))
-                except Exception:
-                    pass
-                now = datetime.datetime.now().strftime('%H:%M:%S')
-                logger.info(f"[SaoJoaoScraper] [{now}] Abrindo página do produto para buscar: {', '.join(reason_open)} | URL: {product_url}")
-                now2 = datetime.datetime.now().strftime('%H:%M:%S')
-                logger.info(f"[SaoJoaoScraper] [{now2}] Resultado da extração na página do produto: marca='{brand}', preço={price}, original_price={original_price}")
-                return (product_url, brand, price, original_price)
-            finally:
-                driver.quit()
-        # Coletar produtos que precisam buscar marca ou preço
-        products_to_update = [p for p in products if (p.get('brand') in [None, '', 'Marca não disponível'] or p.get('price') == 'Preço não disponível' or p.get('original_price') == 'Preço não disponível') and p.get('product_url')]
-        if products_to_update:
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_url = {executor.submit(fetch_brand_and_price_with_own_driver, p): p for p in products_to_update}
-                url_to_data = {}
-                for future in as_completed(future_to_url):
-                    url, brand, price, original_price = future.result()
-                    # Capitalizar brand, exceto EMS
-                    if isinstance(brand, str) and brand.strip():
-                        if brand.strip().upper() == 'EMS':
-                            brand = 'EMS'
-                        else:
-                            brand = ' '.join([w.capitalize() for w in brand.strip().split()])
-                    url_to_data[url] = (brand, price, original_price)
-                # Atualizar produtos
-                for p in products:
-                    if p.get('product_url') in url_to_data:
-                        brand, price, original_price = url_to_data[p['product_url']]
-                        p['brand'] = brand
-                        p['price'] = price
-                        p['original_price'] = original_price
-                        # Garantir que brand nunca seja string vazia
-                        if not p['brand'] or not str(p['brand']).strip():
-                            p['brand'] = "Marca não disponível"
-        # Filtrar produtos com '+' no nome que não correspondem ao termo de busca (com log e normalização)
+                product = self._build_product(record, record.get('position') or idx, search_term)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                self.logger.error(f"Erro ao montar produto extraído no navegador: {e}")
+                continue
+        return self._finish_products(products, search_term)
+
+    def _finish_products(self, products, search_term):
+        """
+        Completa os produtos pelas páginas específicas e aplica o filtro '+'
+        """
+        # Completar marca/preço abrindo as páginas específicas no backend compartilhado
+        products = self._enrich_products(products)
+        return self._filter_plus_products(products, search_term)
+
+    def _filter_plus_products(self, products, search_term):
+        """
+        Filtra produtos com '+' no nome que não correspondem ao termo de busca (com log e normalização)
+        """
         import unicodedata
         def normalize(text):
             return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII').lower()
@@ -295,95 +391,110 @@ class SaoJoaoScraper(BaseScraper):
         Extrai informações de um produto do HTML
         """
         try:
-            # Nome do produto
-            name_element = section.find('span', class_='vtex-product-summary-2-x-productBrand')
-            name = name_element.get_text(strip=True) if name_element else "Nome não disponível"
-            # Link do produto
-            product_link = ""
-            link_element = section.find('a', class_='vtex-product-summary-2-x-clearLink')
-            if link_element:
-                product_link = self.base_url + link_element.get('href', '')
-            # Descrição/Quantidade - extrair do nome
-            description = ""
-            if name:
-                desc_match = re.search(r'(\d+mg?\s+\d+\s+\w+)', name)
-                if desc_match:
-                    description = desc_match.group(1)
-            # Preço
-            price_info = self._extract_price(section)
-            # Imagem do produto
-            img_element = section.find('img', class_='vtex-product-summary-2-x-image')
-            image_url = img_element.get('src', '') if img_element else ""
-            # Verificar se há desconto
-            discount_info = self._extract_discount_info(section)
-            # --- Lógica de busca da marca ---
-            brand = None
-            
-            # Primeiro, tentar usar o ProductUnifier
-            if name and search_term:
-                found_lab = self.product_unifier.find_best_match(
-                    product_name=name,
-                    product_brand="",
-                    product_description=description,
-                    search_term=search_term
-                )
-                if found_lab and found_lab.get('laboratory'):
-                    brand = found_lab['laboratory']
-            
-            # Se não encontrou com ProductUnifier, buscar na página específica
-            if not brand and product_link:
-                brand = self._extract_brand_from_product_page(product_link)
-            
-            # Se ainda não encontrou, usar "Marca não disponível"
-            if not brand:
-                brand = "Marca não disponível"
-            product_data = {
-                'name': name,
-                'brand': brand,
-                'description': description,
+            # Nome, link, preços e desconto em uma única passada pela seção
+            fields = CARD_EXTRACTOR.extract(section)
+            price_info = self._extract_price(fields)
+            discount_info = self._extract_discount_info(fields)
+            record = {
+                'name': text_of(fields['name']),
+                'url': fields['link'].get('href', '') if fields['link'] is not None else None,
                 'price': price_info['current_price'],
                 'original_price': price_info['original_price'],
-                'discount_percentage': discount_info['percentage'],
-                'product_url': product_link,
-                'has_discount': discount_info['has_discount'],
-                'position': position
+                'discount_percentage': discount_info['percentage'] if discount_info['has_discount'] else None
             }
-            # Capitalizar brand, exceto EMS
-            brand_value = product_data.get('brand', '')
-            if isinstance(brand_value, str) and brand_value.strip():
-                if brand_value.strip().upper() == 'EMS':
-                    brand_value = 'EMS'
-                else:
-                    brand_value = ' '.join([w.capitalize() for w in brand_value.strip().split()])
-            product_data['brand'] = brand_value
-
-            # Logar valor final de brand
-            self.logger.info(f"[DEBUG] Valor final de brand para '{name}': '{product_data['brand']}'")
-
-            # Garantir que brand nunca seja string vazia
-            if not product_data['brand'] or not str(product_data['brand']).strip():
-                product_data['brand'] = "Marca não disponível"
-
-            return product_data
+            return self._build_product(record, position, search_term)
         except Exception as e:
             self.logger.error(f"Erro ao extrair informações do produto: {e}")
             return None
+
+    def _build_product(self, record, position=None, search_term=None):
+        """
+        Monta o produto a partir dos campos de uma seção (lidos pelo parser ou pelo script no navegador)
+        
+        Args:
+            record (dict): name, url, price, original_price e discount_percentage
+            position (int, optional): Posição na busca
+            search_term (str, optional): Termo de busca
+            
+        Returns:
+            dict: Informações do produto
+        """
+        name = record.get('name') or "Nome não disponível"
+        product_link = self.base_url + record['url'] if record.get('url') is not None else ""
+        # Descrição/Quantidade - extrair do nome
+        description = ""
+        desc_match = re.search(r'(\d+mg?\s+\d+\s+\w+)', name)
+        if desc_match:
+            description = desc_match.group(1)
+        price, original_price = parse_brl_batch((record.get('price'), record.get('original_price')))
+        if original_price == MISSING:
+            original_price = price
+        price, original_price = price_field(price), price_field(original_price)
+        discount = record.get('discount_percentage')
+        # --- Lógica de busca da marca ---
+        brand = None
+        
+        # Primeiro, tentar usar o ProductUnifier
+        if name and search_term:
+            found_lab = self.product_unifier.find_best_match(
+                product_name=name,
+                product_brand="",
+                product_description=description,
+                search_term=search_term
+            )
+            if found_lab and found_lab.get('laboratory'):
+                brand = found_lab['laboratory']
+        
+        # Se não encontrou com ProductUnifier, a marca é buscada depois na página
+        # específica, em paralelo, pelo backend compartilhado (_enrich_products)
+        
+        # Se ainda não encontrou, usar "Marca não disponível"
+        if not brand:
+            brand = "Marca não disponível"
+        product_data = {
+            'name': name,
+            'brand': brand,
+            'description': description,
+            'price': price,
+            'original_price': original_price,
+            'discount_percentage': discount or 0,
+            'product_url': product_link,
+            'has_discount': bool(discount),
+            'position': position
+        }
+        # Capitalizar brand, exceto EMS
+        brand_value = product_data.get('brand', '')
+        if isinstance(brand_value, str) and brand_value.strip():
+            if brand_value.strip().upper() == 'EMS':
+                brand_value = 'EMS'
+            else:
+                brand_value = ' '.join([w.capitalize() for w in brand_value.strip().split()])
+        product_data['brand'] = brand_value
+
+        # Logar valor final de brand
+        self.logger.info(f"[DEBUG] Valor final de brand para '{name}': '{product_data['brand']}'")
+
+        # Garantir que brand nunca seja string vazia
+        if not product_data['brand'] or not str(product_data['brand']).strip():
+            product_data['brand'] = "Marca não disponível"
+
+        return product_data
     
-    def _extract_price(self, section):
-        """Extrai informações de preço do produto"""
+    def _extract_price(self, fields):
+        """Extrai informações de preço dos elementos da seção (CARD_EXTRACTOR)"""
         try:
             # Verificar se há desconto (preço com desconto)
-            discount_price_container = section.find('div', class_='sjdigital-custom-apps-7-x-shelfPricesContainer')
-            
-            if discount_price_container:
-                # Verificar se há preço de lista (original)
-                list_price_elem = discount_price_container.find('span', class_='sjdigital-custom-apps-7-x-listPriceValue')
-                selling_price_elem = discount_price_container.find('span', class_='sjdigital-custom-apps-7-x-sellingPriceValue')
+            if fields['prices'] is not None:
+                # Preço de lista (original) e de venda dentro do container de preços
+                list_price_elem = fields['list_price']
+                selling_price_elem = fields['container_selling_price']
                 
                 if list_price_elem and selling_price_elem:
                     # Produto com desconto
-                    original_price = self._extract_price_value(list_price_elem)
-                    current_price = self._extract_price_value(selling_price_elem)
+                    original_price = self._extract_price_value(
+                        list_price_elem, (fields['list_integer'], fields['list_fraction'])
+                    )
+                    current_price = self._extract_selling_price(fields, selling_price_elem)
                     
                     return {
                         'current_price': current_price,
@@ -391,17 +502,16 @@ class SaoJoaoScraper(BaseScraper):
                     }
                 elif selling_price_elem:
                     # Produto sem desconto
-                    price = self._extract_price_value(selling_price_elem)
+                    price = self._extract_selling_price(fields, selling_price_elem)
                     
                     return {
                         'current_price': price,
                         'original_price': price
                     }
             
-            # Fallback: procurar por qualquer elemento de preço
-            price_elem = section.find('span', class_='sjdigital-custom-apps-7-x-sellingPriceValue')
-            if price_elem:
-                price = self._extract_price_value(price_elem)
+            # Fallback: qualquer elemento de preço da seção
+            if fields['selling_price'] is not None:
+                price = self._extract_selling_price(fields, fields['selling_price'])
                 return {
                     'current_price': price,
                     'original_price': price
@@ -411,181 +521,94 @@ class SaoJoaoScraper(BaseScraper):
             self.logger.error(f"Erro ao extrair preço: {e}")
             
         return {
-            'current_price': "Preço não disponível",
-            'original_price': "Preço não disponível"
+            'current_price': PRICE_UNAVAILABLE,
+            'original_price': PRICE_UNAVAILABLE
         }
     
-    def _extract_price_value(self, price_element):
-        """Extrai o valor do preço de um elemento"""
+    def _extract_selling_price(self, fields, price_element):
+        """Valor do preço de venda, usando as partes já localizadas quando são do mesmo elemento"""
+        if price_element is fields['selling_price']:
+            return self._extract_price_value(price_element, (fields['selling_integer'], fields['selling_fraction']))
+        return self._extract_price_value(price_element)
+    
+    def _extract_price_value(self, price_element, parts=None):
+        """
+        Extrai o valor do preço de um elemento
+        
+        Args:
+            price_element: Elemento do preço
+            parts (tuple, optional): Elementos (currencyInteger, currencyFraction) já localizados
+                pelo CARD_EXTRACTOR; sem eles, são procurados no elemento
+                
+        Returns:
+            float: Preço em reais, ou "Preço não disponível"
+        """
         if not price_element:
-            return "Preço não disponível"
+            return PRICE_UNAVAILABLE
         
         # Para o São João, o preço está dividido em partes
-        currency_code = price_element.find('span', class_='sjdigital-custom-apps-7-x-currencyCode')
-        currency_integer = price_element.find('span', class_='sjdigital-custom-apps-7-x-currencyInteger')
-        currency_decimal = price_element.find('span', class_='sjdigital-custom-apps-7-x-currencyDecimal')
-        currency_fraction = price_element.find('span', class_='sjdigital-custom-apps-7-x-currencyFraction')
+        if parts is None:
+            parts = (
+                price_element.find('span', class_=CURRENCY_INTEGER_CLASS),
+                price_element.find('span', class_=CURRENCY_FRACTION_CLASS)
+            )
+        currency_integer, currency_fraction = parts
         
         if currency_integer:
             integer_part = currency_integer.get_text(strip=True)
             decimal_part = currency_fraction.get_text(strip=True) if currency_fraction else "00"
-            
-            try:
-                price_str = f"{integer_part}.{decimal_part}"
-                return float(price_str)
-            except ValueError:
-                return f"R$ {integer_part},{decimal_part}"
-        
-        # Fallback: tentar extrair do texto completo
-        price_text = price_element.get_text(strip=True)
-        price_match = re.search(r'R\$\s*([\d,]+)', price_text)
-        if price_match:
-            price_str = price_match.group(1).replace(',', '.')
-            try:
-                return float(price_str)
-            except ValueError:
-                return price_text
-        return price_text
-    
-    def _extract_brand_from_product_page(self, product_url):
-        """
-        Extrai a marca correta da página do produto
-        """
-        if not product_url:
-            return "Marca não disponível"
-        tried_restart = False
-        while True:
-            try:
-                self.logger.info(f"Acessando página do produto: {product_url}")
-                self.driver.get(product_url)
-                time.sleep(2)
-                try:
-                    WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable(
-                            (By.XPATH, "//button[contains(translate(., 'ACEITAR', 'aceitar'), 'aceitar') or contains(., 'Aceitar') or contains(., 'OK') or contains(., 'Ok') or contains(., 'ok') or contains(., 'Concordo') or contains(., 'concordo')]")
-                        )
-                    ).click()
-                    self.logger.info("Cookies aceitos na página do produto")
-                except Exception:
-                    pass
-                time.sleep(1)
-                brand = self._find_brand_in_page()
-                if brand and brand != "Marca não disponível":
-                    self.logger.info(f"Marca encontrada: {brand}")
-                    return brand
-                else:
-                    self.logger.warning("Marca não encontrada na página do produto")
-                    return "Marca não disponível"
-            except Exception as e:
-                error_msg = str(e)
-                self.logger.error(f"Erro ao acessar página do produto: {e}")
-                if (not tried_restart) and ('invalid session id' in error_msg.lower()):
-                    from app import cleanup_global_driver, setup_global_driver, get_global_driver
-                    cleanup_global_driver()
-                    setup_global_driver()
-                    self.driver = get_global_driver()
-                    tried_restart = True
-                    continue
-                return "Marca não disponível"
+            centavos = parse_brl(f"R$ {integer_part},{decimal_part}", require_symbol=True)
+        else:
+            # Fallback: extrair do texto completo
+            centavos = parse_brl(price_element.get_text(strip=True), require_symbol=True)
+        return price_field(centavos)
     
-    def _find_brand_in_page(self):
+    def _extract_details_from_product_page(self, soup):
+        """Extrai marca e preços da página do produto (PRODUCT_PAGE_SPEC)"""
+        fields = PRODUCT_PAGE_SPEC.extract(soup)
+        brand = self._brand_from_fields(fields)
+        price = None
+        original_price = None
+        if fields['selling_price']:
+            price = self._extract_price_value(fields['selling_price'])
+            original_price = price
+        if fields['list_price']:
+            original_price = self._extract_price_value(fields['list_price'])
+        return {
+            'brand': brand,
+            'price': price,
+            'original_price': original_price
+        }
+
+    def _find_brand_in_soup(self, soup):
         """
-        Procura pela marca na página do produto usando diferentes seletores
+        Procura pela marca no HTML da página do produto (seletores de PRODUCT_PAGE_SPEC)
         
+        Args:
+            soup (BeautifulSoup): HTML parseado da página do produto
+            
         Returns:
             str: Nome da marca encontrada ou "Marca não disponível"
         """
         try:
-            # Lista de seletores para tentar encontrar a marca
-            brand_selectors = [
-                "span.vtex-store-components-3-x-productBrandName",
-                ".vtex-store-components-3-x-productBrandName",
-                "span[class*='productBrandName']",
-                ".vtex-product-identifier-0-x-product-identifier__value",
-                "span[class*='brand']",
-                ".vtex-product-identifier-0-x-product-identifier__value",
-                "span[class*='manufacturer']",
-                ".vtex-product-identifier-0-x-product-identifier__value",
-                # Adicionar mais seletores genéricos
-                "[class*='brand']",
-                "[class*='manufacturer']",
-                "[class*='productBrand']"
-            ]
-            
-            for selector in brand_selectors:
-                try:
-                    brand_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    brand_text = brand_element.text.strip()
-                    if brand_text and len(brand_text) > 1:
-                        self.logger.info(f"Marca encontrada com seletor '{selector}': {brand_text}")
-                        return brand_text
-                except Exception as e:
-                    self.logger.debug(f"Seletor '{selector}' não encontrado: {e}")
-                    continue
-            
-            # Tentar com XPath também
-            xpath_selectors = [
-                "//span[contains(@class, 'productBrandName')]",
-                "//span[contains(@class, 'brand')]",
-                "//span[contains(@class, 'manufacturer')]",
-                "//div[contains(@class, 'productBrandName')]",
-                "//div[contains(@class, 'brand')]",
-                "//*[contains(@class, 'brand')]",
-                "//*[contains(@class, 'manufacturer')]"
-            ]
-            
-            for xpath in xpath_selectors:
-                try:
-                    brand_element = self.driver.find_element(By.XPATH, xpath)
-                    brand_text = brand_element.text.strip()
-                    if brand_text and len(brand_text) > 1:
-                        self.logger.info(f"Marca encontrada com XPath '{xpath}': {brand_text}")
-                        return brand_text
-                except Exception as e:
-                    self.logger.debug(f"XPath '{xpath}' não encontrado: {e}")
-                    continue
-            
-            # Se não encontrar com seletores específicos, tentar extrair do título da página
-            try:
-                page_title = self.driver.title
-                if page_title:
-                    # Tentar extrair marca do título
-                    brand_match = re.search(r'^([^-]+)', page_title)
-                    if brand_match:
-                        brand_text = brand_match.group(1).strip()
-                        if brand_text and len(brand_text) > 2:
-                            self.logger.info(f"Marca extraída do título: {brand_text}")
-                            return brand_text
-            except Exception as e:
-                self.logger.debug(f"Erro ao extrair marca do título: {e}")
-            
-            # Tentar extrair do URL da página
-            try:
-                current_url = self.driver.current_url
-                if current_url:
-                    # Tentar extrair marca do URL
-                    url_parts = current_url.split('/')
-                    for part in url_parts:
-                        if part and len(part) > 2 and not part.startswith('http'):
-                            # Verificar se parece ser uma marca
-                            if not any(char.isdigit() for char in part) and part not in ['www', 'com', 'br', 'farmacias']:
-                                self.logger.info(f"Marca extraída do URL: {part}")
-                                return part
-            except Exception as e:
-                self.logger.debug(f"Erro ao extrair marca do URL: {e}")
-            
-            self.logger.warning("Nenhuma marca encontrada na página do produto")
-            return "Marca não disponível"
-            
+            return self._brand_from_fields(PRODUCT_PAGE_SPEC.extract(soup))
         except Exception as e:
             self.logger.error(f"Erro ao procurar marca na página: {e}")
             return "Marca não disponível"
     
-    def _extract_discount_info(self, section):
-        """Extrai informações de desconto do produto"""
+    def _brand_from_fields(self, fields):
+        """Marca extraída pela especificação da página, ou 'Marca não disponível'"""
+        if fields['brand']:
+            self.logger.info(f"Marca encontrada na página do produto: {fields['brand']}")
+            return fields['brand']
+        self.logger.warning("Nenhuma marca encontrada na página do produto")
+        return "Marca não disponível"
+    
+    def _extract_discount_info(self, fields):
+        """Extrai informações de desconto dos elementos da seção (CARD_EXTRACTOR)"""
         try:
             # Verificar se há tag de desconto
-            discount_tag = section.find('span', class_='vtex-product-price-1-x-savingsPercentage')
+            discount_tag = fields['discount']
             
             if discount_tag:
                 discount_text = discount_tag.get_text(strip=True)
@@ -0,0 +1,118 @@
+import unittest
+import threading
+import time
+from unittest.mock import MagicMock
+from utils.driver_pool import DriverPool
+from utils.browser_backend import BrowserBackend
+from scrapers.panvel import PanvelScraper
+
+PANVEL_PRODUCT_PAGE = """
+<html><body>
+  <span class="brand-name">neo quimica</span>
+  <span class="deal-price">R$ 12,90</span>
+  <span data-cy="product-discount">15% OFF</span>
+</body></html>
+"""
+
+class ConcurrencyTracker:
+    """Registra o número máximo de páginas abertas ao mesmo tempo"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.maximum = 0
+
+    def make_driver(self):
+        driver = MagicMock()
+        driver.window_handles = ['main']
+        driver.page_source = '<html></html>'
+
+        def get(url):
+            if url == 'about:blank':
+                return
+            with self.lock:
+                self.current += 1
+                self.maximum = max(self.maximum, self.current)
+            time.sleep(0.02)
+            with self.lock:
+                self.current -= 1
+
+        driver.get.side_effect = get
+        return driver
+
+class TestBrowserBackend(unittest.TestCase):
+    """Testes para o BrowserBackend"""
+
+    def test_global_page_cap(self):
+        """Testa se o backend respeita o limite global de páginas simultâneas"""
+        tracker = ConcurrencyTracker()
+        pool = DriverPool(tracker.make_driver, max_size=10)
+        backend = BrowserBackend(pool, max_concurrent_pages=2)
+
+        threads = [threading.Thread(target=backend.fetch_page, args=(f'http://x/{i}',)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(tracker.maximum, 2)
+        stats = backend.get_stats()
+        self.assertEqual(stats['pages_fetched'], 8)
+        self.assertLessEqual(stats['pool']['created'], 2)
+        backend.close()
+
+    def test_errors_are_counted(self):
+        """Testa se erros de navegação são contabilizados e propagados"""
+        driver = MagicMock()
+        driver.get.side_effect = Exception('invalid session id')
+        backend = BrowserBackend(DriverPool(lambda: driver, max_size=1), max_concurrent_pages=1)
+
+        with self.assertRaises(Exception):
+            backend.fetch_page('http://x/')
+        self.assertEqual(backend.get_stats()['errors'], 1)
+        self.assertEqual(backend.get_stats()['in_flight'], 0)
+
+class TestScraperEnrichment(unittest.TestCase):
+    """Testes do enriquecimento de produtos pelo backend compartilhado"""
+
+    def test_enrich_products_merges_page_details(self):
+        """Testa se marca, preço e desconto da página são aplicados ao produto"""
+        backend = MagicMock()
+        backend.max_concurrent_pages = 4
+        backend.fetch_page.return_value = PANVEL_PRODUCT_PAGE
+        scraper = PanvelScraper(browser_backend=backend)
+        products = [
+            {'name': 'Dipirona', 'brand': 'Marca não disponível', 'price': 'Preço não disponível',
+             'original_price': 'Preço não disponível', 'discount_percentage': 0, 'has_discount': False,
+             'product_url': 'https://www.panvel.com/panvel/dipirona/p-1'},
+            {'name': 'Paracetamol', 'brand': 'EMS', 'price': 9.5, 'original_price': 9.5,
+             'discount_percentage': 0, 'has_discount': False,
+             'product_url': 'https://www.panvel.com/panvel/paracetamol/p-2'}
+        ]
+
+        scraper._enrich_products(products)
+
+        backend.fetch_page.assert_called_once()
+        self.assertEqual(products[0]['brand'], 'Neo Quimica')
+        self.assertEqual(products[0]['price'], 12.9)
+        self.assertEqual(products[0]['discount_percentage'], 15)
+        self.assertTrue(products[0]['has_discount'])
+        self.assertEqual(products[1]['price'], 9.5)
+
+    def test_failed_page_keeps_listing_data(self):
+        """Testa se uma falha na página do produto mantém os dados da listagem"""
+        backend = MagicMock()
+        backend.max_concurrent_pages = 4
+        backend.fetch_page.side_effect = Exception('timeout')
+        scraper = PanvelScraper(browser_backend=backend)
+        products = [{'name': 'Dipirona', 'brand': '', 'price': 5.0, 'original_price': 5.0,
+                     'product_url': 'https://www.panvel.com/panvel/dipirona/p-1', '_pending_brand': True}]
+
+        scraper._enrich_products(products)
+
+        self.assertEqual(products[0]['brand'], 'Marca não disponível')
+        self.assertEqual(products[0]['price'], 5.0)
+        self.assertNotIn('_pending_brand', products[0])
+
+if __name__ == '__main__':
+    unittest.main()
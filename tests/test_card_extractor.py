@@ -0,0 +1,71 @@
+import unittest
+from bs4 import BeautifulSoup
+from scrapers.droga_raia import DrogaRaiaScraper
+from utils.card_extractor import CardExtractor, CardField, text_of
+
+CARD_HTML = """
+<article class="vertical">
+  <span class="price old">R$ 1,00</span>
+  <div data-testid="price-discount">
+    <div class="sc-1 bZuLpF">R$ 12,90</div>
+    <div class="sc-2 hsAtyD">R$ 9,90</div>
+  </div>
+  <h2 class="sc-3 eGzxuI"><a href="/dipirona-1g.html">Dipirona 1g</a></h2>
+  <a class="sc-4 fibMCW">medley</a>
+  <div class="sc-5 bogZNT"><div>23% OFF</div></div>
+</article>
+"""
+
+class TestCardExtractor(unittest.TestCase):
+    """Testes do extrator de campos em uma única passada pelo card"""
+
+    def test_same_elements_as_find(self):
+        """Testa se cada campo recebe o mesmo elemento que o find() correspondente"""
+        card = BeautifulSoup(CARD_HTML, 'lxml').article
+        extractor = CardExtractor([
+            CardField('old_price', 'span', classes=['price', 'old']),
+            CardField('prices', 'div', attrs={'data-testid': 'price-discount'}),
+            CardField('current', 'div', class_contains='hsAtyD', within='prices'),
+            CardField('name', 'h2', class_contains='eGzxuI'),
+            CardField('link', 'a', within='name'),
+            CardField('brand', 'a', class_contains='fibMCW'),
+            CardField('image', 'img')
+        ])
+
+        found = extractor.extract(card)
+
+        self.assertIs(found['old_price'], card.find('span', class_='price old'))
+        self.assertIs(found['current'], card.find('div', {'data-testid': 'price-discount'}).find('div', class_='hsAtyD'))
+        self.assertIs(found['link'], card.find('h2').find('a'))
+        self.assertEqual(text_of(found['brand']), 'medley')
+        self.assertIsNone(found['image'])
+
+    def test_within_ignores_elements_outside_container(self):
+        """Testa se um campo com within ignora elementos anteriores fora do container"""
+        card = BeautifulSoup('<div><a>fora</a><h2><a>dentro</a></h2></div>', 'lxml').div
+        extractor = CardExtractor([CardField('title', 'h2'), CardField('link', 'a', within='title')])
+
+        self.assertEqual(text_of(extractor.extract(card)['link']), 'dentro')
+
+    def test_invalid_fields(self):
+        """Testa a validação dos campos na criação do extrator"""
+        with self.assertRaises(ValueError):
+            CardExtractor([CardField('link', 'a', within='title'), CardField('title', 'h2')])
+        with self.assertRaises(ValueError):
+            CardExtractor([CardField('name', 'h2'), CardField('name', 'h3')])
+
+    def test_droga_raia_card(self):
+        """Testa o card da Droga Raia extraído em uma única passada"""
+        scraper = DrogaRaiaScraper(session_store=None)
+        card = BeautifulSoup(CARD_HTML, 'lxml').article
+
+        product = scraper._extract_product_info(card, 1, skip_open=True)
+
+        self.assertEqual(product['name'], 'Dipirona 1g')
+        self.assertEqual(product['product_url'], 'https://www.drogaraia.com.br/dipirona-1g.html')
+        self.assertEqual((product['price'], product['original_price']), (9.9, 12.9))
+        self.assertEqual((product['discount_percentage'], product['has_discount']), (23, True))
+        self.assertEqual(product['brand'], 'Medley')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from selenium.webdriver.common.service import Service as SeleniumService
+from utils.chromedriver_service import SharedChromeDriverService
+from utils import driver_pool
+
+def fake_start(service):
+    """Simula o início do processo do ChromeDriver"""
+    service.process = MagicMock(pid=4321)
+    service.process.poll.return_value = None
+
+class TestSharedChromeDriverService(unittest.TestCase):
+    """Testes para o SharedChromeDriverService"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.service = SharedChromeDriverService('/usr/bin/chromedriver', port=9515)
+
+    def test_sessions_reuse_running_process(self):
+        """Testa se várias sessões iniciam o ChromeDriver apenas uma vez"""
+        with patch.object(SeleniumService, 'start', autospec=True, side_effect=fake_start) as start:
+            self.service.start()
+            self.service.start()
+            self.service.start()
+
+        self.assertEqual(start.call_count, 1)
+        self.assertEqual(self.service.get_stats()['sessions_started'], 3)
+
+    def test_session_quit_keeps_process(self):
+        """Testa se o quit de uma sessão não encerra o ChromeDriver compartilhado"""
+        with patch.object(SeleniumService, 'start', autospec=True, side_effect=fake_start):
+            self.service.start()
+        with patch.object(SeleniumService, 'stop', autospec=True) as stop:
+            self.service.stop()
+            stop.assert_not_called()
+
+            self.service.shutdown()
+            stop.assert_called_once()
+        with self.assertRaises(RuntimeError):
+            self.service.start()
+
+    def test_dead_process_is_restarted(self):
+        """Testa se o ChromeDriver é reiniciado quando o processo caiu"""
+        with patch.object(SeleniumService, 'start', autospec=True, side_effect=fake_start) as start:
+            self.service.start()
+            self.service.process.poll.return_value = 1
+            self.service.start()
+
+        self.assertEqual(start.call_count, 2)
+        self.assertEqual(self.service.get_stats()['restarts'], 1)
+
+    def test_path_resolved_on_first_session(self):
+        """Testa se o binário só é localizado quando uma sessão lê o caminho, e uma única vez"""
+        resolver = MagicMock(return_value='/opt/chromedriver')
+        service = SharedChromeDriverService(path_resolver=resolver)
+        resolver.assert_not_called()
+
+        self.assertEqual(service.path, '/opt/chromedriver')
+        self.assertEqual(service.path, '/opt/chromedriver')
+        resolver.assert_called_once()
+
+    def test_memory_is_measured_per_browser(self):
+        """Testa se a memória de um driver no serviço compartilhado é medida só pelo seu Chrome"""
+        driver = MagicMock()
+        driver.service = self.service
+        with patch.object(driver_pool, 'psutil', None), \
+                patch.object(driver_pool, '_find_browser_pid', return_value=777), \
+                patch.object(driver_pool, '_proc_tree_rss_mb', return_value=150.0) as tree:
+            self.assertEqual(driver_pool.get_driver_rss_mb(driver), 150.0)
+
+        tree.assert_called_once_with(777, True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+import threading
+from unittest.mock import MagicMock, patch
+from utils.driver_pool import DriverPool
+
+def make_driver():
+    """Cria um driver falso que responde à verificação de saúde"""
+    driver = MagicMock()
+    driver.window_handles = ['main']
+    return driver
+
+class TestDriverPool(unittest.TestCase):
+    """Testes para o DriverPool"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.factory = MagicMock(side_effect=make_driver)
+        self.pool = DriverPool(self.factory, max_size=2, lease_timeout=0.2)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        self.pool.close()
+
+    def test_lease_reuses_released_driver(self):
+        """Testa se um driver devolvido é reutilizado sem criar outro"""
+        driver = self.pool.lease()
+        self.pool.release(driver)
+
+        self.assertIs(self.pool.lease(), driver)
+        self.assertEqual(self.factory.call_count, 1)
+        driver.get.assert_called_with('about:blank')
+
+    def test_pool_is_bounded(self):
+        """Testa se o pool respeita o tamanho máximo"""
+        self.pool.lease()
+        self.pool.lease()
+
+        with self.assertRaises(TimeoutError):
+            self.pool.lease()
+        self.assertEqual(self.pool.get_stats()['lease_timeouts'], 1)
+
+    def test_waiting_lease_gets_released_driver(self):
+        """Testa se um empréstimo em espera recebe o driver devolvido"""
+        first = self.pool.lease()
+        self.pool.lease()
+
+        timer = threading.Timer(0.05, self.pool.release, args=(first,))
+        timer.start()
+        self.assertIs(self.pool.lease(timeout=2), first)
+        timer.join()
+
+    def test_unhealthy_driver_is_discarded(self):
+        """Testa se um driver que falha na verificação de saúde é descartado"""
+        driver = self.pool.lease()
+        type(driver).window_handles = property(lambda self: (_ for _ in ()).throw(Exception('invalid session id')))
+        self.pool.release(driver)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['size'], 0)
+        self.assertEqual(stats['discarded'], 1)
+        driver.quit.assert_called_once()
+
+    def test_leased_context_discards_on_invalid_session(self):
+        """Testa se o context manager descarta o driver com sessão inválida"""
+        with self.assertRaises(Exception):
+            with self.pool.leased() as driver:
+                raise Exception('invalid session id')
+
+        driver.quit.assert_called_once()
+        self.assertEqual(self.pool.get_stats()['size'], 0)
+
+    def test_prewarm(self):
+        """Testa se o pré-aquecimento cria drivers ociosos até o limite"""
+        created = self.pool.prewarm(5)
+
+        self.assertEqual(created, 2)
+        self.assertEqual(self.pool.get_stats()['idle'], 2)
+
+    def test_close_quits_idle_drivers(self):
+        """Testa se o encerramento do pool encerra os drivers ociosos"""
+        driver = self.pool.lease()
+        self.pool.release(driver)
+        self.pool.close()
+
+        driver.quit.assert_called_once()
+        with self.assertRaises(RuntimeError):
+            self.pool.lease()
+
+    def test_lease_prefers_driver_with_same_affinity(self):
+        """Testa se o empréstimo com afinidade reutiliza o driver criado para ela"""
+        factory = MagicMock(side_effect=lambda affinity=None: make_driver())
+        pool = DriverPool(factory, max_size=2)
+        panvel = pool.lease(affinity='panvel')
+        pool.release(panvel)
+
+        raia = pool.lease(affinity='droga_raia')
+        self.assertIsNot(raia, panvel)
+        factory.assert_called_with('droga_raia')
+        pool.release(raia)
+
+        self.assertIs(pool.lease(affinity='panvel'), panvel)
+        # Sem capacidade para criar, qualquer driver ocioso serve
+        self.assertIs(pool.lease(affinity='sao_joao'), raia)
+        pool.close()
+
+class TestDriverRecycling(unittest.TestCase):
+    """Testes da reciclagem de drivers por páginas, idade e memória"""
+
+    def test_page_limit_recycles_on_release(self):
+        """Testa se o driver que atingiu o limite de páginas é reciclado ao ser devolvido, não durante o uso"""
+        pool = DriverPool(make_driver, max_size=1, max_pages=2)
+        driver = pool.lease()
+        pool.record_page(driver)
+        pool.record_page(driver)
+        driver.quit.assert_not_called()
+
+        pool.release(driver)
+
+        driver.quit.assert_called_once()
+        stats = pool.get_stats()
+        self.assertEqual(stats['recycled'], 1)
+        self.assertEqual(stats['recycle_reasons']['pages'], 1)
+        self.assertEqual(stats['discarded'], 0)
+        self.assertIsNot(pool.lease(), driver)
+        pool.close()
+
+    def test_idle_driver_over_age_is_not_leased(self):
+        """Testa se um driver ocioso que passou da idade máxima é reciclado no empréstimo"""
+        pool = DriverPool(make_driver, max_size=1, max_age=60)
+        driver = pool.lease()
+        pool.release(driver)
+        pool._drivers[driver]['created_at'] -= 120
+
+        self.assertIsNot(pool.lease(), driver)
+        driver.quit.assert_called_once()
+        self.assertEqual(pool.get_stats()['recycle_reasons']['age'], 1)
+        pool.close()
+
+    def test_background_recycle_by_memory(self):
+        """Testa se a verificação periódica recicla e repõe drivers ociosos acima do limite de memória"""
+        pool = DriverPool(make_driver, max_size=2, max_memory_mb=500)
+        pool.prewarm(2)
+        busy = pool.lease()
+
+        with patch('utils.driver_pool.get_driver_rss_mb', return_value=800):
+            recycled = pool.recycle()
+
+        self.assertEqual(recycled, 1)
+        stats = pool.get_stats()
+        self.assertEqual(stats['recycle_reasons']['memory'], 1)
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['created'], 3)
+        busy.quit.assert_not_called()
+
+        # O driver emprestado é reciclado apenas quando devolvido
+        pool.release(busy)
+        busy.quit.assert_called_once()
+        self.assertEqual(pool.get_stats()['recycle_reasons']['memory'], 2)
+        pool.close()
+
+    def test_stats_list_drivers(self):
+        """Testa se as estatísticas expõem páginas e estado de cada driver"""
+        pool = DriverPool(make_driver, max_size=1)
+        driver = pool.lease()
+        pool.record_page(driver)
+
+        drivers = pool.get_stats()['drivers']
+        self.assertEqual(len(drivers), 1)
+        self.assertEqual(drivers[0]['state'], 'leased')
+        self.assertEqual(drivers[0]['pages'], 1)
+        pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
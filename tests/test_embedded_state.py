@@ -0,0 +1,92 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+from bs4 import BeautifulSoup
+from utils.embedded_state import load_next_data, find_records, first_value, to_price, to_text
+from scrapers.droga_raia import DrogaRaiaScraper
+
+def next_data_html(state, body=""):
+    """Monta uma página Next.js com o estado embutido"""
+    return (f'<html><body>{body}<script id="__NEXT_DATA__" type="application/json">'
+            f'{json.dumps(state)}</script></body></html>')
+
+SEARCH_STATE = {
+    'props': {'pageProps': {
+        'menu': [{'name': 'Medicamentos', 'url': '/medicamentos'}],
+        'search': {'products': [
+            {'name': 'Dipirona 500mg 10 Comprimidos', 'urlKey': 'dipirona-500mg-medley.html',
+             'manufacturer': {'name': 'MEDLEY'}, 'finalPrice': 8.0, 'regularPrice': 10.0},
+            {'name': 'Dipirona 500mg 20 Comprimidos', 'urlKey': '/dipirona-500mg-ems.html',
+             'manufacturer': 'EMS', 'price': {'final': 'R$ 12,50', 'regular': 'R$ 12,50'}},
+            {'name': 'Dipirona Gotas', 'urlKey': 'dipirona-gotas.html', 'manufacturer': 'Neo Química',
+             'finalPrice': 5.0, 'available': False}
+        ]}
+    }}
+}
+
+class TestEmbeddedState(unittest.TestCase):
+    """Testes da leitura do estado embutido das páginas"""
+
+    def test_find_largest_record_list(self):
+        """Testa se a maior lista de registros reconhecidos é escolhida em qualquer profundidade"""
+        state = load_next_data(BeautifulSoup(next_data_html(SEARCH_STATE), 'html.parser'))
+        records = find_records(state, lambda r: 'urlKey' in r)
+
+        self.assertEqual(len(records), 3)
+
+    def test_values_and_prices(self):
+        """Testa caminhos com ponto e conversão de preços e textos"""
+        self.assertEqual(first_value({'price': {'final': 3}}, ('finalPrice', 'price.final')), 3)
+        self.assertEqual(to_price('R$ 1.234,56'), 1234.56)
+        self.assertEqual(to_price('12.90'), 12.9)
+        self.assertIsNone(to_price(0))
+        self.assertEqual(to_text({'label': ' EMS '}), 'EMS')
+
+    def test_missing_or_invalid_state(self):
+        """Testa páginas sem estado ou com JSON inválido"""
+        self.assertIsNone(load_next_data(BeautifulSoup('<html></html>', 'html.parser')))
+        invalid = '<script id="__NEXT_DATA__">{quebrado</script>'
+        self.assertIsNone(load_next_data(BeautifulSoup(invalid, 'html.parser')))
+
+class TestDrogaRaiaStateExtraction(unittest.TestCase):
+    """Testes da extração de produtos da Droga Raia pelo estado embutido"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.scraper = DrogaRaiaScraper(session_store=None)
+        self.scraper.fetch_product_page = MagicMock(side_effect=AssertionError('página de produto aberta'))
+
+    def test_products_from_state_without_product_pages(self):
+        """Testa se fabricante e preços vêm do estado, sem abrir as páginas dos produtos"""
+        soup = self.scraper.parse_html(next_data_html(SEARCH_STATE))
+
+        products = self.scraper._extract_products(soup, 'dipirona 500mg')
+
+        self.assertEqual(len(products), 2)
+        first, second = products
+        self.assertEqual(first['brand'], 'Medley')
+        self.assertEqual((first['price'], first['original_price'], first['discount_percentage']), (8.0, 10.0, 20))
+        self.assertEqual(first['product_url'], 'https://www.drogaraia.com.br/dipirona-500mg-medley.html')
+        self.assertEqual(second['brand'], 'EMS')
+        self.assertEqual(second['price'], 12.5)
+        self.assertFalse(second['has_discount'])
+        self.assertEqual(second['product_url'], 'https://www.drogaraia.com.br/dipirona-500mg-ems.html')
+
+    def test_scoped_listing_parse_keeps_state(self):
+        """Testa se a listagem parseada só com as regiões declaradas traz os mesmos produtos"""
+        html = next_data_html(SEARCH_STATE, body='<header>' + '<nav><a href="/x">menu</a></nav>' * 50 + '</header>')
+
+        scoped = self.scraper.parse_listing(html)
+
+        self.assertIsNone(scoped.find('nav'))
+        self.assertEqual(self.scraper._extract_products(scoped, 'dipirona 500mg'),
+                         self.scraper._extract_products(self.scraper.parse_html(html), 'dipirona 500mg'))
+
+    def test_falls_back_to_cards_without_state(self):
+        """Testa se, sem estado embutido, os cards do HTML continuam sendo usados"""
+        soup = self.scraper.parse_html('<html><body><div data-testid="container-products"></div></body></html>')
+
+        self.assertEqual(self.scraper._extract_products(soup, 'dipirona'), [])
+
+if __name__ == '__main__':
+    unittest.main()
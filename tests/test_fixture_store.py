@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from scrapers.sao_joao import SaoJoaoScraper
+from utils.fixture_store import FixtureStore, set_default_capture_store
+from utils.transports import ReplayTransport, register_transport, REPLAY_TRANSPORTS, KIND_PRODUCT
+
+VTEX_ITEMS = [{
+    'productName': 'Dipirona 500mg 10 Comprimidos',
+    'brand': 'MEDLEY',
+    'link': 'https://www.saojoaofarmacias.com.br/dipirona-medley/p',
+    'items': [{'sellers': [{'sellerDefault': True, 'commertialOffer': {'Price': 8.0, 'ListPrice': 10.0}}]}]
+}]
+
+class TestFixtureStore(unittest.TestCase):
+    """Testes do armazenamento de páginas gravadas"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.store = FixtureStore(self.root)
+
+    def test_get_prefers_search_term(self):
+        """Testa se a página do mesmo termo é preferida e a de outro termo serve de reserva"""
+        url = 'https://www.panvel.com/busca'
+        self.store.put(url, '<html>dipirona</html>', search_term='dipirona')
+        self.store.put(url, '<html>paracetamol</html>', search_term='paracetamol')
+
+        self.assertEqual(self.store.get(url, 'dipirona')['content'], '<html>dipirona</html>')
+        self.assertEqual(self.store.get(url, 'ibuprofeno')['content'], '<html>paracetamol</html>')
+        self.assertIsNone(self.store.get('https://www.panvel.com/outra'))
+
+    def test_content_addressed_blobs(self):
+        """Testa se corpos iguais são gravados uma única vez"""
+        self.store.put('https://a.com/p1', '<html>mesmo</html>', search_term='a')
+        self.store.put('https://a.com/p2', '<html>mesmo</html>', search_term='b')
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats['blobs'], 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, 'blobs'))), 1)
+
+class TestCaptureAndReplay(unittest.TestCase):
+    """Testes da captura das páginas de uma busca e do replay offline"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.addCleanup(set_default_capture_store, None)
+        self.session = MagicMock()
+        patcher = patch('utils.transports.get_default_http_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_search_replays_offline(self):
+        """Testa se a busca gravada é reproduzida sem rede nem navegador, com o mesmo resultado"""
+        text = json.dumps(VTEX_ITEMS)
+        self.session.get.return_value = MagicMock(status_code=200, text=text, content=text.encode('utf-8'))
+        set_default_capture_store(FixtureStore(self.root))
+        captured = SaoJoaoScraper(session_store=None).search('dipirona')
+        set_default_capture_store(None)
+
+        self.session.get.side_effect = requests.ConnectionError('sem rede')
+        register_transport(ReplayTransport(FixtureStore(self.root)))
+        scraper = SaoJoaoScraper(session_store=None, transports=REPLAY_TRANSPORTS)
+        scraper.fetch_listing_page = MagicMock(side_effect=AssertionError('navegador aberto'))
+        replayed = scraper.search('dipirona')
+
+        self.assertEqual(replayed['products'], captured['products'])
+        self.assertEqual(replayed['products'][0]['brand'], 'Medley')
+        self.assertEqual(replayed['fetch_path'], 'api')
+
+    def test_replay_skips_enrichment_engine(self):
+        """Testa se o replay abre as páginas de produto gravadas em vez do motor HTTP"""
+        url = 'https://www.saojoaofarmacias.com.br/dipirona-medley/p'
+        FixtureStore(self.root).put(url, '<html></html>', kind=KIND_PRODUCT)
+        register_transport(ReplayTransport(FixtureStore(self.root)))
+        scraper = SaoJoaoScraper(session_store=None, transports=REPLAY_TRANSPORTS)
+        scraper._extract_details_from_product_page = MagicMock(return_value={'brand': 'Medley'})
+        engine = MagicMock()
+
+        with patch('scrapers.base_scraper.get_default_enrichment_engine', return_value=engine):
+            products = scraper._enrich_products([{'brand': 'Marca não disponível', 'price': 8.0,
+                                                  'original_price': 8.0, 'product_url': url}])
+
+        engine.enrich.assert_not_called()
+        self.assertEqual(products[0]['brand'], 'Medley')
+
+if __name__ == '__main__':
+    unittest.main()
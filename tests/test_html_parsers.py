@@ -0,0 +1,69 @@
+import unittest
+from scrapers.panvel import PanvelScraper
+from utils.html_parsers import (
+    ParserBackend, get_parser_backend, register_parser_backend, available_parser_backends, region_strainer,
+    PARSER_HTML, PARSER_LXML
+)
+
+LISTING_HTML = """
+<html><body>
+<lib-card-item-v2-vertical><span class="item-name">Dipirona 500mg</span></lib-card-item-v2-vertical>
+<lib-card-item-v2-vertical><span class="item-name">Dipirona 1g</span></lib-card-item-v2-vertical>
+</body></html>
+"""
+
+class TestParserBackends(unittest.TestCase):
+    """Testes dos backends de parse de HTML"""
+
+    def test_backends_build_same_tree(self):
+        """Testa se html.parser e lxml encontram os mesmos elementos"""
+        names = {}
+        for backend_name in (PARSER_HTML, PARSER_LXML):
+            soup = get_parser_backend(backend_name).parse(LISTING_HTML)
+            names[backend_name] = [span.get_text() for span in soup.select('lib-card-item-v2-vertical .item-name')]
+        self.assertEqual(names[PARSER_HTML], ['Dipirona 500mg', 'Dipirona 1g'])
+        self.assertEqual(names[PARSER_LXML], names[PARSER_HTML])
+
+    def test_has_match(self):
+        """Testa a checagem de seletor em todos os backends disponíveis"""
+        for backend_name in available_parser_backends():
+            backend = get_parser_backend(backend_name)
+            self.assertTrue(backend.has_match(LISTING_HTML, 'lib-card-item-v2-vertical'), backend_name)
+            self.assertFalse(backend.has_match(LISTING_HTML, 'article'), backend_name)
+
+    def test_scraper_parser_choice(self):
+        """Testa o parser padrão dos scrapers e a escolha por scraper"""
+        self.assertEqual(PanvelScraper(session_store=None).parser.name, PARSER_LXML)
+        self.assertEqual(PanvelScraper(session_store=None, parser_backend=PARSER_HTML).parser.name, PARSER_HTML)
+        with self.assertRaises(ValueError):
+            PanvelScraper(session_store=None, parser_backend='regex')
+
+    def test_region_strainer(self):
+        """Testa se apenas as regiões declaradas são montadas, com classes múltiplas e qualquer elemento da tag"""
+        html = ('<html><body><div class="gallery wide"><section>A</section></div><div class="other">B</div>'
+                '<lib-card-item-v2-vertical>C</lib-card-item-v2-vertical><p>D</p></body></html>')
+        strainer = region_strainer(('div', 'class', 'gallery'), ('lib-card-item-v2-vertical', None, None))
+        for backend_name in (PARSER_HTML, PARSER_LXML):
+            soup = get_parser_backend(backend_name).parse(html, parse_only=strainer)
+            self.assertEqual(soup.get_text(), 'AC', backend_name)
+
+    def test_listing_check_reuses_strained_tree(self):
+        """Testa se a checagem da listagem monta só as regiões, e a mesma árvore é usada na extração"""
+        scraper = PanvelScraper(session_store=None)
+        html = '<html><body><p>menu</p>' + LISTING_HTML + '</body></html>'
+
+        self.assertTrue(scraper._has_listing_content(html))
+        soup = scraper._parsed_listing[1]
+        self.assertIsNone(soup.find('p'))
+        self.assertIs(scraper.parse_listing(html), soup)
+        self.assertIsNot(scraper.parse_listing(html), soup)
+        self.assertFalse(scraper._has_listing_content('<html><body><p>Nenhum produto</p></body></html>'))
+
+    def test_register_backend(self):
+        """Testa o registro de um backend adicional"""
+        register_parser_backend(ParserBackend('lxml-test', PARSER_LXML))
+        self.assertIn('lxml-test', available_parser_backends())
+        self.assertEqual(get_parser_backend('lxml-test').parse('<p>ok</p>').p.get_text(), 'ok')
+
+if __name__ == '__main__':
+    unittest.main()
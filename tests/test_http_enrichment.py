@@ -0,0 +1,145 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from utils.http_enrichment import HttpEnrichmentEngine
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.panvel import PanvelScraper
+
+DROGA_RAIA_PRODUCT_PAGE = """
+<html><body>
+  <ul><li><span>Fabricante</span><span>neo quimica</span></li></ul>
+  <span class="sc-fd6fe09f-0 jRRyrf price-pdp-content">R$ 12,90</span>
+</body></html>
+"""
+
+class FakeSession:
+    """Sessão HTTP falsa que registra o máximo de requisições simultâneas por host"""
+
+    def __init__(self, delay=0.02, pages=None):
+        self.delay = delay
+        self.pages = pages or {}
+        self.lock = threading.Lock()
+        self.current = {}
+        self.maximum = {}
+
+    def get(self, url, timeout=None):
+        host = url.split('/')[2]
+        with self.lock:
+            self.current[host] = self.current.get(host, 0) + 1
+            self.maximum[host] = max(self.maximum.get(host, 0), self.current[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.current[host] -= 1
+        if url not in self.pages:
+            raise requests.HTTPError('404 Not Found')
+        text = self.pages[url]
+        return MagicMock(text=text, content=text.encode('utf-8'))
+
+class TestHttpEnrichmentEngine(unittest.TestCase):
+    """Testes para o HttpEnrichmentEngine"""
+
+    def test_per_host_limit(self):
+        """Testa se cada host respeita o limite de páginas simultâneas"""
+        urls = [f'https://a.com/{i}' for i in range(6)] + [f'https://b.com/{i}' for i in range(6)]
+        session = FakeSession(pages={url: '<html></html>' for url in urls})
+        engine = HttpEnrichmentEngine(session, per_host_limit=2)
+
+        pages = engine.fetch_all(urls)
+
+        self.assertEqual(len(pages), 12)
+        self.assertLessEqual(session.maximum['a.com'], 2)
+        self.assertLessEqual(session.maximum['b.com'], 2)
+        self.assertEqual(engine.get_stats()['pages_fetched'], 12)
+        engine.close()
+
+    def test_batch_timeout(self):
+        """Testa se páginas fora do orçamento do lote ficam sem resultado"""
+        session = FakeSession(delay=0.3, pages={'https://a.com/1': 'x', 'https://a.com/2': 'y'})
+        engine = HttpEnrichmentEngine(session, per_host_limit=1, batch_timeout=0.45)
+
+        pages = engine.fetch_all(['https://a.com/1', 'https://a.com/2'])
+
+        self.assertEqual(pages['https://a.com/1'], 'x')
+        self.assertIsNone(pages['https://a.com/2'])
+        self.assertEqual(engine.get_stats()['timeouts'], 1)
+        engine.close()
+
+    def test_per_host_limit_after_timeout(self):
+        """Testa se as requisições fora do orçamento continuam ocupando a vaga do host até terminar"""
+        urls = [f'https://a.com/{i}' for i in range(4)]
+        session = FakeSession(delay=0.3, pages={url: 'x' for url in urls})
+        engine = HttpEnrichmentEngine(session, per_host_limit=1, batch_timeout=0.1)
+
+        self.assertEqual(engine.fetch_all(urls[:2]), {urls[0]: None, urls[1]: None})
+        pages = engine.fetch_all(urls[2:])
+
+        self.assertLessEqual(session.maximum['a.com'], 1)
+        self.assertEqual(engine.get_stats()['timeouts'], 4)
+        self.assertEqual(pages, {urls[2]: None, urls[3]: None})
+        time.sleep(0.4)
+        # Só a primeira página chegou a ser pedida: as que esperavam vaga quando o lote expirou foram descartadas
+        self.assertEqual(engine.get_stats()['pages_fetched'], 1)
+        engine.close()
+
+    def test_enrich_result_shape(self):
+        """Testa o formato (url, brand, price, original_price, discount, has_discount) dos resultados"""
+        session = FakeSession(pages={'https://a.com/1': 'html'})
+        engine = HttpEnrichmentEngine(session)
+        extract = MagicMock(return_value={'brand': 'EMS', 'price': 9.5, 'original_price': 10.0,
+                                          'discount_percentage': 5, 'has_discount': True})
+
+        results = engine.enrich(['https://a.com/1', 'https://a.com/404'], extract)
+
+        self.assertEqual(results, [('https://a.com/1', 'EMS', 9.5, 10.0, 5, True)])
+        self.assertEqual(engine.get_stats()['errors'], 1)
+        engine.close()
+
+class TestScraperHttpEnrichment(unittest.TestCase):
+    """Testes do enriquecimento por HTTP antes do navegador"""
+
+    def test_http_pages_skip_browser(self):
+        """Testa se só os produtos que continuam incompletos vão para o navegador"""
+        url = 'https://www.drogaraia.com.br/dipirona-1g.html'
+        session = FakeSession(pages={url: DROGA_RAIA_PRODUCT_PAGE})
+        engine = HttpEnrichmentEngine(session)
+        backend = MagicMock()
+        backend.max_concurrent_pages = 4
+        backend.fetch_page.return_value = '<html></html>'
+        scraper = DrogaRaiaScraper(browser_backend=backend, session_store=None)
+        products = [
+            {'name': 'Dipirona', 'brand': 'Marca não disponível', 'price': 'Preço não disponível',
+             'original_price': 'Preço não disponível', 'product_url': url, '_pending_brand': True},
+            {'name': 'Paracetamol', 'brand': 'Marca não disponível', 'price': 3.0, 'original_price': 3.0,
+             'product_url': 'https://www.drogaraia.com.br/paracetamol.html'}
+        ]
+
+        with patch('scrapers.base_scraper.get_default_enrichment_engine', return_value=engine):
+            scraper._enrich_products(products)
+
+        self.assertEqual(products[0]['brand'], 'Neo Quimica')
+        self.assertEqual(products[0]['price'], 12.9)
+        backend.fetch_page.assert_called_once()
+        self.assertEqual(backend.fetch_page.call_args[0][0], 'https://www.drogaraia.com.br/paracetamol.html')
+        self.assertEqual(scraper.network_stats.to_dict()['pages'], 1)
+        engine.close()
+
+    def test_client_rendered_sites_skip_http(self):
+        """Testa se os sites renderizados no cliente vão direto para o navegador"""
+        engine = MagicMock()
+        backend = MagicMock()
+        backend.max_concurrent_pages = 4
+        backend.fetch_page.return_value = '<html></html>'
+        scraper = PanvelScraper(browser_backend=backend, session_store=None)
+        products = [{'name': 'Dipirona', 'brand': 'Marca não disponível', 'price': 3.0, 'original_price': 3.0,
+                     'product_url': 'https://www.panvel.com/panvel/dipirona/p-1'}]
+
+        with patch('scrapers.base_scraper.get_default_enrichment_engine', return_value=engine):
+            scraper._enrich_products(products)
+
+        engine.enrich.assert_not_called()
+        backend.fetch_page.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from scrapers.base_scraper import FETCH_PATH_HTTP, FETCH_PATH_BROWSER
+from scrapers.panvel import PanvelScraper
+
+CARDS_HTML = """
+<html><body>
+<lib-card-item-v2-vertical>
+  <a href="/dipirona-500mg/p-1"><span class="item-name">Dipirona 500mg</span></a>
+  <span class="brand-name">EMS</span><span class="price">R$ 9,90</span>
+</lib-card-item-v2-vertical>
+</body></html>
+"""
+EMPTY_HTML = "<html><body><app-root></app-root></body></html>"
+
+def http_response(text, status_code=200):
+    """Cria uma resposta HTTP falsa"""
+    return MagicMock(status_code=status_code, text=text, content=text.encode('utf-8'))
+
+class TestHttpListing(unittest.TestCase):
+    """Testes do caminho HTTP da listagem com fallback para o Selenium"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.scraper = PanvelScraper(session_store=None)
+        self.scraper.fetch_listing_page = MagicMock(return_value=CARDS_HTML)
+        self.session = MagicMock()
+        patcher = patch('utils.transports.get_default_http_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_http_path_serves_listing_with_cards(self):
+        """Testa se a listagem com cards no HTML do servidor dispensa o navegador"""
+        self.session.get.return_value = http_response(CARDS_HTML)
+
+        response = self.scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+
+        self.assertEqual(response['content'], CARDS_HTML)
+        self.assertEqual(self.scraper.fetch_path, FETCH_PATH_HTTP)
+        self.scraper.fetch_listing_page.assert_not_called()
+        self.assertEqual(self.scraper.network_stats.to_dict()['bytes_transferred'], len(CARDS_HTML.encode('utf-8')))
+
+    def test_falls_back_to_browser_without_cards(self):
+        """Testa se o navegador é usado quando o HTML do servidor não traz cards"""
+        self.session.get.return_value = http_response(EMPTY_HTML)
+
+        self.scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+
+        self.assertEqual(self.scraper.fetch_path, FETCH_PATH_BROWSER)
+        self.scraper.fetch_listing_page.assert_called_once()
+
+    def test_falls_back_to_browser_on_http_error(self):
+        """Testa se erros HTTP (ex.: bloqueio anti-bot) levam ao navegador"""
+        self.session.get.return_value = http_response('Forbidden', status_code=403)
+
+        self.scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+
+        self.assertEqual(self.scraper.fetch_path, FETCH_PATH_BROWSER)
+        self.assertEqual(self.scraper.format_response([], '')['fetch_path'], FETCH_PATH_BROWSER)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from scrapers.panvel import PanvelScraper
+from scrapers.droga_raia import DrogaRaiaScraper
+from utils.driver_pool import DriverPool
+from utils.browser_backend import BrowserBackend
+from utils.fixture_store import FixtureStore, set_default_capture_store
+from utils.transports import KIND_LISTING
+
+CARDS_HTML = """
+<html><body>
+<lib-card-item-v2-vertical>
+  <a href="/dipirona-500mg/p-1"><span class="item-name">Dipirona 500mg</span></a>
+  <span class="brand-name">EMS</span><span class="price">R$ 9,90</span>
+  <span class="discount-percentage">10% OFF</span>
+</lib-card-item-v2-vertical>
+</body></html>
+"""
+
+# Registro que LISTING_RECORDS_SCRIPT devolve para o card acima
+CARD_RECORD = {
+    'name': 'Dipirona 500mg', 'brand': 'EMS', 'description': None, 'price': 9.9, 'original_price': 9.9,
+    'discount_percentage': 10, 'url': '/dipirona-500mg/p-1', 'position': 1
+}
+
+class TestListingExtraction(unittest.TestCase):
+    """Testes da extração dos produtos da listagem no navegador (LISTING_EXTRACT_SCRIPT)"""
+
+    def make_scraper(self, cls=PanvelScraper):
+        """Cria um scraper com um driver falso e sem páginas de produto"""
+        scraper = cls(session_store=None, transports={KIND_LISTING: ['selenium']})
+        scraper.driver = MagicMock()
+        scraper.driver.page_source = CARDS_HTML
+        scraper._prepare_page = MagicMock()
+        scraper._wait_listing_page = MagicMock()
+        scraper._finish_page = MagicMock()
+        scraper._enrich_products = lambda products: products
+        return scraper
+
+    def test_records_replace_page_source(self):
+        """Testa se os registros do script dispensam o HTML e geram os mesmos produtos do parser"""
+        scraper = self.make_scraper()
+        scraper.driver.execute_script.return_value = [CARD_RECORD]
+
+        response = scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+        from_records = scraper._extract_listing(response, 'dipirona')
+
+        self.assertEqual(response['records'], [CARD_RECORD])
+        self.assertEqual(response['content'], '')
+        self.assertEqual(scraper.driver.execute_script.call_args[0][0], PanvelScraper.LISTING_EXTRACT_SCRIPT)
+        from_html = scraper._extract_products(scraper.parse_listing(CARDS_HTML), 'dipirona')
+        self.assertEqual(from_records, from_html)
+        self.assertEqual(from_records[0]['product_url'], 'https://www.panvel.com/panvel/dipirona-500mg/p-1')
+        self.assertEqual((from_records[0]['price'], from_records[0]['discount_percentage']), (9.9, 10))
+
+    def test_falls_back_to_parser(self):
+        """Testa se erro ou lista vazia do script levam ao page_source"""
+        scraper = self.make_scraper()
+        for outcome in (Exception('javascript error'), []):
+            scraper.driver.execute_script.side_effect = outcome if isinstance(outcome, Exception) else None
+            scraper.driver.execute_script.return_value = outcome
+
+            response = scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+
+            self.assertIsNone(response['records'])
+            self.assertEqual(response['content'], CARDS_HTML)
+            self.assertEqual(scraper._extract_listing(response, 'dipirona')[0]['name'], 'Dipirona 500mg')
+
+    def test_capture_keeps_html(self):
+        """Testa se a captura de páginas desativa o script (as gravações precisam do HTML)"""
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, True)
+        set_default_capture_store(FixtureStore(root))
+        self.addCleanup(set_default_capture_store, None)
+        scraper = self.make_scraper()
+
+        response = scraper.make_request('https://www.panvel.com/panvel/buscarProduto.do?termoPesquisa=dipirona')
+
+        scraper.driver.execute_script.assert_not_called()
+        self.assertEqual(response['content'], CARDS_HTML)
+
+    def test_state_records(self):
+        """Testa se os registros do estado embutido encontrados no navegador viram produtos"""
+        scraper = self.make_scraper(DrogaRaiaScraper)
+        fields, script_id = scraper._listing_script_args()
+        self.assertIn('finalPrice', fields['price'])
+        self.assertEqual(script_id, '__NEXT_DATA__')
+        records = [
+            {'name': 'Dipirona 1g', 'urlKey': 'dipirona-1g.html', 'finalPrice': 12.5, 'manufacturer': 'Medley'},
+            {'name': 'Sem link', 'finalPrice': 3.0}
+        ]
+
+        products = scraper._extract_products_from_records(records, 'dipirona')
+
+        self.assertEqual([p['name'] for p in products], ['Dipirona 1g'])
+        self.assertEqual(products[0]['price'], 12.5)
+
+    def test_backend_extract_hook(self):
+        """Testa se o resultado da extração substitui o HTML no backend de navegador"""
+        driver = MagicMock()
+        driver.page_source = '<html></html>'
+        backend = BrowserBackend(DriverPool(lambda: driver, max_size=1), max_concurrent_pages=1)
+
+        self.assertEqual(backend.fetch_page('http://x/', extract=lambda d: [{'name': 'a'}]), [{'name': 'a'}])
+        self.assertEqual(backend.fetch_page('http://x/', extract=lambda d: None), '<html></html>')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import shutil
+import tempfile
+import unittest
+import requests
+from scrapers.panvel import PanvelScraper
+from scrapers.base_scraper import replace_origin
+from utils.fixture_store import FixtureStore
+from utils.mock_pharmacy_server import MockPharmacyServer, LatencyModel
+from utils.transports import KIND_LISTING
+
+ORIGIN = 'https://www.panvel.com'
+SEARCH_URL = f"{ORIGIN}/panvel/buscarProduto.do?termoPesquisa=dipirona"
+CARDS_HTML = f"""
+<html><body>
+<lib-card-item-v2-vertical>
+  <a href="{ORIGIN}/panvel/dipirona-500mg/p-1"><span class="item-name">Dipirona 500mg</span></a>
+</lib-card-item-v2-vertical>
+</body></html>
+"""
+
+class TestMockPharmacyServer(unittest.TestCase):
+    """Testes do servidor local que imita os sites das farmácias"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.store = FixtureStore(self.root)
+        self.store.put(SEARCH_URL, CARDS_HTML, kind=KIND_LISTING, search_term='dipirona')
+
+    def start(self, **options):
+        """Inicia um servidor para o teste"""
+        server = MockPharmacyServer(self.store, ORIGIN, **options).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_serves_recorded_page_with_rewritten_origin(self):
+        """Testa se a página gravada é servida com os links apontando para o servidor local"""
+        server = self.start()
+
+        response = requests.get(replace_origin(SEARCH_URL, server.url), timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"{server.url}/panvel/dipirona-500mg/p-1", response.text)
+        self.assertNotIn(ORIGIN, response.text)
+        self.assertEqual(requests.get(f"{server.url}/nao-gravada", timeout=5).status_code, 404)
+        self.assertEqual(server.get_stats()['pages'], 1)
+
+    def test_injected_errors_and_resources(self):
+        """Testa a taxa de erros das páginas e a resposta vazia dos recursos não gravados"""
+        server = self.start(error_rate=1.0)
+
+        self.assertEqual(requests.get(replace_origin(SEARCH_URL, server.url), timeout=5).status_code, 503)
+        resource = requests.get(f"{server.url}/static/app.js?v=1", timeout=5)
+        self.assertEqual((resource.status_code, resource.content), (200, b''))
+        stats = server.get_stats()
+        self.assertEqual((stats['errors_injected'], stats['resources']), (1, 1))
+
+    def test_scraper_base_url_override(self):
+        """Testa se o scraper passa a buscar no servidor local"""
+        server = self.start()
+        scraper = PanvelScraper(session_store=None, base_url_override=server.url, transports={KIND_LISTING: ['http']})
+
+        self.assertEqual(scraper.create_search_url('dipirona'), replace_origin(SEARCH_URL, server.url))
+        self.assertIn('Dipirona 500mg', scraper.make_request(scraper.create_search_url('dipirona'))['content'])
+        self.assertEqual(scraper.fetch_path, 'http')
+
+    def test_latency_models(self):
+        """Testa as distribuições de latência"""
+        rng = random.Random(1)
+        self.assertEqual(LatencyModel('fixed', 0.2).sample(rng), 0.2)
+        self.assertTrue(all(0.1 <= LatencyModel('uniform', 0.2, 0.1).sample(rng) <= 0.3 for _ in range(50)))
+        samples = [LatencyModel('lognormal', 0.2, 0.5).sample(rng) for _ in range(2000)]
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.2, delta=0.02)
+        with self.assertRaises(ValueError):
+            LatencyModel('pareto', 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from bs4 import BeautifulSoup
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.sao_joao import SaoJoaoScraper
+from utils.money import (
+    MISSING, PRICE_UNAVAILABLE, parse_brl, parse_brl_batch, parse_reais, price_field, sort_by_price, to_reais
+)
+
+class TestMoney(unittest.TestCase):
+    """Testes do parser de preços em centavos"""
+
+    def test_parse_brl(self):
+        """Testa os formatos de preço das farmácias"""
+        cases = {
+            'R$ 1.234,56': 123456,
+            'R$12,9': 1290,
+            '2 por R$ 9,90 cada': 990,
+            '12.90': 1290,
+            '1.234': 123400,
+            15.9: 1590,
+            0.1 + 0.2: 30,
+            0: 0
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_brl(value), expected, value)
+        for value in (None, '', PRICE_UNAVAILABLE, -5, True, float('nan'), {'value': 1}):
+            self.assertEqual(parse_brl(value), MISSING, value)
+
+    def test_require_symbol(self):
+        """Testa se textos sem 'R$' são ausentes quando o símbolo é exigido, e sem ele quando não são só o número"""
+        self.assertEqual(parse_brl_batch(['Leve 3', 'R$ 3,00', '10% OFF'], require_symbol=True), [MISSING, 300, MISSING])
+        for value in ('10% OFF', 'Leve 3', '3 unidades'):
+            self.assertEqual(parse_brl(value), MISSING, value)
+        self.assertEqual(parse_brl(' 12,90 '), 1290)
+
+    def test_conversions(self):
+        """Testa a volta para reais e o campo de preço dos produtos"""
+        self.assertEqual(to_reais(1290), 12.9)
+        self.assertIsNone(to_reais(MISSING))
+        self.assertEqual(price_field(MISSING), PRICE_UNAVAILABLE)
+        self.assertEqual(parse_reais('R$ 0,99'), 0.99)
+        # Somas em centavos não acumulam erro de float
+        self.assertEqual(sum(parse_brl_batch([0.1] * 10)), 100)
+
+    def test_sort_by_price(self):
+        """Testa a ordenação por centavos, com os produtos sem preço no fim e na ordem original"""
+        products = [
+            {'name': 'a', 'price': PRICE_UNAVAILABLE},
+            {'name': 'b', 'price': 12.9},
+            {'name': 'c', 'price': 'R$ 1.012,00'},
+            {'name': 'd', 'price': None},
+            {'name': 'e', 'price': 9.9}
+        ]
+        self.assertEqual([p['name'] for p in sort_by_price(products)], ['e', 'b', 'c', 'a', 'd'])
+
+    def test_scraper_prices(self):
+        """Testa preços com milhar, que os padrões anteriores truncavam"""
+        droga_raia = DrogaRaiaScraper(session_store=None)
+        span = BeautifulSoup('<span>R$ 1.299,90</span>', 'lxml').span
+        self.assertEqual(droga_raia._extract_price_value(span), 1299.9)
+        self.assertEqual(droga_raia._extract_price_value(None), PRICE_UNAVAILABLE)
+
+        sao_joao = SaoJoaoScraper(session_store=None)
+        element = BeautifulSoup(
+            '<span><span class="sjdigital-custom-apps-7-x-currencyInteger">1.049</span>'
+            '<span class="sjdigital-custom-apps-7-x-currencyFraction">90</span></span>', 'lxml').span
+        self.assertEqual(sao_joao._extract_price_value(element), 1049.9)
+        offer = {'commertialOffer': {'Price': 8.0, 'ListPrice': 10.0}}
+        product = sao_joao._extract_api_product_info({'productName': 'Dipirona', 'items': [{'sellers': [offer]}]})
+        self.assertEqual((product['price'], product['original_price'], product['discount_percentage']), (8.0, 10.0, 20))
+
+if __name__ == '__main__':
+    unittest.main()
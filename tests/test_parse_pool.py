@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+from scrapers.panvel import PanvelScraper
+from utils.parse_pool import ParsePool, scraper_path, set_default_parse_pool
+
+CARDS_HTML = """
+<html><body>
+<lib-card-item-v2-vertical>
+  <a href="/dipirona-500mg/p-1"><span class="item-name">Dipirona 500mg</span></a>
+  <span class="brand-name">EMS</span><span class="price">R$ 9,90</span>
+</lib-card-item-v2-vertical>
+<lib-card-item-v2-vertical>
+  <a href="/dipirona-1g/p-2"><span class="item-name">Dipirona 1g + Cafeína</span></a>
+  <span class="brand-name">Medley</span><span class="price">R$ 15,50</span>
+</lib-card-item-v2-vertical>
+</body></html>
+"""
+
+class TestParsePool(unittest.TestCase):
+    """Testes do pool de processos que parseia as listagens"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Inicia um pool com o scraper da Panvel pré-carregado (compartilhado pelos testes)"""
+        scraper = PanvelScraper(session_store=None)
+        cls.pool = ParsePool(max_workers=1, preload=[(scraper_path(PanvelScraper), scraper.parse_pool_options())])
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def make_scraper(self):
+        """Cria um scraper sem páginas de produto"""
+        scraper = PanvelScraper(session_store=None)
+        scraper._enrich_products = lambda products: products
+        return scraper
+
+    def test_worker_matches_local_extraction(self):
+        """Testa se o processo devolve os mesmos produtos da extração local"""
+        scraper = self.make_scraper()
+        before = self.pool.get_stats()
+
+        products = self.pool.extract_listing(scraper, CARDS_HTML, 'dipirona')
+
+        local = scraper._extract_listing_products(scraper.parse_listing(CARDS_HTML), 'dipirona')
+        self.assertEqual(products, local)
+        self.assertEqual([p['price'] for p in products], [9.9, 15.5])
+        stats = self.pool.get_stats()
+        self.assertEqual((stats['listings'] - before['listings'], stats['products'] - before['products']), (1, 2))
+
+    def test_scraper_finishes_products_from_pool(self):
+        """Testa se a busca usa o pool e aplica enriquecimento e filtro '+' no processo da aplicação"""
+        set_default_parse_pool(self.pool)
+        self.addCleanup(set_default_parse_pool, None)
+        scraper = self.make_scraper()
+
+        products = scraper._extract_listing({'content': CARDS_HTML, 'records': None}, 'dipirona')
+
+        self.assertEqual([p['name'] for p in products], ['Dipirona 500mg'])
+
+    def test_falls_back_when_pool_fails(self):
+        """Testa se a extração volta para a thread da busca quando o pool falha"""
+        broken = MagicMock()
+        broken.extract_listing.side_effect = RuntimeError('Pool de parse encerrado')
+        set_default_parse_pool(broken)
+        self.addCleanup(set_default_parse_pool, None)
+
+        products = self.make_scraper()._extract_listing({'content': CARDS_HTML, 'records': None}, 'dipirona')
+
+        self.assertEqual([p['name'] for p in products], ['Dipirona 500mg'])
+
+if __name__ == '__main__':
+    unittest.main()
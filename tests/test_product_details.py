@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from scrapers.panvel import PanvelScraper
+from utils.product_details import ProductDetailStore, set_default_product_detail_store
+
+URL = 'https://www.panvel.com/panvel/dipirona-1g/p-123'
+
+class TestProductDetailStore(unittest.TestCase):
+    """Testes dos detalhes de produto persistidos por product_url"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def make_store(self):
+        """Cria um armazenamento no diretório temporário"""
+        return ProductDetailStore(store_dir=self.root, brand_ttl_hours=24 * 21, price_ttl_hours=6)
+
+    def test_split_ttls(self):
+        """Testa se o preço expira antes da marca"""
+        store = self.make_store()
+        store.record_many([(URL, {'brand': 'Medley', 'price': 9.9, 'original_price': 12.9,
+                                  'discount_percentage': 23, 'has_discount': True})])
+        self.assertEqual(store.lookup(URL), {'brand': 'Medley', 'price': 9.9, 'original_price': 12.9,
+                                             'discount_percentage': 23, 'has_discount': True})
+
+        store._site(URL)[URL]['price_at'] = time.time() - 7 * 3600
+        self.assertEqual(store.lookup(URL), {'brand': 'Medley'})
+
+        store._site(URL)[URL]['brand_at'] = time.time() - 22 * 24 * 3600
+        self.assertIsNone(store.lookup(URL))
+        self.assertEqual(store.get_stats()['misses'], 1)
+
+    def test_persisted_between_instances(self):
+        """Testa se os detalhes gravados são lidos por um novo armazenamento, ignorando partes não encontradas"""
+        self.make_store().record_many([
+            (URL, {'brand': 'Marca não disponível', 'price': 9.9}),
+            ('https://www.panvel.com/panvel/outro/p-1', {'brand': None, 'price': 'Preço não disponível'})
+        ])
+
+        store = self.make_store()
+        self.assertEqual(store.lookup(URL), {'price': 9.9, 'original_price': 9.9,
+                                             'discount_percentage': None, 'has_discount': False})
+        self.assertIsNone(store.lookup('https://www.panvel.com/panvel/outro/p-1'))
+
+    def test_enrichment_skips_stored_pages(self):
+        """Testa se a segunda busca completa o produto sem abrir a página e sem trocar o preço da listagem"""
+        set_default_product_detail_store(self.make_store())
+        self.addCleanup(set_default_product_detail_store, None)
+        scraper = PanvelScraper(session_store=None)
+        scraper._get_browser_backend = MagicMock(return_value=MagicMock(max_concurrent_pages=2))
+        scraper._fetch_product_details = MagicMock(return_value={'brand': 'medley', 'price': 8.5, 'original_price': 8.5})
+
+        def listing_product():
+            return {'name': 'Dipirona', 'brand': 'Marca não disponível', 'price': 9.9,
+                    'original_price': 9.9, 'product_url': URL}
+
+        with patch('scrapers.base_scraper.get_default_enrichment_engine', return_value=None):
+            first = scraper._enrich_products([listing_product()])
+            second = scraper._enrich_products([listing_product()])
+
+        self.assertEqual(scraper._fetch_product_details.call_count, 1)
+        self.assertEqual((first[0]['brand'], second[0]['brand']), ('Medley', 'Medley'))
+        self.assertEqual(second[0]['price'], 9.9)
+
+if __name__ == '__main__':
+    unittest.main()
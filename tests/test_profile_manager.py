@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from utils.profile_manager import ProfileManager, DISK_CACHE_DIRNAME
+
+def write_cache_file(profile_dir, name, size):
+    """Grava um arquivo de cache falso no perfil"""
+    cache_dir = os.path.join(profile_dir, DISK_CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, name), 'wb') as f:
+        f.write(b'x' * size)
+
+class TestProfileManager(unittest.TestCase):
+    """Testes para o ProfileManager"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.base_dir = tempfile.mkdtemp()
+        self.manager = ProfileManager(base_dir=self.base_dir, disk_cache_mb=10, max_profiles_per_key=2)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def test_profiles_are_exclusive_and_reused(self):
+        """Testa se cada Chrome recebe um perfil exclusivo e se o perfil liberado é reaproveitado"""
+        first = self.manager.acquire('panvel')
+        second = self.manager.acquire('panvel')
+        self.assertNotEqual(first, second)
+
+        self.manager.release(first)
+        self.assertEqual(self.manager.acquire('panvel'), first)
+
+    def test_temporary_profile_above_limit(self):
+        """Testa se acima do limite por farmácia o perfil é temporário e removido ao liberar"""
+        self.manager.acquire('panvel')
+        self.manager.acquire('panvel')
+        temporary = self.manager.acquire('panvel')
+
+        self.assertFalse(temporary.startswith(self.base_dir))
+        self.assertEqual(self.manager.get_stats()['profiles']['panvel']['temporary'], 1)
+        self.manager.release(temporary)
+        self.assertFalse(os.path.exists(temporary))
+
+    def test_new_profile_is_cloned_from_seed(self):
+        """Testa se um perfil novo começa com o cache do último perfil encerrado da farmácia"""
+        first = self.manager.acquire('sao_joao')
+        write_cache_file(first, 'bundle.js', 100)
+        self.manager.release(first)
+
+        self.manager.acquire('sao_joao')
+        clone = self.manager.acquire('sao_joao')
+
+        self.assertNotEqual(clone, first)
+        self.assertTrue(os.path.exists(os.path.join(clone, DISK_CACHE_DIRNAME, 'bundle.js')))
+
+    def test_eviction_removes_least_recently_used_free_profiles(self):
+        """Testa se o limite total remove os perfis livres mais antigos, nunca os em uso"""
+        manager = ProfileManager(base_dir=self.base_dir, max_profiles_per_key=4, max_total_mb=1)
+        old = manager.acquire('panvel')
+        busy = manager.acquire('droga_raia')
+        write_cache_file(old, 'old.bin', 700 * 1024)
+        write_cache_file(busy, 'busy.bin', 700 * 1024)
+        manager.release(old)
+
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(busy))
+
+    def test_chrome_arguments(self):
+        """Testa os argumentos de perfil e cache limitado do Chrome"""
+        path = self.manager.acquire('panvel')
+        arguments = self.manager.chrome_arguments(path)
+
+        self.assertIn(f"--user-data-dir={os.path.abspath(path)}", arguments)
+        self.assertIn(f"--disk-cache-size={10 * 1024 * 1024}", arguments)
+
+    def test_existing_profiles_are_discovered(self):
+        """Testa se perfis de execuções anteriores são reaproveitados"""
+        path = self.manager.acquire('panvel')
+        self.manager.release(path)
+
+        self.assertEqual(ProfileManager(base_dir=self.base_dir).acquire('panvel'), path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import time
+import unittest
+from utils.readiness import ReadinessCondition, wait_until_ready, wait_for_navigation, wait_for_page
+
+class ScriptedDriver:
+    """Driver falso que devolve estados de página em sequência (o último se repete)"""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        state = self.states[min(self.calls, len(self.states)) - 1]
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+class TestReadiness(unittest.TestCase):
+    """Testes para a espera adaptativa de prontidão"""
+
+    def test_stable_product_count(self):
+        """Testa se a espera termina quando a contagem de produtos para de mudar"""
+        driver = ScriptedDriver([['interactive', 0, 5], ['interactive', 4, 6], ['interactive', 8, 7], ['interactive', 8, 8]])
+        condition = ReadinessCondition('article', timeout=5, stable_for=0.05, network_idle_for=10, poll_interval=0.01)
+
+        result = wait_until_ready(driver, condition)
+
+        self.assertTrue(result['ready'])
+        self.assertEqual(result['reason'], 'stable')
+        self.assertEqual(result['nodes'], 8)
+
+    def test_network_idle_without_products(self):
+        """Testa se uma busca sem resultados termina quando a rede fica ociosa"""
+        driver = ScriptedDriver([['loading', 0, 3], ['complete', 0, 9]])
+        condition = ReadinessCondition('article', timeout=5, network_idle_for=0, poll_interval=0)
+
+        result = wait_until_ready(driver, condition)
+
+        self.assertEqual(result['reason'], 'network_idle')
+        self.assertEqual(result['nodes'], 0)
+
+    def test_upper_bound(self):
+        """Testa se a espera respeita o limite máximo"""
+        driver = ScriptedDriver([['loading', 0, None]])
+        condition = ReadinessCondition('article', timeout=0.05, poll_interval=0.01)
+
+        result = wait_until_ready(driver, condition)
+
+        self.assertFalse(result['ready'])
+        self.assertEqual(result['reason'], 'timeout')
+        self.assertLess(result['elapsed'], 1)
+
+    def test_script_errors_are_retried_and_session_errors_raised(self):
+        """Testa se erros de script durante a navegação são tolerados e a sessão caída é propagada"""
+        driver = ScriptedDriver([Exception('javascript error'), ['interactive', 2, 1]])
+        condition = ReadinessCondition('article', timeout=5, stable_for=0, network_idle_for=10, poll_interval=0)
+        self.assertTrue(wait_until_ready(driver, condition)['ready'])
+
+        with self.assertRaises(Exception):
+            wait_until_ready(ScriptedDriver([Exception('invalid session id')]), condition)
+
+    def test_on_poll_stops_after_success(self):
+        """Testa se a ação por verificação deixa de ser chamada após retornar True"""
+        driver = ScriptedDriver([['interactive', 1, 1], ['interactive', 2, 2], ['interactive', 2, 2]])
+        condition = ReadinessCondition('article', timeout=5, stable_for=0, network_idle_for=10, poll_interval=0)
+        calls = []
+
+        wait_until_ready(driver, condition, on_poll=lambda d: calls.append(d) or True)
+
+        self.assertEqual(len(calls), 1)
+class TestNavigationStrategy(unittest.TestCase):
+    """Testes da emulação da estratégia de carregamento"""
+
+    def test_eager_waits_for_new_document(self):
+        """Testa se 'eager' ignora o documento antigo e aceita o novo documento interativo"""
+        driver = ScriptedDriver([['complete', True], Exception('javascript error'), ['loading', False], ['interactive', False]])
+
+        self.assertTrue(wait_for_navigation(driver, 'eager', timeout=5, poll_interval=0))
+        self.assertEqual(driver.calls, 4)
+
+    def test_none_accepts_loading_document(self):
+        """Testa se 'none' retorna assim que o novo documento existe"""
+        driver = ScriptedDriver([['complete', True], ['loading', False]])
+
+        self.assertTrue(wait_for_navigation(driver, 'none', timeout=5, poll_interval=0))
+        self.assertEqual(driver.calls, 2)
+
+    def test_navigation_upper_bound(self):
+        """Testa se a emulação respeita o limite máximo"""
+        driver = ScriptedDriver([['complete', True]])
+
+        self.assertFalse(wait_for_navigation(driver, 'normal', timeout=0.05, poll_interval=0.01))
+
+    def test_page_wait_shares_one_deadline(self):
+        """Testa se a navegação e a prontidão juntas respeitam um único limite"""
+        driver = ScriptedDriver([['complete', True]])
+        condition = ReadinessCondition('article', timeout=0.3, poll_interval=0.01)
+
+        started = time.monotonic()
+        result = wait_for_page(driver, 'normal', condition)
+
+        self.assertEqual(result['reason'], 'timeout')
+        self.assertLess(time.monotonic() - started, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import queue
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from utils.resource_blocking import BlockingPolicy, NetworkStats
+from utils.tab_backend import TabBrowserBackend
+from scrapers.panvel import PanvelScraper
+from scrapers.sao_joao import SaoJoaoScraper
+
+def log_entry(method, params, webview='tab'):
+    """Cria uma entrada no formato do log de performance do ChromeDriver"""
+    return {'message': json.dumps({'message': {'method': method, 'params': params}, 'webview': webview})}
+
+class FakeDevToolsSocket:
+    """Conexão DevTools falsa: responde a cada comando e entrega os eventos enfileirados"""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = queue.Queue()
+
+    def settimeout(self, timeout):
+        pass
+
+    def send(self, data):
+        message = json.loads(data)
+        self.sent.append(message)
+        self.incoming.put({'id': message['id'], 'result': {}})
+
+    def recv(self):
+        message = self.incoming.get(timeout=2)
+        if message is None:
+            raise ConnectionError('fechada')
+        return json.dumps(message)
+
+class TestBlockingPolicy(unittest.TestCase):
+    """Testes para a BlockingPolicy"""
+
+    def test_patterns_cover_types_and_urls(self):
+        """Testa se os tipos de recurso são bloqueados pelo tipo do DevTools, e não pela extensão da URL"""
+        policy = BlockingPolicy(resource_types=['Font'], url_patterns=['*tracker.com*'])
+        self.assertEqual(policy.patterns(), [
+            {'urlPattern': '*', 'resourceType': 'Font', 'requestStage': 'Request'},
+            {'urlPattern': '*tracker.com*', 'requestStage': 'Request'}
+        ])
+
+    def test_overrides(self):
+        """Testa se as sobrescritas liberam e acrescentam bloqueios sem alterar a política original"""
+        policy = BlockingPolicy(resource_types=['Image', 'Stylesheet'], url_patterns=['*a.com*'])
+        overridden = policy.with_overrides({'allow_resource_types': ['Stylesheet'], 'block_url_patterns': ['*b.com*']})
+        self.assertEqual(overridden.resource_types, ['Image'])
+        self.assertEqual(overridden.url_patterns, ['*a.com*', '*b.com*'])
+        self.assertEqual(policy.resource_types, ['Image', 'Stylesheet'])
+        self.assertEqual(policy.with_overrides({'enabled': False}).patterns(), [])
+
+    def test_unknown_resource_type(self):
+        """Testa se tipos de recurso desconhecidos são rejeitados"""
+        with self.assertRaises(ValueError):
+            BlockingPolicy(resource_types=['Video'])
+
+    def test_scraper_applies_policy_before_navigation(self):
+        """Testa se o scraper habilita o bloqueio na aba antes de abrir a listagem e falha as requisições pausadas"""
+        socket = FakeDevToolsSocket()
+        driver = MagicMock()
+        driver.capabilities = {'goog:chromeOptions': {'debuggerAddress': '127.0.0.1:9222'}}
+        driver.execute_cdp_cmd.return_value = {'targetInfo': {'targetId': 'T1'}}
+        driver.get_log.return_value = []
+        driver.page_source = '<html></html>'
+        scraper = PanvelScraper(driver=driver)
+        scraper._wait_listing_page = lambda d: None
+
+        with patch('utils.resource_blocking.websocket.create_connection', return_value=socket) as connect:
+            scraper.fetch_listing_page('http://x/')
+            scraper.fetch_listing_page('http://x/')
+        socket.incoming.put({'method': 'Fetch.requestPaused', 'params': {'requestId': 'r1', 'resourceType': 'Image'}})
+        socket.incoming.put(None)
+
+        connect.assert_called_once()
+        self.assertEqual(connect.call_args[0][0], 'ws://127.0.0.1:9222/devtools/page/T1')
+        self.assertEqual(socket.sent[0], {'id': 1, 'method': 'Fetch.enable',
+                                          'params': {'patterns': scraper.blocking_policy.patterns()}})
+        self.assertEqual(driver.get.call_count, 2)
+        for _ in range(20):
+            if len(socket.sent) > 1:
+                break
+            time.sleep(0.05)
+        self.assertEqual(socket.sent[1]['method'], 'Fetch.failRequest')
+        self.assertEqual(socket.sent[1]['params'], {'requestId': 'r1', 'errorReason': 'BlockedByClient'})
+
+    def test_pharmacy_override(self):
+        """Testa se a farmácia e a configuração podem sobrescrever a política padrão"""
+        self.assertNotIn('Stylesheet', SaoJoaoScraper().blocking_policy.resource_types)
+        scraper = PanvelScraper(blocking_overrides={'allow_resource_types': ['Image']})
+        self.assertNotIn('Image', scraper.blocking_policy.resource_types)
+
+class TestNetworkStats(unittest.TestCase):
+    """Testes para o NetworkStats"""
+
+    def test_record_performance_log(self):
+        """Testa a contagem de requisições bloqueadas e bytes transferidos"""
+        stats = NetworkStats()
+        stats.record_performance_log([
+            log_entry('Network.requestWillBeSent', {'requestId': '1', 'type': 'Document'}),
+            log_entry('Network.loadingFinished', {'requestId': '1', 'encodedDataLength': 1000}),
+            log_entry('Network.requestWillBeSent', {'requestId': '2', 'type': 'Image'}),
+            log_entry('Network.loadingFailed', {'requestId': '2', 'type': 'Image',
+                                                'errorText': 'net::ERR_BLOCKED_BY_CLIENT'}),
+            log_entry('Network.loadingFailed', {'requestId': '3', 'type': 'XHR', 'errorText': 'net::ERR_FAILED'}),
+            {'message': 'inválido'}
+        ])
+
+        result = stats.to_dict()
+        self.assertEqual(result['requests_total'], 2)
+        self.assertEqual(result['requests_blocked'], 1)
+        self.assertEqual(result['blocked_by_type'], {'Image': 1})
+        self.assertEqual(result['bytes_transferred'], 1000)
+        self.assertNotIn('estimated_bytes_saved', result)
+
+    def test_tab_backend_splits_log_by_tab(self):
+        """Testa se o log de performance de uma aba não é atribuído a outra"""
+        driver = MagicMock()
+        driver.current_window_handle = 'home'
+        backend = TabBrowserBackend(lambda: driver, max_tabs=2)
+        backend._ensure_browser()
+        backend._performance_buffers = {'a': [], 'b': []}
+        driver.get_log.return_value = [log_entry('Network.requestWillBeSent', {}, 'a'),
+                                       log_entry('Network.requestWillBeSent', {}, 'b')]
+
+        self.assertEqual(len(backend._performance_log('a')), 1)
+        driver.get_log.return_value = []
+        self.assertEqual(len(backend._performance_log('b')), 1)
+        self.assertEqual(backend._performance_log('a'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from scrapers.base_scraper import FETCH_PATH_API, FETCH_PATH_BROWSER
+from scrapers.sao_joao import SaoJoaoScraper
+
+def vtex_product(name, brand, price, list_price, link_text):
+    """Monta um produto no formato da API de catálogo da VTEX"""
+    return {
+        'productName': name,
+        'brand': brand,
+        'linkText': link_text,
+        'link': f"https://www.saojoaofarmacias.com.br/{link_text}/p",
+        'items': [{
+            'sellers': [
+                {'sellerDefault': False, 'commertialOffer': {'Price': 1.0, 'ListPrice': 1.0}},
+                {'sellerDefault': True, 'commertialOffer': {'Price': price, 'ListPrice': list_price}}
+            ]
+        }]
+    }
+
+class TestSaoJoaoApiSearch(unittest.TestCase):
+    """Testes da busca do São João pela API de catálogo da VTEX"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.scraper = SaoJoaoScraper(session_store=None)
+        self.scraper.fetch_listing_page = MagicMock(return_value="<html><body></body></html>")
+        self.session = MagicMock()
+        patcher = patch('utils.transports.get_default_http_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def api_response(self, items):
+        """Configura a resposta da API"""
+        text = json.dumps(items)
+        self.session.get.return_value = MagicMock(status_code=200, text=text, content=text.encode('utf-8'))
+
+    def test_api_url(self):
+        """Testa a URL da busca no catálogo"""
+        self.assertEqual(
+            self.scraper.create_api_url('dipirona 500mg'),
+            'https://www.saojoaofarmacias.com.br/api/catalog_system/pub/products/search?ft=dipirona%20500mg&_from=0&_to=49'
+        )
+
+    def test_products_filled_from_json(self):
+        """Testa se nome, marca, preços, link e posição vêm direto do JSON, sem navegador"""
+        self.api_response([
+            vtex_product('Dipirona 500mg 10 Comprimidos', 'MEDLEY', 8.0, 10.0, 'dipirona-medley'),
+            vtex_product('Dipirona 500mg 20 Comprimidos', 'EMS', 12.5, 12.5, 'dipirona-ems')
+        ])
+
+        result = self.scraper.search('dipirona 500mg')
+
+        self.assertEqual(result['fetch_path'], FETCH_PATH_API)
+        self.scraper.fetch_listing_page.assert_not_called()
+        first, second = result['products']
+        self.assertEqual(first['brand'], 'Medley')
+        self.assertEqual((first['price'], first['original_price']), (8.0, 10.0))
+        self.assertEqual(first['discount_percentage'], 20)
+        self.assertTrue(first['has_discount'])
+        self.assertEqual(first['product_url'], 'https://www.saojoaofarmacias.com.br/dipirona-medley/p')
+        self.assertEqual(first['position'], 1)
+        self.assertEqual(second['brand'], 'EMS')
+        self.assertFalse(second['has_discount'])
+
+    def test_falls_back_to_browser(self):
+        """Testa se a busca usa o navegador quando a API falha ou não retorna produtos"""
+        self.session.get.side_effect = requests.ConnectionError('sem conexão')
+        self.assertEqual(self.scraper.search('dipirona')['fetch_path'], FETCH_PATH_BROWSER)
+
+        self.session.get.side_effect = None
+        self.api_response([])
+        self.assertEqual(self.scraper.search('dipirona')['fetch_path'], FETCH_PATH_BROWSER)
+        self.assertEqual(self.scraper.fetch_listing_page.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from bs4 import BeautifulSoup
+from scrapers.droga_raia import DrogaRaiaScraper
+from scrapers.panvel import PanvelScraper
+from scrapers.sao_joao import PRODUCT_PAGE_SPEC, SaoJoaoScraper
+from utils.money import PRICE_UNAVAILABLE
+from utils.selector_spec import CompiledSelector, FieldSpec, PageSpec
+
+PAGE_HTML = """
+<html><head><title>Medley - Dipirona 1g</title></head><body>
+  <div class="header-brand-logo"><img></div>
+  <span class="x-productBrandName-wrapper">M</span>
+  <div class="vtex-product-identifier-0-x-product-identifier__value">EMS</div>
+  <span class="vtex-store-components-3-x-productBrandName">Neo Química</span>
+  <span data-cy="product-discount">15% OFF</span>
+</body></html>
+"""
+
+class TestSelectorSpec(unittest.TestCase):
+    """Testes das especificações declarativas de seletores"""
+
+    def test_same_element_as_select_one(self):
+        """Testa se cada seletor compilado casa o mesmo primeiro elemento que select_one()"""
+        soup = BeautifulSoup(PAGE_HTML, 'lxml')
+        selectors = [
+            "span.vtex-store-components-3-x-productBrandName",
+            "span[class*='productBrandName']",
+            ".vtex-product-identifier-0-x-product-identifier__value",
+            "[class*='brand']",
+            "span[data-cy=product-discount]",
+            "div[class^='header']",
+            "title"
+        ]
+        for css in selectors:
+            spec = PageSpec([FieldSpec('value', css, transform='element')])
+            self.assertIs(spec.extract(soup)['value'], soup.select_one(css), css)
+
+    def test_selector_order_and_invalid_values(self):
+        """Testa se vale o primeiro seletor com valor válido, na ordem declarada, e não na do documento"""
+        soup = BeautifulSoup(PAGE_HTML, 'lxml')
+        spec = PageSpec([FieldSpec('brand', [
+            "span.vtex-store-components-3-x-productBrandName",
+            "span[class*='productBrandName']"
+        ], min_length=2)])
+        self.assertEqual(spec.extract(soup)['brand'], 'Neo Química')
+
+        # O primeiro elemento de "span[class*='productBrandName']" tem texto curto demais: o seletor não vale
+        spec = PageSpec([FieldSpec('brand', ["span[class*='productBrandName']", '.missing'], min_length=2,
+                                   fallback=FieldSpec('title', 'title', pattern=r'^([^-]+)', min_length=3))])
+        self.assertEqual(spec.extract(soup)['brand'], 'Medley')
+
+    def test_pattern_cast_and_missing(self):
+        """Testa padrão, conversão e campos sem elemento"""
+        soup = BeautifulSoup(PAGE_HTML, 'lxml')
+        spec = PageSpec([
+            FieldSpec('discount', "span[data-cy='product-discount']", pattern=r'(\d+)%', cast=int),
+            FieldSpec('price', 'span.deal-price')
+        ])
+        self.assertEqual(spec.extract(soup), {'discount': 15, 'price': None})
+
+    def test_invalid_specs(self):
+        """Testa a rejeição de seletores fora do subconjunto suportado e de campos repetidos"""
+        for css in ('div > span', 'li:nth-child(2)', 'div span', ''):
+            with self.assertRaises(ValueError):
+                CompiledSelector(css)
+        with self.assertRaises(ValueError):
+            PageSpec([FieldSpec('brand', 'span'), FieldSpec('brand', 'div')])
+
+    def test_sao_joao_brand(self):
+        """Testa a marca da São João pela especificação e o fallback do título"""
+        scraper = SaoJoaoScraper(session_store=None)
+        soup = BeautifulSoup(PAGE_HTML, 'lxml')
+        self.assertEqual(scraper._find_brand_in_soup(soup), 'Neo Química')
+        title_only = BeautifulSoup('<html><head><title>Cimed - Dorflex</title></head><body></body></html>', 'lxml')
+        self.assertEqual(PRODUCT_PAGE_SPEC.extract(title_only)['brand'], 'Cimed')
+        self.assertEqual(scraper._find_brand_in_soup(BeautifulSoup('<p></p>', 'lxml')), 'Marca não disponível')
+
+    def test_product_pages(self):
+        """Testa os detalhes das páginas de produto da Panvel e da Droga Raia"""
+        panvel = PanvelScraper(session_store=None)._extract_details_from_product_page(BeautifulSoup(
+            '<span class="brand-name">EMS</span><span class="deal-price">sem preço</span>'
+            '<span class="original-price">R$ 1.012,90</span><span data-cy="product-discount">10%</span>', 'lxml'))
+        self.assertEqual((panvel['brand'], panvel['price'], panvel['discount_percentage']), ('EMS', 1012.9, 10))
+
+        droga_raia = DrogaRaiaScraper(session_store=None)._extract_details_from_product_page(BeautifulSoup(
+            '<ul><li><span>Marca</span><span>Dorflex</span></li>'
+            '<li><span>Fabricante</span><span><a>Sanofi</a></span></li></ul>'
+            '<span class="sc-fd6fe09f-0 jRRyrf price-pdp-content">R$ 19,90</span>'
+            '<span class="sc-14e14dc8-0 kpLpXu">R$ 24,90</span>', 'lxml'))
+        self.assertEqual((droga_raia['brand'], droga_raia['price'], droga_raia['original_price']), ('Sanofi', 19.9, 24.9))
+
+    def test_droga_raia_price_fallbacks(self):
+        """Testa os preços da Droga Raia sem as classes: spans com 'R$' legível, na mesma passada da especificação"""
+        scraper = DrogaRaiaScraper(session_store=None)
+        details = scraper._extract_details_from_product_page(BeautifulSoup(
+            '<span>R$</span><span class="sc-fd6fe09f-0 jRRyrf price-pdp-content">R$ 19,90</span>'
+            '<span>R$ 29,90</span>', 'lxml'))
+        self.assertEqual((details['price'], details['original_price']), (19.9, 29.9))
+
+        details = scraper._extract_details_from_product_page(BeautifulSoup(
+            '<span>10x de</span><span>R$ 9,90</span><span>R$ 1,99</span>', 'lxml'))
+        self.assertEqual((details['price'], details['original_price']), (9.9, 9.9))
+
+        details = scraper._extract_details_from_product_page(BeautifulSoup('<span>Indisponível</span>', 'lxml'))
+        self.assertEqual((details['price'], details['original_price']), (PRICE_UNAVAILABLE, PRICE_UNAVAILABLE))
+
+if __name__ == '__main__':
+    unittest.main()
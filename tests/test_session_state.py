@@ -0,0 +1,102 @@
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from utils.session_state import SessionStateStore, get_default_session_store, session_key
+from scrapers.sao_joao import SaoJoaoScraper
+
+class TestSessionStateStore(unittest.TestCase):
+    """Testes para o SessionStateStore"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.state_dir = tempfile.mkdtemp()
+        self.store = SessionStateStore(state_dir=self.state_dir, max_age_hours=1)
+        self.driver = MagicMock()
+        self.driver.get_cookies.return_value = [
+            {'name': 'OptanonAlertBoxClosed', 'value': '2024-01-01', 'domain': '.saojoaofarmacias.com.br',
+             'path': '/', 'secure': True, 'httpOnly': False, 'expiry': 1900000000}
+        ]
+        self.driver.execute_script.return_value = {'cookieConsent': 'accepted'}
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def test_session_key(self):
+        """Testa a geração da chave a partir do nome da farmácia"""
+        self.assertEqual(session_key('São João'), 'sao_joao')
+        self.assertEqual(session_key('Droga Raia'), 'droga_raia')
+
+    def test_disabled_until_configured(self):
+        """Testa se o armazenamento padrão só existe depois de configurado pela aplicação"""
+        self.assertIsNone(get_default_session_store())
+        self.assertIsNone(SaoJoaoScraper().session_store)
+
+    def test_capture_persists_state(self):
+        """Testa se o estado capturado é salvo e recarregado por outra instância"""
+        self.store.capture(self.driver, 'sao_joao', 'https://www.saojoaofarmacias.com.br')
+
+        other = SessionStateStore(state_dir=self.state_dir)
+        state = other.get('sao_joao')
+        self.assertEqual(state['cookies'][0]['name'], 'OptanonAlertBoxClosed')
+        self.assertEqual(state['local_storage'], {'cookieConsent': 'accepted'})
+        self.assertTrue(other.is_warm('sao_joao'))
+        self.assertFalse(other.is_warm('panvel'))
+
+    def test_expired_state_is_ignored(self):
+        """Testa se o estado expirado não é usado"""
+        state = self.store.capture(self.driver, 'sao_joao', 'https://www.saojoaofarmacias.com.br')
+        state['captured_at'] = time.time() - 7200
+
+        self.assertIsNone(self.store.get('sao_joao'))
+
+    def test_inject_once_per_driver(self):
+        """Testa se cookies e localStorage são injetados via DevTools uma única vez por driver"""
+        self.store.capture(self.driver, 'sao_joao', 'https://www.saojoaofarmacias.com.br')
+        target = MagicMock()
+
+        self.assertTrue(self.store.inject(target, 'sao_joao'))
+        self.assertTrue(self.store.inject(target, 'sao_joao'))
+
+        commands = [c.args[0] for c in target.execute_cdp_cmd.call_args_list]
+        self.assertEqual(commands, ['Network.enable', 'Network.setCookie', 'Page.addScriptToEvaluateOnNewDocument'])
+        cookie = target.execute_cdp_cmd.call_args_list[1].args[1]
+        self.assertEqual(cookie['domain'], '.saojoaofarmacias.com.br')
+        self.assertEqual(cookie['expires'], 1900000000)
+        script = target.execute_cdp_cmd.call_args_list[2].args[1]['source']
+        self.assertIn(json.dumps('https://www.saojoaofarmacias.com.br'), script)
+        self.assertFalse(self.store.inject(target, 'panvel'))
+
+    def test_consent_wait_is_noop_on_warm_session(self):
+        """Testa se o São João não procura o banner de cookies quando a sessão já está salva"""
+        cold = SaoJoaoScraper(session_store=self.store)
+        page = MagicMock()
+        page.find_elements.return_value = []
+        self.assertFalse(cold._while_waiting(page))
+        page.find_elements.assert_called_once()
+
+        self.store.capture(self.driver, 'sao_joao', 'https://www.saojoaofarmacias.com.br')
+        warm = SaoJoaoScraper(session_store=self.store)
+        page = MagicMock()
+        self.assertTrue(warm._while_waiting(page))
+        page.find_elements.assert_not_called()
+
+    def test_accepted_banner_triggers_capture(self):
+        """Testa se aceitar o banner faz o scraper capturar o estado ao final da página"""
+        scraper = SaoJoaoScraper(session_store=self.store)
+        button = MagicMock()
+        self.driver.find_elements.return_value = [button]
+        self.driver.get_log.return_value = []
+
+        self.assertTrue(scraper._while_waiting(self.driver))
+        scraper._finish_page(self.driver)
+
+        button.click.assert_called_once()
+        self.assertTrue(self.store.is_warm('sao_joao'))
+        self.assertEqual(self.store.get('sao_joao')['origin'], 'https://www.saojoaofarmacias.com.br')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import threading
+from utils.tab_backend import TabBrowserBackend
+
+class FakeSwitchTo:
+    """switch_to falso que troca a janela atual do FakeBrowser"""
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    def new_window(self, kind):
+        self.browser.counter += 1
+        handle = f'tab-{self.browser.counter}'
+        self.browser.urls[handle] = 'about:blank'
+        self.browser.current_window_handle = handle
+
+    def window(self, handle):
+        if handle not in self.browser.urls:
+            raise Exception('no such window')
+        self.browser.current_window_handle = handle
+
+class FakeBrowser:
+    """Navegador falso com várias abas; o HTML de cada aba depende da URL dela"""
+
+    def __init__(self, failing_urls=None, crash_urls=None):
+        self.urls = {'home': 'about:blank'}
+        self.current_window_handle = 'home'
+        self.counter = 0
+        self.failing_urls = failing_urls or set()
+        self.crash_urls = crash_urls or set()
+        self.switch_to = FakeSwitchTo(self)
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        return list(self.urls)
+
+    def get(self, url):
+        if url in self.failing_urls:
+            raise Exception('no such window: target window already closed')
+        if url in self.crash_urls:
+            self.crash_urls.discard(url)
+            raise Exception('invalid session id')
+        self.urls[self.current_window_handle] = url
+
+    def execute_script(self, script, *args):
+        return ['complete', self.urls[self.current_window_handle]]
+
+    @property
+    def page_source(self):
+        return f'<html>{self.urls[self.current_window_handle]}</html>'
+
+    def close(self):
+        del self.urls[self.current_window_handle]
+
+    def quit(self):
+        self.quit_called = True
+
+class TestTabBrowserBackend(unittest.TestCase):
+    """Testes para o TabBrowserBackend"""
+
+    def test_concurrent_pages_share_one_browser(self):
+        """Testa se páginas simultâneas usam um único navegador e recebem o HTML da própria aba"""
+        browsers = []
+
+        def factory():
+            browsers.append(FakeBrowser())
+            return browsers[-1]
+
+        backend = TabBrowserBackend(factory, max_tabs=4, poll_interval=0)
+        results = {}
+
+        def fetch(i):
+            results[i] = backend.fetch_page(f'http://x/{i}')
+
+        threads = [threading.Thread(target=fetch, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(browsers), 1)
+        for i in range(10):
+            self.assertEqual(results[i], f'<html>http://x/{i}</html>')
+        self.assertEqual(backend.get_stats()['tabs_open'], 0)
+        self.assertEqual(browsers[0].window_handles, ['home'])
+
+    def test_tab_error_is_isolated(self):
+        """Testa se o erro de uma aba não afeta as outras páginas"""
+        browser = FakeBrowser(failing_urls={'http://x/bad'})
+        backend = TabBrowserBackend(lambda: browser, max_tabs=2, poll_interval=0)
+
+        with self.assertRaises(Exception):
+            backend.fetch_page('http://x/bad')
+
+        self.assertEqual(backend.fetch_page('http://x/good'), '<html>http://x/good</html>')
+        self.assertEqual(backend.get_stats()['browser_restarts'], 0)
+        self.assertFalse(browser.quit_called)
+
+    def test_session_error_restarts_browser_and_retries(self):
+        """Testa se uma sessão inválida reinicia o navegador e repete a página"""
+        browsers = []
+
+        def factory():
+            browsers.append(FakeBrowser(crash_urls={'http://x/crash'} if not browsers else set()))
+            return browsers[-1]
+
+        backend = TabBrowserBackend(factory, max_tabs=2, poll_interval=0)
+
+        self.assertEqual(backend.fetch_page('http://x/crash'), '<html>http://x/crash</html>')
+        self.assertEqual(len(browsers), 2)
+        self.assertTrue(browsers[0].quit_called)
+        self.assertEqual(backend.get_stats()['browser_restarts'], 1)
+
+    def test_wait_receives_tab_scoped_driver(self):
+        """Testa se a função de espera opera sobre a aba da página"""
+        browser = FakeBrowser()
+        backend = TabBrowserBackend(lambda: browser, max_tabs=2, poll_interval=0)
+        seen = []
+
+        backend.fetch_page('http://x/1', wait=lambda tab: seen.append(tab.execute_script('return location.href')[1]))
+
+        self.assertEqual(seen, ['http://x/1'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from scrapers.panvel import PanvelScraper
+from utils import transports as transport_registry
+from utils.fixture_store import FixtureStore
+from utils.transports import (
+    Transport, TransportResponse, ReplayTransport, get_transport, register_transport,
+    KIND_LISTING, KIND_PRODUCT
+)
+
+CARDS_HTML = "<html><body><lib-card-item-v2-vertical>Dipirona</lib-card-item-v2-vertical></body></html>"
+
+class FakeTransport(Transport):
+    """Transporte de teste com respostas ou erros fixos"""
+
+    def __init__(self, name, content=None, error=None):
+        self.name = name
+        self.content = content
+        self.error = error
+        self.calls = []
+
+    def fetch(self, scraper, url, kind=KIND_LISTING):
+        self.calls.append((url, kind))
+        if self.error:
+            raise self.error
+        return TransportResponse(url, self.content, transport=self.name)
+
+class TestTransportChain(unittest.TestCase):
+    """Testes da cadeia de transportes dos scrapers"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.fixture_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.fixture_dir, True)
+        self.registered = dict(transport_registry._transports)
+
+    def tearDown(self):
+        """Restaura o registro global de transportes"""
+        with transport_registry._transports_lock:
+            transport_registry._transports.clear()
+            transport_registry._transports.update(self.registered)
+
+    def scraper_with(self, *transports, kind=KIND_LISTING):
+        """Cria um scraper com a cadeia de transportes informada para o tipo de página"""
+        for transport in transports:
+            register_transport(transport)
+        return PanvelScraper(session_store=None, transports={kind: [t.name for t in transports]})
+
+    def test_first_transport_with_content_wins(self):
+        """Testa se o primeiro transporte com produtos atende a listagem"""
+        first = FakeTransport('fake-a', CARDS_HTML)
+        second = FakeTransport('fake-b', CARDS_HTML)
+        scraper = self.scraper_with(first, second)
+
+        response = scraper.make_request('https://www.panvel.com/busca')
+
+        self.assertEqual(response['content'], CARDS_HTML)
+        self.assertEqual(scraper.fetch_path, 'fake-a')
+        self.assertEqual(second.calls, [])
+
+    def test_falls_through_on_error_and_empty_listing(self):
+        """Testa se erros e listagens sem produtos passam para o próximo transporte"""
+        failing = FakeTransport('fake-error', error=ConnectionError('sem conexão'))
+        empty = FakeTransport('fake-empty', '<html><body></body></html>')
+        last = FakeTransport('fake-last', CARDS_HTML)
+        scraper = self.scraper_with(failing, empty, last)
+
+        scraper.make_request('https://www.panvel.com/busca')
+
+        self.assertEqual(scraper.fetch_path, 'fake-last')
+        self.assertEqual(len(empty.calls), 1)
+
+    def test_last_transport_error_propagates(self):
+        """Testa se o erro do último transporte é propagado"""
+        scraper = self.scraper_with(FakeTransport('fake-down', error=ConnectionError('sem conexão')),
+                                    kind=KIND_PRODUCT)
+
+        with self.assertRaises(ConnectionError):
+            scraper.fetch('https://www.panvel.com/produto', KIND_PRODUCT)
+
+    def test_unknown_transport(self):
+        """Testa se nomes de transporte desconhecidos são rejeitados na criação do scraper"""
+        with self.assertRaises(ValueError):
+            get_transport('carrier-pigeon')
+        with self.assertRaises(ValueError):
+            PanvelScraper(session_store=None, transports={KIND_LISTING: ['carrier-pigeon']})
+
+    def test_selenium_transport_is_default_for_product_pages(self):
+        """Testa se as páginas de produto usam o navegador por padrão"""
+        scraper = PanvelScraper(session_store=None)
+        scraper.fetch_product_page = MagicMock(return_value='<html></html>')
+
+        response = scraper.fetch('https://www.panvel.com/produto', KIND_PRODUCT)
+
+        self.assertEqual(response.transport, 'selenium')
+        scraper.fetch_product_page.assert_called_once_with('https://www.panvel.com/produto')
+
+    def test_replay_transport(self):
+        """Testa se o transporte de replay serve as páginas gravadas, com a latência configurada"""
+        url = 'https://www.panvel.com/busca?q=dipirona'
+        FixtureStore(self.fixture_dir).put(url, CARDS_HTML, kind=KIND_LISTING)
+        transport = ReplayTransport(FixtureStore(self.fixture_dir), latency=0.05)
+
+        started = time.monotonic()
+        response = transport.fetch(None, url)
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(response.content, CARDS_HTML)
+        self.assertEqual(response.transport, 'replay')
+        with self.assertRaises(LookupError):
+            transport.fetch(None, 'https://www.panvel.com/nao-gravada')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
 # Utilitários do projeto pharma_price_scan
 
 from .cache_manager import CacheManager
+from .driver_pool import DriverPool
+from .browser_backend import BrowserBackend
+from .tab_backend import TabBrowserBackend
+from .resource_blocking import BlockingPolicy, NetworkStats
 from .product_unifier import ProductUnifier, standardize_products
 
-__all__ = ['ProductUnifier', 'standardize_products', 'CacheManager'] 
\ No newline at end of file
+__all__ = ['ProductUnifier', 'standardize_products', 'CacheManager', 'DriverPool', 'BrowserBackend', 'TabBrowserBackend',
+           'BlockingPolicy', 'NetworkStats'] 
\ No newline at end of file
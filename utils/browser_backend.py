@@ -0,0 +1,99 @@
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class BrowserBackend:
+    """Backend compartilhado de navegador para abrir páginas de produto com limite global de páginas simultâneas"""
+
+    def __init__(self, driver_pool, max_concurrent_pages: int = 4):
+        """
+        Inicializa o backend de navegador
+
+        Args:
+            driver_pool: DriverPool com os drivers usados para abrir as páginas
+            max_concurrent_pages: Limite global de páginas abertas ao mesmo tempo
+        """
+        if max_concurrent_pages < 1:
+            raise ValueError("O limite de páginas simultâneas deve ser pelo menos 1")
+        self.driver_pool = driver_pool
+        self.max_concurrent_pages = max_concurrent_pages
+        self._semaphore = threading.BoundedSemaphore(max_concurrent_pages)
+        self._lock = threading.Lock()
+        self._first_fetch_at: Optional[float] = None
+        self._stats = {
+            'pages_fetched': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'page_seconds': 0.0
+        }
+
+    def fetch_page(self, url: str, wait: Optional[Callable[[Any], None]] = None,
+                   prepare: Optional[Callable[[Any], None]] = None, affinity: Optional[str] = None,
+                   extract: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Abre uma página em um driver do backend e retorna o HTML
+
+        Args:
+            url: URL da página
+            wait: Função chamada com o driver após a navegação para aguardar o conteúdo
+            prepare: Função chamada com o driver antes da navegação (ex.: bloqueio de recursos)
+            affinity: Afinidade do driver no pool (ex.: chave da farmácia, para usar o perfil dela)
+            extract: Função chamada com o driver após a espera; um resultado diferente de None
+                (ex.: registros lidos no DOM) é retornado no lugar do HTML
+
+        Returns:
+            HTML da página carregada, ou o resultado de extract
+        """
+        with self._semaphore:
+            with self._lock:
+                self._stats['in_flight'] += 1
+                if self._first_fetch_at is None:
+                    self._first_fetch_at = time.monotonic()
+            start = time.monotonic()
+            try:
+                with self.driver_pool.leased(affinity=affinity) as driver:
+                    if prepare is not None:
+                        prepare(driver)
+                    driver.get(url)
+                    self.driver_pool.record_page(driver)
+                    if wait is not None:
+                        wait(driver)
+                    page_source = extract(driver) if extract is not None else None
+                    if page_source is None:
+                        page_source = driver.page_source
+            except Exception:
+                with self._lock:
+                    self._stats['errors'] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._stats['in_flight'] -= 1
+            with self._lock:
+                self._stats['pages_fetched'] += 1
+                self._stats['page_seconds'] += time.monotonic() - start
+            return page_source
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do backend
+
+        Returns:
+            Dicionário com estatísticas de páginas abertas e vazão
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            elapsed = time.monotonic() - self._first_fetch_at if self._first_fetch_at else 0
+        pages = stats['pages_fetched']
+        stats['max_concurrent_pages'] = self.max_concurrent_pages
+        stats['avg_page_seconds'] = round(stats['page_seconds'] / pages, 3) if pages else 0
+        stats['pages_per_second'] = round(pages / elapsed, 3) if elapsed else 0
+        stats['page_seconds'] = round(stats['page_seconds'], 3)
+        stats['pool'] = self.driver_pool.get_stats()
+        return stats
+
+    def close(self):
+        """Encerra os drivers do backend"""
+        self.driver_pool.close()
@@ -0,0 +1,117 @@
+from typing import Any, Dict, Iterable, List, Optional
+from bs4 import Tag
+
+class CardField:
+    """
+    Regra de um campo do card: o primeiro elemento, em ordem do documento, com a
+    tag, as classes e os atributos informados (a mesma semântica de find()).
+    """
+
+    def __init__(self, name: str, tag: Optional[str] = None, classes: Iterable[str] = (),
+                 class_contains: Optional[str] = None, attrs: Optional[Dict[str, Any]] = None,
+                 within: Optional[str] = None):
+        """
+        Args:
+            name: Nome do campo
+            tag: Nome da tag (None aceita qualquer tag)
+            classes: Classes que o elemento precisa ter (todas)
+            class_contains: Trecho que alguma classe precisa conter (classes geradas, ex.: 'eGzxuI')
+            attrs: Atributos exigidos; True exige apenas a presença do atributo
+            within: Campo cujo elemento precisa conter este (equivale a find() dentro do elemento dele)
+        """
+        self.name = name
+        self.tag = tag
+        self.classes = tuple(classes)
+        self._class_set = frozenset(self.classes)
+        self.class_contains = class_contains
+        self.attrs = tuple((attrs or {}).items())
+        self.within = within
+
+    def matches(self, element: Tag) -> bool:
+        """Indica se o elemento satisfaz a regra (sem considerar within)"""
+        if self.classes or self.class_contains:
+            element_classes = element.get('class') or ()
+            if self._class_set and not self._class_set.issubset(element_classes):
+                return False
+            if self.class_contains and not any(self.class_contains in value for value in element_classes):
+                return False
+        for attribute, expected in self.attrs:
+            actual = element.get(attribute)
+            if actual is None or (expected is not True and actual != expected):
+                return False
+        return True
+
+class CardExtractor:
+    """
+    Extrator que preenche todos os campos de um card em uma única passada.
+
+    Em vez de um find() por campo, cada um percorrendo o card de novo, as
+    regras são indexadas por tag na criação e o card é percorrido uma vez, em
+    ordem do documento: cada elemento é testado apenas contra as regras da
+    sua tag ainda não preenchidas, e a passada termina assim que todos os
+    campos são encontrados.
+    """
+
+    def __init__(self, fields: Iterable[CardField]):
+        """
+        Args:
+            fields: Regras dos campos; as de within precisam vir depois do campo que as contém
+        """
+        self.fields: List[CardField] = list(fields)
+        names = [field.name for field in self.fields]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Campos repetidos no extrator: {names}")
+        self._by_tag: Dict[Optional[str], List[CardField]] = {}
+        for field in self.fields:
+            if field.within is not None and field.within not in names[:names.index(field.name)]:
+                raise ValueError(f"O campo '{field.name}' está dentro de '{field.within}', que não o precede")
+            self._by_tag.setdefault(field.tag, []).append(field)
+        self._any_tag = self._by_tag.pop(None, [])
+
+    def extract(self, card: Tag) -> Dict[str, Optional[Tag]]:
+        """
+        Localiza os elementos de todos os campos no card
+
+        Args:
+            card: Elemento do card (BeautifulSoup)
+
+        Returns:
+            Dicionário campo -> elemento (None para campos não encontrados)
+        """
+        found: Dict[str, Optional[Tag]] = {field.name: None for field in self.fields}
+        pending = len(self.fields)
+        for element in card.descendants:
+            if not isinstance(element, Tag):
+                continue
+            candidates = self._by_tag.get(element.name)
+            for rules in (candidates, self._any_tag):
+                if not rules:
+                    continue
+                for field in rules:
+                    if found[field.name] is not None or not field.matches(element):
+                        continue
+                    if field.within is not None and not self._is_inside(element, found[field.within], card):
+                        continue
+                    found[field.name] = element
+                    pending -= 1
+            if pending == 0:
+                break
+        return found
+
+    @staticmethod
+    def _is_inside(element: Tag, container: Optional[Tag], card: Tag) -> bool:
+        """Indica se o elemento está dentro do container (já encontrado no card)"""
+        if container is None:
+            return False
+        for parent in element.parents:
+            if parent is container:
+                return True
+            if parent is card:
+                return False
+        return False
+
+def text_of(element: Optional[Tag]) -> Optional[str]:
+    """Texto do elemento sem espaços nas pontas (None se ausente ou vazio)"""
+    if element is None:
+        return None
+    return element.get_text(strip=True) or None
@@ -0,0 +1,114 @@
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+from selenium.webdriver.chrome.service import Service
+
+logger = logging.getLogger(__name__)
+
+class SharedChromeDriverService(Service):
+    """
+    Processo único do ChromeDriver compartilhado por todas as sessões do Chrome.
+
+    O ChromeDriver atende várias sessões ao mesmo tempo, então cada driver só
+    precisa iniciar o próprio Chrome. O webdriver.Chrome chama start() ao ser
+    criado e stop() no quit(); aqui start() apenas garante que o processo está
+    no ar (reiniciando-o se tiver caído) e stop() não faz nada. O processo é
+    encerrado pela aplicação com shutdown().
+    """
+
+    # Indica ao pool que a árvore de processos do serviço contém os Chromes de todas as sessões
+    shared = True
+
+    def __init__(self, executable_path: Optional[str] = None,
+                 path_resolver: Optional[Callable[[], str]] = None, **kwargs):
+        """
+        Inicializa o serviço compartilhado (o processo só é iniciado na primeira sessão)
+
+        Args:
+            executable_path: Caminho do binário do ChromeDriver
+            path_resolver: Função que localiza o binário (ex.: download pelo ChromeDriverManager),
+                chamada só quando a primeira sessão precisar do caminho
+            **kwargs: Demais argumentos do Service do Selenium (port, service_args, log_output...)
+        """
+        self._path_resolver = path_resolver
+        self._path_lock = threading.Lock()
+        super().__init__(executable_path=executable_path, **kwargs)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.sessions_started = 0
+        self.restarts = 0
+
+    @property
+    def path(self) -> str:
+        """Caminho do ChromeDriver, localizado por path_resolver na primeira vez que é lido"""
+        with self._path_lock:
+            if not self._path and self._path_resolver is not None:
+                self._path = self._path_resolver()
+        return self._path or ""
+
+    @path.setter
+    def path(self, value: str):
+        self._path = str(value)
+
+    def is_running(self) -> bool:
+        """Indica se o processo do ChromeDriver está no ar"""
+        process = getattr(self, 'process', None)
+        return process is not None and process.poll() is None
+
+    def start(self):
+        """Garante que o ChromeDriver está no ar antes de uma nova sessão"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Serviço do ChromeDriver encerrado")
+            self.sessions_started += 1
+            if self.is_running():
+                return
+            if getattr(self, 'process', None) is not None:
+                self.restarts += 1
+                logger.warning("ChromeDriver compartilhado não está respondendo, reiniciando...")
+            super().start()
+            logger.info(f"ChromeDriver compartilhado iniciado (pid {self.process.pid}, porta {self.port})")
+
+    def stop(self):
+        """Ignorado: encerrar uma sessão não encerra o ChromeDriver compartilhado"""
+
+    def shutdown(self):
+        """Encerra o processo do ChromeDriver compartilhado"""
+        with self._lock:
+            self._closed = True
+            if getattr(self, 'process', None) is not None:
+                super().stop()
+                logger.info("ChromeDriver compartilhado encerrado")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do serviço
+
+        Returns:
+            Dicionário com estado, pid, porta, sessões iniciadas e reinícios
+        """
+        return {
+            'running': self.is_running(),
+            'pid': self.process.pid if self.is_running() else None,
+            'port': self.port,
+            'sessions_started': self.sessions_started,
+            'restarts': self.restarts
+        }
+
+    def __del__(self):
+        try:
+            self.shutdown()
+        except Exception:
+            pass
+
+# Serviço usado na criação dos drivers (configurável pela aplicação; None cria um ChromeDriver por driver)
+_default_service: Optional[SharedChromeDriverService] = None
+
+def get_default_chromedriver_service() -> Optional[SharedChromeDriverService]:
+    """Retorna o serviço do ChromeDriver compartilhado"""
+    return _default_service
+
+def set_default_chromedriver_service(service: Optional[SharedChromeDriverService]):
+    """Define o serviço do ChromeDriver compartilhado (None volta a um ChromeDriver por driver)"""
+    global _default_service
+    _default_service = service
@@ -0,0 +1,472 @@
+import os
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # Opcional: sem psutil, a memória é lida de /proc (Linux)
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Motivos de reciclagem de drivers
+RECYCLE_PAGES = 'pages'  # Serviu o número máximo de páginas
+RECYCLE_AGE = 'age'  # Está vivo há mais tempo que o permitido
+RECYCLE_MEMORY = 'memory'  # Processos do Chrome passaram do limite de memória
+
+class DriverPool:
+    """Pool limitado de drivers Selenium pré-iniciados, com empréstimo e devolução"""
+
+    def __init__(self, driver_factory: Callable[[], Any], max_size: int = 3, lease_timeout: float = 120,
+                 max_pages: Optional[int] = None, max_age: Optional[float] = None,
+                 max_memory_mb: Optional[float] = None, recycle_interval: float = 30):
+        """
+        Inicializa o pool de drivers
+
+        Args:
+            driver_factory: Função que cria um novo driver já configurado; recebe a afinidade
+                (ex.: chave da farmácia, para usar o perfil dela) quando o empréstimo informa uma
+            max_size: Número máximo de drivers vivos (ociosos + emprestados)
+            lease_timeout: Tempo máximo de espera por um driver livre, em segundos
+            max_pages: Páginas servidas por driver antes de reciclá-lo (None = sem limite)
+            max_age: Idade máxima de um driver, em segundos (None = sem limite)
+            max_memory_mb: Memória (RSS) máxima dos processos do Chrome de um driver, em MB (None = sem limite)
+            recycle_interval: Intervalo da verificação em segundo plano, em segundos
+        """
+        if max_size < 1:
+            raise ValueError("O tamanho do pool de drivers deve ser pelo menos 1")
+        self.driver_factory = driver_factory
+        self.max_size = max_size
+        self.lease_timeout = lease_timeout
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_memory_mb = max_memory_mb
+        self.recycle_interval = recycle_interval
+        self._idle: List[Any] = []
+        self._leased = set()
+        self._drivers: Dict[Any, Dict[str, Any]] = {}  # Páginas servidas, criação e memória de cada driver vivo
+        self._recycler: Optional[threading.Thread] = None
+        self._stop_recycler = threading.Event()
+        self._size = 0  # Drivers vivos, incluindo os que estão sendo criados
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'leases': 0,
+            'discarded': 0,
+            'lease_timeouts': 0,
+            'recycled': 0
+        }
+        self._recycle_reasons = {RECYCLE_PAGES: 0, RECYCLE_AGE: 0, RECYCLE_MEMORY: 0}
+
+    def prewarm(self, count: Optional[int] = None) -> int:
+        """
+        Inicia drivers antecipadamente para que os primeiros empréstimos não esperem o Chrome
+
+        Args:
+            count: Quantidade de drivers a iniciar (padrão: tamanho máximo do pool)
+
+        Returns:
+            Quantidade de drivers efetivamente criados
+        """
+        target = self.max_size if count is None else min(count, self.max_size)
+        created = 0
+        while True:
+            with self._condition:
+                if self._closed or self._size >= target:
+                    break
+                self._size += 1
+            try:
+                driver = self._create_driver()
+            except Exception as e:
+                logger.error(f"Erro ao pré-iniciar driver: {e}")
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                break
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+            created += 1
+        logger.info(f"Pool de drivers pré-aquecido com {created} driver(s)")
+        return created
+
+    def lease(self, timeout: Optional[float] = None, affinity: Optional[str] = None) -> Any:
+        """
+        Empresta um driver do pool, criando um novo se houver capacidade
+
+        Com afinidade, prefere um driver ocioso criado para ela (ou sem afinidade);
+        se não houver, cria um novo para ela e, sem capacidade, usa qualquer ocioso.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (padrão: lease_timeout)
+            affinity: Afinidade desejada (ex.: chave da farmácia)
+
+        Returns:
+            Driver Selenium emprestado
+        """
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        retired = []
+        try:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Pool de drivers encerrado")
+                    driver = self._pick_idle(affinity, allow_other=self._size >= self.max_size)
+                    if driver is not None:
+                        self._idle.remove(driver)
+                        reason = self._recycle_reason(driver)
+                        if reason:
+                            # Passou do limite enquanto estava ocioso: reciclar e tentar o próximo
+                            self._retire(driver, reason)
+                            retired.append(driver)
+                            continue
+                        self._leased.add(driver)
+                        self._stats['leases'] += 1
+                        return driver
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['lease_timeouts'] += 1
+                        raise TimeoutError(f"Nenhum driver disponível no pool após {timeout}s")
+                    self._condition.wait(remaining)
+        finally:
+            for driver in retired:
+                self._quit_driver(driver)
+
+        # Criar o driver fora do lock para não bloquear devoluções
+        try:
+            driver = self._create_driver(affinity)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._leased.add(driver)
+            self._stats['leases'] += 1
+        return driver
+
+    def release(self, driver: Any, discard: bool = False):
+        """
+        Devolve um driver ao pool, descartando-o se não passar na verificação de saúde
+
+        Args:
+            driver: Driver emprestado anteriormente
+            discard: Força o descarte do driver (ex.: sessão inválida)
+        """
+        with self._condition:
+            reason = None if discard or self._closed else self._recycle_reason(driver)
+        # Drivers que passaram dos limites são reciclados na devolução, nunca durante o uso
+        healthy = not discard and reason is None and self._is_healthy(driver)
+        with self._condition:
+            self._leased.discard(driver)
+            keep = healthy and not self._closed
+            if keep:
+                self._idle.append(driver)
+                self._condition.notify()
+            elif reason:
+                self._retire(driver, reason)
+            else:
+                self._remove(driver)
+                self._stats['discarded'] += 1
+        if not keep:
+            if not reason:
+                logger.info("Driver descartado ao ser devolvido ao pool")
+            self._quit_driver(driver)
+
+    def record_page(self, driver: Any):
+        """
+        Registra uma página servida pelo driver (usado no limite de páginas por driver)
+
+        Args:
+            driver: Driver emprestado do pool
+        """
+        with self._condition:
+            info = self._drivers.get(driver)
+            if info is not None:
+                info['pages'] += 1
+
+    def recycle(self) -> int:
+        """
+        Mede a memória dos drivers e recicla os ociosos que passaram dos limites,
+        repondo-os com drivers novos. Os emprestados são reciclados ao serem devolvidos.
+
+        Returns:
+            Quantidade de drivers ociosos reciclados
+        """
+        if self.max_memory_mb is not None:
+            with self._condition:
+                drivers = list(self._drivers.items())
+            for driver, info in drivers:
+                info['rss_mb'] = get_driver_rss_mb(driver)
+        retired = []
+        with self._condition:
+            if self._closed:
+                return 0
+            target_size = self._size
+            for driver in list(self._idle):
+                reason = self._recycle_reason(driver)
+                if reason:
+                    self._idle.remove(driver)
+                    self._retire(driver, reason)
+                    retired.append(driver)
+        for driver in retired:
+            self._quit_driver(driver)
+        if retired:
+            # Repor os drivers reciclados para que o próximo empréstimo não espere o Chrome iniciar
+            self.prewarm(target_size)
+        return len(retired)
+
+    def start_recycler(self):
+        """Inicia a verificação periódica de reciclagem em segundo plano"""
+        with self._condition:
+            if self._recycler is not None or self._closed:
+                return
+            self._recycler = threading.Thread(target=self._recycle_loop, name='driver-pool-recycler', daemon=True)
+        self._recycler.start()
+        logger.info(f"Reciclagem de drivers iniciada (a cada {self.recycle_interval}s)")
+
+    def _recycle_loop(self):
+        """Executa a reciclagem periodicamente até o pool ser encerrado"""
+        while not self._stop_recycler.wait(self.recycle_interval):
+            try:
+                self.recycle()
+            except Exception as e:
+                logger.error(f"Erro na reciclagem de drivers: {e}")
+
+    def _recycle_reason(self, driver: Any) -> Optional[str]:
+        """Retorna o motivo para reciclar o driver, ou None se estiver dentro dos limites (chamado sob o lock)"""
+        info = self._drivers.get(driver)
+        if info is None:
+            return None
+        if self.max_pages is not None and info['pages'] >= self.max_pages:
+            return RECYCLE_PAGES
+        if self.max_age is not None and time.monotonic() - info['created_at'] >= self.max_age:
+            return RECYCLE_AGE
+        if self.max_memory_mb is not None and info['rss_mb'] is not None and info['rss_mb'] >= self.max_memory_mb:
+            return RECYCLE_MEMORY
+        return None
+
+    def _retire(self, driver: Any, reason: str):
+        """Remove um driver reciclado do pool (chamado sob o lock; o driver é encerrado fora dele)"""
+        info = self._remove(driver) or {}
+        self._stats['recycled'] += 1
+        self._recycle_reasons[reason] += 1
+        logger.info(f"Driver reciclado ({reason}): {info.get('pages', 0)} páginas, RSS {info.get('rss_mb')} MB")
+
+    def _remove(self, driver: Any) -> Optional[Dict[str, Any]]:
+        """Remove um driver da contagem do pool (chamado sob o lock)"""
+        self._size -= 1
+        self._condition.notify()
+        return self._drivers.pop(driver, None)
+
+    @contextmanager
+    def leased(self, timeout: Optional[float] = None, affinity: Optional[str] = None):
+        """
+        Context manager que empresta um driver e o devolve ao final
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+            affinity: Afinidade desejada (ver lease)
+        """
+        driver = self.lease(timeout, affinity)
+        discard = False
+        try:
+            yield driver
+        except Exception as e:
+            discard = 'invalid session id' in str(e).lower()
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def close(self):
+        """Encerra todos os drivers ociosos; os emprestados são encerrados ao serem devolvidos"""
+        self._stop_recycler.set()
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            for driver in idle:
+                self._remove(driver)
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit_driver(driver)
+        logger.info("Pool de drivers encerrado")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do pool
+
+        Returns:
+            Dicionário com estatísticas do pool
+        """
+        now = time.monotonic()
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'leased': len(self._leased),
+                **self._stats,
+                'recycle_reasons': dict(self._recycle_reasons),
+                'limits': {
+                    'max_pages': self.max_pages,
+                    'max_age': self.max_age,
+                    'max_memory_mb': self.max_memory_mb
+                },
+                'drivers': [
+                    {
+                        'state': 'leased' if driver in self._leased else 'idle',
+                        'affinity': info['affinity'],
+                        'pages': info['pages'],
+                        'age_seconds': round(now - info['created_at'], 1),
+                        'rss_mb': info['rss_mb']
+                    }
+                    for driver, info in self._drivers.items()
+                ]
+            }
+
+    def _pick_idle(self, affinity: Optional[str], allow_other: bool) -> Optional[Any]:
+        """
+        Escolhe um driver ocioso para a afinidade (chamado sob o lock)
+
+        LIFO: o driver usado mais recentemente é o mais "quente".
+        """
+        for driver in reversed(self._idle):
+            driver_affinity = self._drivers.get(driver, {}).get('affinity')
+            if affinity is None or driver_affinity in (None, affinity):
+                return driver
+        if allow_other and self._idle:
+            return self._idle[-1]
+        return None
+
+    def _create_driver(self, affinity: Optional[str] = None) -> Any:
+        """Cria um driver usando a factory configurada"""
+        driver = self.driver_factory() if affinity is None else self.driver_factory(affinity)
+        with self._condition:
+            self._stats['created'] += 1
+            self._drivers[driver] = {'created_at': time.monotonic(), 'pages': 0, 'rss_mb': None, 'affinity': affinity}
+        logger.info("Novo driver criado para o pool")
+        return driver
+
+    def _is_healthy(self, driver: Any) -> bool:
+        """Verifica se o driver responde e o deixa em uma página em branco para o próximo uso"""
+        try:
+            handles = driver.window_handles
+            if not handles:
+                return False
+            # Fechar abas extras abertas durante o uso
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            logger.warning(f"Driver falhou na verificação de saúde: {e}")
+            return False
+
+    def _quit_driver(self, driver: Any):
+        """Encerra um driver ignorando erros"""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Erro ao encerrar driver: {e}")
+
+def get_driver_rss_mb(driver: Any) -> Optional[float]:
+    """
+    Soma a memória residente (RSS) dos processos do Chrome iniciados pelo ChromeDriver do driver
+
+    Args:
+        driver: Driver Selenium (Chrome)
+
+    Returns:
+        RSS em MB, ou None se não for possível medir
+    """
+    try:
+        if getattr(driver.service, 'shared', False):
+            # O ChromeDriver compartilhado é pai dos Chromes de todas as sessões: medir só o navegador do driver
+            pid, include_root = _find_browser_pid(driver), True
+        else:
+            pid, include_root = driver.service.process.pid, False
+    except AttributeError:
+        return None
+    if not isinstance(pid, int):
+        return None
+    try:
+        if psutil is not None:
+            process = psutil.Process(pid)
+            processes = process.children(recursive=True) + ([process] if include_root else [])
+            rss = 0
+            for child in processes:
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return round(rss / (1024 * 1024), 1)
+        return _proc_tree_rss_mb(pid, include_root)
+    except Exception as e:
+        logger.debug(f"Não foi possível medir a memória do driver: {e}")
+        return None
+
+def _find_browser_pid(driver: Any) -> Optional[int]:
+    """Localiza o processo principal do Chrome de um driver pelo diretório de perfil da sessão"""
+    user_data_dir = driver.capabilities.get('chrome', {}).get('userDataDir')
+    if not user_data_dir:
+        return None
+    flag = f"--user-data-dir={user_data_dir}"
+    if psutil is not None:
+        for process in psutil.process_iter(['pid', 'cmdline']):
+            cmdline = process.info['cmdline'] or []
+            if flag in cmdline and not any(arg.startswith('--type=') for arg in cmdline):
+                return process.info['pid']
+        return None
+    if not os.path.isdir('/proc'):
+        return None
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                cmdline = f.read().decode('utf-8', 'ignore').split('\0')
+        except OSError:
+            continue
+        # Os processos filhos (renderizadores, GPU) também recebem --user-data-dir, mas com --type=
+        if flag in cmdline and not any(arg.startswith('--type=') for arg in cmdline):
+            return int(entry)
+    return None
+
+def _proc_tree_rss_mb(root_pid: int, include_root: bool = False) -> Optional[float]:
+    """Soma o RSS dos descendentes de um processo (e opcionalmente do próprio processo) lendo /proc (Linux)"""
+    if not os.path.isdir('/proc'):
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # O nome do processo fica entre parênteses e pode conter espaços
+                fields = f.read().rsplit(')', 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    rss = 0
+    pending = [root_pid] if include_root else list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                rss += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return round(rss / (1024 * 1024), 1)
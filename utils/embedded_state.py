@@ -0,0 +1,101 @@
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from utils.money import parse_brl, to_reais
+
+logger = logging.getLogger(__name__)
+
+# Script em que aplicações Next.js serializam o estado da página renderizada no servidor
+NEXT_DATA_SCRIPT_ID = '__NEXT_DATA__'
+
+def load_next_data(soup) -> Optional[Dict[str, Any]]:
+    """
+    Lê o estado embutido de uma página Next.js (<script id="__NEXT_DATA__">)
+
+    Args:
+        soup: HTML parseado (BeautifulSoup)
+
+    Returns:
+        Estado da página, ou None se ausente ou inválido
+    """
+    script = soup.find('script', id=NEXT_DATA_SCRIPT_ID)
+    if script is None or not script.string:
+        return None
+    try:
+        return json.loads(script.string)
+    except ValueError as e:
+        logger.warning(f"Estado embutido (__NEXT_DATA__) inválido: {e}")
+        return None
+
+def find_records(state: Any, is_record: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+    """
+    Procura no estado a maior lista de registros que satisfazem o critério
+
+    O formato do estado muda com as versões do site; em vez de um caminho
+    fixo, a busca percorre todo o JSON e escolhe a lista com mais registros
+    reconhecidos (ex.: a lista de produtos da busca).
+
+    Args:
+        state: Estado da página (dicts e listas aninhados)
+        is_record: Função que indica se um dict é um registro procurado
+
+    Returns:
+        Registros da maior lista encontrada (vazia se nenhuma)
+    """
+    best: List[Dict[str, Any]] = []
+    pending = [state]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            records = [item for item in node if isinstance(item, dict) and is_record(item)]
+            if len(records) > len(best):
+                best = records
+            pending.extend(node)
+    return best
+
+def first_value(record: Dict[str, Any], keys: Iterable[str]) -> Any:
+    """
+    Retorna o primeiro valor não vazio do registro entre as chaves candidatas
+
+    Args:
+        record: Registro do estado
+        keys: Chaves candidatas, em ordem de preferência; aceitam caminhos com ponto (ex.: 'price.final')
+
+    Returns:
+        Valor encontrado, ou None
+    """
+    for key in keys:
+        value: Any = record
+        for part in key.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+def to_text(value: Any) -> Optional[str]:
+    """Converte um valor do estado em texto (dicts com 'name', 'label' ou 'value' são aceitos)"""
+    if isinstance(value, dict):
+        value = first_value(value, ('name', 'label', 'value'))
+    if isinstance(value, list):
+        value = to_text(value[0]) if value else None
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        text = str(value).strip()
+        return text or None
+    return None
+
+def to_price(value: Any) -> Optional[float]:
+    """
+    Converte um valor de preço do estado em float (pelos centavos de utils.money)
+
+    Aceita números, textos no formato brasileiro ('R$ 1.234,56') ou decimal
+    ('12.90') e dicts com 'value' ou 'amount'.
+
+    Returns:
+        Preço, ou None se ausente ou não positivo
+    """
+    if isinstance(value, dict):
+        value = first_value(value, ('value', 'amount', 'final', 'price'))
+    centavos = parse_brl(value)
+    return to_reais(centavos) if centavos > 0 else None
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class FixtureStore:
+    """
+    Páginas gravadas das farmácias para execuções offline (benchmarks e testes).
+
+    O corpo de cada página é salvo uma única vez, endereçado pelo seu SHA-256
+    (blobs/), e um índice (index/) aponta cada par URL + termo de busca para o
+    corpo gravado. A mesma página de produto vista em várias buscas ocupa um
+    só arquivo; páginas gravadas sem termo (ou de outro termo) servem de
+    reserva quando o par exato não existe.
+    """
+
+    def __init__(self, root: str):
+        """
+        Inicializa o armazenamento
+
+        Args:
+            root: Diretório das páginas gravadas
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry_key(url: str, search_term: Optional[str] = None) -> str:
+        """Chave do índice para a URL e o termo de busca"""
+        return hashlib.sha256(f"{search_term or ''}\n{url}".encode('utf-8')).hexdigest()
+
+    def _get_blob_path(self, content_hash: str) -> str:
+        """Obtém o caminho do corpo gravado"""
+        return os.path.join(self.root, 'blobs', f"{content_hash}.body")
+
+    def _get_entry_path(self, key: str) -> str:
+        """Obtém o caminho da entrada do índice"""
+        return os.path.join(self.root, 'index', f"{key}.json")
+
+    def put(self, url: str, content: str, status_code: int = 200, kind: str = '',
+            search_term: Optional[str] = None) -> str:
+        """
+        Grava uma página
+
+        Args:
+            url: URL requisitada
+            content: Corpo da página (HTML ou JSON)
+            status_code: Status HTTP da resposta
+            kind: Tipo de página ('listing', 'product' ou 'api')
+            search_term: Termo da busca que obteve a página
+
+        Returns:
+            SHA-256 do corpo gravado
+        """
+        body = content.encode('utf-8')
+        content_hash = hashlib.sha256(body).hexdigest()
+        entry = {
+            'url': url,
+            'search_term': search_term,
+            'kind': kind,
+            'status_code': status_code,
+            'content_sha256': content_hash,
+            'recorded_at': time.time()
+        }
+        with self._lock:
+            os.makedirs(os.path.join(self.root, 'blobs'), exist_ok=True)
+            os.makedirs(os.path.join(self.root, 'index'), exist_ok=True)
+            blob_path = self._get_blob_path(content_hash)
+            if not os.path.exists(blob_path):
+                self._write(blob_path, body)
+            keys = {self.entry_key(url, search_term), self.entry_key(url)}
+            for key in keys:
+                self._write(self._get_entry_path(key), json.dumps(entry, ensure_ascii=False, indent=2).encode('utf-8'))
+        return content_hash
+
+    def get(self, url: str, search_term: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma página gravada, preferindo a gravada com o mesmo termo de busca
+
+        Args:
+            url: URL requisitada
+            search_term: Termo da busca atual
+
+        Returns:
+            Entrada do índice com 'content', ou None se a URL não foi gravada
+        """
+        for key in dict.fromkeys((self.entry_key(url, search_term), self.entry_key(url))):
+            try:
+                with open(self._get_entry_path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                with open(self._get_blob_path(entry['content_sha256']), 'r', encoding='utf-8') as f:
+                    entry['content'] = f.read()
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Página gravada inválida para {url}: {e}")
+                continue
+            return entry
+        return None
+
+    def iter_entries(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre as páginas gravadas, uma vez por corpo distinto
+
+        Args:
+            kind: Filtra pelo tipo de página ('listing', 'product' ou 'api')
+
+        Yields:
+            Entradas do índice com 'content'
+        """
+        seen = set()
+        index_dir = os.path.join(self.root, 'index')
+        try:
+            names = sorted(os.listdir(index_dir))
+        except FileNotFoundError:
+            return
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(index_dir, name), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry['content_sha256'] in seen or (kind and entry.get('kind') != kind):
+                    continue
+                with open(self._get_blob_path(entry['content_sha256']), 'r', encoding='utf-8') as f:
+                    entry['content'] = f.read()
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Entrada gravada inválida ({name}): {e}")
+                continue
+            seen.add(entry['content_sha256'])
+            yield entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do armazenamento
+
+        Returns:
+            Dicionário com entradas do índice, corpos distintos e bytes gravados
+        """
+        def list_dir(name):
+            try:
+                return [os.path.join(self.root, name, f) for f in os.listdir(os.path.join(self.root, name))]
+            except FileNotFoundError:
+                return []
+        blobs = list_dir('blobs')
+        return {
+            'root': self.root,
+            'entries': len(list_dir('index')),
+            'blobs': len(blobs),
+            'bytes': sum(os.path.getsize(path) for path in blobs)
+        }
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        """Escreve o arquivo de forma atômica (leitores nunca veem um arquivo pela metade)"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+# Armazenamento em que os scrapers gravam as páginas obtidas (configurável pela aplicação; None desativa a captura)
+_default_capture_store: Optional[FixtureStore] = None
+
+def get_default_capture_store() -> Optional[FixtureStore]:
+    """Retorna o armazenamento de captura padrão"""
+    return _default_capture_store
+
+def set_default_capture_store(store: Optional[FixtureStore]):
+    """Define o armazenamento de captura padrão (None desativa a captura)"""
+    global _default_capture_store
+    _default_capture_store = store
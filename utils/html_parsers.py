@@ -0,0 +1,125 @@
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # Opcional: sem selectolax, o backend 'selectolax' não é registrado
+    SelectolaxParser = None
+
+logger = logging.getLogger(__name__)
+
+PARSER_HTML = 'html.parser'  # Parser puro Python da biblioteca padrão
+PARSER_LXML = 'lxml'  # libxml2 (C), via lxml
+PARSER_SELECTOLAX = 'selectolax'  # Lexbor (C): consultas por seletor CSS sem montar a árvore do BeautifulSoup
+
+class ParserBackend:
+    """
+    Forma de parsear o HTML das páginas.
+
+    parse() sempre devolve um BeautifulSoup, usado pelos extratores dos
+    scrapers; has_match() responde apenas se um seletor CSS existe na página
+    (ex.: checagem de listagem com produtos) e pode usar um parser mais rápido.
+    """
+
+    # Indica se has_match() responde sem montar a árvore do BeautifulSoup; sem isso, a checagem da
+    # listagem usa a própria árvore restrita da extração (BaseScraper._has_listing_content)
+    match_without_tree = False
+
+    def __init__(self, name: str, builder: str):
+        """
+        Args:
+            name: Nome do backend
+            builder: Tree builder do BeautifulSoup ('html.parser' ou 'lxml')
+        """
+        self.name = name
+        self.builder = builder
+
+    def parse(self, content: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        Parseia o HTML
+
+        Args:
+            content: HTML da página
+            parse_only: Regiões a montar (ver region_strainer); None monta o documento inteiro
+        """
+        return BeautifulSoup(content, self.builder, parse_only=parse_only)
+
+    def has_match(self, content: str, selector: str) -> bool:
+        """Indica se algum elemento do HTML satisfaz o seletor CSS"""
+        return self.parse(content).select_one(selector) is not None
+
+class SelectolaxBackend(ParserBackend):
+    """Seletores pelo Lexbor (selectolax); a árvore para os extratores continua no lxml"""
+
+    match_without_tree = True
+
+    def __init__(self):
+        super().__init__(PARSER_SELECTOLAX, PARSER_LXML)
+
+    def has_match(self, content: str, selector: str) -> bool:
+        return SelectolaxParser(content).css_first(selector) is not None
+
+def region_strainer(*regions: Tuple[str, Optional[str], Optional[str]]) -> SoupStrainer:
+    """
+    Cria um filtro que monta apenas as regiões da página usadas pelo extrator
+
+    Cada região é (tag, atributo, valor); atributo None aceita qualquer elemento
+    da tag. Para 'class', o valor precisa ser uma das classes do elemento. A
+    região inteira (o elemento e tudo dentro dele) é mantida; o resto do
+    documento nem chega a virar objetos do BeautifulSoup.
+
+    Args:
+        *regions: Regiões mantidas, ex.: ('div', 'data-testid', 'container-products')
+
+    Returns:
+        SoupStrainer para ParserBackend.parse(parse_only=...)
+    """
+    def matches(name, attrs):
+        for tag, attribute, value in regions:
+            if name != tag:
+                continue
+            if attribute is None:
+                return True
+            actual = (attrs or {}).get(attribute)
+            if attribute == 'class':
+                classes = actual.split() if isinstance(actual, str) else (actual or [])
+                if value in classes:
+                    return True
+            elif actual == value:
+                return True
+        return False
+    return SoupStrainer(matches)
+
+# Backends disponíveis por nome
+_backends: Dict[str, ParserBackend] = {
+    PARSER_HTML: ParserBackend(PARSER_HTML, PARSER_HTML),
+    PARSER_LXML: ParserBackend(PARSER_LXML, PARSER_LXML)
+}
+if SelectolaxParser is not None:
+    _backends[PARSER_SELECTOLAX] = SelectolaxBackend()
+_backends_lock = threading.Lock()
+
+def get_parser_backend(name: str) -> ParserBackend:
+    """
+    Retorna o backend registrado com o nome
+
+    Raises:
+        ValueError: Se o backend não estiver disponível (ex.: dependência opcional ausente)
+    """
+    with _backends_lock:
+        backend = _backends.get(name)
+    if backend is None:
+        raise ValueError(f"Parser HTML indisponível: {name} (disponíveis: {', '.join(available_parser_backends())})")
+    return backend
+
+def register_parser_backend(backend: ParserBackend):
+    """Registra (ou substitui) um backend pelo seu nome"""
+    with _backends_lock:
+        _backends[backend.name] = backend
+
+def available_parser_backends() -> List[str]:
+    """Nomes dos backends registrados"""
+    with _backends_lock:
+        return list(_backends)
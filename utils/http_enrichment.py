@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from utils.http_session import get_default_http_session
+
+logger = logging.getLogger(__name__)
+
+# Resultado de uma página de produto: (url, brand, price, original_price, discount_percentage, has_discount)
+EnrichmentResult = Tuple[str, Optional[str], Any, Any, Optional[int], bool]
+
+class HttpEnrichmentEngine:
+    """
+    Busca páginas de produto por HTTP, sem navegador, para completar marca e preço.
+
+    Um event loop asyncio próprio, em uma thread de fundo, coordena todos os
+    lotes, e cada lote tem um orçamento de tempo; as páginas que não terminarem
+    dentro dele ficam sem resultado. As requisições usam a sessão HTTP
+    keep-alive compartilhada e bloqueiam uma thread do pool até terminar, por
+    isso o limite de páginas simultâneas por host (compartilhado entre as
+    buscas) é um semáforo de threads segurado pela própria requisição: uma
+    página fora do orçamento continua ocupando a vaga do host até a requisição
+    acabar, e as que ainda esperavam vaga são descartadas sem requisição.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, per_host_limit: int = 4,
+                 batch_timeout: float = 20, request_timeout: float = 10, max_workers: int = 16):
+        """
+        Inicializa o motor de enriquecimento
+
+        Args:
+            session: Sessão HTTP usada nas requisições (padrão: a sessão compartilhada)
+            per_host_limit: Máximo de páginas simultâneas por host, somando todas as buscas
+            batch_timeout: Orçamento de tempo de um lote de páginas, em segundos
+            request_timeout: Limite de espera de cada requisição, em segundos
+            max_workers: Threads que executam as requisições
+        """
+        if per_host_limit < 1:
+            raise ValueError("O limite por host deve ser pelo menos 1")
+        self.session = session
+        self.per_host_limit = per_host_limit
+        self.batch_timeout = batch_timeout
+        self.request_timeout = request_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http-enrichment')
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='http-enrichment-loop', daemon=True)
+        self._thread.start()
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limits_lock = threading.Lock()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.pages_fetched = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def fetch_all(self, urls: Iterable[str], stats=None) -> Dict[str, Optional[str]]:
+        """
+        Busca as páginas em paralelo, respeitando o limite por host e o orçamento do lote
+
+        Args:
+            urls: URLs das páginas
+            stats: NetworkStats da busca, para contabilizar as páginas (opcional)
+
+        Returns:
+            Dicionário url -> HTML (None para páginas com erro ou fora do orçamento)
+        """
+        if self._closed:
+            raise RuntimeError("Motor de enriquecimento HTTP encerrado")
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        future = asyncio.run_coroutine_threadsafe(self._fetch_batch(urls, stats), self._loop)
+        return future.result()
+
+    def enrich(self, urls: Iterable[str], extract: Callable[[str], Dict[str, Any]], stats=None,
+               on_page: Optional[Callable[[str, str], None]] = None) -> List[EnrichmentResult]:
+        """
+        Busca as páginas de produto e extrai os detalhes de cada uma
+
+        Args:
+            urls: URLs das páginas de produto
+            extract: Função que recebe o HTML e retorna os detalhes (brand, price, original_price,
+                discount_percentage, has_discount), como _extract_details_from_product_page
+            stats: NetworkStats da busca (opcional)
+            on_page: Função chamada com (url, html) de cada página obtida (ex.: captura de fixtures)
+
+        Returns:
+            Lista de (url, brand, price, original_price, discount_percentage, has_discount)
+            das páginas obtidas
+        """
+        results = []
+        for url, html in self.fetch_all(urls, stats).items():
+            if html is None:
+                continue
+            if on_page is not None:
+                on_page(url, html)
+            try:
+                details = extract(html) or {}
+            except Exception as e:
+                logger.warning(f"Erro ao extrair detalhes de {url}: {e}")
+                continue
+            results.append((url, details.get('brand'), details.get('price'), details.get('original_price'),
+                            details.get('discount_percentage'), bool(details.get('has_discount', False))))
+        return results
+
+    async def _fetch_batch(self, urls: List[str], stats) -> Dict[str, Optional[str]]:
+        """Busca um lote de páginas dentro do orçamento de tempo (executado no event loop do motor)"""
+        # Sinaliza às requisições que ainda esperam vaga no host que o lote já terminou
+        expired = threading.Event()
+        futures = {self._loop.run_in_executor(self._executor, self._get, url, stats, expired): url for url in urls}
+        done, pending = await asyncio.wait(futures, timeout=self.batch_timeout)
+        if pending:
+            expired.set()
+            for future in pending:
+                future.cancel()
+            with self._stats_lock:
+                self.timeouts += len(pending)
+            logger.warning(f"{len(pending)} páginas de produto excederam o orçamento de {self.batch_timeout}s")
+        return {
+            url: future.result() if future in done and future.exception() is None else None
+            for future, url in futures.items()
+        }
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        """Semáforo do host da URL, com o limite de páginas simultâneas"""
+        host = urlparse(url).netloc
+        with self._host_limits_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+        return limit
+
+    def _get(self, url: str, stats, expired: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        Executa a requisição HTTP (em uma thread do pool), segurando a vaga do host até ela terminar
+
+        Args:
+            url: URL da página
+            stats: NetworkStats da busca (opcional)
+            expired: Evento do lote; se já sinalizado quando a vaga sai, a página é descartada
+
+        Returns:
+            HTML da página, ou None em caso de erro ou lote expirado
+        """
+        with self._host_limit(url):
+            if expired is not None and expired.is_set():
+                return None
+            session = self.session or get_default_http_session()
+            try:
+                response = session.get(url, timeout=self.request_timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.debug(f"Página de produto indisponível por HTTP ({url}): {e}")
+                with self._stats_lock:
+                    self.errors += 1
+                return None
+        if stats is not None:
+            stats.record_http_response(len(response.content))
+        with self._stats_lock:
+            self.pages_fetched += 1
+        return response.text
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do motor
+
+        Returns:
+            Dicionário com limites, páginas obtidas, erros e páginas fora do orçamento
+        """
+        with self._stats_lock:
+            return {
+                'per_host_limit': self.per_host_limit,
+                'batch_timeout': self.batch_timeout,
+                'pages_fetched': self.pages_fetched,
+                'errors': self.errors,
+                'timeouts': self.timeouts
+            }
+
+    def close(self):
+        """Encerra o event loop e o pool de threads do motor"""
+        if self._closed:
+            return
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+# Motor usado pelos scrapers (configurável pela aplicação; None mantém as páginas de produto no navegador)
+_default_engine: Optional[HttpEnrichmentEngine] = None
+
+def get_default_enrichment_engine() -> Optional[HttpEnrichmentEngine]:
+    """Retorna o motor de enriquecimento HTTP padrão"""
+    return _default_engine
+
+def set_default_enrichment_engine(engine: Optional[HttpEnrichmentEngine]):
+    """Define o motor de enriquecimento HTTP padrão (None desativa o enriquecimento por HTTP)"""
+    global _default_engine
+    _default_engine = engine
@@ -0,0 +1,54 @@
+import threading
+import logging
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalhos de navegador enviados nas requisições HTTP diretas às farmácias
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,application/json;q=0.8,*/*;q=0.7',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Connection': 'keep-alive'
+}
+
+def create_http_session(pool_maxsize: int = 10, user_agent: Optional[str] = None) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões keep-alive
+
+    Args:
+        pool_maxsize: Conexões mantidas abertas por host (uma por busca simultânea)
+        user_agent: User-Agent enviado nas requisições
+
+    Returns:
+        Sessão do requests pronta para uso concorrente entre as buscas
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    return session
+
+# Sessão padrão compartilhada pelos scrapers (configurável pela aplicação)
+_default_session: Optional[requests.Session] = None
+_default_session_lock = threading.Lock()
+
+def get_default_http_session() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada, criando-a se necessário"""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_http_session()
+        return _default_session
+
+def set_default_http_session(session: Optional[requests.Session]):
+    """Define a sessão HTTP compartilhada (None recria uma sessão padrão no próximo uso)"""
+    global _default_session
+    with _default_session_lock:
+        previous, _default_session = _default_session, session
+    if previous is not None and previous is not session:
+        previous.close()
@@ -0,0 +1,215 @@
+import math
+import mimetypes
+import os
+import random
+import threading
+import time
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from utils.fixture_store import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+# Origens reais das farmácias, servidas pelo servidor local a partir das páginas gravadas
+PHARMACY_ORIGINS = {
+    'droga_raia': 'https://www.drogaraia.com.br',
+    'sao_joao': 'https://www.saojoaofarmacias.com.br',
+    'panvel': 'https://www.panvel.com'
+}
+
+# Extensões tratadas como recursos da página (JS, CSS, imagens, fontes), e não como páginas gravadas
+RESOURCE_EXTENSIONS = {
+    '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico', '.woff', '.woff2', '.ttf', '.map'
+}
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+class LatencyModel:
+    """Distribuição do atraso de resposta de cada página, em segundos"""
+
+    def __init__(self, distribution: str = 'fixed', mean: float = 0.0, spread: float = 0.0):
+        """
+        Inicializa o modelo de latência
+
+        Args:
+            distribution: 'fixed' (sempre a média), 'uniform' (média ± spread) ou
+                'lognormal' (média com cauda longa; spread é o sigma do log)
+            mean: Atraso médio, em segundos
+            spread: Dispersão da distribuição
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Distribuição de latência inválida: {distribution}")
+        if mean < 0 or spread < 0:
+            raise ValueError("Latência e dispersão não podem ser negativas")
+        self.distribution = distribution
+        self.mean = mean
+        self.spread = spread
+
+    def sample(self, rng: random.Random) -> float:
+        """Sorteia o atraso de uma resposta"""
+        if self.mean == 0:
+            return 0.0
+        if self.distribution == 'uniform':
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.distribution == 'lognormal':
+            # Parametrizada para que a média da distribuição seja a média configurada
+            mu = math.log(self.mean) - self.spread ** 2 / 2
+            return rng.lognormvariate(mu, self.spread)
+        return self.mean
+
+class MockPharmacyServer:
+    """
+    Servidor HTTP local que imita o site de uma farmácia a partir das páginas gravadas.
+
+    Cada requisição é convertida de volta para a URL real (origem da farmácia +
+    caminho e query) e servida do FixtureStore, com a origem real trocada pela
+    do servidor no corpo, para que links de produto e chamadas de API também
+    venham para o servidor local. Latência, taxa de erros (503) e atraso dos
+    recursos da página (JS, CSS, imagens) são configuráveis; recursos não
+    gravados são respondidos vazios.
+    """
+
+    def __init__(self, store: FixtureStore, origin: str, host: str = '127.0.0.1', port: int = 0,
+                 latency: Optional[LatencyModel] = None, error_rate: float = 0.0,
+                 slow_resource_delay: float = 0.0, seed: Optional[int] = None):
+        """
+        Inicializa o servidor
+
+        Args:
+            store: Páginas gravadas
+            origin: Origem real imitada (ex.: 'https://www.panvel.com')
+            host: Endereço de escuta
+            port: Porta de escuta (0 escolhe uma porta livre)
+            latency: Atraso das páginas (padrão: nenhum)
+            error_rate: Fração das páginas respondidas com 503
+            slow_resource_delay: Atraso dos recursos da página, em segundos
+            seed: Semente dos sorteios de latência e erros (execuções reproduzíveis)
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("A taxa de erros deve estar entre 0 e 1")
+        self.store = store
+        self.origin = origin.rstrip('/')
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.slow_resource_delay = slow_resource_delay
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'pages': 0, 'resources': 0, 'errors_injected': 0, 'not_found': 0}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Origem do servidor local (ex.: 'http://127.0.0.1:8123'), usada como base_url_override"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockPharmacyServer':
+        """Inicia o servidor em uma thread de fundo"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='mock-pharmacy', daemon=True)
+            self._thread.start()
+            logger.info(f"Servidor local de {self.origin} em {self.url}")
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do servidor
+
+        Returns:
+            Dicionário com requisições, páginas, recursos, erros injetados e páginas não gravadas
+        """
+        with self._stats_lock:
+            return {'origin': self.origin, 'url': self.url, **self._stats}
+
+    def _count(self, key: str):
+        """Incrementa um contador de estatísticas"""
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _draw(self):
+        """Sorteia a latência e se a página falha"""
+        with self._rng_lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def _respond(self, path: str):
+        """
+        Monta a resposta para o caminho requisitado
+
+        Returns:
+            Tupla (status, content-type, corpo)
+        """
+        self._count('requests')
+        resource_path = urlsplit(path).path
+        extension = os.path.splitext(resource_path)[1].lower()
+        fixture = self.store.get(f"{self.origin}{path}")
+        if fixture is None and extension in RESOURCE_EXTENSIONS:
+            self._count('resources')
+            if self.slow_resource_delay > 0:
+                time.sleep(self.slow_resource_delay)
+            return 200, mimetypes.guess_type(resource_path)[0] or 'application/octet-stream', b''
+        delay, fail = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            self._count('errors_injected')
+            return 503, 'text/plain; charset=utf-8', b'Service Unavailable'
+        if fixture is None:
+            self._count('not_found')
+            return 404, 'text/plain; charset=utf-8', b'Not Found'
+        self._count('pages')
+        content = fixture['content'].replace(self.origin, self.url)
+        content_type = 'application/json' if fixture.get('kind') == 'api' else 'text/html'
+        return fixture.get('status_code', 200), f"{content_type}; charset=utf-8", content.encode('utf-8')
+
+    def _make_handler(self):
+        """Cria a classe de handler ligada a este servidor"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body = server._respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
+
+def start_mock_pharmacies(store: FixtureStore, **options) -> Dict[str, MockPharmacyServer]:
+    """
+    Inicia um servidor local para cada farmácia (PHARMACY_ORIGINS)
+
+    Args:
+        store: Páginas gravadas
+        **options: Opções de MockPharmacyServer (latency, error_rate, slow_resource_delay, seed)
+
+    Returns:
+        Dicionário chave da farmácia -> servidor iniciado (ver server.url)
+    """
+    return {
+        key: MockPharmacyServer(store, origin, **options).start()
+        for key, origin in PHARMACY_ORIGINS.items()
+    }
@@ -0,0 +1,127 @@
+import math
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Valores monetários em centavos inteiros (R$ 12,90 -> 1290): comparações, ordenação e somas sem arredondamento de float
+Centavos = int
+
+# Centavos de um preço ausente ou ilegível; como preços nunca são negativos, `centavos > 0` separa os válidos
+MISSING = -1
+
+# Chave de ordenação dos produtos sem preço (depois de qualquer preço)
+_UNPRICED = sys.maxsize
+
+# Valor do campo de preço dos produtos quando não há preço
+PRICE_UNAVAILABLE = "Preço não disponível"
+
+# Número no formato brasileiro ('1.234,56', '12,9', '1234') ou decimal ('12.90'); o valor após 'R$' tem preferência,
+# e sem 'R$' o texto inteiro precisa ser o número
+_NUMBER = r'\d+(?:\.\d+)*(?:,\d+)?'
+_SYMBOL_RE = re.compile(r'R\$\s*(' + _NUMBER + ')')
+_NUMBER_RE = re.compile(_NUMBER)
+
+# Função JavaScript parseBrl(texto) com o critério de parse_brl(texto, require_symbol=True), para os scripts
+# que leem os preços no DOM do navegador: valor em reais após 'R$', ou null
+PARSE_BRL_JS = r"""
+function parseBrl(text) {
+    var match = text && text.match(/R\$\s*(\d+(?:\.\d+)*(?:,\d+)?)/);
+    if (!match) return null;
+    var parts = match[1].split(','), integer = parts[0], fraction = parts[1] || '';
+    var dot = integer.lastIndexOf('.');
+    if (!fraction && dot > 0 && integer.indexOf('.') === dot && integer.length - dot - 1 <= 2) {
+        fraction = integer.slice(dot + 1);
+        integer = integer.slice(0, dot);
+    }
+    return (parseInt(integer.replace(/\./g, ''), 10) * 100 + parseInt((fraction.slice(0, 2) + '00').slice(0, 2), 10)) / 100;
+}
+"""
+
+def parse_brl(value: Any, require_symbol: bool = False) -> Centavos:
+    """
+    Converte um preço em centavos
+
+    Aceita números (em reais) e textos como 'R$ 1.234,56', '2 por R$ 9,90 cada'
+    (vale o valor após 'R$') ou '12.90'. Sem 'R$', o texto precisa ser só o
+    número: 'Leve 3' e '10% OFF' não são preços. Sem vírgula, um único ponto
+    seguido de um ou dois dígitos é a casa decimal; os demais pontos separam milhares.
+
+    Args:
+        value: Preço em reais (número) ou texto com o preço
+        require_symbol: Exige 'R$' antes do valor (textos de elementos que podem trazer outros números)
+
+    Returns:
+        Centavos, ou MISSING se o valor for ausente, negativo ou ilegível
+    """
+    if isinstance(value, bool) or value is None:
+        return MISSING
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value) or value < 0:
+            return MISSING
+        return round(value * 100)
+    if not isinstance(value, str):
+        return MISSING
+    match = _SYMBOL_RE.search(value)
+    if match:
+        number = match.group(1)
+    elif require_symbol:
+        return MISSING
+    else:
+        match = _NUMBER_RE.fullmatch(value.strip())
+        if not match:
+            return MISSING
+        number = match.group(0)
+    integer, _, fraction = number.partition(',')
+    if not fraction:
+        head, _, tail = integer.rpartition('.')
+        if head and '.' not in head and len(tail) <= 2:
+            integer, fraction = head, tail
+    return int(integer.replace('.', '')) * 100 + int(fraction[:2].ljust(2, '0') if fraction else 0)
+
+def parse_brl_batch(values: Iterable[Any], require_symbol: bool = False) -> List[Centavos]:
+    """
+    Converte uma sequência de preços em centavos (ver parse_brl)
+
+    Args:
+        values: Preços em reais ou textos
+        require_symbol: Exige 'R$' antes do valor
+
+    Returns:
+        Lista de centavos na mesma ordem, com MISSING para os ausentes
+    """
+    return [parse_brl(value, require_symbol) for value in values]
+
+def to_reais(centavos: Centavos) -> Optional[float]:
+    """Valor em reais dos centavos, ou None se MISSING"""
+    if centavos < 0:
+        return None
+    return centavos / 100
+
+def parse_reais(value: Any, require_symbol: bool = False) -> Optional[float]:
+    """
+    Converte um preço em reais, passando pelos centavos (ver parse_brl)
+
+    Returns:
+        Preço em reais, ou None se ausente ou ilegível
+    """
+    return to_reais(parse_brl(value, require_symbol))
+
+def price_field(centavos: Centavos) -> Union[float, str]:
+    """Valor do campo de preço de um produto: reais, ou PRICE_UNAVAILABLE se MISSING"""
+    if centavos < 0:
+        return PRICE_UNAVAILABLE
+    return centavos / 100
+
+def sort_by_price(products: List[Dict[str, Any]], field: str = 'price') -> List[Dict[str, Any]]:
+    """
+    Ordena produtos pelo preço, em centavos, com os sem preço no fim (ordenação estável)
+
+    Args:
+        products: Produtos com o campo de preço em reais, texto ou PRICE_UNAVAILABLE
+        field: Campo do preço
+
+    Returns:
+        Nova lista ordenada
+    """
+    keys = [centavos if centavos >= 0 else _UNPRICED for centavos in parse_brl_batch(p.get(field) for p in products)]
+    return [products[index] for index in sorted(range(len(products)), key=keys.__getitem__)]
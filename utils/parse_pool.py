@@ -0,0 +1,157 @@
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Scraper e opções de construção pré-carregados nos processos: ('scrapers.panvel:PanvelScraper', {...})
+ScraperSpec = Tuple[str, Dict[str, Any]]
+
+# Scrapers já montados neste processo (parser e ProductUnifier carregados), por classe e opções
+_worker_scrapers: Dict[Tuple[str, Tuple], Any] = {}
+
+def scraper_path(scraper_class) -> str:
+    """Caminho importável da classe do scraper, ex.: 'scrapers.panvel:PanvelScraper'"""
+    return f"{scraper_class.__module__}:{scraper_class.__qualname__}"
+
+def _load_scraper(path: str, options: Dict[str, Any]):
+    """Obtém (ou monta, na primeira vez) o scraper deste processo"""
+    key = (path, tuple(sorted(options.items())))
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        module_name, class_name = path.split(':')
+        scraper_class = getattr(importlib.import_module(module_name), class_name)
+        scraper = scraper_class(session_store=None, **options)
+        _worker_scrapers[key] = scraper
+    return scraper
+
+def _init_worker(preload: Tuple[ScraperSpec, ...]):
+    """Inicializa o processo com os scrapers configurados já montados"""
+    for path, options in preload:
+        _load_scraper(path, options)
+
+def _worker_ready() -> int:
+    """Tarefa vazia usada para iniciar os processos antes da primeira busca"""
+    return os.getpid()
+
+def _extract_listing(path: str, options: Dict[str, Any], content: str, search_term: str) -> List[Dict[str, Any]]:
+    """Parseia a listagem e extrai os produtos no processo do pool"""
+    scraper = _load_scraper(path, options)
+    scraper.search_term = search_term
+    return scraper._extract_listing_products(scraper.parse_listing(content), search_term)
+
+class ParsePool:
+    """
+    Pool de processos que parseia as listagens e extrai os produtos fora do processo da aplicação.
+
+    O parse do HTML e os laços de extração são CPU-bound; executados nas
+    threads das buscas, disputam o GIL quando as farmácias respondem juntas.
+    Aqui cada listagem vai para um processo, que devolve os produtos como
+    dicts simples; o enriquecimento pelas páginas de produto continua no
+    scraper. Os processos são iniciados de antemão (start) com os scrapers
+    configurados já montados, isto é, com o parser e o ProductUnifier carregados.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, preload: Iterable[ScraperSpec] = (),
+                 start_method: str = 'spawn'):
+        """
+        Inicializa o pool
+
+        Args:
+            max_workers: Processos do pool (padrão: número de CPUs)
+            preload: Scrapers montados em cada processo ao iniciar, como (caminho da classe, opções)
+            start_method: Forma de criar os processos ('spawn', 'forkserver' ou 'fork'); 'spawn'
+                evita herdar as threads e drivers da aplicação
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if self.max_workers < 1:
+            raise ValueError("O pool de parse precisa de pelo menos 1 processo")
+        self.preload = tuple((path, dict(options)) for path, options in preload)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.preload,)
+        )
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'listings': 0,
+            'products': 0,
+            'errors': 0,
+            'worker_seconds': 0.0
+        }
+
+    def start(self) -> 'ParsePool':
+        """Inicia todos os processos (com os scrapers pré-carregados) antes da primeira busca"""
+        futures = [self._executor.submit(_worker_ready) for _ in range(self.max_workers)]
+        pids = {future.result() for future in futures}
+        logger.info(f"Pool de parse iniciado com {len(pids)} processos")
+        return self
+
+    def extract_listing(self, scraper, content: str, search_term: str) -> List[Dict[str, Any]]:
+        """
+        Parseia a listagem e extrai os produtos em um processo do pool
+
+        Args:
+            scraper: Scraper que fez a busca (a classe e as opções são reproduzidas no processo)
+            content: HTML da listagem
+            search_term: Termo de busca
+
+        Returns:
+            Produtos extraídos, ainda sem o enriquecimento pelas páginas de produto
+        """
+        if self._closed:
+            raise RuntimeError("Pool de parse encerrado")
+        start = time.monotonic()
+        try:
+            products = self._executor.submit(
+                _extract_listing, scraper_path(type(scraper)), scraper.parse_pool_options(), content, search_term
+            ).result()
+        except Exception:
+            with self._stats_lock:
+                self._stats['errors'] += 1
+            raise
+        with self._stats_lock:
+            self._stats['listings'] += 1
+            self._stats['products'] += len(products)
+            self._stats['worker_seconds'] += time.monotonic() - start
+        return products
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do pool
+
+        Returns:
+            Dicionário com listagens e produtos extraídos, erros e tempo médio por listagem
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['max_workers'] = self.max_workers
+        stats['avg_listing_seconds'] = round(stats['worker_seconds'] / stats['listings'], 3) if stats['listings'] else 0
+        stats['worker_seconds'] = round(stats['worker_seconds'], 3)
+        return stats
+
+    def close(self):
+        """Encerra os processos do pool"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+# Pool usado pelos scrapers (configurável pela aplicação; None mantém o parse na thread da busca)
+_default_parse_pool: Optional[ParsePool] = None
+
+def get_default_parse_pool() -> Optional[ParsePool]:
+    """Retorna o pool de parse padrão"""
+    return _default_parse_pool
+
+def set_default_parse_pool(pool: Optional[ParsePool]):
+    """Define o pool de parse padrão (None desativa o parse em processos)"""
+    global _default_parse_pool
+    _default_parse_pool = pool
@@ -0,0 +1,186 @@
+import json
+import os
+import re
+import time
+import threading
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Campos de cada parte dos detalhes: marca/fabricante (não muda) e preço/desconto (muda com frequência)
+BRAND_FIELDS = ('brand',)
+PRICE_FIELDS = ('price', 'original_price', 'discount_percentage', 'has_discount')
+
+class ProductDetailStore:
+    """
+    Detalhes das páginas de produto (marca, preço e desconto) por product_url, persistidos em JSON.
+
+    A marca e o preço têm validades separadas: o fabricante de um produto não
+    muda, e vale por semanas; o preço e o desconto mudam, e valem por horas.
+    O enriquecimento consulta o armazenamento antes de abrir a página do
+    produto e só a abre quando falta uma parte ainda válida. Os detalhes
+    ficam em um arquivo por site, carregado na primeira consulta.
+    """
+
+    def __init__(self, store_dir: str = "cache/product_details", brand_ttl_hours: float = 24 * 21,
+                 price_ttl_hours: float = 6):
+        """
+        Inicializa o armazenamento de detalhes de produto
+
+        Args:
+            store_dir: Diretório dos arquivos JSON (um por site)
+            brand_ttl_hours: Validade da marca/fabricante, em horas
+            price_ttl_hours: Validade do preço e do desconto, em horas
+        """
+        self.store_dir = store_dir
+        self.brand_ttl_hours = brand_ttl_hours
+        self.price_ttl_hours = price_ttl_hours
+        self._sites: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'brand_hits': 0, 'price_hits': 0, 'misses': 0, 'stored': 0}
+
+    def lookup(self, product_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém os detalhes ainda válidos do produto
+
+        Args:
+            product_url: URL da página do produto
+
+        Returns:
+            Detalhes no formato de _extract_details_from_product_page, apenas com as
+            partes válidas (marca e/ou preço e desconto), ou None se nenhuma for
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._site(product_url).get(product_url)
+            details = {}
+            if entry is not None:
+                if now - entry.get('brand_at', 0) <= self.brand_ttl_hours * 3600:
+                    details.update({field: entry[field] for field in BRAND_FIELDS if field in entry})
+                    self._stats['brand_hits'] += 1
+                if now - entry.get('price_at', 0) <= self.price_ttl_hours * 3600:
+                    details.update({field: entry[field] for field in PRICE_FIELDS if field in entry})
+                    self._stats['price_hits'] += 1
+            if not details:
+                self._stats['misses'] += 1
+                return None
+        return details
+
+    def record_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Guarda os detalhes extraídos das páginas de produto e persiste os sites alterados
+
+        Apenas partes encontradas são guardadas: uma marca válida renova a parte
+        da marca, e um preço numérico renova a parte do preço e do desconto.
+
+        Args:
+            items: Pares (product_url, detalhes de _extract_details_from_product_page)
+        """
+        now = time.time()
+        changed = set()
+        with self._lock:
+            for product_url, details in items:
+                if not product_url or not details:
+                    continue
+                entry = self._site(product_url).setdefault(product_url, {})
+                stored = False
+                brand = details.get('brand')
+                if isinstance(brand, str) and brand.strip() and brand != 'Marca não disponível':
+                    entry['brand'] = brand
+                    entry['brand_at'] = now
+                    stored = True
+                if isinstance(details.get('price'), (int, float)):
+                    for field in PRICE_FIELDS:
+                        entry[field] = details.get(field)
+                    if not isinstance(entry['original_price'], (int, float)):
+                        entry['original_price'] = entry['price']
+                    entry['has_discount'] = bool(entry['has_discount'])
+                    entry['price_at'] = now
+                    stored = True
+                if not stored:
+                    if not entry:
+                        self._site(product_url).pop(product_url)
+                    continue
+                self._stats['stored'] += 1
+                changed.add(_site_key(product_url))
+            for site in changed:
+                self._save(site)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do armazenamento: consultas com marca/preço válidos, sem detalhes e detalhes guardados"""
+        with self._lock:
+            return dict(self._stats, products=sum(len(entries) for entries in self._sites.values()))
+
+    def clear(self):
+        """Remove todos os detalhes guardados"""
+        with self._lock:
+            for site in list(self._sites):
+                try:
+                    os.remove(self._get_site_file_path(site))
+                except OSError:
+                    pass
+            self._sites.clear()
+
+    def _site(self, product_url: str) -> Dict[str, Dict[str, Any]]:
+        """Detalhes do site da URL (carregados do disco na primeira consulta); chamado com o lock"""
+        site = _site_key(product_url)
+        entries = self._sites.get(site)
+        if entries is None:
+            entries = self._sites[site] = self._load(site)
+        return entries
+
+    def _get_site_file_path(self, site: str) -> str:
+        """Obtém o caminho do arquivo de detalhes do site"""
+        return os.path.join(self.store_dir, f"{site}.json")
+
+    def _load(self, site: str) -> Dict[str, Dict[str, Any]]:
+        """Carrega os detalhes salvos do site, descartando os que já expiraram por completo"""
+        path = self._get_site_file_path(site)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Erro ao carregar detalhes de produto de {site}: {e}")
+            return {}
+        return {url: entry for url, entry in entries.items() if not self._expired(entry)}
+
+    def _save(self, site: str):
+        """Salva os detalhes do site em disco (arquivo temporário + rename); chamado com o lock"""
+        entries = {url: entry for url, entry in self._sites.get(site, {}).items() if not self._expired(entry)}
+        self._sites[site] = entries
+        path = self._get_site_file_path(site)
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar detalhes de produto de {site}: {e}")
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        """Indica se as duas partes do detalhe já expiraram"""
+        now = time.time()
+        return (now - entry.get('brand_at', 0) > self.brand_ttl_hours * 3600
+                and now - entry.get('price_at', 0) > self.price_ttl_hours * 3600)
+
+def _site_key(product_url: str) -> str:
+    """Chave do arquivo do site da URL (ex.: 'www.drogaraia.com.br' -> 'www_drogaraia_com_br')"""
+    host = urlsplit(product_url).netloc.lower() or 'local'
+    return re.sub(r'[^a-z0-9]+', '_', host).strip('_')
+
+# Armazenamento padrão usado pelos scrapers (configurável pela aplicação; None desativa)
+_default_store: Optional[ProductDetailStore] = None
+
+def get_default_product_detail_store() -> Optional[ProductDetailStore]:
+    """Retorna o armazenamento de detalhes de produto padrão"""
+    return _default_store
+
+def set_default_product_detail_store(store: Optional[ProductDetailStore]):
+    """Define o armazenamento de detalhes de produto padrão (None desativa)"""
+    global _default_store
+    _default_store = store
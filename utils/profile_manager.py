@@ -0,0 +1,255 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Subdiretório do cache HTTP em disco dentro de cada perfil
+DISK_CACHE_DIRNAME = 'disk_cache'
+
+# Cópia do cache de um perfil encerrado, usada para iniciar os slots novos da farmácia
+SEED_DIRNAME = 'seed'
+
+class ProfileManager:
+    """
+    Perfis do Chrome por farmácia, com cache HTTP em disco compartilhado entre drivers.
+
+    Um diretório de perfil só pode ser usado por um Chrome por vez, então cada
+    farmácia tem vários "slots" de perfil. Um driver reserva um slot livre da
+    farmácia ao iniciar e o libera ao encerrar; o cache do slot sobrevive ao
+    driver e é reaproveitado pelo próximo. Slots novos são clonados de uma cópia
+    ("seed") do cache tirada de um slot já encerrado, nunca de um Chrome em uso.
+    O tamanho do cache de cada slot, o número de slots por farmácia e o tamanho
+    total em disco são limitados.
+    """
+
+    def __init__(self, base_dir: str = "cache/chrome_profiles", disk_cache_mb: int = 100,
+                 max_profiles_per_key: int = 4, max_total_mb: int = 1024, seed_refresh_seconds: float = 3600):
+        """
+        Inicializa o gerenciador de perfis
+
+        Args:
+            base_dir: Diretório raiz dos perfis
+            disk_cache_mb: Tamanho máximo do cache HTTP de cada perfil (--disk-cache-size), em MB
+            max_profiles_per_key: Máximo de slots persistentes por farmácia; acima disso usa perfis temporários
+            max_total_mb: Tamanho máximo de todos os perfis em disco; slots livres mais antigos são removidos
+            seed_refresh_seconds: Intervalo mínimo entre atualizações da cópia de cache usada nos slots novos
+        """
+        self.base_dir = base_dir
+        self.disk_cache_mb = disk_cache_mb
+        self.max_profiles_per_key = max_profiles_per_key
+        self.max_total_mb = max_total_mb
+        self.seed_refresh_seconds = seed_refresh_seconds
+        self._lock = threading.Lock()
+        self._slots: Dict[str, Dict[str, Any]] = {}
+        self._discover()
+
+    def _discover(self):
+        """Registra os slots já existentes em disco (de execuções anteriores)"""
+        if not os.path.isdir(self.base_dir):
+            return
+        for key in os.listdir(self.base_dir):
+            key_dir = os.path.join(self.base_dir, key)
+            if not os.path.isdir(key_dir):
+                continue
+            for name in os.listdir(key_dir):
+                path = os.path.join(key_dir, name)
+                if name.startswith('slot-') and os.path.isdir(path):
+                    self._slots[path] = {'key': key, 'in_use': False, 'temporary': False,
+                                         'last_used': os.path.getmtime(path)}
+
+    def acquire(self, key: str) -> str:
+        """
+        Reserva um diretório de perfil da farmácia para um novo Chrome
+
+        Args:
+            key: Chave da farmácia (ex.: 'sao_joao')
+
+        Returns:
+            Caminho do diretório de perfil (usar em --user-data-dir)
+        """
+        with self._lock:
+            free = [path for path, slot in self._slots.items() if slot['key'] == key and not slot['in_use']]
+            if free:
+                # O slot usado mais recentemente tem o cache mais atualizado
+                path = max(free, key=lambda p: self._slots[p]['last_used'])
+                self._slots[path]['in_use'] = True
+                return path
+            owned = [p for p, slot in self._slots.items() if slot['key'] == key and not slot['temporary']]
+            temporary = len(owned) >= self.max_profiles_per_key
+            if temporary:
+                path = tempfile.mkdtemp(prefix=f'chrome-profile-{key}-')
+            else:
+                path = os.path.join(self.base_dir, key, f'slot-{self._next_slot_number(owned)}')
+            self._slots[path] = {'key': key, 'in_use': True, 'temporary': temporary, 'last_used': time.time()}
+        os.makedirs(path, exist_ok=True)
+        self._clone_seed(key, path)
+        logger.info(f"Perfil do Chrome criado para {key}: {path}{' (temporário)' if temporary else ''}")
+        return path
+
+    def release(self, path: str):
+        """
+        Libera o perfil quando o Chrome que o usava foi encerrado
+
+        Args:
+            path: Caminho retornado por acquire
+        """
+        with self._lock:
+            slot = self._slots.get(path)
+            if slot is None:
+                return
+            slot['in_use'] = False
+            slot['last_used'] = time.time()
+            if slot['temporary']:
+                del self._slots[path]
+        if slot['temporary']:
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            self._refresh_seed(slot['key'], path)
+            self.evict()
+
+    def chrome_arguments(self, path: str) -> List[str]:
+        """
+        Argumentos do Chrome para usar o perfil e o cache HTTP limitado
+
+        Args:
+            path: Caminho retornado por acquire
+
+        Returns:
+            Lista de argumentos de linha de comando
+        """
+        return [
+            f"--user-data-dir={os.path.abspath(path)}",
+            f"--disk-cache-dir={os.path.abspath(os.path.join(path, DISK_CACHE_DIRNAME))}",
+            f"--disk-cache-size={self.disk_cache_mb * 1024 * 1024}"
+        ]
+
+    def evict(self) -> int:
+        """
+        Remove slots livres menos usados recentemente até o total ficar dentro do limite
+
+        Returns:
+            Quantidade de slots removidos
+        """
+        with self._lock:
+            persistent = {p: dict(slot) for p, slot in self._slots.items() if not slot['temporary']}
+        sizes = {path: _directory_size(path) for path in persistent}
+        total = sum(sizes.values())
+        limit = self.max_total_mb * 1024 * 1024
+        removed = 0
+        for path in sorted(persistent, key=lambda p: persistent[p]['last_used']):
+            if total <= limit:
+                break
+            with self._lock:
+                slot = self._slots.get(path)
+                if slot is None or slot['in_use']:
+                    continue
+                del self._slots[path]
+            shutil.rmtree(path, ignore_errors=True)
+            total -= sizes[path]
+            removed += 1
+            logger.info(f"Perfil do Chrome removido para liberar espaço: {path}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas dos perfis
+
+        Returns:
+            Dicionário com slots por farmácia e uso
+        """
+        with self._lock:
+            slots = {p: dict(slot) for p, slot in self._slots.items()}
+        by_key: Dict[str, Dict[str, int]] = {}
+        for slot in slots.values():
+            entry = by_key.setdefault(slot['key'], {'profiles': 0, 'in_use': 0, 'temporary': 0})
+            entry['profiles'] += 1
+            entry['in_use'] += int(slot['in_use'])
+            entry['temporary'] += int(slot['temporary'])
+        return {
+            'base_dir': self.base_dir,
+            'disk_cache_mb': self.disk_cache_mb,
+            'max_total_mb': self.max_total_mb,
+            'profiles': by_key
+        }
+
+    def _next_slot_number(self, owned: List[str]) -> int:
+        """Retorna o menor número de slot livre (chamado sob o lock)"""
+        numbers = set()
+        for path in owned:
+            try:
+                numbers.add(int(os.path.basename(path).split('-', 1)[1]))
+            except (IndexError, ValueError):
+                continue
+        number = 0
+        while number in numbers:
+            number += 1
+        return number
+
+    def _seed_path(self, key: str) -> str:
+        """Caminho da cópia de cache usada para iniciar os slots novos da farmácia"""
+        return os.path.join(self.base_dir, key, SEED_DIRNAME, DISK_CACHE_DIRNAME)
+
+    def _refresh_seed(self, key: str, path: str):
+        """Atualiza a cópia de cache da farmácia a partir de um slot recém-liberado (Chrome já encerrado)"""
+        seed = self._seed_path(key)
+        source = os.path.join(path, DISK_CACHE_DIRNAME)
+        if not os.path.isdir(source):
+            return
+        if os.path.isdir(seed) and time.time() - os.path.getmtime(seed) < self.seed_refresh_seconds:
+            return
+        with self._lock:
+            if self._slots.get(path, {}).get('in_use'):
+                # O slot já foi reservado por outro Chrome, que pode estar gravando no cache
+                return
+            self._slots[path]['in_use'] = True
+        staging = f"{seed}.tmp"
+        try:
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.copytree(source, staging)
+            shutil.rmtree(seed, ignore_errors=True)
+            os.replace(staging, seed)
+        except (OSError, shutil.Error) as e:
+            logger.debug(f"Não foi possível atualizar o cache semente de {key}: {e}")
+        finally:
+            with self._lock:
+                if path in self._slots:
+                    self._slots[path]['in_use'] = False
+
+    def _clone_seed(self, key: str, target: str):
+        """Copia o cache semente da farmácia para um slot novo, para que comece aquecido"""
+        seed = self._seed_path(key)
+        target_cache = os.path.join(target, DISK_CACHE_DIRNAME)
+        if not os.path.isdir(seed) or os.path.exists(target_cache):
+            return
+        try:
+            shutil.copytree(seed, target_cache)
+        except (OSError, shutil.Error) as e:
+            logger.debug(f"Não foi possível clonar o cache semente de {key}: {e}")
+
+def _directory_size(path: str) -> int:
+    """Soma o tamanho dos arquivos de um diretório"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+# Gerenciador padrão usado na criação dos drivers (configurável pela aplicação; None desativa)
+_default_manager: Optional[ProfileManager] = None
+
+def get_default_profile_manager() -> Optional[ProfileManager]:
+    """Retorna o gerenciador de perfis padrão"""
+    return _default_manager
+
+def set_default_profile_manager(manager: Optional[ProfileManager]):
+    """Define o gerenciador de perfis padrão (None desativa os perfis persistentes)"""
+    global _default_manager
+    _default_manager = manager
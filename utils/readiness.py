@@ -0,0 +1,190 @@
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+from utils.tab_backend import is_session_error
+
+logger = logging.getLogger(__name__)
+
+# Estado da página lido a cada verificação: carregamento do documento, nós de produto e recursos requisitados
+READINESS_SCRIPT = """
+return [
+    document.readyState,
+    document.querySelectorAll(arguments[0]).length,
+    performance.getEntriesByType('resource').length
+];
+"""
+
+# Estados de document.readyState aceitos ao fim da navegação em cada estratégia de carregamento
+PAGE_LOAD_STRATEGIES = {
+    'normal': ('complete',),  # Todos os sub-recursos carregados
+    'eager': ('interactive', 'complete'),  # DOM pronto (DOMContentLoaded)
+    'none': ('loading', 'interactive', 'complete')  # Assim que o novo documento existir
+}
+
+# Marca o documento atual para distinguir o documento antigo do novo após driver.get()
+MARK_STALE_SCRIPT = "document.__pharmaStale = true;"
+NAVIGATION_SCRIPT = "return [document.readyState, document.__pharmaStale === true];"
+
+class ReadinessCondition:
+    """
+    Condição de prontidão de uma página, definida por farmácia.
+
+    A página é considerada pronta assim que o número de nós de produto para
+    de mudar por `stable_for` segundos, ou quando a rede fica ociosa (documento
+    carregado e nenhuma requisição nova por `network_idle_for` segundos). A
+    espera nunca passa de `timeout` segundos.
+    """
+
+    def __init__(self, selector: str, timeout: float = 15, stable_for: float = 1.0,
+                 network_idle_for: float = 1.5, min_nodes: int = 1, poll_interval: float = 0.25):
+        """
+        Inicializa a condição de prontidão
+
+        Args:
+            selector: Seletor CSS dos nós que indicam o conteúdo (cards de produto, preço etc.)
+            timeout: Limite máximo de espera, em segundos
+            stable_for: Tempo sem mudança na contagem de nós para considerar a página estável
+            network_idle_for: Tempo sem requisições novas para considerar a rede ociosa
+            min_nodes: Número mínimo de nós para que a contagem estável conte como pronta
+            poll_interval: Intervalo entre verificações, em segundos
+        """
+        if timeout <= 0:
+            raise ValueError("O limite de espera deve ser positivo")
+        self.selector = selector
+        self.timeout = timeout
+        self.stable_for = stable_for
+        self.network_idle_for = network_idle_for
+        self.min_nodes = min_nodes
+        self.poll_interval = poll_interval
+
+def wait_until_ready(driver, condition: ReadinessCondition,
+                     on_poll: Optional[Callable[[Any], bool]] = None,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Aguarda a página do driver ficar pronta segundo a condição
+
+    Args:
+        driver: Driver Selenium ou aba do backend de abas
+        condition: Condição de prontidão da página
+        on_poll: Função chamada com o driver a cada verificação (ex.: fechar banner de cookies);
+            deixa de ser chamada quando retorna True
+        timeout: Limite de espera, em segundos (padrão: condition.timeout)
+
+    Returns:
+        Dicionário com 'ready', 'reason' ('stable', 'network_idle' ou 'timeout'), 'nodes' e 'elapsed'
+    """
+    start = time.monotonic()
+    timeout = condition.timeout if timeout is None else timeout
+    deadline = start + timeout
+    last_nodes = last_resources = None
+    nodes_changed_at = resources_changed_at = start
+    nodes = 0
+    while True:
+        now = time.monotonic()
+        if on_poll is not None:
+            try:
+                if on_poll(driver):
+                    on_poll = None
+            except Exception as e:
+                if is_session_error(e):
+                    raise
+                logger.debug(f"Erro na ação durante a espera: {e}")
+        try:
+            state, nodes, resources = driver.execute_script(READINESS_SCRIPT, condition.selector)
+        except Exception as e:
+            if is_session_error(e):
+                raise
+            # A página pode estar no meio de uma navegação; tentar de novo na próxima verificação
+            state, nodes, resources = 'loading', 0, None
+        if nodes != last_nodes:
+            last_nodes, nodes_changed_at = nodes, now
+        if resources != last_resources:
+            last_resources, resources_changed_at = resources, now
+
+        if nodes >= condition.min_nodes and now - nodes_changed_at >= condition.stable_for:
+            return _result(True, 'stable', nodes, start)
+        if state == 'complete' and resources is not None and now - resources_changed_at >= condition.network_idle_for:
+            return _result(True, 'network_idle', nodes, start)
+        if now >= deadline:
+            logger.warning(f"Página não ficou pronta em {timeout:.1f}s ({condition.selector}: {nodes} nós)")
+            return _result(False, 'timeout', nodes, start)
+        time.sleep(min(condition.poll_interval, max(deadline - time.monotonic(), 0)))
+
+def wait_for_page(driver, strategy: str, condition: ReadinessCondition,
+                  on_poll: Optional[Callable[[Any], bool]] = None) -> Dict[str, Any]:
+    """
+    Aguarda a navegação (wait_for_navigation) e a prontidão (wait_until_ready) dentro de um único prazo
+
+    A espera inteira dura no máximo condition.timeout: o tempo gasto na
+    navegação é descontado da espera pela prontidão.
+
+    Args:
+        driver: Driver Selenium ou aba do backend de abas
+        strategy: 'normal', 'eager' ou 'none'
+        condition: Condição de prontidão da página
+        on_poll: Função chamada com o driver a cada verificação de prontidão
+
+    Returns:
+        Resultado de wait_until_ready
+    """
+    deadline = time.monotonic() + condition.timeout
+    wait_for_navigation(driver, strategy, timeout=condition.timeout)
+    return wait_until_ready(driver, condition, on_poll=on_poll, timeout=max(deadline - time.monotonic(), 0))
+
+def mark_stale_document(driver):
+    """
+    Marca o documento atual antes de uma navegação
+
+    Com page_load_strategy 'none', driver.get() retorna antes de o novo
+    documento existir; a marca permite esperar a troca de documento.
+
+    Args:
+        driver: Driver Selenium ou aba do backend de abas
+    """
+    try:
+        driver.execute_script(MARK_STALE_SCRIPT)
+    except Exception as e:
+        if is_session_error(e):
+            raise
+        logger.debug(f"Não foi possível marcar o documento atual: {e}")
+
+def wait_for_navigation(driver, strategy: str, timeout: float = 30, poll_interval: float = 0.05) -> bool:
+    """
+    Emula a estratégia de carregamento em drivers criados com page_load_strategy 'none'
+
+    Aguarda o novo documento (sem a marca de mark_stale_document) chegar ao
+    estado de carregamento exigido pela estratégia.
+
+    Args:
+        driver: Driver Selenium ou aba do backend de abas
+        strategy: 'normal', 'eager' ou 'none'
+        timeout: Limite máximo de espera, em segundos
+        poll_interval: Intervalo entre verificações, em segundos
+
+    Returns:
+        True se a navegação chegou ao estado esperado dentro do limite
+    """
+    accepted = PAGE_LOAD_STRATEGIES[strategy]
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            state, stale = driver.execute_script(NAVIGATION_SCRIPT)
+            if not stale and state in accepted:
+                return True
+        except Exception as e:
+            if is_session_error(e):
+                raise
+            # Contexto de execução trocando durante a navegação
+        if time.monotonic() >= deadline:
+            logger.warning(f"Navegação não atingiu o estado '{strategy}' em {timeout}s")
+            return False
+        time.sleep(poll_interval)
+
+def _result(ready: bool, reason: str, nodes: int, start: float) -> Dict[str, Any]:
+    """Monta o resultado da espera"""
+    return {
+        'ready': ready,
+        'reason': reason,
+        'nodes': nodes,
+        'elapsed': round(time.monotonic() - start, 3)
+    }
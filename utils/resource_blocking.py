@@ -0,0 +1,270 @@
+import json
+import threading
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+import websocket
+
+logger = logging.getLogger(__name__)
+
+# Tipos de recurso do DevTools (Network.ResourceType) que podem ser bloqueados; o Chrome classifica
+# cada requisição pelo uso (ex.: '/static/icons.js' é Script), sem depender da extensão da URL
+RESOURCE_TYPES = ('Image', 'Font', 'Stylesheet', 'Media')
+
+# Tempo máximo para abrir a conexão DevTools da aba e confirmar o Fetch.enable, em segundos
+FETCH_CONNECT_TIMEOUT = 5
+
+# Tipos de recurso bloqueados por padrão: só precisamos do DOM dos cards de produto
+DEFAULT_BLOCKED_RESOURCE_TYPES = ['Image', 'Font', 'Stylesheet', 'Media']
+
+# Rastreadores e analytics de terceiros presentes nas páginas das farmácias
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googleadservices.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+    '*analytics.tiktok.com*',
+    '*criteo.com*',
+    '*criteo.net*',
+    '*nr-data.net*',
+    '*newrelic.com*',
+    '*bing.com/bat*',
+    '*youtube.com*'
+]
+
+class BlockingPolicy:
+    """
+    Política de bloqueio de recursos aplicada via DevTools antes de cada navegação.
+
+    O bloqueio usa o domínio Fetch: as requisições dos tipos de recurso
+    bloqueados, ou com URL nos padrões bloqueados, são pausadas pelo Chrome e
+    falhadas (BlockedByClient) por uma conexão DevTools própria da aba.
+    """
+
+    def __init__(self, resource_types: Optional[Iterable[str]] = None,
+                 url_patterns: Optional[Iterable[str]] = None, enabled: bool = True):
+        """
+        Inicializa a política de bloqueio
+
+        Args:
+            resource_types: Tipos de recurso bloqueados (de RESOURCE_TYPES)
+            url_patterns: Padrões de URL bloqueados, com curinga '*'
+            enabled: Se o bloqueio está ativo
+        """
+        self.resource_types = list(DEFAULT_BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.url_patterns = list(DEFAULT_BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns)
+        self.enabled = enabled
+        unknown = set(self.resource_types) - set(RESOURCE_TYPES)
+        if unknown:
+            raise ValueError(f"Tipos de recurso desconhecidos: {sorted(unknown)}")
+
+    def with_overrides(self, overrides: Optional[Dict[str, Any]]) -> 'BlockingPolicy':
+        """
+        Cria uma nova política aplicando sobrescritas (ex.: por farmácia)
+
+        Args:
+            overrides: Dicionário com as chaves opcionais 'enabled', 'block_resource_types',
+                'allow_resource_types', 'block_url_patterns' e 'allow_url_patterns'
+
+        Returns:
+            Nova política com as sobrescritas aplicadas
+        """
+        if not overrides:
+            return self
+        resource_types = [t for t in self.resource_types if t not in overrides.get('allow_resource_types', [])]
+        resource_types += [t for t in overrides.get('block_resource_types', []) if t not in resource_types]
+        url_patterns = [p for p in self.url_patterns if p not in overrides.get('allow_url_patterns', [])]
+        url_patterns += [p for p in overrides.get('block_url_patterns', []) if p not in url_patterns]
+        return BlockingPolicy(resource_types, url_patterns, overrides.get('enabled', self.enabled))
+
+    def patterns(self) -> List[Dict[str, str]]:
+        """Retorna os padrões de requisição (Fetch.RequestPattern) bloqueados pela política"""
+        if not self.enabled:
+            return []
+        patterns = [{'urlPattern': '*', 'resourceType': resource_type, 'requestStage': 'Request'}
+                    for resource_type in self.resource_types]
+        patterns.extend({'urlPattern': pattern, 'requestStage': 'Request'} for pattern in self.url_patterns)
+        return patterns
+
+    def apply(self, driver):
+        """
+        Aplica a política na aba atual do driver via DevTools (Fetch.enable)
+
+        Args:
+            driver: Driver Selenium (Chrome) ou aba do backend de abas
+        """
+        patterns = self.patterns()
+        try:
+            blocker = _fetch_blocker(driver, create=bool(patterns))
+            if blocker is not None:
+                blocker.enable(patterns)
+        except Exception as e:
+            logger.warning(f"Não foi possível aplicar o bloqueio de recursos: {e}")
+
+class _FetchBlocker:
+    """
+    Conexão DevTools própria de uma aba que falha as requisições pausadas pelo domínio Fetch.
+
+    O Chrome só pausa as requisições para o cliente que habilitou o Fetch, e as
+    libera quando a conexão fecha; por isso a conexão fica aberta enquanto a aba
+    existir, com uma thread que responde a cada Fetch.requestPaused.
+    """
+
+    def __init__(self, websocket_url: str):
+        """
+        Abre a conexão com a aba
+
+        Args:
+            websocket_url: URL DevTools da aba (ws://host:porta/devtools/page/<id>)
+        """
+        self._socket = websocket.create_connection(websocket_url, timeout=FETCH_CONNECT_TIMEOUT, suppress_origin=True)
+        self._socket.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+        self._replies: Dict[int, threading.Event] = {}
+        self._patterns = None
+        self.closed = False
+        threading.Thread(target=self._run, name='fetch-blocker', daemon=True).start()
+
+    def enable(self, patterns: List[Dict[str, str]]):
+        """Passa a bloquear os padrões (lista vazia desabilita), esperando a confirmação do Chrome"""
+        if patterns == self._patterns:
+            return
+        reply = self._send('Fetch.enable', {'patterns': patterns}) if patterns else self._send('Fetch.disable', {})
+        if not reply.wait(FETCH_CONNECT_TIMEOUT) or self.closed:
+            raise RuntimeError("o Chrome não confirmou o bloqueio da aba")
+        self._patterns = patterns
+
+    def _send(self, method: str, params: Dict[str, Any]) -> threading.Event:
+        """Envia um comando DevTools e retorna o evento sinalizado pela resposta"""
+        with self._send_lock:
+            self._next_id += 1
+            reply = self._replies[self._next_id] = threading.Event()
+            self._socket.send(json.dumps({'id': self._next_id, 'method': method, 'params': params}))
+        return reply
+
+    def _run(self):
+        """Lê as mensagens da aba até a conexão fechar, falhando cada requisição pausada"""
+        try:
+            while True:
+                message = json.loads(self._socket.recv())
+                if 'id' in message:
+                    reply = self._replies.pop(message['id'], None)
+                    if reply is not None:
+                        reply.set()
+                elif message.get('method') == 'Fetch.requestPaused':
+                    self._send('Fetch.failRequest', {'requestId': message['params']['requestId'],
+                                                     'errorReason': 'BlockedByClient'})
+        except Exception as e:
+            logger.debug(f"Conexão de bloqueio da aba encerrada: {e}")
+        finally:
+            self.closed = True
+            for reply in list(self._replies.values()):
+                reply.set()
+
+# Conexões de bloqueio abertas, por URL DevTools da aba
+_blockers: Dict[str, _FetchBlocker] = {}
+_blockers_lock = threading.Lock()
+
+def _fetch_blocker(driver, create: bool = True) -> Optional[_FetchBlocker]:
+    """Obtém a conexão de bloqueio da aba atual do driver, abrindo-a se `create` (senão None se não houver)"""
+    address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+    if not isinstance(address, str):
+        if not create:
+            return None
+        raise RuntimeError("driver sem endereço DevTools (debuggerAddress)")
+    target_id = driver.execute_cdp_cmd('Target.getTargetInfo', {})['targetInfo']['targetId']
+    websocket_url = f"ws://{address}/devtools/page/{target_id}"
+    with _blockers_lock:
+        for url in [url for url, blocker in _blockers.items() if blocker.closed]:
+            del _blockers[url]
+        blocker = _blockers.get(websocket_url)
+        if blocker is None and create:
+            blocker = _blockers[websocket_url] = _FetchBlocker(websocket_url)
+    return blocker
+
+# Política padrão usada pelos scrapers (configurável pela aplicação)
+_default_policy = BlockingPolicy()
+
+def get_default_blocking_policy() -> BlockingPolicy:
+    """Retorna a política de bloqueio padrão"""
+    return _default_policy
+
+def set_default_blocking_policy(policy: BlockingPolicy):
+    """Define a política de bloqueio padrão usada pelos scrapers"""
+    global _default_policy
+    _default_policy = policy
+
+class NetworkStats:
+    """
+    Acumula requisições e bytes de uma busca a partir do log de performance do Chrome.
+
+    Os bytes são os medidos (encodedDataLength de Network.loadingFinished); das
+    requisições bloqueadas, que nunca chegam a ser feitas, só há a contagem por tipo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.requests_total = 0
+        self.requests_blocked = 0
+        self.bytes_transferred = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def record_performance_log(self, entries: List[Dict[str, Any]]):
+        """
+        Contabiliza as entradas do log de performance ('goog:loggingPrefs') de uma página
+
+        Args:
+            entries: Entradas retornadas por driver.get_log('performance')
+        """
+        requests_total = 0
+        bytes_transferred = 0
+        blocked = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                requests_total += 1
+            elif method == 'Network.loadingFinished':
+                bytes_transferred += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and (
+                    params.get('blockedReason') or 'ERR_BLOCKED_BY_CLIENT' in params.get('errorText', '')):
+                blocked.append(params.get('type', 'Other'))
+        with self._lock:
+            self.pages += 1
+            self.requests_total += requests_total
+            self.bytes_transferred += bytes_transferred
+            for resource_type in blocked:
+                self.requests_blocked += 1
+                self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def record_http_response(self, num_bytes: int):
+        """
+        Contabiliza uma página obtida por HTTP direto, sem navegador
+
+        Args:
+            num_bytes: Tamanho do corpo da resposta
+        """
+        with self._lock:
+            self.pages += 1
+            self.requests_total += 1
+            self.bytes_transferred += num_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna as estatísticas acumuladas"""
+        with self._lock:
+            return {
+                'pages': self.pages,
+                'requests_total': self.requests_total,
+                'requests_blocked': self.requests_blocked,
+                'blocked_by_type': dict(self.blocked_by_type),
+                'bytes_transferred': self.bytes_transferred
+            }
@@ -0,0 +1,245 @@
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from bs4 import Tag
+
+# Partes de um seletor composto: tag, .classe, #id e [atributo], [atributo=v], [atributo*=v], [atributo^=v], [atributo$=v]
+_TAG_RE = re.compile(r'[a-zA-Z][\w-]*')
+_PART_RE = re.compile(
+    r'\.(?P<cls>-?[_a-zA-Z][\w-]*)'
+    r'|#(?P<id>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$]?=)\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<bare>[\w-]+))\s*)?\]'
+)
+
+# Operadores de atributo: valor do elemento (classes unidas por espaço, como no soupsieve) vs. valor esperado
+_ATTR_OPS = {
+    None: lambda actual, expected: True,
+    '=': lambda actual, expected: actual == expected,
+    '*=': lambda actual, expected: bool(expected) and expected in actual,
+    '^=': lambda actual, expected: bool(expected) and actual.startswith(expected),
+    '$=': lambda actual, expected: bool(expected) and actual.endswith(expected)
+}
+
+# Marcador de candidato que ainda não casou com nenhum elemento
+_MISSING = object()
+
+class CompiledSelector:
+    """
+    Seletor CSS composto (sem combinadores) compilado em um teste de elemento.
+
+    Aceita apenas o subconjunto usado nas páginas das farmácias: tag opcional
+    seguida de classes, id e atributos. Seletores fora dele geram ValueError
+    na compilação, e não uma busca lenta ou diferente da esperada.
+    """
+
+    def __init__(self, css: str):
+        """
+        Args:
+            css: Seletor, ex.: "span[class*='productBrandName']"
+        """
+        self.css = css
+        text = css.strip()
+        tag_match = _TAG_RE.match(text)
+        self.tag: Optional[str] = tag_match.group(0).lower() if tag_match else None
+        position = tag_match.end() if tag_match else 0
+        classes: List[str] = []
+        attrs: List[Tuple[str, Callable[[str, str], bool], str]] = []
+        while position < len(text):
+            part = _PART_RE.match(text, position)
+            if not part:
+                raise ValueError(f"Seletor não suportado: '{css}' (apenas tag, .classe, #id e [atributo])")
+            if part.group('cls'):
+                classes.append(part.group('cls'))
+            elif part.group('id'):
+                attrs.append(('id', _ATTR_OPS['='], part.group('id')))
+            else:
+                value = next((v for v in part.group('dq', 'sq', 'bare') if v is not None), '')
+                attrs.append((part.group('attr').lower(), _ATTR_OPS[part.group('op')], value))
+            position = part.end()
+        if self.tag is None and not classes and not attrs:
+            raise ValueError(f"Seletor vazio ou não suportado: '{css}'")
+        self._classes = frozenset(classes)
+        self._attrs = tuple(attrs)
+
+    def matches(self, element: Tag) -> bool:
+        """Indica se o elemento satisfaz o seletor (a tag é conferida pelo índice de PageSpec)"""
+        if self._classes and not self._classes.issubset(element.get('class') or ()):
+            return False
+        for attribute, test, expected in self._attrs:
+            actual = element.get(attribute)
+            if actual is None:
+                return False
+            if isinstance(actual, list):
+                actual = ' '.join(actual)
+            if not test(actual, expected):
+                return False
+        return True
+
+    def __repr__(self):
+        return f"CompiledSelector({self.css!r})"
+
+class FieldSpec:
+    """
+    Campo declarativo de uma página: seletores em ordem de preferência,
+    transformação do elemento encontrado e um fallback opcional.
+
+    Cada seletor considera apenas o primeiro elemento que o satisfaz, em ordem
+    do documento (a semântica de select_one()); se o valor desse elemento não
+    for válido, vale o próximo seletor e, esgotados todos, o fallback.
+    """
+
+    def __init__(self, name: str, selectors: Union[str, Sequence[str]],
+                 transform: Union[str, Callable[[Tag], Any]] = 'text', pattern: Optional[str] = None,
+                 cast: Optional[Callable[[str], Any]] = None, min_length: int = 1,
+                 where: Optional[Callable[[Tag], bool]] = None, fallback: Optional['FieldSpec'] = None):
+        """
+        Args:
+            name: Nome do campo
+            selectors: Seletor ou lista de seletores, em ordem de preferência
+            transform: 'text' (texto sem espaços nas pontas), 'element' (o próprio elemento) ou função do elemento
+            pattern: Expressão aplicada ao texto; o valor passa a ser o primeiro grupo (ou o trecho casado)
+            cast: Conversão do texto (ex.: int); ValueError torna o valor inválido
+            min_length: Comprimento mínimo de valores texto
+            where: Filtro adicional do elemento (ex.: rótulo de uma linha de tabela)
+            fallback: Campo tentado quando nenhum seletor deste gera valor válido
+        """
+        self.name = name
+        self.selectors = [CompiledSelector(css) for css in ([selectors] if isinstance(selectors, str) else selectors)]
+        if not self.selectors:
+            raise ValueError(f"O campo '{name}' não tem seletores")
+        if transform == 'text':
+            transform = _element_text
+        elif transform == 'element':
+            transform = _element_itself
+        elif not callable(transform):
+            raise ValueError(f"Transformação inválida no campo '{name}': {transform!r}")
+        self.transform = transform
+        self.pattern = re.compile(pattern) if pattern else None
+        self.cast = cast
+        self.min_length = min_length
+        self.where = where
+        self.fallback = fallback
+
+    def value_of(self, element: Tag) -> Any:
+        """
+        Valor do campo para o elemento encontrado pelo seletor
+
+        Returns:
+            Valor transformado, ou None se inválido
+        """
+        value = self.transform(element)
+        if isinstance(value, str):
+            if self.pattern is not None:
+                match = self.pattern.search(value)
+                if not match:
+                    return None
+                value = (match.group(1) if match.groups() else match.group(0)).strip()
+            if len(value) < self.min_length:
+                return None
+            if self.cast is not None:
+                try:
+                    value = self.cast(value)
+                except ValueError:
+                    return None
+        return value
+
+    def candidates(self) -> List[Tuple['FieldSpec', CompiledSelector]]:
+        """Seletores do campo e dos fallbacks, na ordem em que são tentados"""
+        spec: Optional[FieldSpec] = self
+        result = []
+        while spec is not None:
+            result.extend((spec, selector) for selector in spec.selectors)
+            spec = spec.fallback
+        return result
+
+class PageSpec:
+    """
+    Extrator compilado a partir dos campos declarativos de uma página.
+
+    Em vez de um select_one() por seletor, cada um percorrendo a página
+    inteira, os seletores de todos os campos (e fallbacks) são indexados por
+    tag na criação e a página é percorrida uma vez: cada elemento guarda o
+    primeiro casamento de cada seletor, e a passada termina assim que o valor
+    de todos os campos está decidido, ou seja, quando um seletor deu valor
+    válido e todos os anteriores a ele já casaram sem valor.
+    """
+
+    def __init__(self, fields: Iterable[FieldSpec]):
+        """
+        Args:
+            fields: Campos da página
+        """
+        self.fields: List[FieldSpec] = list(fields)
+        names = [field.name for field in self.fields]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Campos repetidos na especificação: {names}")
+        # Seletores de cada campo em ordem de tentativa e, por tag, as posições (campo, candidato) que a usam
+        self._candidates: List[List[Tuple[FieldSpec, CompiledSelector]]] = [field.candidates() for field in self.fields]
+        self._by_tag: Dict[Optional[str], List[Tuple[int, int]]] = {}
+        for field_index, candidates in enumerate(self._candidates):
+            for candidate_index, (_, selector) in enumerate(candidates):
+                self._by_tag.setdefault(selector.tag, []).append((field_index, candidate_index))
+        self._any_tag = self._by_tag.pop(None, [])
+
+    def extract(self, root: Tag) -> Dict[str, Any]:
+        """
+        Extrai o valor de todos os campos em uma única passada
+
+        Args:
+            root: Página ou elemento (BeautifulSoup); o próprio root não é considerado
+
+        Returns:
+            Dicionário campo -> valor (None para campos sem valor válido)
+        """
+        # Por candidato: MISSING enquanto não casou, depois o valor do primeiro elemento casado
+        seen = [[_MISSING] * len(candidates) for candidates in self._candidates]
+        values: List[Any] = [None] * len(self.fields)
+        settled = [False] * len(self.fields)
+        pending = len(self.fields)
+        for element in root.descendants:
+            if not isinstance(element, Tag):
+                continue
+            changed = False
+            for rules in (self._by_tag.get(element.name), self._any_tag):
+                if not rules:
+                    continue
+                for field_index, candidate_index in rules:
+                    if settled[field_index] or seen[field_index][candidate_index] is not _MISSING:
+                        continue
+                    spec, selector = self._candidates[field_index][candidate_index]
+                    if not selector.matches(element) or (spec.where is not None and not spec.where(element)):
+                        continue
+                    seen[field_index][candidate_index] = spec.value_of(element)
+                    if self._settle(field_index, seen, values, settled):
+                        pending -= 1
+                    changed = True
+            if changed and pending == 0:
+                break
+        for field_index in range(len(self.fields)):
+            if not settled[field_index]:
+                values[field_index] = next((v for v in seen[field_index] if v is not _MISSING and v is not None), None)
+        return {field.name: values[index] for index, field in enumerate(self.fields)}
+
+    @staticmethod
+    def _settle(field_index: int, seen: List[List[Any]], values: List[Any], settled: List[bool]) -> bool:
+        """
+        Decide o valor do campo se um candidato válido só tem antes dele candidatos
+        já casados (ou se todos casaram sem valor válido)
+        """
+        if settled[field_index]:
+            return False
+        for value in seen[field_index]:
+            if value is _MISSING:
+                return False
+            if value is not None:
+                values[field_index] = value
+                break
+        settled[field_index] = True
+        return True
+
+def _element_text(element: Tag) -> str:
+    """Texto do elemento sem espaços nas pontas"""
+    return element.get_text(strip=True)
+
+def _element_itself(element: Tag) -> Tag:
+    """O próprio elemento (para campos tratados pelo scraper)"""
+    return element
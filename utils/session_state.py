@@ -0,0 +1,220 @@
+import json
+import os
+import re
+import time
+import threading
+import unicodedata
+import weakref
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Restaura o localStorage capturado no novo documento, apenas na origem da farmácia
+LOCAL_STORAGE_SCRIPT = """
+(function() {
+    if (location.origin !== %s) { return; }
+    var items = %s;
+    try {
+        Object.keys(items).forEach(function(key) {
+            if (localStorage.getItem(key) === null) { localStorage.setItem(key, items[key]); }
+        });
+    } catch (e) {}
+})();
+"""
+
+def session_key(pharmacy_name: str) -> str:
+    """
+    Gera a chave do estado de sessão a partir do nome da farmácia (ex.: 'São João' -> 'sao_joao')
+
+    Args:
+        pharmacy_name: Nome da farmácia
+
+    Returns:
+        Chave segura para nome de arquivo
+    """
+    ascii_name = unicodedata.normalize('NFKD', pharmacy_name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_')
+
+class SessionStateStore:
+    """
+    Estado de sessão (cookies e localStorage) por farmácia, persistido em JSON.
+
+    O estado é capturado uma vez, depois que o banner de cookies é aceito, e
+    injetado via DevTools em todo driver ou aba novo antes da navegação, para
+    que as páginas seguintes já abram sem o banner.
+    """
+
+    def __init__(self, state_dir: str = "cache/session_state", max_age_hours: float = 24):
+        """
+        Inicializa o armazenamento de estado de sessão
+
+        Args:
+            state_dir: Diretório onde os arquivos de estado são salvos
+            max_age_hours: Validade do estado capturado, em horas
+        """
+        self.state_dir = state_dir
+        self.max_age_hours = max_age_hours
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Versão do estado já injetada em cada driver/aba, para não repetir a injeção
+        self._injected = weakref.WeakKeyDictionary()
+
+    def _get_state_file_path(self, key: str) -> str:
+        """Obtém o caminho do arquivo de estado da farmácia"""
+        return os.path.join(self.state_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém o estado de sessão válido da farmácia
+
+        Args:
+            key: Chave da farmácia (ver session_key)
+
+        Returns:
+            Estado com 'origin', 'cookies', 'local_storage' e 'captured_at', ou None se ausente/expirado
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._load(key)
+                if state is not None:
+                    self._states[key] = state
+        if state is None:
+            return None
+        if time.time() - state.get('captured_at', 0) > self.max_age_hours * 3600:
+            return None
+        return state
+
+    def is_warm(self, key: str) -> bool:
+        """Indica se já existe estado de sessão válido para a farmácia"""
+        return self.get(key) is not None
+
+    def capture(self, driver, key: str, origin: str) -> Optional[Dict[str, Any]]:
+        """
+        Captura cookies e localStorage da página atual do driver e persiste o estado
+
+        Args:
+            driver: Driver Selenium ou aba, já na origem da farmácia
+            key: Chave da farmácia
+            origin: Origem da farmácia (ex.: 'https://www.saojoaofarmacias.com.br')
+
+        Returns:
+            Estado capturado, ou None em caso de erro
+        """
+        try:
+            state = {
+                'origin': origin,
+                'cookies': driver.get_cookies(),
+                'local_storage': driver.execute_script(
+                    "var items = {}; for (var i = 0; i < localStorage.length; i++) {"
+                    " var k = localStorage.key(i); items[k] = localStorage.getItem(k); } return items;"
+                ) or {},
+                'captured_at': time.time()
+            }
+        except Exception as e:
+            logger.warning(f"Não foi possível capturar o estado de sessão de {key}: {e}")
+            return None
+        with self._lock:
+            self._states[key] = state
+            self._save(key, state)
+        logger.info(f"Estado de sessão de {key} capturado ({len(state['cookies'])} cookies, "
+                    f"{len(state['local_storage'])} itens de localStorage)")
+        return state
+
+    def inject(self, driver, key: str) -> bool:
+        """
+        Injeta o estado de sessão da farmácia no driver antes da navegação
+
+        Args:
+            driver: Driver Selenium ou aba do backend de abas
+            key: Chave da farmácia
+
+        Returns:
+            True se havia estado válido para injetar
+        """
+        state = self.get(key)
+        if state is None:
+            return False
+        version = (key, state['captured_at'])
+        try:
+            if self._injected.get(driver) == version:
+                return True
+        except TypeError:
+            pass
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            for cookie in state['cookies']:
+                driver.execute_cdp_cmd('Network.setCookie', _cdp_cookie(cookie, state['origin']))
+            if state['local_storage']:
+                script = LOCAL_STORAGE_SCRIPT % (json.dumps(state['origin']), json.dumps(state['local_storage']))
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+        except Exception as e:
+            logger.warning(f"Não foi possível injetar o estado de sessão de {key}: {e}")
+            return False
+        try:
+            self._injected[driver] = version
+        except TypeError:
+            pass
+        return True
+
+    def clear(self, key: str):
+        """Remove o estado de sessão da farmácia (ex.: quando o site passar a rejeitá-lo)"""
+        with self._lock:
+            self._states.pop(key, None)
+            try:
+                os.remove(self._get_state_file_path(key))
+            except OSError:
+                pass
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Carrega o estado salvo em disco"""
+        path = self._get_state_file_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Erro ao carregar estado de sessão de {key}: {e}")
+            return None
+
+    def _save(self, key: str, state: Dict[str, Any]):
+        """Salva o estado em disco"""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(self._get_state_file_path(key), 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar estado de sessão de {key}: {e}")
+
+def _cdp_cookie(cookie: Dict[str, Any], origin: str) -> Dict[str, Any]:
+    """Converte um cookie do Selenium para os parâmetros de Network.setCookie"""
+    params = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False)
+    }
+    if cookie.get('domain'):
+        params['domain'] = cookie['domain']
+    else:
+        params['url'] = origin
+    if cookie.get('expiry'):
+        params['expires'] = cookie['expiry']
+    if cookie.get('sameSite'):
+        params['sameSite'] = cookie['sameSite']
+    return params
+
+# Armazenamento padrão usado pelos scrapers (ativado pela aplicação em setup_session_state; None desativa)
+_default_store: Optional[SessionStateStore] = None
+
+def get_default_session_store() -> Optional[SessionStateStore]:
+    """Retorna o armazenamento de estado de sessão padrão"""
+    return _default_store
+
+def set_default_session_store(store: Optional[SessionStateStore]):
+    """Define o armazenamento de estado de sessão padrão (None desativa a persistência)"""
+    global _default_store
+    _default_store = store
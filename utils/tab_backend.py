@@ -0,0 +1,285 @@
+import json
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from selenium.webdriver.remote.webelement import WebElement
+
+logger = logging.getLogger(__name__)
+
+# Erros que indicam que a sessão inteira do navegador caiu, e não apenas uma aba
+SESSION_ERRORS = ('invalid session id', 'no such session', 'chrome not reachable', 'session deleted')
+
+def is_session_error(error: Exception) -> bool:
+    """Indica se o erro derrubou a sessão do navegador"""
+    message = str(error).lower()
+    return any(marker in message for marker in SESSION_ERRORS)
+
+class _TabElement:
+    """Elemento de uma aba; cada comando seleciona a aba antes de executar"""
+
+    def __init__(self, tab, element: WebElement):
+        self._tab = tab
+        self._element = element
+
+    def __getattr__(self, name):
+        return self._tab._run(lambda: getattr(self._element, name))
+
+class TabDriver:
+    """
+    Visão de uma única aba do navegador compartilhado.
+
+    Expõe a mesma interface do driver Selenium, mas cada comando seleciona
+    a aba antes de executar, sob o lock do backend. Esperas (time.sleep,
+    WebDriverWait) ocorrem fora do lock, permitindo que outras abas avancem.
+    """
+
+    def __init__(self, backend, handle: str):
+        self._backend = backend
+        self.handle = handle
+
+    def _run(self, command: Callable[[], Any]) -> Any:
+        """Executa um comando com a aba selecionada"""
+        with self._backend._command_lock:
+            self._backend._select_tab(self.handle)
+            value = command()
+        if callable(value):
+            def call(*args, **kwargs):
+                return self._run(lambda: value(*args, **kwargs))
+            return call
+        return self._wrap(value)
+
+    def _wrap(self, value):
+        """Envolve elementos retornados para que também selecionem esta aba"""
+        if isinstance(value, WebElement):
+            return _TabElement(self, value)
+        if isinstance(value, list) and value and isinstance(value[0], WebElement):
+            return [_TabElement(self, element) for element in value]
+        return value
+
+    def get_log(self, log_type: str):
+        """Retorna o log do navegador; o log de performance é filtrado para esta aba"""
+        if log_type == 'performance':
+            return self._backend._performance_log(self.handle)
+        return self._run(lambda: self._backend.driver.get_log(log_type))
+
+    def __getattr__(self, name):
+        return self._run(lambda: getattr(self._backend.driver, name))
+
+class TabBrowserBackend:
+    """
+    Backend que multiplexa várias abas isoladas em um único processo do Chrome.
+
+    Cada página é aberta em uma aba própria, criada e fechada a cada uso. As
+    navegações correm em paralelo dentro do navegador; apenas os comandos
+    WebDriver são serializados. Erros de uma aba afetam somente a página dela;
+    se a sessão inteira cair, o navegador é reiniciado uma única vez e as
+    páginas em andamento nas outras abas são repetidas no novo navegador.
+    """
+
+    def __init__(self, driver_factory: Callable[[], Any], max_tabs: int = 8,
+                 navigation_timeout: float = 30, poll_interval: float = 0.1):
+        """
+        Inicializa o backend de abas
+
+        Args:
+            driver_factory: Função que cria o driver (deve usar page_load_strategy 'none')
+            max_tabs: Máximo de abas abertas ao mesmo tempo
+            navigation_timeout: Espera máxima pelo carregamento de uma aba, em segundos
+            poll_interval: Intervalo entre verificações de carregamento, em segundos
+        """
+        if max_tabs < 1:
+            raise ValueError("O número máximo de abas deve ser pelo menos 1")
+        self.driver_factory = driver_factory
+        self.max_concurrent_pages = max_tabs
+        self.navigation_timeout = navigation_timeout
+        self.poll_interval = poll_interval
+        self.driver = None
+        self._generation = 0
+        self._current_handle: Optional[str] = None
+        self._home_handle: Optional[str] = None
+        self._command_lock = threading.RLock()
+        self._performance_buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._slots = threading.BoundedSemaphore(max_tabs)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'pages_fetched': 0,
+            'tab_errors': 0,
+            'browser_restarts': 0,
+            'tabs_open': 0
+        }
+
+    def fetch_page(self, url: str, wait: Optional[Callable[[Any], None]] = None,
+                   prepare: Optional[Callable[[Any], None]] = None, affinity: Optional[str] = None,
+                   extract: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Abre a URL em uma aba nova e retorna o HTML
+
+        Args:
+            url: URL da página
+            wait: Função chamada com a aba (TabDriver) para aguardar o conteúdo; quando informada,
+                substitui a espera padrão pelo carregamento completo do documento
+            prepare: Função chamada com a aba antes da navegação (ex.: bloqueio de recursos)
+            affinity: Ignorada; todas as abas compartilham o mesmo navegador e perfil
+            extract: Função chamada com a aba após a espera; um resultado diferente de None
+                (ex.: registros lidos no DOM) é retornado no lugar do HTML
+
+        Returns:
+            HTML da página carregada, ou o resultado de extract
+        """
+        with self._slots:
+            for attempt in range(2):
+                generation = self._generation
+                try:
+                    page_source = self._fetch_in_new_tab(url, wait, prepare, extract)
+                    with self._stats_lock:
+                        self._stats['pages_fetched'] += 1
+                    return page_source
+                except Exception as e:
+                    with self._stats_lock:
+                        self._stats['tab_errors'] += 1
+                    if attempt == 0 and is_session_error(e):
+                        logger.warning(f"Sessão do navegador caiu durante {url}; reiniciando e repetindo a aba")
+                        self._recover(generation)
+                        continue
+                    raise
+
+    def _fetch_in_new_tab(self, url: str, wait: Optional[Callable[[Any], None]],
+                          prepare: Optional[Callable[[Any], None]] = None,
+                          extract: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Abre a URL em uma aba própria, aguarda o conteúdo e fecha a aba"""
+        tab = self._open_tab()
+        try:
+            if prepare is not None:
+                prepare(tab)
+            tab.get(url)
+            if wait is not None:
+                wait(tab)
+            else:
+                self._wait_navigation(tab, url)
+            result = extract(tab) if extract is not None else None
+            return result if result is not None else tab.page_source
+        finally:
+            self._close_tab(tab.handle)
+
+    def _wait_navigation(self, tab: TabDriver, url: str):
+        """Aguarda a aba sair de about:blank e o documento terminar de carregar"""
+        deadline = time.monotonic() + self.navigation_timeout
+        while time.monotonic() < deadline:
+            state = tab.execute_script("return [document.readyState, location.href];")
+            if state and state[0] == 'complete' and state[1] != 'about:blank':
+                return
+            time.sleep(self.poll_interval)
+        logger.warning(f"Aba não terminou de carregar em {self.navigation_timeout}s: {url}")
+
+    def _ensure_browser(self):
+        """Inicia o navegador compartilhado se necessário (chamado sob o lock)"""
+        if self.driver is None:
+            self.driver = self.driver_factory()
+            self._home_handle = self.driver.current_window_handle
+            self._current_handle = self._home_handle
+            logger.info("Navegador compartilhado iniciado para o backend de abas")
+
+    def _open_tab(self) -> TabDriver:
+        """Abre uma nova aba em branco"""
+        with self._command_lock:
+            self._ensure_browser()
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            self._current_handle = handle
+            self._performance_buffers[handle] = []
+        with self._stats_lock:
+            self._stats['tabs_open'] += 1
+        return TabDriver(self, handle)
+
+    def _close_tab(self, handle: str):
+        """Fecha uma aba, ignorando erros (a aba pode ter caído)"""
+        with self._command_lock:
+            self._performance_buffers.pop(handle, None)
+            try:
+                if self.driver is not None and handle in self.driver.window_handles:
+                    self._select_tab(handle)
+                    self.driver.close()
+                    self._select_tab(self._home_handle)
+            except Exception as e:
+                logger.debug(f"Erro ao fechar aba: {e}")
+                self._current_handle = None
+        with self._stats_lock:
+            self._stats['tabs_open'] -= 1
+
+    def _select_tab(self, handle: str):
+        """Seleciona a aba alvo dos próximos comandos (chamado sob o lock)"""
+        if self.driver is None:
+            raise RuntimeError("invalid session id: navegador do backend de abas não está ativo")
+        if self._current_handle != handle:
+            self.driver.switch_to.window(handle)
+            self._current_handle = handle
+
+    def _performance_log(self, handle: str) -> List[Dict[str, Any]]:
+        """
+        Lê o log de performance do navegador e separa as entradas por aba
+
+        O ChromeDriver mantém um único log por sessão; as entradas das outras
+        abas ficam guardadas até que cada aba leia as suas.
+        """
+        with self._command_lock:
+            if self.driver is None:
+                return []
+            try:
+                entries = self.driver.get_log('performance')
+            except Exception as e:
+                logger.debug(f"Log de performance indisponível: {e}")
+                entries = []
+            for entry in entries:
+                try:
+                    webview = json.loads(entry['message']).get('webview')
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if webview in self._performance_buffers:
+                    self._performance_buffers[webview].append(entry)
+            own_entries = self._performance_buffers.get(handle, [])
+            if handle in self._performance_buffers:
+                self._performance_buffers[handle] = []
+            return own_entries
+
+    def _recover(self, generation: int):
+        """Reinicia o navegador, a menos que outra aba já o tenha feito"""
+        with self._command_lock:
+            if generation != self._generation:
+                return
+            old_driver = self.driver
+            self.driver = None
+            self._current_handle = None
+            self._generation += 1
+            self._performance_buffers.clear()
+            if old_driver is not None:
+                try:
+                    old_driver.quit()
+                except Exception as e:
+                    logger.debug(f"Erro ao encerrar navegador caído: {e}")
+            with self._stats_lock:
+                self._stats['browser_restarts'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtém estatísticas do backend de abas
+
+        Returns:
+            Dicionário com estatísticas de abas e páginas
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['max_concurrent_pages'] = self.max_concurrent_pages
+        stats['browser_active'] = self.driver is not None
+        return stats
+
+    def close(self):
+        """Encerra o navegador compartilhado"""
+        with self._command_lock:
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except Exception as e:
+                    logger.debug(f"Erro ao encerrar navegador: {e}")
+                self.driver = None
+                self._current_handle = None
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+import requests
+from utils.http_session import get_default_http_session
+from utils.fixture_store import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+# Tipos de página buscados pelos scrapers; cada tipo tem sua própria cadeia de transportes
+KIND_LISTING = 'listing'  # Página de busca
+KIND_PRODUCT = 'product'  # Página de um produto
+KIND_API = 'api'  # Resposta JSON da API de busca da loja
+
+class TransportResponse:
+    """Resposta normalizada de qualquer transporte"""
+
+    def __init__(self, url: str, content: str, status_code: int = 200, transport: str = '',
+                 final_url: Optional[str] = None, records: Optional[List[Dict[str, Any]]] = None):
+        """
+        Inicializa a resposta
+
+        Args:
+            url: URL requisitada
+            content: Corpo da página (HTML ou JSON)
+            status_code: Status HTTP (200 para páginas renderizadas no navegador)
+            transport: Nome do transporte que atendeu a requisição
+            final_url: URL final após redirecionamentos
+            records: Registros dos produtos extraídos no navegador (o HTML fica vazio)
+        """
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.transport = transport
+        self.final_url = final_url or url
+        self.records = records
+
+    @property
+    def ok(self) -> bool:
+        """Indica se a resposta tem status de sucesso"""
+        return 200 <= self.status_code < 400
+
+    def json(self) -> Any:
+        """Decodifica o corpo como JSON"""
+        return json.loads(self.content)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato de make_request: {'content', 'status_code', 'url', 'records'}"""
+        return {'content': self.content, 'status_code': self.status_code, 'url': self.url, 'records': self.records}
+
+class Transport:
+    """
+    Forma de obter uma página para um scraper.
+
+    Cada transporte recebe o scraper que faz a requisição, para usar o
+    contexto dele (driver, cabeçalhos, estatísticas de rede).
+    """
+
+    name = ''
+
+    def fetch(self, scraper, url: str, kind: str = KIND_LISTING) -> TransportResponse:
+        """
+        Obtém a página
+
+        Args:
+            scraper: Scraper que faz a requisição
+            url: URL da página
+            kind: KIND_LISTING, KIND_PRODUCT ou KIND_API
+
+        Returns:
+            Resposta normalizada
+        """
+        raise NotImplementedError
+
+class SeleniumTransport(Transport):
+    """Renderiza a página no navegador do scraper (driver do pool, aba ou backend compartilhado)"""
+
+    name = 'selenium'
+
+    def fetch(self, scraper, url: str, kind: str = KIND_LISTING) -> TransportResponse:
+        if kind == KIND_LISTING:
+            content = scraper.fetch_listing_page(url)
+        elif kind == KIND_PRODUCT:
+            content = scraper.fetch_product_page(url)
+        else:
+            raise ValueError(f"O transporte selenium não atende páginas do tipo '{kind}'")
+        if isinstance(content, list):
+            # Registros extraídos no navegador (LISTING_EXTRACT_SCRIPT) no lugar do HTML
+            return TransportResponse(url, '', transport=self.name, records=content)
+        return TransportResponse(url, content, transport=self.name)
+
+class HttpTransport(Transport):
+    """Requisição HTTP direta na sessão keep-alive compartilhada, sem navegador"""
+
+    name = 'http'
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Args:
+            session: Sessão HTTP (padrão: a sessão compartilhada)
+        """
+        self.session = session
+
+    def fetch(self, scraper, url: str, kind: str = KIND_LISTING) -> TransportResponse:
+        session = self.session or get_default_http_session()
+        response = session.get(url, headers=scraper.http_headers(kind), timeout=scraper.HTTP_TIMEOUT)
+        scraper.network_stats.record_http_response(len(response.content))
+        return TransportResponse(url, response.text, response.status_code, self.name, response.url)
+
+class ReplayTransport(Transport):
+    """Serve páginas gravadas no FixtureStore, sem rede, com latência simulada opcional"""
+
+    name = 'replay'
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0):
+        """
+        Args:
+            store: Páginas gravadas (ver utils.fixture_store)
+            latency: Atraso injetado em cada página, em segundos (0 para máxima velocidade)
+        """
+        self.store = store
+        self.latency = latency
+
+    def fetch(self, scraper, url: str, kind: str = KIND_LISTING) -> TransportResponse:
+        fixture = self.store.get(url, getattr(scraper, 'search_term', None))
+        if fixture is None:
+            raise LookupError(f"Página não gravada: {url}")
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return TransportResponse(url, fixture['content'], fixture.get('status_code', 200), self.name)
+
+# Transportes disponíveis por nome (configuráveis pela aplicação)
+_transports: Dict[str, Transport] = {
+    SeleniumTransport.name: SeleniumTransport(),
+    HttpTransport.name: HttpTransport()
+}
+_transports_lock = threading.Lock()
+
+def get_transport(name: str) -> Transport:
+    """
+    Retorna o transporte registrado com o nome
+
+    Raises:
+        ValueError: Se o transporte não estiver registrado
+    """
+    with _transports_lock:
+        transport = _transports.get(name)
+    if transport is None:
+        raise ValueError(f"Transporte desconhecido: {name}")
+    return transport
+
+def register_transport(transport: Transport):
+    """Registra (ou substitui) um transporte pelo seu nome"""
+    with _transports_lock:
+        _transports[transport.name] = transport
+
+# Cadeias que servem todos os tipos de página pelas páginas gravadas (busca inteira offline)
+REPLAY_TRANSPORTS = {kind: (ReplayTransport.name,) for kind in (KIND_LISTING, KIND_PRODUCT, KIND_API)}
+
+def resolve_transports(names: Iterable[str]):
+    """Converte uma cadeia de nomes em transportes, validando os nomes"""
+    return [get_transport(name) for name in names]